@@ -10,7 +10,7 @@ general methods.
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any, Callable, TYPE_CHECKING, Iterable, Optional
+from typing import Any, Callable, TYPE_CHECKING, Iterable, Optional, TypeVar
 
 # Third-Party Imports
 import numpy as np
@@ -32,10 +32,64 @@ if TYPE_CHECKING:
 
 
 SAMPLES: int = 1000
+Data = TypeVar("Data")
 
 np.seterr(divide="ignore", invalid="ignore")
 
 
+class BaselineFingerprint:
+    """Precomputed models and statistics of the baseline profile
+
+    When the same baseline is checked against many target profiles (e.g. against each mutation
+    during the fuzzing), the baseline side of the checks (the applicable methods, the best models
+    of each uid, the averages of the amounts, etc.) is computed only once and then looked up in
+    the fingerprint.
+
+    :ivar Profile profile: the baseline profile
+    :ivar dict data: map of the names of the precomputed data to the data
+    """
+
+    __slots__ = ["profile", "data"]
+
+    def __init__(self, profile: Profile) -> None:
+        """Initializes the empty fingerprint; the data are computed lazily by their first lookup
+
+        :param Profile profile: the baseline profile
+        """
+        self.profile = profile
+        self.data: dict[str, Any] = {}
+
+    def lookup(self, key: str, compute: Callable[[Profile], Data]) -> Data:
+        """Returns the data of the baseline, computing them if they are not precomputed yet
+
+        :param str key: name of the data
+        :param callable compute: function computing the data from the baseline profile
+        :return: the precomputed data
+        """
+        if key not in self.data:
+            self.data[key] = compute(self.profile)
+        return self.data[key]
+
+
+def lookup_baseline_data(
+    baseline_profile: Profile,
+    key: str,
+    compute: Callable[[Profile], Data],
+    fingerprint: Optional[BaselineFingerprint] = None,
+) -> Data:
+    """Returns the data computed from the baseline profile, reusing the fingerprint if possible
+
+    :param Profile baseline_profile: baseline profile
+    :param str key: name of the data
+    :param callable compute: function computing the data from the baseline profile
+    :param BaselineFingerprint fingerprint: fingerprint of the baseline or None
+    :return: the data of the baseline profile
+    """
+    if fingerprint is not None and fingerprint.profile is baseline_profile:
+        return fingerprint.lookup(key, compute)
+    return compute(baseline_profile)
+
+
 def create_filter_by_model(
     model_name: str,
 ) -> Callable[[dict[str, Any], dict[str, Any]], bool]:
@@ -125,6 +179,24 @@ def get_filtered_best_models_of(
     return best_model_map
 
 
+def get_best_param_models_of(profile: Profile) -> dict[str, ModelRecord]:
+    """
+    :param Profile profile: profile with models
+    :returns: map of unique identifiers to their best parametric models
+    """
+    return get_filtered_best_models_of(profile, group="param")
+
+
+def get_linear_param_models_of(profile: Profile) -> dict[str, ModelRecord]:
+    """
+    :param Profile profile: profile with models
+    :returns: map of unique identifiers to their best linear models
+    """
+    return get_filtered_best_models_of(
+        profile, group="param", model_filter=create_filter_by_model("linear")
+    )
+
+
 def get_function_values(model: ModelRecord) -> tuple[list[float], list[float]]:
     """Obtains the relevant values of dependent and independent variables according to
     the given profile, respectively its coefficients. On the base of the count of samples
@@ -167,6 +239,7 @@ def general_detection(
     baseline_profile: Profile,
     target_profile: Profile,
     classification_method: ClassificationMethod = ClassificationMethod.PolynomialRegression,
+    fingerprint: Optional[BaselineFingerprint] = None,
 ) -> Iterable[DegradationInfo]:
     """The general method, which covers all detection logic. At the beginning obtains the pairs
     of the best models from the given profiles and the pairs of the linear models. Subsequently,
@@ -179,14 +252,17 @@ def general_detection(
     :param Profile target_profile: profile corresponding to the checked minor version
     :param ClassificationMethod classification_method: method used for actual classification of
         performance changes
+    :param BaselineFingerprint fingerprint: precomputed models of the baseline profile or None
     :returns: tuple (degradation result, degradation location, degradation rate, confidence)
     """
 
     # obtaining the needed models from both profiles
-    best_baseline_models = get_filtered_best_models_of(baseline_profile, group="param")
+    best_baseline_models = lookup_baseline_data(
+        baseline_profile, "best-param-models", get_best_param_models_of, fingerprint
+    )
     best_target_models = get_filtered_best_models_of(target_profile, group="param")
-    linear_baseline_model = get_filtered_best_models_of(
-        baseline_profile, group="param", model_filter=create_filter_by_model("linear")
+    linear_baseline_model = lookup_baseline_data(
+        baseline_profile, "linear-param-models", get_linear_param_models_of, fingerprint
     )
     linear_target_model = get_filtered_best_models_of(
         target_profile, group="param", model_filter=create_filter_by_model("linear")
@@ -4,18 +4,26 @@ Collection of global methods for detection of performance changes
 from __future__ import annotations
 
 # Standard Imports
+import collections
 import contextlib
 import distutils.util as dutils
+import json
+import multiprocessing
+import multiprocessing.pool
+import operator
 import os
 import re
+import signal
+import sys
 
-from typing import Any, Iterable, Protocol, TYPE_CHECKING
+from typing import Any, Iterable, Iterator, Optional, Protocol, TYPE_CHECKING
 
 # Third-Party Imports
 
 # Perun Imports
-from perun.logic import config, pcs, runner, store
+from perun.logic import config, pcs, runner, store, summary
 from perun.select.abstract_base_selection import AbstractBaseSelection
+from perun.check import detection_kit
 from perun.check.methods import (
     average_amount_threshold,
     best_model_order_equality,
@@ -27,6 +35,7 @@ from perun.check.methods import (
     polynomial_regression,
 )
 from perun.utils import decorators, log
+from perun.utils.common import common_kit
 from perun.utils.structs import (
     DetectionChangeResult,
     DegradationInfo,
@@ -34,7 +43,7 @@ from perun.utils.structs import (
     MinorVersion,
     ModelRecord,
 )
-from perun.utils.exceptions import UnsupportedModuleException
+from perun.utils.exceptions import SuppressedExceptions, UnsupportedModuleException
 import perun.profile.helpers as profiles
 
 if TYPE_CHECKING:
@@ -43,6 +52,9 @@ if TYPE_CHECKING:
 
 # Minimal confidence rate from both models to perform the detection
 _MIN_CONFIDENCE_RATE = 0.15
+DEFAULT_DEGRADATION_WORKERS: str = "1"
+# Checked pair of profiles: command string, path to target, path to baseline and baseline minor
+HistoryCheckPair = tuple[str, str, str, str]
 
 
 class CallableDetectionMethod(Protocol):
@@ -153,48 +165,340 @@ def degradation_in_minor(
     for parent_version in selection.get_parents(minor_version_info):
         pre_collect_profiles(parent_version)
 
-    profile_queue = profiles_to_queue(minor_version)
+    profile_queue = list(profiles_to_queue(minor_version).items())
     detected_changes = []
 
-    for target_config, target_profile_info in profile_queue.items():
-        # Iterate through the profiles and check degradation between those of same configuration
-        target_prof = store.load_profile_from_file(target_profile_info.realpath, False, True)
-        cmdstr = profiles.config_tuple_to_cmdstr(target_config)
+    # Load the target profiles and their baselines in batches, so only the profiles of one batch
+    # are held in the memory, while each batch is still loaded concurrently
+    batch_size = store.get_profile_load_workers()
+    for batch_start in range(0, len(profile_queue), batch_size):
+        batch = profile_queue[batch_start : batch_start + batch_size]
+        target_profiles = profiles.ProfileInfo.load_all([target_info for _, target_info in batch])
+        baseline_infos = [
+            selection.get_profiles(minor_version_info, target_prof)
+            for target_prof in target_profiles
+        ]
+        baseline_profiles = iter(
+            profiles.ProfileInfo.load_all(
+                [
+                    baseline_profile_info
+                    for baselines in baseline_infos
+                    for _, baseline_profile_info in baselines
+                ]
+            )
+        )
 
-        for baseline_info, baseline_profile_info in selection.get_profiles(
-            minor_version_info, target_prof
+        for (target_config, _), target_prof, baselines in zip(
+            batch, target_profiles, baseline_infos
         ):
-            baseline_prof = store.load_profile_from_file(
-                baseline_profile_info.realpath, False, True
-            )
-            for deg in degradation_between_profiles(baseline_prof, target_prof, "best-model"):
-                if deg.result != PerformanceChange.NoChange:
-                    detected_changes.append((deg, cmdstr, baseline_info.checksum))
+            # Iterate through the profiles and check degradation between those of same configuration
+            cmdstr = profiles.config_tuple_to_cmdstr(target_config)
+
+            for baseline_info, _ in baselines:
+                baseline_prof = next(baseline_profiles)
+                for deg in degradation_between_profiles(baseline_prof, target_prof, "best-model"):
+                    if deg.result != PerformanceChange.NoChange:
+                        detected_changes.append((deg, cmdstr, baseline_info.checksum))
 
     # Store the detected degradation
     store.save_degradation_list_for(pcs.get_object_directory(), minor_version, detected_changes)
+    summary.update_summaries_of([minor_version])
     if not quiet:
         log.print_list_of_degradations(detected_changes)
     return detected_changes
 
 
+class HistoryCheckpoint:
+    """Checkpoint of the degradation check of the whole history
+
+    The changes detected in each finished minor version are appended as one JSON line to the
+    checkpoint in the ``.perun/cache/check`` directory right after the minor version is checked,
+    so the interrupted check of the history can be resumed without checking the finished minor
+    versions again.
+
+    :ivar str path: path to the file with the checkpoint
+    :ivar dict finished: map of checksums of finished minor versions to their changes stored as
+        changelog lines (see :func:`perun.logic.store.parse_changelog_line`)
+    """
+
+    __slots__ = ["path", "finished"]
+
+    def __init__(self, head: str, resume: bool) -> None:
+        """Initializes the checkpoint of the history starting at the head
+
+        :param str head: checksum of the head of the checked history
+        :param bool resume: if set to true, then the previously stored checkpoint is loaded,
+            otherwise it is discarded
+        """
+        self.path = os.path.join(pcs.get_cache_directory(), "check", f"{head}.jsonl")
+        self.finished: dict[str, list[str]] = {}
+        if not resume:
+            self.remove()
+        elif os.path.exists(self.path):
+            with SuppressedExceptions(OSError):
+                with open(self.path, "r") as checkpoint_handle:
+                    for line in checkpoint_handle:
+                        # The last line can be incomplete, if the check was killed while writing
+                        with SuppressedExceptions(ValueError, TypeError, KeyError):
+                            record = json.loads(line)
+                            self.finished[record["minor"]] = record["changes"]
+
+    def is_finished(self, minor_version: str) -> bool:
+        """Checks whether the minor version was already checked
+
+        :param str minor_version: checksum of the minor version
+        :return: true if the changes of the minor version are stored in the checkpoint
+        """
+        return minor_version in self.finished
+
+    def changes_of(self, minor_version: str) -> list[tuple[DegradationInfo, str, str]]:
+        """Returns the changes detected in the finished minor version
+
+        :param str minor_version: checksum of the finished minor version
+        :return: list of triples (degradation info, command string, baseline minor version)
+        """
+        return [store.parse_changelog_line(line) for line in self.finished[minor_version]]
+
+    def finish(
+        self, minor_version: str, detected_changes: list[tuple[DegradationInfo, str, str]]
+    ) -> None:
+        """Appends the changes detected in the minor version to the checkpoint
+
+        :param str minor_version: checksum of the finished minor version
+        :param list detected_changes: list of triples (degradation info, command string, baseline
+            minor version)
+        """
+        self.finished[minor_version] = [
+            " ".join([deg.to_storage_record(), source, cmdstr])
+            for deg, cmdstr, source in detected_changes
+        ]
+        common_kit.touch_dir(os.path.dirname(self.path))
+        with open(self.path, "a") as checkpoint_handle:
+            checkpoint_handle.write(
+                json.dumps({"minor": minor_version, "changes": self.finished[minor_version]}) + "\n"
+            )
+
+    def remove(self) -> None:
+        """Removes the checkpoint once the whole history is checked"""
+        with SuppressedExceptions(OSError):
+            os.remove(self.path)
+
+
+class HistoryProfileCache:
+    """Cache of the profiles loaded for the check of the history
+
+    The profiles are loaded per minor version, right before the minor version is checked, and
+    each profile is evicted once the last planned pair, that uses it, was checked. Hence, only
+    the profiles shared by the neighbouring minor versions (e.g. the target profiles of parents,
+    which are first used as baselines of their children) are kept in the memory.
+
+    :ivar dict remaining_uses: map of paths of profiles to the number of planned pairs, that use
+        the profile and were not checked yet
+    :ivar dict profiles: map of paths of currently loaded profiles to the profiles
+    """
+
+    __slots__ = ["remaining_uses", "profiles"]
+
+    def __init__(self, checked_pairs: list[list[HistoryCheckPair]]) -> None:
+        """Counts the uses of the profiles in all planned pairs
+
+        :param list checked_pairs: list of pairs of checked profiles for each checked minor version
+        """
+        self.remaining_uses: dict[str, int] = collections.Counter(
+            path
+            for pairs in checked_pairs
+            for _, target_path, baseline_path, _ in pairs
+            for path in (target_path, baseline_path)
+        )
+        self.profiles: dict[str, Profile] = {}
+
+    def acquire(self, pairs: list[HistoryCheckPair]) -> dict[str, Profile]:
+        """Loads the profiles of the pairs, that are not loaded yet
+
+        :param list pairs: list of pairs of checked profiles of the minor version
+        :return: map of paths of the profiles of the pairs to the profiles
+        """
+        paths = list(
+            dict.fromkeys(path for _, target, baseline, _ in pairs for path in (target, baseline))
+        )
+        unloaded_paths = [path for path in paths if path not in self.profiles]
+        self.profiles.update(
+            zip(unloaded_paths, store.load_profiles_from_files(unloaded_paths, False))
+        )
+        return {path: self.profiles[path] for path in paths}
+
+    def release(self, pairs: list[HistoryCheckPair]) -> None:
+        """Evicts the profiles, whose last pair was checked
+
+        :param list pairs: list of pairs of checked profiles of the minor version
+        """
+        for _, target_path, baseline_path, _ in pairs:
+            for path in (target_path, baseline_path):
+                self.remaining_uses[path] -= 1
+                if self.remaining_uses[path] <= 0:
+                    self.profiles.pop(path, None)
+
+
+def get_degradation_workers() -> int:
+    """Returns the number of processes used for checking the minor versions of the history
+
+    :return: value of :ckey:`degradation.workers` or the number of CPUs if it is set to 0
+    """
+    workers = DEFAULT_DEGRADATION_WORKERS
+    with SuppressedExceptions(OSError):
+        workers = config.lookup_key_recursively("degradation.workers", DEFAULT_DEGRADATION_WORKERS)
+    return int(workers) if int(workers) > 0 else (os.cpu_count() or 1)
+
+
+def plan_history_check(minor_versions: list[MinorVersion]) -> dict[str, list[HistoryCheckPair]]:
+    """Pairs the target profiles of the checked minor versions with their baseline profiles
+
+    The pairs are planned only from the metadata of the target profiles (see
+    :func:`perun.logic.store.load_profile_metadata_from_file`), which are sufficient for finding
+    the compatible baseline profiles; the whole profiles are loaded only when checking the pairs.
+
+    :param list minor_versions: list of checked minor versions
+    :return: map of checksums of minor versions to the list of their pairs of the checked profiles
+    """
+    selection: AbstractBaseSelection = pcs.selection()
+    pairs = {}
+    for minor_version in minor_versions:
+        # Precollect profiles for near versions
+        pre_collect_profiles(minor_version)
+        for parent_version in selection.get_parents(minor_version):
+            pre_collect_profiles(parent_version)
+
+        pairs[minor_version.checksum] = [
+            (
+                profiles.config_tuple_to_cmdstr(target_config),
+                target_info.realpath,
+                baseline_info.realpath,
+                baseline_minor.checksum,
+            )
+            for target_config, target_info in profiles_to_queue(minor_version.checksum).items()
+            for baseline_minor, baseline_info in selection.get_profiles(
+                minor_version,
+                store.load_profile_metadata_from_file(target_info.realpath, False),  # type: ignore
+            )
+        ]
+    return pairs
+
+
+def init_history_worker() -> None:
+    """Initializes the worker checking the minor versions of the history
+
+    The output of the worker is discarded, since it would break the printed history.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.stdout = open(os.devnull, "w")
+
+
+def check_history_pairs(
+    pairs: list[HistoryCheckPair], loaded_profiles: dict[str, Profile]
+) -> list[tuple[DegradationInfo, str, str]]:
+    """Checks the pairs of profiles of one minor version for degradations
+
+    :param list pairs: list of pairs of checked profiles of the minor version
+    :param dict loaded_profiles: map of paths of the profiles of the pairs to the profiles
+    :return: list of found changes
+    """
+    detected_changes = []
+    for cmdstr, target_path, baseline_path, baseline_minor in pairs:
+        for deg in degradation_between_profiles(
+            loaded_profiles[baseline_path], loaded_profiles[target_path], "best-model"
+        ):
+            if deg.result != PerformanceChange.NoChange:
+                detected_changes.append((deg, cmdstr, baseline_minor))
+    return detected_changes
+
+
+def check_history(
+    checked_pairs: list[list[HistoryCheckPair]],
+) -> Iterator[list[tuple[DegradationInfo, str, str]]]:
+    """Checks the minor versions of the history, possibly in parallel
+
+    The profiles are loaded per minor version into the bounded cache (see
+    :class:`HistoryProfileCache`). When checking in parallel, at most twice as many minor versions
+    as there are workers are sent to the workers at once, together with their profiles.
+
+    :param list checked_pairs: list of pairs of checked profiles for each checked minor version
+    :return: iterator of the changes found in the minor versions in the same order as the pairs
+    """
+    profile_cache = HistoryProfileCache(checked_pairs)
+    workers = min(get_degradation_workers(), len(checked_pairs))
+    if workers <= 1:
+        for pairs in checked_pairs:
+            detected_changes = check_history_pairs(pairs, profile_cache.acquire(pairs))
+            profile_cache.release(pairs)
+            yield detected_changes
+        return
+
+    with multiprocessing.Pool(workers, init_history_worker) as pool:
+        pending: collections.deque[multiprocessing.pool.AsyncResult[Any]] = collections.deque()
+        for pairs in checked_pairs:
+            pending.append(
+                pool.apply_async(check_history_pairs, (pairs, profile_cache.acquire(pairs)))
+            )
+            profile_cache.release(pairs)
+            while len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
 @log.print_elapsed_time
-def degradation_in_history(head: str) -> list[tuple[DegradationInfo, str, str]]:
+def degradation_in_history(
+    head: str, resume: bool = False
+) -> list[tuple[DegradationInfo, str, str]]:
     """Walks through the minor version starting from the given head, checking for degradation.
 
+    The pairs of target and baseline profiles of all checked minor versions are first planned
+    (see :func:`plan_history_check`). The minor versions are then checked in the pool of
+    :ckey:`degradation.workers` processes, while their profiles are loaded only when needed and
+    the results are reported in the order of the history. The changes of each checked minor
+    version are checkpointed, so the interrupted check can be later resumed.
+
     :param str head: starting point of the checked history for degradation.
+    :param bool resume: if set to true, then the minor versions checked by the previously
+        interrupted check of the same history are not checked again
     :returns: tuple (degradation result, degradation location, degradation rate)
     """
     log.major_info("Checking Whole History")
     log.minor_info("This might take a while")
     detected_changes = []
     version_selection: AbstractBaseSelection = pcs.selection()
+    minor_versions = list(pcs.vcs().walk_minor_versions(head))
+    checkpoint = HistoryCheckpoint(minor_versions[0].checksum if minor_versions else head, resume)
+    checked_versions = [
+        minor_version
+        for minor_version in minor_versions
+        if version_selection.should_check_version(minor_version)
+        and not checkpoint.is_finished(minor_version.checksum)
+    ]
+    pairs = plan_history_check(checked_versions)
+    checked_changes = check_history(
+        [pairs[minor_version.checksum] for minor_version in checked_versions]
+    )
+
     with log.History(head) as history:
-        for minor_version in pcs.vcs().walk_minor_versions(head):
+        for minor_version in minor_versions:
             history.progress_to_next_minor_version(minor_version)
             newly_detected_changes = []
-            if version_selection.should_check_version(minor_version):
-                newly_detected_changes = degradation_in_minor(minor_version.checksum, True)
+            if checkpoint.is_finished(minor_version.checksum):
+                log.major_info(f"Checking Version {minor_version.checksum}")
+                log.minor_info("Resumed from the checkpoint")
+                newly_detected_changes = checkpoint.changes_of(minor_version.checksum)
+                log.print_short_change_string(
+                    log.count_degradations_per_group(newly_detected_changes)
+                )
+            elif version_selection.should_check_version(minor_version):
+                log.major_info(f"Checking Version {minor_version.checksum}")
+                newly_detected_changes = next(checked_changes)
+                # Store the detected degradation
+                store.save_degradation_list_for(
+                    pcs.get_object_directory(), minor_version.checksum, newly_detected_changes
+                )
+                checkpoint.finish(minor_version.checksum, newly_detected_changes)
                 log.print_short_change_string(
                     log.count_degradations_per_group(newly_detected_changes)
                 )
@@ -204,13 +508,18 @@ def degradation_in_history(head: str) -> list[tuple[DegradationInfo, str, str]]:
             log.print_list_of_degradations(newly_detected_changes)
             detected_changes.extend(newly_detected_changes)
             history.flush(with_border=True)
+    summary.update_summaries_of(minor_version.checksum for minor_version in checked_versions)
+    checkpoint.remove()
     log.newline()
     log.print_short_summary_of_degradations(detected_changes)
     return detected_changes
 
 
 def degradation_between_profiles(
-    baseline_profile: Profile, target_profile: Profile, models_strategy: str
+    baseline_profile: Profile,
+    target_profile: Profile,
+    models_strategy: str,
+    fingerprint: Optional[detection_kit.BaselineFingerprint] = None,
 ) -> Iterable[DegradationInfo]:
     """Checks between a pair of (baseline, target) profiles, whether there can be degradation detected
 
@@ -220,15 +529,63 @@ def degradation_between_profiles(
     :param ProfileInfo baseline_profile: baseline against which we are checking the degradation
     :param ProfileInfo target_profile: profile corresponding to the checked minor version
     :param str models_strategy: name of detection models strategy to obtains relevant model kinds
+    :param BaselineFingerprint fingerprint: precomputed models and statistics of the baseline,
+        which is checked against many targets, or None
     :returns: tuple (degradation result, degradation location, degradation rate)
     """
+    strategies = detection_kit.lookup_baseline_data(
+        baseline_profile,
+        "strategies",
+        lambda profile: list(get_strategies_for(profile)),
+        fingerprint,
+    )
     # We run all degradation methods suitable for the given configuration of profile
-    for degradation_method in get_strategies_for(baseline_profile):
+    for degradation_method in strategies:
         yield from run_degradation_check(
-            degradation_method, baseline_profile, target_profile, models_strategy=models_strategy
+            degradation_method,
+            baseline_profile,
+            target_profile,
+            models_strategy=models_strategy,
+            fingerprint=fingerprint,
         )
 
 
+def create_baseline_fingerprint(
+    baseline_profile: Profile, models_strategy: str
+) -> detection_kit.BaselineFingerprint:
+    """Precomputes the data of the baseline profile, that are looked up by the applicable methods
+
+    :param Profile baseline_profile: baseline, which will be checked against many targets
+    :param str models_strategy: name of detection models strategy to obtains relevant model kinds
+    :returns: fingerprint of the baseline profile
+    """
+    fingerprint = detection_kit.BaselineFingerprint(baseline_profile)
+    strategies = fingerprint.lookup("strategies", lambda profile: list(get_strategies_for(profile)))
+    partial_strategies = {
+        "all-models": ["all-param", "all-nonparam"],
+        "best-both": ["best-param", "best-nonparam"],
+    }.get(models_strategy, [models_strategy])
+    for degradation_method in strategies:
+        if degradation_method == "average_amount_threshold":
+            fingerprint.lookup("averages", average_amount_threshold.get_averages)
+        if degradation_method in (
+            "best_model_order_equality",
+            "fast_check",
+            "linear_regression",
+            "polynomial_regression",
+        ):
+            fingerprint.lookup("best-param-models", detection_kit.get_best_param_models_of)
+        if degradation_method in ("fast_check", "linear_regression", "polynomial_regression"):
+            fingerprint.lookup("linear-param-models", detection_kit.get_linear_param_models_of)
+        if degradation_method in ("integral_comparison", "local_statistics"):
+            for partial_strategy in partial_strategies:
+                fingerprint.lookup(
+                    f"{partial_strategy}-models",
+                    operator.methodcaller("all_filtered_models", partial_strategy),
+                )
+    return fingerprint
+
+
 def run_degradation_check(
     degradation_method: str, baseline_profile: Profile, target_profile: Profile, **kwargs: Any
 ) -> Iterable[DegradationInfo]:
@@ -310,6 +667,7 @@ def degradation_between_files(
     store.save_degradation_list_for(
         pcs.get_object_directory(), target_minor_version, detected_changes
     )
+    summary.update_summaries_of([target_minor_version])
     log.newline()
     log.print_list_of_degradations(detected_changes)
     log.print_short_summary_of_degradations(detected_changes)
@@ -401,6 +759,7 @@ def run_detection_with_strategy(
     baseline_profile: Profile,
     target_profile: Profile,
     models_strategy: str,
+    fingerprint: Optional[detection_kit.BaselineFingerprint] = None,
 ) -> Iterable[DegradationInfo]:
     """
     The wrapper for running detection methods for all kinds of models.
@@ -414,6 +773,7 @@ def run_detection_with_strategy(
     :param Profile baseline_profile: baseline profile against which we are checking the degradation
     :param Profile target_profile: target profile corresponding to the checked minor version
     :param str models_strategy: name of detection models strategy to obtains relevant model kinds
+    :param BaselineFingerprint fingerprint: precomputed models of the baseline profile or None
     :returns: tuple - degradation result (structure DegradationInfo)
     """
     if models_strategy in ("all-models", "best-both"):
@@ -424,11 +784,16 @@ def run_detection_with_strategy(
         )
         for partial_strategy in partial_strategies:
             for degradation_info in run_detection_with_strategy(
-                detection_method, baseline_profile, target_profile, partial_strategy
+                detection_method, baseline_profile, target_profile, partial_strategy, fingerprint
             ):
                 yield degradation_info
     else:
-        baseline_models = baseline_profile.all_filtered_models(models_strategy)
+        baseline_models = detection_kit.lookup_baseline_data(
+            baseline_profile,
+            f"{models_strategy}-models",
+            lambda profile: profile.all_filtered_models(models_strategy),
+            fingerprint,
+        )
         target_models = target_profile.all_filtered_models(models_strategy)
         for degradation_info in _run_detection_for_models(
             detection_method,
@@ -46,6 +46,7 @@ from perun.check.methods.abstract_base_checker import AbstractBaseChecker
 from perun.profile import convert
 from perun.utils.common import common_kit
 from perun.utils.structs import DegradationInfo, PerformanceChange
+import perun.check.detection_kit as detection
 
 if TYPE_CHECKING:
     from perun.profile.factory import Profile
@@ -60,7 +61,7 @@ def get_averages(profile: Profile) -> dict[str, float]:
     :param profiles.Profile profile: dictionary representation of profile
     :returns: dictionary with averages for all uids
     """
-    data_frame = convert.resources_to_pandas_dataframe(profile)
+    data_frame = convert.resources_to_pandas_dataframe(profile, columns=["uid", "amount"])
     # Short fix for non-measured (static) profiles
     if "amount" not in data_frame:
         data_frame["amount"] = 0
@@ -69,7 +70,7 @@ def get_averages(profile: Profile) -> dict[str, float]:
 
 class AverageAmountThreshold(AbstractBaseChecker):
     def check(
-        self, baseline_profile: Profile, target_profile: Profile, **_: Any
+        self, baseline_profile: Profile, target_profile: Profile, **kwargs: Any
     ) -> Iterable[DegradationInfo]:
         """Checks between a pair of (baseline, target) profiles, whether there can be degradation detected
 
@@ -78,10 +79,12 @@ class AverageAmountThreshold(AbstractBaseChecker):
 
         :param profiles.Profile baseline_profile: baseline against which we are checking the degradation
         :param profiles.Profile target_profile: profile corresponding to the checked minor version
-        :param dict _: unification with other detection methods (unused in this method)
+        :param dict kwargs: the fingerprint of the baseline profile (if precomputed)
         :returns: tuple (degradation result, degradation location, degradation rate)
         """
-        baseline_averages = get_averages(baseline_profile)
+        baseline_averages = detection.lookup_baseline_data(
+            baseline_profile, "averages", get_averages, kwargs.get("fingerprint")
+        )
         target_averages = get_averages(target_profile)
 
         # Fixme: Temporary solution ;)
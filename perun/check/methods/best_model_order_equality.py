@@ -68,7 +68,7 @@ MODEL_ORDERING = [
 
 class BestModelOrderEquality(AbstractBaseChecker):
     def check(
-        self, baseline_profile: Profile, target_profile: Profile, **_: Any
+        self, baseline_profile: Profile, target_profile: Profile, **kwargs: Any
     ) -> Iterable[DegradationInfo]:
         """Checks between a pair of (baseline, target) profiles, whether there can be degradation detected
 
@@ -77,11 +77,14 @@ class BestModelOrderEquality(AbstractBaseChecker):
 
         :param dict baseline_profile: baseline against which we are checking the degradation
         :param dict target_profile: profile corresponding to the checked minor version
-        :param dict _: unification with other detection methods (unused in this method)
+        :param dict kwargs: the fingerprint of the baseline profile (if precomputed)
         :returns: tuple (degradation result, degradation location, degradation rate)
         """
-        best_baseline_models = detection.get_filtered_best_models_of(
-            baseline_profile, group="param"
+        best_baseline_models = detection.lookup_baseline_data(
+            baseline_profile,
+            "best-param-models",
+            detection.get_best_param_models_of,
+            kwargs.get("fingerprint"),
         )
         best_target_models = detection.get_filtered_best_models_of(target_profile, group="param")
 
@@ -67,9 +67,12 @@ from __future__ import annotations
 
 # Standard Imports
 from typing import Optional, Iterable, Any, TYPE_CHECKING
+import bisect
+import difflib
+import math
+import re
 
 # Third-Party Imports
-import difflib
 import numpy as np
 import pandas as pd
 from scipy import stats
@@ -77,10 +80,12 @@ from scipy import stats
 # Perun Imports
 from perun.check.methods.abstract_base_checker import AbstractBaseChecker
 from perun.logic import config
-from perun.profile import convert
+from perun.profile import query
 from perun.utils.structs import DegradationInfo, PerformanceChange
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
+
     from perun.profile.factory import Profile
 
 OldLocMap = dict[str, str]
@@ -92,6 +97,31 @@ MZS_CUTOFF = 3.5
 IQR_CUTOFF = 1.5
 STDDEV_CUTOFF = 2.0
 NS_TO_MS = 1000000
+SIMILARITY_CUTOFF = 0.6
+
+# Indexes of the results of the exclusive time changes in _CHANGES
+_CHANGES = (
+    PerformanceChange.NoChange,
+    PerformanceChange.NotInBaseline,
+    PerformanceChange.NotInTarget,
+    PerformanceChange.SevereDegradation,
+    PerformanceChange.SevereOptimization,
+    PerformanceChange.Degradation,
+    PerformanceChange.Optimization,
+    PerformanceChange.MaybeDegradation,
+    PerformanceChange.MaybeOptimization,
+)
+(
+    _NO_CHANGE,
+    _NOT_IN_BASELINE,
+    _NOT_IN_TARGET,
+    _SEVERE_DEGRADATION,
+    _SEVERE_OPTIMIZATION,
+    _DEGRADATION,
+    _OPTIMIZATION,
+    _MAYBE_DEGRADATION,
+    _MAYBE_OPTIMIZATION,
+) = range(len(_CHANGES))
 
 
 class ExclusiveTimeOutliers(AbstractBaseChecker):
@@ -179,30 +209,32 @@ class DiffProfile:
         self.std_dev_multiple()
         self.new_deleted_functions()
 
-        # Transform the DataFrame to DegradationInfo for each function in the DF
-        for _, row in self.df.iterrows():
-            # Do not report changes that are below the cutoff threshold
-            if -self.cut_off < row["loc exclusive T Δ [%]"] < self.cut_off:
-                continue
-            # Determine the severity and confidence of the changes
-            result, ct, cr = self._determine_result_and_confidence(row)
+        # Do not report changes that are below the cutoff threshold
+        df = self.df
+        rel_delta = df["loc exclusive T Δ [%]"].to_numpy()
+        reported = ~((-self.cut_off < rel_delta) & (rel_delta < self.cut_off))
+        # Determine the severity and confidence of the changes
+        results, confidence_types, confidence_rates = self._determine_result_and_confidence()
+        # Transform the DataFrame to DegradationInfo for each reported function in the DF
+        for result, uid, fb, tt, rd, rdr, ct, cr in zip(
+            results[reported],
+            df["uid"].to_numpy()[reported],
+            _rounded_exclusive_times(df["-exclusive T [ms]"].to_numpy()[reported]),
+            _rounded_exclusive_times(df["+exclusive T [ms]"].to_numpy()[reported]),
+            df["exclusive T Δ [ms]"].to_numpy()[reported].tolist(),
+            rel_delta[reported].tolist(),
+            confidence_types[reported],
+            confidence_rates[reported].tolist(),
+        ):
             # Report the changes of function exclusive times
             yield DegradationInfo(
                 res=result,
-                loc=row["uid"],
-                fb=str(
-                    0.0
-                    if pd.isnull(row["-exclusive T [ms]"])
-                    else round(row["-exclusive T [ms]"], 3)
-                ),
-                tt=str(
-                    0.0
-                    if pd.isnull(row["+exclusive T [ms]"])
-                    else round(row["+exclusive T [ms]"], 3)
-                ),
+                loc=uid,
+                fb=fb,
+                tt=tt,
                 t="time",
-                rd=row["exclusive T Δ [ms]"],
-                rdr=row["loc exclusive T Δ [%]"],
+                rd=rd,
+                rdr=rdr,
                 ct=ct,
                 cr=round(cr, 2),
             )
@@ -231,48 +263,44 @@ class DiffProfile:
                 ct="N/A",
             )
 
-    @staticmethod
     def _determine_result_and_confidence(
-        row: pd.Series[Any],
-    ) -> tuple[PerformanceChange, str, float]:
-        """Select the severity, confidence type and confidence rate of the exclusive time change.
+        self,
+    ) -> tuple[npt.NDArray[Any], npt.NDArray[Any], npt.NDArray[np.float64]]:
+        """Select the severity, confidence type and confidence rate of the exclusive time changes.
 
-        :param row: DataFrame row of specific 'uid' (i.e., function) record
+        The changes are classified for all the records (i.e., functions) of the DataFrame at once.
 
-        :return: severity, confidence type and confidence rate
+        :return: arrays of severities, confidence types and confidence rates of all records
         """
-        exc_time = row["exclusive T Δ [ms]"]
-        if row["Mzs flag"]:
-            if exc_time > 0:
-                result = PerformanceChange.SevereDegradation
-            else:
-                result = PerformanceChange.SevereOptimization
-            # We use IQR multiple instead of the mod. z-score to make the human comparison easier
-            # ct, cr = 'Modified Z-score', row['Modified Z-score']
-            ct, cr = "IQR_multiple", row["IQR multiple"]
-        elif row["IQR flag"]:
-            if exc_time > 0:
-                result = PerformanceChange.Degradation
-            else:
-                result = PerformanceChange.Optimization
-            ct, cr = "IQR_multiple", row["IQR multiple"]
-        elif row["StdDev flag"]:
-            if exc_time > 0:
-                result = PerformanceChange.MaybeDegradation
-            else:
-                result = PerformanceChange.MaybeOptimization
-            ct, cr = "StdDev_multiple", row["StdDev multiple"]
-        else:
-            result = PerformanceChange.NoChange
-            ct, cr = "StdDev_multiple", row["StdDev multiple"]
-
-        # Update the result if the function is actually new or deleted
-        if row["NewDel flag"]:
-            if exc_time > 0:
-                result = PerformanceChange.NotInBaseline
-            else:
-                result = PerformanceChange.NotInTarget
-        return result, ct, cr
+        degradations = self.df["exclusive T Δ [ms]"].to_numpy() > 0
+        mzs_flags = self.df["Mzs flag"].to_numpy(dtype=bool)
+        iqr_flags = self.df["IQR flag"].to_numpy(dtype=bool)
+        stddev_flags = self.df["StdDev flag"].to_numpy(dtype=bool)
+        # The function that is actually new or deleted overrides the other flags
+        results = np.select(
+            [
+                self.df["NewDel flag"].to_numpy(dtype=bool),
+                mzs_flags,
+                iqr_flags,
+                stddev_flags,
+            ],
+            [
+                np.where(degradations, _NOT_IN_BASELINE, _NOT_IN_TARGET),
+                np.where(degradations, _SEVERE_DEGRADATION, _SEVERE_OPTIMIZATION),
+                np.where(degradations, _DEGRADATION, _OPTIMIZATION),
+                np.where(degradations, _MAYBE_DEGRADATION, _MAYBE_OPTIMIZATION),
+            ],
+            default=_NO_CHANGE,
+        )
+        # We use IQR multiple instead of the mod. z-score to make the human comparison easier
+        iqr_confidence = mzs_flags | iqr_flags
+        confidence_types = np.where(iqr_confidence, "IQR_multiple", "StdDev_multiple")
+        confidence_rates = np.where(
+            iqr_confidence,
+            self.df["IQR multiple"].to_numpy(dtype=np.float64),
+            self.df["StdDev multiple"].to_numpy(dtype=np.float64),
+        )
+        return np.array(_CHANGES, dtype=object)[results], confidence_types, confidence_rates
 
     def modified_z_score(self) -> None:
         """Compute the modified Z-score (Mzs) for each function in the DataFrame.
@@ -357,22 +385,52 @@ class DiffProfile:
         2) sum all individual exclusive time records
         3) filter the location based on the supplied regex
 
+        The exclusive times are summed directly over the columns of each resource type of the
+        profile, hence the whole profile is never converted to the DataFrame and only the
+        aggregated records (one per function and location) are constructed.
+
         :param profile: standard perun representation of a profile
 
         :return: an appropriately formatted DataFrame
         """
-        columns = ["uid", "exclusive", "location"]
-        # Obtain "Uid (function name), exclusive time, location" DataFrame
-        # and sum the exclusive times of individual functions
+        uids, locations, exclusive_times = [], [], []
+        for persistent, collectable, count in profile.all_resources_by_type(flatten_values=False):
+            uid, location = persistent.get("uid"), persistent.get("location")
+            if uid is None or location is None:
+                continue
+            # Only the (possibly nested) uid and location are flattened, not the whole resource
+            uids.append(uid if isinstance(uid, str) else _flattened_value("uid", uid))
+            locations.append(
+                location if isinstance(location, str) else _flattened_value("location", location)
+            )
+            if "exclusive" in persistent:
+                exclusive_times.append(persistent["exclusive"] * count)
+            elif "exclusive" in collectable:
+                exclusive_times.append(sum(collectable["exclusive"][:count]))
+            else:
+                exclusive_times.append(0)
+        # Sum the exclusive times of resource types of the same function and location
         df = (
-            convert.resources_to_pandas_dataframe(profile)[columns]
+            pd.DataFrame(
+                {
+                    "uid": uids,
+                    "location": locations,
+                    "exclusive": np.array(exclusive_times),
+                }
+            )
             .groupby(["uid", "location"])
             .sum()
             .reset_index()
         )
         # Filter the location based on the provided regex filter
         if self.location_filter is not None:
-            return df[df["location"].str.contains(self.location_filter, regex=True, na=False)]
+            location_filter = re.compile(self.location_filter)
+            matching = [
+                location
+                for location in df["location"].unique()
+                if isinstance(location, str) and location_filter.search(location)
+            ]
+            return df[df["location"].isin(matching)]
         return df
 
     @staticmethod
@@ -387,19 +445,6 @@ class DiffProfile:
         :return: the merged and extended DataFrame
         """
 
-        def _delta_exc(row: pd.Series[Any]) -> float:
-            """Helper function for properly computing the absolute exclusive time delta even
-            when the function is new / deleted (in those cases, one of the exclusive times is
-            nan, which breaks the computation).
-
-            :param row: a specific DataFrame row
-
-            :return: absolute exclusive time delta
-            """
-            exc_new = 0.0 if pd.isnull(row["+exclusive T [ms]"]) else row["+exclusive T [ms]"]
-            exc_old = 0.0 if pd.isnull(row["-exclusive T [ms]"]) else row["-exclusive T [ms]"]
-            return exc_new - exc_old
-
         # Rename the exclusive time columns appropriately (- for old, + for new) and merge them
         baseline_profile.rename(columns={"exclusive": "-exclusive T [ms]"}, inplace=True)
         target_profile.rename(columns={"exclusive": "+exclusive T [ms]"}, inplace=True)
@@ -413,33 +458,45 @@ class DiffProfile:
             list(baseline_profile["location"].unique()),
             list(target_profile["location"].unique()),
         )
-        baseline_profile["location"].replace(rename_old, inplace=True)
-        target_profile["location"].replace(rename_new, inplace=True)
+        baseline_profile["location"] = baseline_profile["location"].replace(rename_old)
+        target_profile["location"] = target_profile["location"].replace(rename_new)
 
         df_merge = pd.merge(target_profile, baseline_profile, on=["uid", "location"], how="left")
-        # Compute the exclusive time diff
-        df_merge["exclusive T Δ [ms]"] = df_merge.apply(_delta_exc, axis=1)
-        # Prepare filters
-        new_nan_filt = df_merge["+exclusive T [ms]"].isna()
-        old_nan_filt = df_merge["-exclusive T [ms]"].isna()
-        no_nan_filt = ~(df_merge["-exclusive T [ms]"].isna() | df_merge["-exclusive T [ms]"].isna())
-        # Compute the sum of all exclusive times
-        total_exc = df_merge["+exclusive T [ms]"].sum()
+        # Compute the exclusive time diff, the new / deleted functions have nan exclusive time
+        df_merge["exclusive T Δ [ms]"] = df_merge["+exclusive T [ms]"].fillna(0.0) - df_merge[
+            "-exclusive T [ms]"
+        ].fillna(0.0)
         # Compute the impact of change on the total location exclusive time
-        df_merge.loc[new_nan_filt, "loc exclusive T Δ [%]"] = (
-            df_merge["-exclusive T [ms]"] / total_exc * (-100)
-        )
-        df_merge.loc[old_nan_filt, "loc exclusive T Δ [%]"] = (
-            df_merge["+exclusive T [ms]"] / total_exc * 100
-        )
-        df_merge.loc[no_nan_filt, "loc exclusive T Δ [%]"] = (
-            (df_merge["+exclusive T [ms]"] - df_merge["-exclusive T [ms]"]) / total_exc * 100
-        )
+        total_exc = df_merge["+exclusive T [ms]"].sum()
+        df_merge["loc exclusive T Δ [%]"] = df_merge["exclusive T Δ [ms]"] / total_exc * 100
 
         # Sort by the most significant time difference
         return df_merge.sort_values(by="exclusive T Δ [ms]", ascending=False).reset_index(drop=True)
 
 
+def _flattened_value(key: str, value: Any) -> Any:
+    """Flatten the persistent value of the resource as in the tabular representation of profile.
+
+    :param key: the key of the persistent value
+    :param value: the persistent value, e.g., the nested dictionary of the uid
+
+    :return: the flattened value, e.g., the joined values of the nested dictionary
+    """
+    if isinstance(value, (dict, list)):
+        return dict(query.flattened_values(key, value))[key]
+    return value
+
+
+def _rounded_exclusive_times(exclusive_times: npt.NDArray[np.float64]) -> list[str]:
+    """Round the exclusive times for the report, missing times (nan) are reported as zero.
+
+    :param exclusive_times: array of exclusive times
+
+    :return: list of rounded exclusive times as strings
+    """
+    return [str(round(time, 3)) for time in np.nan_to_num(exclusive_times, nan=0.0).tolist()]
+
+
 def _map_similar_names(
     strings_old: list[str], strings_new: list[str]
 ) -> tuple[OldLocMap, NewLocMap]:
@@ -447,6 +504,10 @@ def _map_similar_names(
 
     E.g., due to the names containing the version number (mylib-3.4 vs mylib-3.5).
 
+    The names are not compared all to all: identical names are matched directly and otherwise
+    the similarity is computed only for names of comparable length (see :func:`_length_bounds`),
+    since other names can never be similar enough.
+
     :param strings_old: a collection of location names found in the previous version
     :param strings_new: a collection of location names found in the current version
 
@@ -454,8 +515,20 @@ def _map_similar_names(
              (e.g., mylib-3.4 -> mylib-3._ and mylib-3.5 -> mylib-3._)
     """
     renames_old, renames_new = {}, {}
+    unmatched = set(strings_new)
+    # Index of the unmatched names sorted by their length
+    by_length = sorted((len(new_name), new_name) for new_name in unmatched)
     for old_name in strings_old:
-        matching_name = difflib.get_close_matches(old_name, strings_new, n=1)
+        if old_name in unmatched:
+            matching_name = [old_name]
+        else:
+            lower, upper = _length_bounds(len(old_name))
+            first = bisect.bisect_left(by_length, (lower, ""))
+            last = bisect.bisect_left(by_length, (upper + 1, ""))
+            candidates = [new_name for (_, new_name) in by_length[first:last]]
+            matching_name = difflib.get_close_matches(
+                old_name, candidates, n=1, cutoff=SIMILARITY_CUTOFF
+            )
         # If no match was found, no rename will be done
         if matching_name:
             # We found a match, and now we want to find the longest common prefix
@@ -463,12 +536,29 @@ def _map_similar_names(
             new_name = _longest_common_prefix(old_name, match)
             # Update the rename map
             renames_old[old_name] = new_name
-            renames_new[str(match)] = new_name
+            renames_new[match] = new_name
             # Remove the already matched name
-            strings_new.remove(str(match))
+            unmatched.remove(match)
+            del by_length[bisect.bisect_left(by_length, (len(match), match))]
     return renames_old, renames_new
 
 
+def _length_bounds(length: int) -> tuple[int, int]:
+    """Computes the bounds of lengths of names that can be similar to the name of given length.
+
+    The similarity ratio of two strings of lengths `a` and `b` is at most
+    ``2 * min(a, b) / (a + b)``, hence, only the names of length within the returned bounds can
+    reach the similarity cutoff.
+
+    :param length: length of the name
+
+    :return: the lowest and the highest (inclusive) length of the possibly similar name
+    """
+    lower = math.floor(length * SIMILARITY_CUTOFF / (2 - SIMILARITY_CUTOFF))
+    upper = math.ceil(length * (2 - SIMILARITY_CUTOFF) / SIMILARITY_CUTOFF)
+    return lower, upper
+
+
 def _longest_common_prefix(string1: str, string2: str) -> str:
     """Find the longest common prefix of two strings.
 
@@ -128,7 +128,7 @@ class IntegralComparison(AbstractBaseChecker):
         baseline_profile: Profile,
         target_profile: Profile,
         models_strategy: str = "best-model",
-        **_: Any,
+        **kwargs: Any,
     ) -> Iterable[DegradationInfo]:
         """
         The wrapper of `integral comparison` detection method. Method calls the general method
@@ -138,10 +138,14 @@ class IntegralComparison(AbstractBaseChecker):
         :param Profile baseline_profile: baseline profile against which we are checking the degradation
         :param Profile target_profile: target profile corresponding to the checked minor version
         :param str models_strategy: detection model strategy for obtains the relevant kind of models
-        :param _: other kwgargs
+        :param kwargs: other kwargs, e.g. the fingerprint of the baseline profile
         :returns: tuple - degradation result (structure DegradationInfo)
         """
         for degradation_info in factory.run_detection_with_strategy(
-            execute_analysis, baseline_profile, target_profile, models_strategy
+            execute_analysis,
+            baseline_profile,
+            target_profile,
+            models_strategy,
+            kwargs.get("fingerprint"),
         ):
             yield degradation_info
@@ -255,7 +255,7 @@ class LocalStatistics(AbstractBaseChecker):
         baseline_profile: Profile,
         target_profile: Profile,
         models_strategy: str = "best-model",
-        **__: Any,
+        **kwargs: Any,
     ) -> Iterable[DegradationInfo]:
         """
         The wrapper of `local_statistics` detection method. Method calls the general method
@@ -265,9 +265,14 @@ class LocalStatistics(AbstractBaseChecker):
         :param Profile baseline_profile: base against which we are checking the degradation
         :param Profile target_profile: profile corresponding to the checked minor version
         :param str models_strategy: detection model strategy for obtains the relevant kind of models
+        :param kwargs: other kwargs, e.g. the fingerprint of the baseline profile
         :returns: tuple - degradation result
         """
         for degradation_info in factory.run_detection_with_strategy(
-            execute_analysis, baseline_profile, target_profile, models_strategy
+            execute_analysis,
+            baseline_profile,
+            target_profile,
+            models_strategy,
+            kwargs.get("fingerprint"),
         ):
             yield degradation_info
@@ -26,20 +26,21 @@ THRESHOLD = 100000000
 
 class PolynomialRegression(AbstractBaseChecker):
     def check(
-        self, baseline_profile: Profile, target_profile: Profile, **_: Any
+        self, baseline_profile: Profile, target_profile: Profile, **kwargs: Any
     ) -> Iterable[DegradationInfo]:
         """Temporary function, which call the general function and subsequently returns the
         information about performance changes to calling function.
 
         :param dict baseline_profile: baseline against which we are checking the degradation
         :param dict target_profile: profile corresponding to the checked minor version
-        :param dict _: unification with other detection methods (unused in this method)
+        :param dict kwargs: the fingerprint of the baseline profile (if precomputed)
         :returns: tuple (degradation result, degradation location, degradation rate, confidence)
         """
         return detect.general_detection(
             baseline_profile,
             target_profile,
             ClassificationMethod.PolynomialRegression,
+            kwargs.get("fingerprint"),
         )
 
 
@@ -1218,6 +1218,20 @@ def collect(ctx: click.Context, **kwargs: Any) -> None:
     required=False,
     help="Will not plot the interpretation of the fuzzing in form of graphs.",
 )
+@click.option(
+    "--workers",
+    "-j",
+    nargs=1,
+    required=False,
+    default=1,
+    type=click.IntRange(0, None, False),
+    metavar="<int>",
+    help=(
+        "The number of processes, which evaluate the batches of mutations concurrently, each in"
+        " its own temporary directory. The results are merged in the order of the mutations."
+        " If set to 0, the number of CPUs is used."
+    ),
+)
 def fuzz_cmd(cmd: str, **kwargs: Any) -> None:
     """Performs fuzzing for the specified command according to the initial sample of workload."""
     kwargs["executable"] = Executable(cmd)
@@ -163,7 +163,32 @@ def check_head(head_minor: str = "HEAD") -> None:
     callback=cli_kit.lookup_minor_version_callback,
     default="HEAD",
 )
-def check_all(minor_head: str = "HEAD") -> None:
+@click.option(
+    "--resume",
+    "-r",
+    is_flag=True,
+    default=False,
+    help=(
+        "Resume the previously interrupted check of the same history: the minor versions that were"
+        " already checked are reported from the checkpoint and are not checked again."
+    ),
+)
+@click.option(
+    "--workers",
+    "-j",
+    nargs=1,
+    required=False,
+    default=None,
+    type=click.IntRange(0, None, False),
+    metavar="<int>",
+    help=(
+        "The number of processes, which check the minor versions concurrently (overrides the"
+        " degradation.workers key). If set to 0, the number of CPUs is used."
+    ),
+)
+def check_all(
+    minor_head: str = "HEAD", resume: bool = False, workers: Optional[int] = None
+) -> None:
     """Checks for changes in performance for the specified interval of version history.
 
     The command crawls through the whole history of project versions starting from the specified
@@ -171,8 +196,15 @@ def check_all(minor_head: str = "HEAD") -> None:
     tries to find a suitable predecessor profile (corresponding to some `baseline` minor version)
     and runs the performance check according to the set of strategies set in the configuration
     (see :ref:`degradation-config` or :doc:`config`).
+
+    The pairs of profiles of all minor versions are planned up front and each profile is loaded
+    only once. The minor versions can be checked concurrently (see ``--workers``), while the
+    results are still reported in the order of the history. Each checked minor version is
+    checkpointed, so the interrupted check can be resumed by ``--resume``.
     """
-    check.degradation_in_history(minor_head)
+    if workers is not None:
+        perun_config.runtime().set("degradation.workers", workers)
+    check.degradation_in_history(minor_head, resume)
 
 
 @check_group.command("profiles")
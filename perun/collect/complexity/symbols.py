@@ -11,12 +11,13 @@
 from __future__ import annotations
 
 # Standard Imports
+from typing import Optional
 import dataclasses
 
 # Third-Party Imports
 
 # Perun Imports
-from perun.utils.external import commands
+from perun.utils.external import commands, symbols as external_symbols
 from perun.utils import exceptions
 
 # Symbol table columns constants
@@ -84,30 +85,29 @@ def extract_symbol_address_map(executable_path: str) -> dict[str, str]:
         ("0x" + symbols[i].lstrip("0")): symbols[i + 1] for i in range(0, len(symbols), 2)
     }
     # Translate the mangled names
-    name_map = translate_mangled_symbols(list(address_map.values()))
+    name_map = translate_mangled_symbols(list(address_map.values()), executable_path)
     for record in address_map:
         address_map[record] = name_map[address_map[record]]
     return address_map
 
 
-def translate_mangled_symbols(mangled_names: list[str]) -> dict[str, str]:
+def translate_mangled_symbols(
+    mangled_names: list[str], executable_path: Optional[str] = None
+) -> dict[str, str]:
     """Translates the mangled names to their demangled counterparts
 
+    The names are demangled by the shared c++filt co-process, the names already demangled for the
+    executable are looked up in its (persistent) cache of symbols.
+
     :param list mangled_names: the names to be translated
+    :param str executable_path: path to the executable the names come from
 
     :return dict: function symbols name map in form 'mangled name: demangled name'
     """
-    # Transform the names to string parameter
-    mangled_str = "\n".join(mangled_names)
-
-    # Create demangled counterparts of the function names
-    demangled_bytes, _ = commands.run_safely_external_command(f"echo '{mangled_str}' | c++filt")
-    demangled_names = demangled_bytes.decode("utf-8").split("\n")
-    if "" in demangled_names:
-        demangled_names.remove("")
-
-    # Map the names
-    return dict(zip(mangled_names, demangled_names))
+    resolver = external_symbols.get_resolver(executable_path)
+    name_map = resolver.demangle(mangled_names)
+    resolver.save()
+    return name_map
 
 
 def filter_symbols(
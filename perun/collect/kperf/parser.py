@@ -4,7 +4,7 @@ Contains helper functions for parsing information from perf
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any
+from typing import Any, Iterable
 
 # Third-Party Imports
 import progressbar
@@ -12,6 +12,41 @@ import progressbar
 # Perun Imports
 
 
+def aggregate_events(perf_events: Iterable[str], stack_counts: dict[str, list[int]]) -> None:
+    """Aggregates the folded perf events into the counts of samples of each distinct stack
+
+    The events are processed one by one, so they can be streamed directly from the output of
+    perf; the memory then scales only with the number of distinct stacks. For each stack, we keep
+    the number of its samples from each run (i.e. from each aggregated output of perf).
+
+    :param perf_events: iterable of folded perf events (i.e. stacks and their number of samples)
+    :param stack_counts: map of stacks to the list of their counts of samples, which is updated
+    """
+    for event in perf_events:
+        if event.strip():
+            record, samples = event.rsplit(" ", 1)
+            stack_counts.setdefault(record, []).append(int(samples))
+
+
+def parse_stack_counts(stack_counts: dict[str, list[int]]) -> list[dict[str, Any]]:
+    """Parses the aggregated counts of stacks into a list of resources
+
+    Each stack is parsed only once and all of its resources share the same trace.
+
+    :param stack_counts: map of stacks to the list of their counts of samples
+    :return: list of resources
+    """
+    resources: list[dict[str, Any]] = []
+    for record, counts in progressbar.progressbar(stack_counts.items()):
+        parts = record.split(";")
+        command, trace, uid = parts[0], [{"func": f} for f in parts[1:-1]], parts[-1]
+        resources.extend(
+            {"amount": samples, "uid": uid, "command": command, "trace": trace}
+            for samples in counts
+        )
+    return resources
+
+
 def parse_events(perf_events: list[str]) -> list[dict[str, Any]]:
     """Parses perf events into a list of resources
 
@@ -22,18 +57,6 @@ def parse_events(perf_events: list[str]) -> list[dict[str, Any]]:
     :param perf_events: string with perf events
     :return: list of resources
     """
-    resources = []
-    for event in progressbar.progressbar(perf_events):
-        if event.strip():
-            record, samples = event.split(" ")
-            parts = record.split(";")
-            command, trace, uid = parts[0], parts[1:-1], parts[-1]
-            resources.append(
-                {
-                    "amount": int(samples),
-                    "uid": uid,
-                    "command": command,
-                    "trace": [{"func": f} for f in trace],
-                }
-            )
-    return resources
+    stack_counts: dict[str, list[int]] = {}
+    aggregate_events(perf_events, stack_counts)
+    return parse_stack_counts(stack_counts)
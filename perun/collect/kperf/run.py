@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any
+from typing import Any, Iterator
+import concurrent.futures
+import functools
+import os
 import subprocess
 import time
 
@@ -13,12 +16,16 @@ import progressbar
 # Perun Imports
 from perun.collect.kperf import parser
 from perun.logic import runner
-from perun.utils import log
+from perun.utils import exceptions, log
 from perun.utils.common import script_kit
 from perun.utils.structs import Executable, CollectStatus
 from perun.utils.external import commands
 
 
+# File, where perf stores the recorded data
+PERF_DATA_FILE = "collected.data"
+
+
 def before(**_: Any) -> tuple[CollectStatus, str, dict[str, Any]]:
     """Checks that all dependencies are runnable"""
     log.major_info("Checking for Dependencies")
@@ -47,48 +54,106 @@ def before(**_: Any) -> tuple[CollectStatus, str, dict[str, Any]]:
     return CollectStatus.OK, "", {}
 
 
-def run_perf(executable: Executable, run_with_sudo: bool = False) -> str:
-    """Runs perf and obtains the output
+def record_perf(
+    executable: Executable, run_with_sudo: bool = False, output_file: str = PERF_DATA_FILE
+) -> bool:
+    """Runs the executable with perf recording its call stacks
 
     :param executable: run executable profiled by perf
     :param run_with_sudo: if the command should be run with sudo
-    :return: parsed output of perf
+    :param output_file: file, where perf stores the recorded data
+    :return: true if the data were successfully recorded
+    """
+    sudo = "sudo " if run_with_sudo else ""
+    try:
+        commands.run_safely_external_command(
+            f"{sudo}perf record -q -g -o {output_file} {executable}"
+        )
+        return True
+    except subprocess.CalledProcessError:
+        log.minor_fail(f"Raw data from {log.cmd_style(str(executable))}", "not collected")
+        return False
+
+
+def stream_perf(output_file: str = PERF_DATA_FILE, run_with_sudo: bool = False) -> Iterator[str]:
+    """Streams the recorded data of perf as folded stacks
+
+    :param output_file: file with the data recorded by perf
+    :param run_with_sudo: if the command should be run with sudo
+    :return: iterator of folded stacks (stack and its number of samples per line)
+    :raises subprocess.CalledProcessError: when perf or the folding script fails
     """
     parse_script = script_kit.get_script("stackcollapse-perf.pl")
+    sudo = "sudo " if run_with_sudo else ""
+    yield from commands.stream_safely_external_command(
+        f"{sudo}perf script -i {output_file} | {parse_script}"
+    )
 
-    if run_with_sudo:
-        perf_record_command = f"sudo perf record -q -g -o collected.data {executable}"
-        perf_script_command = f"sudo perf script -i collected.data | {parse_script}"
-    else:
-        perf_record_command = f"perf record -q -g -o collected.data {executable}"
-        perf_script_command = f"perf script -i collected.data | {parse_script}"
 
+def aggregate_perf(
+    executable: Executable,
+    stack_counts: dict[str, list[int]],
+    run_with_sudo: bool = False,
+    output_file: str = PERF_DATA_FILE,
+) -> None:
+    """Aggregates the recorded data of perf into the counts of the distinct stacks
+
+    The data of the run are merged into the stack counts only if they were processed entirely.
+
+    :param executable: executable profiled by perf
+    :param stack_counts: map of stacks to the list of their counts of samples, which is updated
+    :param run_with_sudo: if the command should be run with sudo
+    :param output_file: file with the data recorded by perf
+    """
+    run_counts: dict[str, list[int]] = {}
     try:
-        commands.run_safely_external_command(perf_record_command)
-        out, _ = commands.run_safely_external_command(perf_script_command)
-        log.minor_success(f"Raw data from {log.cmd_style(str(executable))}", "collected")
-    except subprocess.CalledProcessError:
+        parser.aggregate_events(stream_perf(output_file, run_with_sudo), run_counts)
+    except (subprocess.CalledProcessError, OSError):
         log.minor_fail(f"Raw data from {log.cmd_style(str(executable))}", "not collected")
-        return ""
-    return out.decode("utf-8")
+        return
+    for record, counts in run_counts.items():
+        stack_counts.setdefault(record, []).extend(counts)
+    log.minor_success(f"Raw data from {log.cmd_style(str(executable))}", "collected")
 
 
 def collect(executable: Executable, **kwargs: Any) -> tuple[CollectStatus, str, dict[str, Any]]:
-    """Runs the workload with perf and transforms it to stack traces"""
+    """Runs the workload with perf and transforms it to stack traces
+
+    The output of perf is streamed and aggregated into counts of samples of distinct stacks, so
+    the memory does not grow with the number of samples and repeats. If more jobs are requested,
+    the repeats are recorded in parallel, each into separate file.
+    """
     log.major_info("Collecting performance data")
     warmups = kwargs["warmup"]
     repeats = kwargs["repeat"]
+    jobs = kwargs.get("jobs", 1)
+    run_with_sudo = kwargs.get("with_sudo", False)
 
     log.minor_info(f"Running {log.highlight(warmups)} warmup iterations")
     for _ in progressbar.progressbar(range(0, warmups)):
-        run_perf(executable, kwargs.get("with_sudo", False))
+        record_perf(executable, run_with_sudo)
 
     log.minor_info(f"Running {log.highlight(repeats)} iterations")
     before_time = time.time()
-    kwargs["raw_data"] = []
-    for _ in progressbar.progressbar(range(0, repeats)):
-        output = run_perf(executable, kwargs.get("with_sudo", False))
-        kwargs["raw_data"].extend(output.splitlines())
+    stack_counts: dict[str, list[int]] = {}
+    if jobs > 1:
+        output_files = [f"collected.{i}.data" for i in range(repeats)]
+        with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+            recorded = list(
+                executor.map(
+                    functools.partial(record_perf, executable, run_with_sudo), output_files
+                )
+            )
+        for output_file, is_recorded in progressbar.progressbar(zip(output_files, recorded)):
+            if is_recorded:
+                aggregate_perf(executable, stack_counts, run_with_sudo, output_file)
+            with exceptions.SuppressedExceptions(OSError):
+                os.remove(output_file)
+    else:
+        for _ in progressbar.progressbar(range(0, repeats)):
+            if record_perf(executable, run_with_sudo):
+                aggregate_perf(executable, stack_counts, run_with_sudo)
+    kwargs["stack_counts"] = stack_counts
     kwargs["time"] = time.time() - before_time
 
     return CollectStatus.OK, "", kwargs
@@ -97,7 +162,7 @@ def collect(executable: Executable, **kwargs: Any) -> tuple[CollectStatus, str,
 def after(**kwargs: Any) -> tuple[CollectStatus, str, dict[str, Any]]:
     """Parses the raw data into performance profile"""
     log.major_info("Creating performance profile")
-    resources = parser.parse_events(kwargs["raw_data"])
+    resources = parser.parse_stack_counts(kwargs["stack_counts"])
 
     if resources:
         log.minor_success("perf events", "parsed")
@@ -133,6 +198,14 @@ def after(**kwargs: Any) -> tuple[CollectStatus, str, dict[str, Any]]:
     type=click.INT,
     help="Runs [INT] samplings of the profiled command.",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Runs up to [INT] samplings of the profiled command in parallel. Note that parallel"
+    " runs may interfere with each other.",
+)
 def kperf(ctx: click.Context, **kwargs: Any) -> None:
     """Generates kernel sampled traces for specific commands based on perf."""
     runner.run_collector_from_cli_context(ctx, "kperf", kwargs)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any
+from typing import Any, Callable
 
 # Third-Party Imports
 
@@ -10,6 +10,87 @@ from typing import Any
 from perun.collect.memory import parsing
 
 
+ALLOCATORS: list[str] = [
+    "malloc",
+    "calloc",
+    "realloc",
+    "free",
+    "memalign",
+    "posix_memalign",
+    "valloc",
+    "aligned_alloc",
+]
+
+
+def filter_resource_trace(
+    resource: dict[str, Any], function: list[str], source: list[str]
+) -> dict[str, Any]:
+    """Remove records in trace of one resource matching source or function
+
+    :param dict resource: resource of one allocation
+    :param list function: list of "function" records to omit
+    :param list source: list of "source" records to omit
+    :returns dict: updated resource
+    """
+    # removing call records
+    resource["trace"] = [
+        call
+        for call in resource["trace"]
+        if call["source"] not in source and call["function"] not in function
+    ]
+    # updating "uid"
+    resource["uid"] = parsing.parse_allocation_location(resource["trace"])
+    return resource
+
+
+def is_allocation_excluded(uid: dict[str, Any], function: list[str], source: list[str]) -> bool:
+    """Checks whether the allocation is done by specified function or in specified source code
+
+    :param dict uid: uid of the allocation
+    :param list function: function's name to remove record of
+    :param list source: source's name to remove record of
+    :returns bool: True if the allocation should be removed out of the profile
+    """
+    if uid:
+        if uid["function"] in function:
+            return True
+        if any(map(lambda s: s is not None and str(uid["source"]).endswith(s), source)):
+            return True
+    return False
+
+
+def create_resource_filter(
+    include_all: bool, exclude_funcs: list[str], exclude_sources: list[str]
+) -> Callable[[dict[str, Any]], bool]:
+    """Creates filter of the resources, which is applied to each resource when it is parsed
+
+    The filter is equivalent to calling :func:`remove_allocators`, :func:`trace_filter` (for
+    unknown functions and unreachable sources), :func:`allocation_filter` and
+    :func:`remove_uidless_records_from` on the whole profile.
+
+    :param bool include_all: if set to true, then the allocators and unreachable records are kept
+        in the traces
+    :param list exclude_funcs: function's names to remove records of
+    :param list exclude_sources: source's names to remove records of
+    :returns function: filter that updates the resource and returns True if the resource should
+        be kept in the profile
+    """
+    omitted_functions = [] if include_all else ALLOCATORS + ["?"]
+    omitted_sources = [] if include_all else ["unreachable"]
+
+    def resource_filter(resource: dict[str, Any]) -> bool:
+        """Updates the trace of the resource and checks if it should be kept"""
+        if not include_all:
+            filter_resource_trace(resource, omitted_functions, omitted_sources)
+        if (exclude_funcs or exclude_sources) and is_allocation_excluded(
+            resource["uid"], exclude_funcs, exclude_sources
+        ):
+            return False
+        return bool(resource["uid"])
+
+    return resource_filter
+
+
 def remove_allocators(profile: dict[str, Any]) -> dict[str, Any]:
     """Remove records in trace with direct allocation function
 
@@ -19,17 +100,7 @@ def remove_allocators(profile: dict[str, Any]) -> dict[str, Any]:
     :param dict profile: dictionary including "snapshots" and "global" sections in the profile
     :returns dict: updated profile
     """
-    allocators = [
-        "malloc",
-        "calloc",
-        "realloc",
-        "free",
-        "memalign",
-        "posix_memalign",
-        "valloc",
-        "aligned_alloc",
-    ]
-    trace_filter(profile, function=allocators, source=[])
+    trace_filter(profile, function=ALLOCATORS, source=[])
 
     return profile
 
@@ -42,19 +113,10 @@ def trace_filter(profile: dict[str, Any], function: list[str], source: list[str]
     :param list source: list of "source" records to omit
     :returns dict: updated profile
     """
-
-    def determinate(call: dict[str, Any]) -> bool:
-        """Determinate expression"""
-        return call["source"] not in source and call["function"] not in function
-
     snapshots = profile["snapshots"]
     for snapshot in snapshots:
-        resources = snapshot["resources"]
-        for res in resources:
-            # removing call records
-            res["trace"] = [call for call in res["trace"] if determinate(call)]
-            # updating "uid"
-            res["uid"] = parsing.parse_allocation_location(res["trace"])
+        for res in snapshot["resources"]:
+            filter_resource_trace(res, function, source)
 
     return profile
 
@@ -76,19 +138,13 @@ def allocation_filter(
     :param list source: source's name to remove record of
     :returns dict: updated profile
     """
-
-    def determinate(uid: dict[str, Any]) -> bool:
-        """Determinate expression"""
-        if uid:
-            if uid["function"] in function:
-                return False
-            if any(map(lambda s: s is not None and str(uid["source"]).endswith(s), source)):
-                return False
-        return True
-
     snapshots = profile["snapshots"]
     for snapshot in snapshots:
-        snapshot["resources"] = [res for res in snapshot["resources"] if determinate(res["uid"])]
+        snapshot["resources"] = [
+            res
+            for res in snapshot["resources"]
+            if not is_allocation_excluded(res["uid"], function, source)
+        ]
     set_global_region(profile)
 
     return profile
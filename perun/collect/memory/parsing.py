@@ -3,8 +3,10 @@ from __future__ import annotations
 
 # Standard Imports
 from decimal import Decimal
-from typing import Any, TYPE_CHECKING
+from typing import Any, Callable, Iterable, Iterator, Optional, TYPE_CHECKING
 import collections
+import functools
+import itertools
 import re
 
 # Third-Party Imports
@@ -12,6 +14,7 @@ import re
 # Perun Imports
 from perun.collect.memory import syscalls
 from perun.profile import convert
+from perun.profile.factory import Profile, to_column
 from perun.utils.common import common_kit
 
 if TYPE_CHECKING:
@@ -23,6 +26,45 @@ PATTERN_TIME: re.Pattern[str] = re.compile(r"\d+([,.]\d*)?|[,.]\d+")
 PATTERN_HEXADECIMAL: re.Pattern[str] = re.compile(r"0x[0-9a-fA-F]+")
 PATTERN_INT: re.Pattern[str] = re.compile(r"\d+")
 UID_RESOURCE_MAP: dict[str, int] = collections.defaultdict(int)
+# Number of allocations, which are parsed (and whose symbols are resolved) at once
+ALLOCATION_BATCH_SIZE: int = 4096
+# Collectable properties specific to the memory resources; the order of the allocation differs
+# for each allocation at the same location, so it is stored in column instead of resource type
+MEMORY_COLLECTABLE: set[str] = {"allocation_order"}
+
+
+def parse_call(call: str) -> dict[str, Any]:
+    """Parse one call record of the stack
+
+    :param str call: raw call record
+    :returns dict: formatted structure representing the function, source and line of the call
+    """
+    call_data: dict[str, Any] = {}
+
+    # parsing name of function,
+    # it's the first word in the call record
+    func = common_kit.safe_match(PATTERN_WORD, call, "<?>")
+    # demangling name of function
+    func = syscalls.demangle(func)
+    call_data["function"] = func
+
+    # parsing instruction pointer,
+    # it's the first hexadecimal number in the call record
+    instruction_pointer = common_kit.safe_match(PATTERN_HEXADECIMAL, call, "<?>")
+
+    # getting information of instruction pointer,
+    # the source file and line number in the source file
+    ip_info = syscalls.address_to_line(instruction_pointer)
+    if ip_info[0] in ["?", "??"]:
+        ip_info[0] = "unreachable"
+    if ip_info[1] in ["?", "??"]:
+        ip_info[1] = 0
+    else:
+        ip_info[1] = common_kit.safe_match(PATTERN_INT, ip_info[1], "<?>")
+
+    call_data["source"] = ip_info[0]
+    call_data["line"] = int(ip_info[1])
+    return call_data
 
 
 def parse_stack(stack: list[str]) -> list[dict[str, Any]]:
@@ -31,37 +73,7 @@ def parse_stack(stack: list[str]) -> list[dict[str, Any]]:
     :param list stack: list of raw stack data
     :returns list: list of formatted structures representing stack trace of one allocation
     """
-    data = []
-    for call in stack:
-        call_data: dict[str, Any] = {}
-
-        # parsing name of function,
-        # it's the first word in the call record
-        func = common_kit.safe_match(PATTERN_WORD, call, "<?>")
-        # demangling name of function
-        func = syscalls.demangle(func)
-        call_data["function"] = func
-
-        # parsing instruction pointer,
-        # it's the first hexadecimal number in the call record
-        instruction_pointer = common_kit.safe_match(PATTERN_HEXADECIMAL, call, "<?>")
-
-        # getting information of instruction pointer,
-        # the source file and line number in the source file
-        ip_info = syscalls.address_to_line(instruction_pointer)
-        if ip_info[0] in ["?", "??"]:
-            ip_info[0] = "unreachable"
-        if ip_info[1] in ["?", "??"]:
-            ip_info[1] = 0
-        else:
-            ip_info[1] = common_kit.safe_match(PATTERN_INT, ip_info[1], "<?>")
-
-        call_data["source"] = ip_info[0]
-        call_data["line"] = int(ip_info[1])
-
-        data.append(call_data)
-
-    return data
+    return [parse_call(call) for call in stack]
 
 
 def parse_allocation_location(trace: list[dict[str, Any]]) -> dict[str, Any]:
@@ -79,10 +91,26 @@ def parse_allocation_location(trace: list[dict[str, Any]]) -> dict[str, Any]:
     return result
 
 
-def parse_resources(allocation: list[str]) -> dict[str, Any]:
+@functools.cache
+def flatten_uid(uid_items: tuple[tuple[str, Any], ...]) -> str:
+    """Flattens the uid of the allocation given by its items
+
+    The allocations share few distinct uids, hence the flattened values are cached.
+
+    :param tuple uid_items: items of the uid dictionary
+    :returns str: flattened uid
+    """
+    return convert.flatten(dict(uid_items))
+
+
+def parse_resources(
+    allocation: list[str], trace: Optional[list[dict[str, Any]]] = None
+) -> dict[str, Any]:
     """Parse resources of one allocation
 
     :param list allocation: list of raw allocation data
+    :param list trace: already parsed stack of the allocation; if not set, the stack is parsed
+        from the allocation data
     :returns structure: formatted structure representing resources of one allocation
     """
     data: dict[str, Any] = {}
@@ -104,7 +132,8 @@ def parse_resources(allocation: list[str]) -> dict[str, Any]:
 
     # parsing stack in the moment of allocation
     # to getting trace of it
-    trace = parse_stack(allocation[2:])
+    if trace is None:
+        trace = parse_stack(allocation[2:])
     data["trace"] = trace
 
     # parsed data is memory type
@@ -115,70 +144,139 @@ def parse_resources(allocation: list[str]) -> dict[str, Any]:
     data["uid"] = parse_allocation_location(trace)
 
     # update the resource number
-    flattened_uid = convert.flatten(data["uid"])
+    flattened_uid = flatten_uid(tuple(data["uid"].items()))
     UID_RESOURCE_MAP[flattened_uid] += 1
     data["allocation_order"] = UID_RESOURCE_MAP[flattened_uid]
 
     return data
 
 
-def parse_log(filename: str, executable: Executable, snapshots_interval: float) -> dict[str, Any]:
-    """Parse raw data in the log file
+def read_allocations(filename: str) -> Iterator[list[str]]:
+    """Lazily reads the raw allocations from the log file
 
-    :param string filename: name of the log file
-    :param Executable executable: profiled binary
-    :param float snapshots_interval: interval of snapshots [s]
-    :returns structure: formatted structure representing section "snapshots" and "global"
-        in memory profile
+    Allocations are split by empty line and only one allocation is kept in the memory at once.
+
+    :param str filename: name of the log file
+    :returns iterator: stream of allocations, each given as list of its raw lines
+    :raises ValueError: if the log does not end with the exit record, i.e. it is malformed
     """
-    interval = snapshots_interval
+    allocation: list[str] = []
     with open(filename) as logfile:
-        log_lines = logfile.read()
-    # allocations are split by empty line
-    log = log_lines.split("\n\n")
+        for line in logfile:
+            line = line.rstrip("\n")
+            if line:
+                allocation.append(line)
+            elif allocation:
+                yield allocation
+                allocation = []
 
     # Check that there is exit, and the Memory Log is thus not malformed
-    if log.pop().strip().find("EXIT") == -1:
+    if not any(line.find("EXIT") != -1 for line in allocation):
         raise ValueError
 
-    allocations = []
-    for item in log:
-        allocations.append(item.splitlines())
 
+def resolve_symbols(calls: Iterable[str], executable: Executable) -> None:
+    """Resolves the symbols of the raw call records of the stacks
+
+    The names and addresses are demangled and translated in single batch by c++filt and addr2line,
+    respectively, and stored in caches for further calls.
+
+    :param iterable calls: raw call records of the stacks
+    :param Executable executable: profiled binary
+    """
     # Collect names and addresses for demangling and addr2line collective call
     names, ips = set(), set()
-    for allocation in allocations:
-        for resource in allocation[2:]:
-            name, instruction_pointer, offset = resource.split(" ")
-            names.add(name)
-            ips.add((instruction_pointer, offset))
-
-    # Build caches for demangle and addr2line for further calls
-    syscalls.build_demangle_cache(names)
-    syscalls.build_address_to_line_cache(ips, executable.cmd)
-
-    snapshots = []
-    data: dict[str, Any] = {"time": f"{interval:f}", "resources": []}
-    for allocation in allocations:
-        # parsing timestamp,
-        # it's the only one number on the 1st line
-        time_string = allocation[0]
-        # in some cases there is '.' instead of ',' in timestamp
-        if time_string.find(",") > 0:
-            time_string = time_string.replace(",", ".")
-
-        time = Decimal(common_kit.safe_match(PATTERN_TIME, time_string, "-1"))
-
-        while time > interval:
-            snapshots.append(data)
-            interval += snapshots_interval
-            data = {"resources": [], "time": f"{interval:f}"}
-
-        # using parse_resources()
-        # parsing resources,
-        data["resources"].append(parse_resources(allocation))
-
-    if data:
-        snapshots.append(data)
-
-    return {"snapshots": snapshots, "global": {"resources": []}}
+    for call in calls:
+        name, instruction_pointer, offset = call.split(" ")
+        names.add(name)
+        ips.add((instruction_pointer, offset))
+
+    syscalls.update_demangle_cache(names, executable.cmd)
+    syscalls.update_address_to_line_cache(ips, executable.cmd)
+
+
+def parse_log(
+    filename: str,
+    executable: Executable,
+    snapshots_interval: float,
+    resource_filter: Optional[Callable[[dict[str, Any]], bool]] = None,
+) -> Profile:
+    """Parse raw data in the log file
+
+    The log is parsed in batches of allocations: the symbols of each batch are resolved at once
+    (only for the calls that were not seen in previous batches), the batch is then filtered,
+    grouped by resource types and appended to the profile. The stacks are parsed only once for
+    each distinct call and trace, hence the memory depends on the number of distinct call sites
+    rather than on the number of allocations.
+
+    :param string filename: name of the log file
+    :param Executable executable: profiled binary
+    :param float snapshots_interval: interval of snapshots [s]
+    :param function resource_filter: filter applied to each parsed resource, which can update
+        the resource and returns False if the resource should be omitted from the profile
+    :returns Profile: memory profile with resources assigned to snapshots
+    """
+    syscalls.demangle_cache.clear()
+    syscalls.address_to_line_cache.clear()
+    call_cache: dict[str, dict[str, Any]] = {}
+    trace_cache: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+
+    profile = Profile()
+    collectable = Profile.collectable | MEMORY_COLLECTABLE
+    snapshot, interval = 0, snapshots_interval
+    allocations = read_allocations(filename)
+    while batch := list(itertools.islice(allocations, ALLOCATION_BATCH_SIZE)):
+        # Extend caches for demangle and addr2line with the calls that were not seen yet
+        resolve_symbols(
+            {call for allocation in batch for call in allocation[2:] if call not in call_cache},
+            executable,
+        )
+
+        resource_types: dict[tuple[Any, ...], tuple[dict[str, Any], dict[str, list[Any]]]] = {}
+        for allocation in batch:
+            # parsing timestamp,
+            # it's the only one number on the 1st line
+            time_string = allocation[0]
+            # in some cases there is '.' instead of ',' in timestamp
+            if time_string.find(",") > 0:
+                time_string = time_string.replace(",", ".")
+
+            time = Decimal(common_kit.safe_match(PATTERN_TIME, time_string, "-1"))
+
+            while time > interval:
+                snapshot += 1
+                interval += snapshots_interval
+
+            stack = tuple(allocation[2:])
+            if (trace := trace_cache.get(stack)) is None:
+                # Each distinct call is parsed once and then shared by all the traces
+                for call in stack:
+                    if call not in call_cache:
+                        call_cache[call] = parse_call(call)
+                trace = trace_cache[stack] = [call_cache[call] for call in stack]
+            resource = parse_resources(allocation, trace)
+            if resource_filter is not None and not resource_filter(resource):
+                continue
+
+            # Resources with the same (shared) calls in the trace share the resource type
+            resource_type = (snapshot, resource["subtype"], tuple(map(id, resource["trace"])))
+            if resource_type not in resource_types:
+                persistent_properties = {
+                    key: value for key, value in resource.items() if key not in collectable
+                }
+                persistent_properties.update({"snapshot": snapshot, "time": f"{interval:f}"})
+                resource_types[resource_type] = (
+                    persistent_properties,
+                    collections.defaultdict(list),
+                )
+            columns = resource_types[resource_type][1]
+            for key, value in resource.items():
+                if key in collectable:
+                    columns[key].append(value)
+
+        profile.update_resource_columns(
+            (persistent_properties, {key: to_column(column) for key, column in columns.items()})
+            for persistent_properties, columns in resource_types.values()
+        )
+    syscalls.save_symbols(executable.cmd)
+    return profile
@@ -107,8 +107,9 @@ def after(
     exclude_funcs = kwargs.get("no_func", [])
     exclude_sources = kwargs.get("no_source", [])
 
+    resource_filter = filters.create_resource_filter(include_all, exclude_funcs, exclude_sources)
     try:
-        profile = parser.parse_log(_tmp_log_filename, executable, sampling)
+        profile = parser.parse_log(_tmp_log_filename, executable, sampling, resource_filter)
     except (IndexError, ValueError) as parse_err:
         log.minor_fail("Parsing of log")
         return (
@@ -117,19 +118,6 @@ def after(
             {},
         )
     log.minor_success("Parsing of log")
-    filters.set_global_region(profile)
-
-    if not include_all:
-        filters.remove_allocators(profile)
-        filters.trace_filter(profile, function=["?"], source=["unreachable"])
-        log.minor_success("Filtering traces")
-
-    if exclude_funcs or exclude_sources:
-        filters.allocation_filter(profile, function=exclude_funcs, source=exclude_sources)
-        log.minor_success("Excluding functions")
-
-    filters.remove_uidless_records_from(profile)
-    log.minor_success("Removing unassigned records")
 
     return CollectStatus.OK, "", {"profile": profile}
 
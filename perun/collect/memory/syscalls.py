@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any, TYPE_CHECKING
+from typing import Any, Iterable, Optional, TYPE_CHECKING
 import os
 import re
 import subprocess
@@ -11,6 +11,7 @@ import subprocess
 # Perun Imports
 
 from perun.utils.exceptions import SuppressedExceptions
+from perun.utils.external import symbols
 
 if TYPE_CHECKING:
     from perun.utils.structs import Executable
@@ -19,24 +20,38 @@ PATTERN_WORD = re.compile(r"(\w+)|[?]")
 PATTERN_HEXADECIMAL = re.compile(r"0x[0-9a-fA-F]+")
 
 
-demangle_cache = {}
-address_to_line_cache = {}
+demangle_cache: dict[str, str] = {}
+address_to_line_cache: dict[str, list[str]] = {}
 
 
-def build_demangle_cache(names: set[str]) -> None:
+def build_demangle_cache(names: Iterable[str], binary_name: Optional[str] = None) -> None:
     """Builds global cache for demangle() function calls.
 
     Instead of continuous calls to subprocess, this takes all of the collected names
-    and calls the demangle just once, while constructing the cache.
+    and demangles them at once, while constructing the cache.
 
     :param set names: set of names that will be demangled in future
+    :param str binary_name: name of the binary, whose persistently cached symbols are used
     """
-    global demangle_cache
+    demangle_cache.clear()
+    update_demangle_cache(names, binary_name)
 
-    list_of_names = [name for name in names if PATTERN_WORD.match(name)]
-    sys_call = ["c++filt"] + list_of_names
-    output = subprocess.check_output(sys_call).decode("utf-8").strip()
-    demangle_cache = dict(zip(list_of_names, output.split("\n")))
+
+def update_demangle_cache(names: Iterable[str], binary_name: Optional[str] = None) -> None:
+    """Extends the global cache for demangle() function calls with new names.
+
+    Only the names, that are not in the cache yet, are demangled (by the shared c++filt
+    co-process, see :mod:`perun.utils.external.symbols`), hence the cache can be built
+    incrementally, e.g. for each batch of parsed allocations.
+
+    :param iterable names: names that will be demangled in future
+    :param str binary_name: name of the binary, whose persistently cached symbols are used
+    """
+    list_of_names = [
+        name for name in names if name not in demangle_cache and PATTERN_WORD.match(name)
+    ]
+    if list_of_names:
+        demangle_cache.update(symbols.get_resolver(binary_name).demangle(list_of_names))
 
 
 def demangle(name: str) -> str:
@@ -47,24 +62,44 @@ def demangle(name: str) -> str:
     return demangle_cache[name]
 
 
-def build_address_to_line_cache(addresses: set[tuple[str, str]], binary_name: str) -> None:
+def build_address_to_line_cache(addresses: Iterable[tuple[str, str]], binary_name: str) -> None:
     """Builds global cache for address_to_line() function calls.
 
     Instead of continuous calls to subprocess, this takes all of collected
-    names and calls the addr2line just once.
+    names and translates them at once.
 
     :param set addresses: set of addresses that will be translated to line info
     :param str binary_name: name of the binary which will be parsed for info
     """
-    global address_to_line_cache
+    address_to_line_cache.clear()
+    update_address_to_line_cache(addresses, binary_name)
+
+
+def update_address_to_line_cache(addresses: Iterable[tuple[str, str]], binary_name: str) -> None:
+    """Extends the global cache for address_to_line() function calls with new addresses.
+
+    Only the addresses, that are not in the cache yet, are translated (by the shared addr2line
+    co-process of the binary), hence the cache can be built incrementally.
+
+    :param iterable addresses: addresses that will be translated to line info
+    :param str binary_name: name of the binary which will be parsed for info
+    """
+    list_of_addresses = [
+        a[0]
+        for a in addresses
+        if a[0] not in address_to_line_cache and PATTERN_HEXADECIMAL.match(a[0])
+    ]
+    if list_of_addresses:
+        lines = symbols.get_resolver(binary_name).address_to_line(list_of_addresses)
+        address_to_line_cache.update((address, line.split(":")) for address, line in lines.items())
+
 
-    list_of_addresses = [a[0] for a in addresses if PATTERN_HEXADECIMAL.match(a[0])]
+def save_symbols(binary_name: str) -> None:
+    """Persistently stores the symbols resolved for the binary
 
-    sys_call = ["addr2line", "-e", binary_name] + list_of_addresses
-    output = subprocess.check_output(sys_call).decode("utf-8").strip()
-    address_to_line_cache = dict(
-        zip(list_of_addresses, map(lambda x: x.split(":"), output.split("\n")))
-    )
+    :param str binary_name: name of the binary
+    """
+    symbols.get_resolver(binary_name).save()
 
 
 def address_to_line(ip: str) -> list[Any]:
@@ -1,8 +1,11 @@
 """ A module with multiprocessing wrappers and classes.
 """
 
+import os
 import queue
-from multiprocessing import Queue, Event
+from multiprocessing import Queue, Event, Semaphore, shared_memory
+
+import numpy as np
 
 from perun.collect.trace.values import QUEUE_TIMEOUT
 
@@ -94,3 +97,116 @@ class SafeQueue:
             if profile is not None:
                 return profile
         return None
+
+
+class SharedRingBuffer:
+    """A ring buffer of shared memory slots that passes the arrays of fixed-layout records (i.e.
+    numpy structured arrays) between processes without pickling them.
+
+    The producer copies the records into the next free slot and sends only a small descriptor
+    (the number of records and optional metadata) through a SafeQueue. The consumer accesses
+    the records directly in the shared memory and frees the slot once the records are processed.
+    Since the slots are consumed in the same order as they were written, the producer simply
+    reuses the slots in a round-robin fashion.
+
+    Note: The buffer expects a single producer and a single consumer
+
+    :ivar np.dtype _dtype: the layout of the records
+    :ivar int _slot_capacity: the maximum number of records in one slot
+    :ivar int _slot_count: the number of slots in the ring
+    :ivar SharedMemory _memory: the shared memory of all the slots
+    :ivar Semaphore _free_slots: the number of slots that are free for writing
+    :ivar SafeQueue _descriptors: a queue of descriptors of the written slots
+    :ivar int _write_slot: the next slot to be written by the producer
+    :ivar int _read_slot: the next slot to be read by the consumer
+    :ivar int _owner_pid: the PID of the process that created (and thus removes) the memory, or
+        None if the memory has already been removed
+    """
+
+    def __init__(self, dtype, slot_capacity, slot_count):
+        """
+        :param np.dtype dtype: the layout of the records
+        :param int slot_capacity: the maximum number of records in one slot
+        :param int slot_count: the number of slots in the ring
+        """
+        self._dtype = np.dtype(dtype)
+        self._slot_capacity = slot_capacity
+        self._slot_count = slot_count
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=max(1, self._dtype.itemsize * slot_capacity * slot_count)
+        )
+        self._free_slots = Semaphore(slot_count)
+        self._descriptors = SafeQueue(slot_count)
+        self._write_slot, self._read_slot = 0, 0
+        self._owner_pid = os.getpid()
+
+    def _slot(self, slot):
+        """Creates the array of records backed by the shared memory of the slot.
+
+        :param int slot: the index of the slot
+        :return np.ndarray: the array of records of the slot
+        """
+        return np.ndarray(
+            self._slot_capacity,
+            dtype=self._dtype,
+            buffer=self._memory.buf,
+            offset=slot * self._slot_capacity * self._dtype.itemsize,
+        )
+
+    def write(self, records, metadata=None, consumer=None):
+        """Copy the records into the free slots, the records are split into as many slots as
+        needed. The metadata are passed along with the first slot.
+
+        :param np.ndarray records: the array of records of the buffer layout
+        :param object metadata: small picklable data passed along with the records
+        :param Process consumer: the consumer process; if given, the writing is stopped once the
+            consumer terminates, since it will never free the slots
+        :return bool: True if all the records were written, False if the consumer terminated
+        """
+        for start in range(0, max(len(records), 1), self._slot_capacity):
+            chunk = records[start : start + self._slot_capacity]
+            # Wait until the consumer frees some slot
+            while not self._free_slots.acquire(timeout=QUEUE_TIMEOUT):
+                if consumer is not None and not consumer.is_alive():
+                    return False
+            slot = self._write_slot
+            self._write_slot = (slot + 1) % self._slot_count
+            self._slot(slot)[: len(chunk)] = chunk
+            self._descriptors.write((len(chunk), metadata))
+            metadata = None
+        return True
+
+    def read(self):
+        """Read the records until the producer signals the end of input. The records are views
+        of the shared memory, hence they are valid only until the next records are read.
+
+        :return iterable: generator of the pairs of records and their metadata
+        """
+        descriptor = self._descriptors.read()
+        while descriptor is not None:
+            record_count, metadata = descriptor
+            slot = self._read_slot
+            self._read_slot = (slot + 1) % self._slot_count
+            try:
+                yield self._slot(slot)[:record_count], metadata
+            finally:
+                self._free_slots.release()
+            descriptor = self._descriptors.read()
+
+    def end_of_input(self):
+        """Signal to the consumer that no more records will be written by the producer."""
+        self._descriptors.end_of_input()
+
+    def close_reader(self):
+        """Free all the remaining slots."""
+        for _ in self.read():
+            continue
+
+    def close_writer(self):
+        """Close the producer's end of the buffer and remove the shared memory."""
+        self._descriptors.close_writer()
+        # Only the creator removes the memory and only once
+        if self._owner_pid == os.getpid():
+            self._owner_pid = None
+            self._memory.close()
+            self._memory.unlink()
@@ -130,6 +130,8 @@ def after(**kwargs):
         )
     else:
         kwargs["profile"] = kwargs["config"].engine.transform(**kwargs)
+        if kwargs["profile"] is None:
+            return CollectStatus.ERROR, "Transformation of the raw data failed.", dict(kwargs)
 
     WATCH_DOG.info("Data processing finished.")
     return CollectStatus.OK, "", dict(kwargs)
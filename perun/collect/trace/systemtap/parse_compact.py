@@ -5,8 +5,11 @@
 import os
 import collections
 import array
+import itertools
 from multiprocessing import Process
 
+import numpy as np
+
 import perun.collect.trace.processes as proc
 import perun.utils.metrics as metrics
 import perun.collect.trace.optimizations.resources.manager as resources
@@ -17,7 +20,6 @@ from perun.collect.trace.watchdog import WATCH_DOG
 import perun.collect.trace.values as vals
 from perun.collect.trace.optimizations.call_graph import CallGraphResource
 from perun.collect.trace.optimizations.optimization import build_stats_names
-from perun.utils.common.common_kit import chunkify
 from perun.utils.exceptions import (
     SignalReceivedException,
     StatsFileNotFoundException,
@@ -25,6 +27,49 @@ from perun.utils.exceptions import (
 )
 
 
+# Parsed raw data records, the probe names and locations are stored as indexes to ProbeTable
+RECORD_DTYPE = np.dtype(
+    [
+        ("type", np.int64),
+        ("tid", np.int64),
+        ("pid", np.int64),
+        ("ppid", np.int64),
+        ("timestamp", np.int64),
+        ("id", np.int64),
+        ("loc", np.int64),
+        ("seq", np.int64),
+        ("step", np.int64),
+    ]
+)
+# The number of numeric values in the regular records of each record type
+_RECORD_VALUES = np.array([3, 3, 3, 3, 3, 4, 4, 5, 5], dtype=np.int64)
+_FUNC_RECORDS = [vals.RecordType.FUNC_BEGIN.value, vals.RecordType.FUNC_END.value]
+# The records that drop the context of the thread
+_THREAD_RESETS = [vals.RecordType.THREAD_END.value, vals.RecordType.PROCESS_END.value]
+_NEWLINE, _SEMICOLON, _SPACE, _ZERO = ord("\n"), ord(";"), ord(" "), ord("0")
+# Powers of ten used for computing the values of the tokens (int64 fits up to 18 digits)
+_POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+# Resources with fixed layout, the uids and locations are stored as indexes to ProbeTable
+RESOURCE_DTYPE = np.dtype(
+    [
+        ("kind", np.int64),
+        ("uid", np.int64),
+        ("location", np.int64),
+        ("tid", np.int64),
+        ("pid", np.int64),
+        ("ppid", np.int64),
+        ("amount", np.int64),
+        ("timestamp", np.int64),
+        ("call-order", np.int64),
+        ("exclusive", np.int64),
+    ]
+)
+# The kinds of resources, i.e. function calls, USDT pairs, threads and processes, that differ in
+# their sets of properties
+CALL_RESOURCE, USDT_RESOURCE, THREAD_RESOURCE, PROCESS_RESOURCE = range(4)
+
+
 class ThreadContext:
     """Class that keeps track of function call stack, USDT hit stack, function call sequence
     map and bottom indicator per each active thread.
@@ -98,37 +143,56 @@ def trace_to_profile(data_file, config, probes, **_):
     """Process raw data and (optionally) convert them into a Perun profile. The conversion is
     delegated to a separate process to speedup the processing task.
 
+    The resources are passed to the process as arrays of fixed-layout records through a ring
+    buffer in the shared memory, only the newly registered names and locations of the resources
+    are pickled along with them.
+
     :param str data_file: name of the file containing raw data
     :param Configuration config: an object containing configuration parameters
     :param Probes probes: an object containing info about probed locations
-    :return Profile: the resulting profile
+    :return Profile: the resulting profile or None, if the transformation process failed
     """
     # Profile should not be generated, simply process the raw data and return empty profile
     if config.no_profile:
-        for _ in process_records(data_file, config, probes):
+        for _ in _process_batches(data_file, config, probes):
             pass
         return Profile()
 
-    # Otherwise create resource queue (passing resources) and profile queue (passing profile)
-    resource_queue = proc.SafeQueue(vals.RESOURCE_QUEUE_CAPACITY)
+    # Otherwise create resource buffer (passing resources) and profile queue (passing profile)
+    resource_buffer = proc.SharedRingBuffer(
+        RESOURCE_DTYPE, vals.RESOURCE_CHUNK, vals.RESOURCE_QUEUE_CAPACITY
+    )
     profile_queue = proc.SafeQueue(1)
     # Also create a new process for transforming the resources into a profile
-    profile_process = Process(target=profile_builder, args=(resource_queue, profile_queue))
+    profile_process = Process(
+        target=profile_builder,
+        args=(resource_buffer, profile_queue, config.executable.workload),
+    )
 
     try:
         # Start the process
         profile_process.start()
-        # Process and send a chunk of resources
-        for res in chunkify(process_records(data_file, config, probes), vals.RESOURCE_CHUNK):
-            resource_queue.write(list(res))
-        resource_queue.end_of_input()
+        # Process and send the resources along with the names and locations unknown to the builder
+        sent_names, sent_locations = 0, 0
+        for resources, probe_table in process_resource_arrays(data_file, config, probes):
+            new_names = probe_table.names[sent_names:]
+            new_locations = probe_table.locations[sent_locations:]
+            if not resource_buffer.write(resources, (new_names, new_locations), profile_process):
+                WATCH_DOG.info("The profile transformation process terminated prematurely.")
+                return None
+            sent_names += len(new_names)
+            sent_locations += len(new_locations)
+        resource_buffer.end_of_input()
         # After all resources have been sent, wait for the resulting profile
         profile = profile_queue.read_large()
 
         return profile
     finally:
         # Cleanup the queues
-        resource_queue.close_writer()
+        resource_buffer.close_writer()
+        if not profile_process.is_alive():
+            # The terminated process might not have signalled the end of its output
+            profile_queue.end_of_input()
         profile_queue.close_reader()
         # Wait for the transformation process to finish
         profile_process.join(timeout=vals.CLEANUP_TIMEOUT)
@@ -138,22 +202,25 @@ def trace_to_profile(data_file, config, probes, **_):
             )
 
 
-def profile_builder(resource_queue, profile_queue):
+def profile_builder(resource_buffer, profile_queue, workload):
     """Transforms resources into a Perun profile. Should be run as a standalone process that
-    obtains resources from a queue and returns the resulting profile through a queue.
+    obtains resources from a shared ring buffer and returns the resulting profile through a queue.
 
-    :param SafeQueue resource_queue: a multiprocessing queue for obtaining resources
+    :param SharedRingBuffer resource_buffer: a shared memory ring buffer for obtaining resources
     :param SafeQueue profile_queue: a multiprocessing queue for passing profile
+    :param str workload: the collection workload
     """
     try:
         # Create a new profile structure
         profile = Profile()
+        names, locations = [], []
 
         # Build the profile
-        profile_resources = resource_queue.read()
-        while profile_resources is not None:
-            profile.update_resources({"resources": profile_resources}, "global")
-            profile_resources = resource_queue.read()
+        for resources, metadata in resource_buffer.read():
+            if metadata is not None:
+                names.extend(metadata[0])
+                locations.extend(metadata[1])
+            _update_profile(profile, resources, names, locations, workload)
         # Pass the resulting profile back to the main process
         profile_queue.write(profile)
         profile_queue.end_of_input()
@@ -163,10 +230,61 @@ def profile_builder(resource_queue, profile_queue):
         pass
     finally:
         # Regardless of type of termination, queue resources should be cleaned
-        resource_queue.close_reader()
+        resource_buffer.close_reader()
         profile_queue.close_writer()
 
 
+def _update_profile(profile, resources, names, locations, workload):
+    """Appends the array of resources to the profile.
+
+    The resources are grouped by their persistent properties, i.e. by the resource types of the
+    profile, and the collectable properties of each group are appended as whole columns. The
+    groups are appended in the order of their first resources, hence the resulting profile is the
+    same as if the resources were added one by one.
+
+    :param Profile profile: the updated profile
+    :param np.ndarray resources: the array of resources (RESOURCE_DTYPE)
+    :param list names: the names referenced by the uids of the resources
+    :param list locations: the locations referenced by the resources
+    :param str workload: the collection workload
+    """
+    if not len(resources):
+        return
+    order, starts = _group(
+        *(resources[key] for key in ("kind", "uid", "location", "tid", "pid", "ppid"))
+    )
+    ends = np.append(starts[1:], len(order))
+    firsts = order[starts]
+    grouped = resources[order]
+    resource_columns = []
+    for group in np.argsort(firsts).tolist():
+        kind, uid, location, tid, pid, ppid = resources[firsts[group]].tolist()[:6]
+        persistent_properties = {
+            "uid": names[uid],
+            "tid": tid,
+            "type": "mixed",
+            "subtype": "time delta",
+            "location": locations[location],
+            "workload": workload,
+            "time": "0.0",
+        }
+        if kind in (THREAD_RESOURCE, PROCESS_RESOURCE):
+            persistent_properties["pid"] = pid
+        if kind == PROCESS_RESOURCE:
+            persistent_properties["ppid"] = ppid
+        keys = ["amount", "timestamp", "call-order"]
+        if kind == CALL_RESOURCE:
+            keys.append("exclusive")
+        group_resources = grouped[starts[group] : ends[group]]
+        resource_columns.append(
+            (
+                persistent_properties,
+                {key: array.array("q", group_resources[key].tobytes()) for key in keys},
+            )
+        )
+    profile.update_resource_columns(resource_columns)
+
+
 def process_records(data_file, config, probes):
     """Transforms the collection output into performance resources. The
     collected time data are paired and provided as resources dictionaries.
@@ -177,24 +295,64 @@ def process_records(data_file, config, probes):
 
     :return iterable: generator object that produces dictionaries representing the resources
     """
+    workload = config.executable.workload
+    for batch, probe_table in _process_batches(data_file, config, probes):
+        call_positions, calls, record_positions, record_resources = batch
+        yield from _merge_resources(
+            call_positions,
+            _call_resources(calls, probe_table, workload),
+            record_positions,
+            record_resources,
+        )
+
+
+def process_resource_arrays(data_file, config, probes):
+    """Transforms the collection output into the arrays of resources with fixed layout (see
+    RESOURCE_DTYPE), which can be passed to other processes without pickling the resources.
+
+    :param str data_file: name of the collection output file
+    :param Configuration config: the configuration object
+    :param Probes probes: the Probes object
+
+    :return iterable: generator object that produces the pairs of the array of resources and the
+        probe table, whose names and locations are referenced by the resources
+    """
+    for batch, probe_table in _process_batches(data_file, config, probes):
+        call_positions, calls, record_positions, record_resources = batch
+        resources = np.concatenate(
+            (
+                calls,
+                np.array(
+                    [_resource_to_record(resource, probe_table) for resource in record_resources],
+                    dtype=RESOURCE_DTYPE,
+                ),
+            )
+        )
+        positions = np.concatenate((call_positions, np.array(record_positions, dtype=np.int64)))
+        yield resources[np.argsort(positions, kind="stable")], probe_table
+
+
+def _process_batches(data_file, config, probes):
+    """Transforms the collection output into the batches of resources, the records are parsed and
+    transformed in large blocks (see :func:`_process_batch`).
+
+    :param str data_file: name of the collection output file
+    :param Configuration config: the configuration object
+    :param Probes probes: the Probes object
+
+    :return iterable: generator object that produces the pairs of the transformed batch and the
+        probe table
+    """
     # Initialize the context
     binaries = set(map(os.path.basename, config.libs + [config.binary]))
     ctx = TransformContext(probes, binaries, config.verbose_trace, config.executable.workload)
-    # Get the handlers
-    handlers = _record_handlers()
+    probe_table = ProbeTable(probes, config.verbose_trace)
 
     metrics.start_timer("data-processing")
-    record = None
+    records = None
     try:
-        for record in parse_records(data_file, probes, config.verbose_trace):
-            try:
-                # Invoke the correct handler based on the record type and return the
-                # resulting resource, if any
-                resource = handlers[record["type"]](record, ctx)
-                if resource:
-                    yield resource
-            except (KeyError, IndexError):
-                continue
+        for records in parse_record_batches(data_file, probe_table):
+            yield _process_batch(records, probe_table, ctx), probe_table
 
         # Register computed metrics
         metrics.end_timer("data-processing")
@@ -221,11 +379,488 @@ def process_records(data_file, config, probes):
 
     except Exception:
         WATCH_DOG.info("Error while processing the raw trace output")
-        WATCH_DOG.debug(f"Record: {record}")
+        WATCH_DOG.debug(f"Records: {records}")
         WATCH_DOG.debug(f"Context: {ctx}")
         raise
 
 
+def _process_batch(records, probe_table, ctx):
+    """Transforms the batch of parsed records into resources.
+
+    The function records (i.e. the majority of the records) of the well-formed threads are paired
+    and their exclusive times are computed in bulk (see :func:`_process_func_records`). The rest of
+    the records, i.e., the thread, process and USDT records and the function records of threads
+    with missing or mismatched records, are dispatched one by one to the record handlers.
+
+    :param np.ndarray records: the array of parsed records
+    :param ProbeTable probe_table: translation of the raw probe IDs
+    :param TransformContext ctx: the parsing context object
+
+    :return tuple: the ordered positions of the exit records of the paired calls, the array of
+        resources of the paired calls, the ordered positions of the rest of the records with
+        resources and the list of their resources
+    """
+    types, tids = records["type"], records["tid"]
+    # The thread context is dropped at the end of each thread (or process), the function records
+    # of the same thread are thus further split by the preceding thread ends
+    generations, last_generations = _thread_generations(tids, np.isin(types, _THREAD_RESETS))
+    func_rows = np.flatnonzero(np.isin(types, _FUNC_RECORDS))
+    span = int(generations.max()) + 1 if len(generations) else 1
+    thread_keys, threads = _factorize(tids[func_rows] * span + generations[func_rows])
+    thread_tids, thread_generations = np.divmod(thread_keys, span)
+    well_formed, open_calls, call_positions, calls = _process_func_records(
+        records[func_rows], func_rows, threads, thread_tids, thread_generations, probe_table, ctx
+    )
+
+    # Dispatch the rest of the records to the handlers in the order of the records
+    handlers = _record_handlers()
+    sequential = np.ones(len(records), dtype=bool)
+    sequential[func_rows[well_formed[threads]]] = False
+    record_positions, record_resources = [], []
+    for position in np.flatnonzero(sequential).tolist():
+        record = _record_to_dict(records[position], probe_table)
+        try:
+            # Invoke the correct handler based on the record type and return the
+            # resulting resource, if any
+            resource = handlers[record["type"]](record, ctx)
+            if resource:
+                record_positions.append(position)
+                record_resources.append(resource)
+        except (KeyError, IndexError):
+            continue
+
+    # Store the stacks of the well-formed threads that have not terminated yet
+    # All the rows of the thread have the same last generation, any of them can be used
+    thread_rows = np.empty(len(thread_tids), dtype=np.int64)
+    thread_rows[threads] = func_rows
+    running = well_formed & (thread_generations == last_generations[thread_rows])
+    for thread in np.flatnonzero(running).tolist():
+        thread_ctx = ctx.per_thread[int(thread_tids[thread])]
+        thread_ctx.func_stack, thread_ctx.depth, thread_ctx.bottom_flag = open_calls[thread]
+    return call_positions, calls, record_positions, record_resources
+
+
+def _merge_resources(call_positions, call_resources, record_positions, record_resources):
+    """Merges the resources of the paired function calls and of the rest of the records.
+
+    The (few) resources of the records are inserted between the chunks of the call resources.
+
+    :param np.ndarray call_positions: the ordered positions of the exit records of the calls
+    :param iterable call_resources: the resources of the calls
+    :param list record_positions: the ordered positions of the records with resources
+    :param list record_resources: the resources of the records
+
+    :return iterable: the resources ordered by the positions of their (last) records
+    """
+    call_resources = iter(call_resources)
+    previous = 0
+    for split, resource in zip(
+        np.searchsorted(call_positions, record_positions).tolist(), record_resources
+    ):
+        yield from itertools.islice(call_resources, split - previous)
+        yield resource
+        previous = split
+    yield from call_resources
+
+
+def _call_resources(calls, probe_table, workload):
+    """Builds the resource dictionaries of the paired function calls, the resources are built
+    lazily, one by one, as they are consumed.
+
+    :param np.ndarray calls: the array of resources of the calls (RESOURCE_DTYPE)
+    :param ProbeTable probe_table: translation of the raw probe IDs
+    :param str workload: the collection workload
+
+    :return iterable: generator of the resource dictionaries
+    """
+    names, locations = probe_table.names, probe_table.locations
+    return (
+        {
+            "amount": amount,
+            "timestamp": timestamp,
+            "call-order": seq,
+            "uid": names[uid],
+            "tid": tid,
+            "type": "mixed",
+            "subtype": "time delta",
+            "location": locations[location],
+            "workload": workload,
+            "exclusive": exclusive,
+        }
+        for amount, timestamp, seq, uid, tid, location, exclusive in zip(
+            calls["amount"].tolist(),
+            calls["timestamp"].tolist(),
+            calls["call-order"].tolist(),
+            calls["uid"].tolist(),
+            calls["tid"].tolist(),
+            calls["location"].tolist(),
+            calls["exclusive"].tolist(),
+        )
+    )
+
+
+def _resource_to_record(resource, probe_table):
+    """Converts the resource dictionary produced by the record handlers to the resource record
+    with fixed layout (see RESOURCE_DTYPE).
+
+    :param dict resource: the resource dictionary
+    :param ProbeTable probe_table: translation of the raw probe IDs
+
+    :return tuple: the resource record
+    """
+    if "ppid" in resource:
+        kind = PROCESS_RESOURCE
+    elif "pid" in resource:
+        kind = THREAD_RESOURCE
+    else:
+        kind = CALL_RESOURCE if "exclusive" in resource else USDT_RESOURCE
+    return (
+        kind,
+        probe_table.name_index(resource["uid"]),
+        probe_table.location_index(resource["location"]),
+        resource["tid"],
+        resource.get("pid", 0),
+        resource.get("ppid", 0),
+        resource["amount"],
+        resource["timestamp"],
+        resource["call-order"],
+        resource.get("exclusive", 0),
+    )
+
+
+def _thread_generations(tids, resets):
+    """Computes the number of preceding thread resets (thread and process end records) of the
+    same thread for each record, and the total number of resets of the thread of each record.
+
+    :param np.ndarray tids: the thread ids of the records
+    :param np.ndarray resets: the mask of the records that reset the thread context
+    :return tuple: the arrays of the generations and the last generations of the record threads
+    """
+    if not len(tids):
+        return tids, tids
+    order, starts = _group(tids)
+    sorted_resets = resets[order].astype(np.int64)
+    sizes = np.diff(np.append(starts, len(order)))
+    cumulative = np.cumsum(sorted_resets)
+    base = np.repeat(cumulative[starts] - sorted_resets[starts], sizes)
+    generations, last_generations = np.empty_like(tids), np.empty_like(tids)
+    generations[order] = cumulative - sorted_resets - base
+    last_generations[order] = np.repeat(cumulative[starts + sizes - 1], sizes) - base
+    return generations, last_generations
+
+
+def _carried_calls(ctx, tid):
+    """Obtains the stack of unfinished function calls of the thread from the previous batches.
+
+    :param TransformContext ctx: the parsing context object
+    :param int tid: the thread id
+    :return tuple or None: the function stack, depth and bottom flag of the thread, or None if the
+        stack is not consistent (e.g. due to lost records) and the thread has to be processed
+        record by record
+    """
+    thread_ctx = ctx.per_thread.get(tid)
+    if thread_ctx is None:
+        return [], -1, False
+    stack = thread_ctx.func_stack
+    callees = [callee["timestamp"] for callee in stack[1:]] + [0]
+    if any(caller["callee_tmp"] != callee for caller, callee in zip(stack, callees)):
+        return None
+    return stack, thread_ctx.depth, thread_ctx.bottom_flag
+
+
+def _process_func_records(funcs, positions, threads, thread_tids, generations, probe_table, ctx):
+    """Pairs the entry and exit function records and computes the resources of function calls.
+
+    The unfinished calls of each thread from the previous batches are prepended to the records of
+    the thread. Then the records are grouped by the threads and the call depths (levels). In the
+    well-formed threads, the records of each group alternate between the entry records and their
+    matching exit records, hence the calls, their callers and exclusive times are computed over
+    the whole arrays. The threads with missing or mismatched records are reported as not
+    well-formed and are left to the record handlers.
+
+    :param np.ndarray funcs: the array of function records
+    :param np.ndarray positions: the positions of the function records in the batch
+    :param np.ndarray threads: the thread index of each function record
+    :param np.ndarray thread_tids: the thread id of each thread index
+    :param np.ndarray generations: the thread generation of each thread index
+    :param ProbeTable probe_table: translation of the raw probe IDs
+    :param TransformContext ctx: the parsing context object
+
+    :return tuple: the mask of well-formed threads, the new function stack, depth and bottom flag
+        of each well-formed thread, the ordered positions of the exit records of the calls and
+        the array of the resources of the calls (RESOURCE_DTYPE)
+    """
+    well_formed = np.ones(len(thread_tids), dtype=bool)
+    if not len(funcs):
+        return well_formed, {}, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=RESOURCE_DTYPE)
+    depth_offsets = np.zeros(len(thread_tids), dtype=np.int64)
+    carried_threads, carried_records, carried_callees, carried_children = [], [], [], []
+    for thread in np.flatnonzero(generations == 0).tolist():
+        carried = _carried_calls(ctx, int(thread_tids[thread]))
+        if carried is None:
+            well_formed[thread] = False
+            continue
+        stack, depth, bottom_flag = carried
+        depth_offsets[thread] = depth + 1 - len(stack)
+        for level, call in enumerate(stack):
+            carried_threads.append(thread)
+            carried_records.append(
+                (
+                    vals.RecordType.FUNC_BEGIN.value,
+                    call["tid"],
+                    call["timestamp"],
+                    probe_table.name_index(call["id"]),
+                    probe_table.location_index(call["loc"]),
+                    call["seq"],
+                )
+            )
+            carried_callees.append(call["callee_time"])
+            # Only the top of the stack may have no callees so far
+            carried_children.append(int(level + 1 < len(stack) or not bottom_flag))
+    carried = np.zeros(len(carried_records), dtype=RECORD_DTYPE)
+    for field, column in zip(
+        ("type", "tid", "timestamp", "id", "loc", "seq"), zip(*carried_records)
+    ):
+        carried[field] = column
+    events = np.concatenate((carried, funcs))
+    threads = np.concatenate((np.array(carried_threads, dtype=np.int64), threads))
+    positions = np.concatenate((np.full(len(carried), -1, dtype=np.int64), positions))
+    callees = np.concatenate(
+        (np.array(carried_callees, dtype=np.int64), np.zeros(len(funcs), dtype=np.int64))
+    )
+    children = np.concatenate(
+        (np.array(carried_children, dtype=np.int64), np.zeros(len(funcs), dtype=np.int64))
+    )
+    tids, timestamps, ids = events["tid"], events["timestamp"], events["id"]
+    is_begin = events["type"] == vals.RecordType.FUNC_BEGIN.value
+
+    # Compute the levels of records: entry records increase the depth of the thread and the exit
+    # records decrease it, the entry and the exit records of the same call have the same level
+    thread_order, thread_starts = _group(threads)
+    deltas = np.where(is_begin[thread_order], 1, -1)
+    thread_sizes = np.diff(np.append(thread_starts, len(thread_order)))
+    depths = np.cumsum(deltas)
+    depths -= np.repeat(depths[thread_starts] - deltas[thread_starts], thread_sizes)
+    levels = np.empty_like(depths)
+    levels[thread_order] = np.where(deltas > 0, depths - 1, depths)
+    sorted_index = np.empty_like(thread_order)
+    sorted_index[thread_order] = np.arange(len(thread_order))
+
+    # Group the records by threads and levels, the records keep their order in each group
+    grouped, _ = _group(threads, levels)
+    group_threads, group_levels, group_begins = threads[grouped], levels[grouped], is_begin[grouped]
+    new_group = np.concatenate(
+        (
+            [True],
+            (group_threads[1:] != group_threads[:-1]) | (group_levels[1:] != group_levels[:-1]),
+        )
+    )
+
+    # The exit record has to directly follow the entry record of the same call in its group
+    exit_slots = np.flatnonzero(~group_begins)
+    entries, exits = grouped[np.maximum(exit_slots - 1, 0)], grouped[exit_slots]
+    paired = (group_levels[exit_slots] >= 0) & ~new_group[exit_slots]
+    paired &= (ids[entries] == ids[exits]) & (timestamps[entries] < timestamps[exits])
+
+    # The caller is the last preceding entry record of the same thread on the previous level
+    group_keys = (np.cumsum(new_group) - 1) * (len(grouped) + 1)
+    slot_keys = group_keys + sorted_index[grouped]
+    callee_slots = np.flatnonzero(group_begins & (group_levels > 0))
+    caller_slots = np.maximum(
+        np.searchsorted(
+            slot_keys,
+            group_keys[callee_slots] - (len(grouped) + 1) + sorted_index[grouped[callee_slots]],
+        )
+        - 1,
+        0,
+    )
+    has_caller = (
+        (group_threads[caller_slots] == group_threads[callee_slots])
+        & (group_levels[caller_slots] == group_levels[callee_slots] - 1)
+        & group_begins[caller_slots]
+    )
+    callers = np.full(len(events), -1, dtype=np.int64)
+    callers[grouped[callee_slots]] = grouped[caller_slots]
+    # Callers without known probe cannot be registered in the dynamic call graph
+    known_callers = np.isin(ids[callers[grouped[callee_slots]]], probe_table.indexes_of(ctx.dyn_cg))
+
+    well_formed[threads[exits[~paired]]] = False
+    well_formed[group_threads[callee_slots[~(has_caller & known_callers)]]] = False
+    well_formed[group_threads[exit_slots[group_levels[exit_slots] < 0]]] = False
+    # The statistics of the calls are gathered per thread id in the order of the calls, hence if
+    # any generation of the thread is not well-formed, all of them are left to the handlers
+    well_formed &= ~np.isin(thread_tids, thread_tids[~well_formed])
+
+    # Compute the resources of the calls of well-formed threads ordered by their exit records
+    calls = np.flatnonzero(paired & well_formed[threads[exits]])
+    entries, exits = entries[calls], exits[calls]
+    order = np.argsort(exits)
+    entries, exits = entries[order], exits[order]
+    amounts = timestamps[exits] - timestamps[entries]
+    call_callers = callers[entries]
+    np.add.at(callees, call_callers[call_callers >= 0], amounts[call_callers >= 0])
+    exclusives = amounts - callees[entries]
+    new_entries = np.flatnonzero(is_begin & (positions >= 0) & well_formed[threads])
+    entry_callers = callers[new_entries]
+    np.add.at(children, entry_callers[entry_callers >= 0], 1)
+
+    call_tids, call_ids = tids[entries], ids[entries]
+    _add_grouped(
+        ctx.level_times_exclusive,
+        call_tids,
+        levels[entries] + depth_offsets[threads[entries]],
+        exclusives,
+    )
+    leaves = children[entries] == 0
+    _add_grouped(
+        ctx.bottom, call_tids[leaves], call_ids[leaves], amounts[leaves], probe_table.names
+    )
+    _extend_funcs(ctx, call_tids, call_ids, exclusives, amounts, probe_table.names)
+    ctx.probes_hit.update(probe_table.names[idx] for idx in _factorize(ids[new_entries])[0])
+    edges = _factorize(
+        ids[entry_callers[entry_callers >= 0]] * len(probe_table.names)
+        + ids[new_entries[entry_callers >= 0]]
+    )[0]
+    for caller, callee in zip(*np.divmod(edges, len(probe_table.names))):
+        ctx.dyn_cg[probe_table.names[caller]].add(probe_table.names[callee])
+
+    calls = np.zeros(len(entries), dtype=RESOURCE_DTYPE)
+    calls["kind"] = CALL_RESOURCE
+    calls["uid"], calls["location"], calls["tid"] = call_ids, events["loc"][entries], call_tids
+    calls["amount"], calls["timestamp"] = amounts, timestamps[entries]
+    calls["call-order"], calls["exclusive"] = events["seq"][entries], exclusives
+
+    # Build the stacks of unfinished calls of the well-formed threads
+    last_records = thread_order[thread_starts + thread_sizes - 1]
+    open_calls = {
+        thread: ([], int(depth_offsets[thread]) - 1, bool(is_begin[last]))
+        for thread, last in zip(threads[last_records].tolist(), last_records.tolist())
+        if well_formed[thread]
+    }
+    unfinished = is_begin & well_formed[threads]
+    unfinished[entries] = False
+    unfinished = np.flatnonzero(unfinished)
+    unfinished = unfinished[np.lexsort((levels[unfinished], threads[unfinished]))]
+    for event, thread in zip(unfinished.tolist(), threads[unfinished].tolist()):
+        stack, depth, bottom_flag = open_calls[thread]
+        if stack:
+            stack[-1]["callee_tmp"] = int(timestamps[event])
+        stack.append(_record_to_dict(events[event], probe_table))
+        stack[-1]["callee_tmp"] = 0
+        stack[-1]["callee_time"] = int(callees[event])
+        open_calls[thread] = (stack, depth + 1, bottom_flag)
+    return well_formed, open_calls, positions[exits], calls
+
+
+def _add_grouped(summary, outer_keys, inner_keys, values, inner_names=None):
+    """Adds the values to the two-level summary dictionary, the values are summed by the keys.
+
+    :param dict summary: the two-level dictionary (e.g. thread -> function -> value)
+    :param np.ndarray outer_keys: the keys of the first level
+    :param np.ndarray inner_keys: the keys of the second level
+    :param np.ndarray values: the added values
+    :param list inner_names: the names of the second level keys (if the keys are indexes)
+    """
+    if not len(values):
+        return
+    order, starts = _group(outer_keys, inner_keys)
+    outer_keys, inner_keys, values = outer_keys[order], inner_keys[order], values[order]
+    sums = np.add.reduceat(values, starts)
+    for outer, inner, value in zip(
+        outer_keys[starts].tolist(), inner_keys[starts].tolist(), sums.tolist()
+    ):
+        summary[outer][inner if inner_names is None else inner_names[inner]] += value
+
+
+def _extend_funcs(ctx, tids, ids, exclusives, amounts, names):
+    """Appends the exclusive and inclusive times of calls to the compact summaries of functions.
+
+    :param TransformContext ctx: the parsing context object
+    :param np.ndarray tids: the thread ids of the calls
+    :param np.ndarray ids: the name indexes of the called functions
+    :param np.ndarray exclusives: the exclusive times of the calls
+    :param np.ndarray amounts: the inclusive times of the calls
+    :param list names: the names of the functions
+    """
+    if not len(tids):
+        return
+    order, starts = _group(tids, ids)
+    tids, ids = tids[order], ids[order]
+    exclusives, amounts = np.abs(exclusives[order]), np.abs(amounts[order])
+    ends = np.append(starts[1:], len(order))
+    for tid, uid, start, end in zip(
+        tids[starts].tolist(), ids[starts].tolist(), starts.tolist(), ends.tolist()
+    ):
+        func = ctx.funcs[tid][names[uid]]
+        func["e"].extend(exclusives[start:end].tolist())
+        func["i"].extend(amounts[start:end].tolist())
+
+
+def _factorize(values):
+    """Maps the values to the indexes of their distinct values.
+
+    The values of small range (such as thread ids or name indexes) are mapped through dense
+    lookup table in linear time, otherwise the values are sorted.
+
+    :param np.ndarray values: the integer values
+    :return tuple: the sorted distinct values and the index of the distinct value of each value
+    """
+    if not len(values):
+        return values, np.zeros(0, dtype=np.int64)
+    low = int(values.min())
+    span = int(values.max()) - low + 1
+    if span > max(len(values), 1 << 16):
+        return np.unique(values, return_inverse=True)
+    present = np.zeros(span, dtype=bool)
+    present[values - low] = True
+    codes = np.cumsum(present) - 1
+    return np.flatnonzero(present) + low, codes[values - low]
+
+
+def _group(*keys):
+    """Computes the stable order of the values that groups them by the keys (the first key is the
+    major one) and the starts of the groups in the ordered values.
+
+    :param np.ndarray keys: the integer keys of the values
+    :return tuple: the order of the values and the positions of the group starts in the order
+    """
+    distinct, codes = _factorize(keys[0])
+    for key in keys[1:]:
+        key_distinct, key_codes = _factorize(key)
+        distinct, codes = _factorize(codes * len(key_distinct) + key_codes)
+    # Small codes are sorted by the (linear) radix sort
+    if len(distinct) <= np.iinfo(np.uint16).max:
+        codes = codes.astype(np.uint16)
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1])))
+    return order, starts[: len(order)]
+
+
+def _record_to_dict(record, probe_table):
+    """Converts the parsed record to the dictionary used by the record handlers.
+
+    :param np.void record: the parsed record
+    :param ProbeTable probe_table: translation of the raw probe IDs
+    :return dict: the record dictionary
+    """
+    record_type, tid, pid, ppid, timestamp, name, location, seq, _ = record.tolist()
+    record_dict = {
+        "type": record_type,
+        "tid": tid,
+        "timestamp": timestamp,
+        "id": probe_table.names[name],
+        "seq": seq,
+        "loc": probe_table.locations[location],
+    }
+    if record_type in vals.THREAD_RECORDS:
+        record_dict["pid"] = pid
+    elif record_type in vals.PROCESS_RECORDS:
+        record_dict["pid"] = pid
+        record_dict["ppid"] = ppid
+    return record_dict
+
+
 def _build_mixed_cg_tmp(config, ctx):
     cg_stats_name, _ = build_stats_names(config)
     static_cg = resources.extract(
@@ -561,76 +1196,315 @@ def _build_resource(record_entry, record_exit, uid, workload):
     }
 
 
-def parse_records(file_name, probes, verbose_trace):
-    """Parse the raw data line by line, each line represented as a dictionary of components.
+class ProbeTable:
+    """Translates the raw probe identifiers from the collection output to the indexes of probe
+    names and locations, so the parsed records can be stored in typed arrays.
 
-    :param str file_name: name of the file containing raw collection data
-    :param Probes probes: class containing probed locations
-    :param bool verbose_trace: flag indicating whether the raw data are verbose or not
-
-    :return iterable: a generator object that returns parsed raw data lines
-    """
-    # ID (numeric id or name) -> (NAME, SAMPLE)
-    dict_key = "name" if verbose_trace else "id"
-    probe_map = {
-        str(probe[dict_key]): (
-            probe["name"],
-            probe["sample"],
-            os.path.basename(probe["lib"]),
+    :ivar dict probe_map: raw probe ID (numeric id or name) -> (name, sample, location)
+    :ivar list names: the names of the probes (or raw ids of unknown probes)
+    :ivar list locations: the locations (binaries) of the probes
+    :ivar dict raw_ids: raw probe ID -> index to the name_ids, location_ids and steps
+    :ivar list name_ids: the index of probe name for each raw probe ID
+    :ivar list location_ids: the index of probe location for each raw probe ID
+    :ivar list steps: the sampling step for each raw probe ID
+    """
+
+    def __init__(self, probes, verbose_trace):
+        """
+        :param Probes probes: class containing probed locations
+        :param bool verbose_trace: flag indicating whether the raw data are verbose or not
+        """
+        dict_key = "name" if verbose_trace else "id"
+        self.probe_map = {
+            str(probe[dict_key]): (
+                probe["name"],
+                probe["sample"],
+                os.path.basename(probe["lib"]),
+            )
+            for probe in list(probes.func.values()) + list(probes.usdt.values())
+        }
+        self.names, self._name_index = [], {}
+        self.locations, self._location_index = [], {}
+        self.raw_ids, self.name_ids, self.location_ids, self.steps = {}, [], [], []
+
+    def name_index(self, name):
+        """Returns the index of the probe name, registers the name if it is not known yet.
+
+        :param str name: the probe name
+        :return int: the index of the name
+        """
+        if name not in self._name_index:
+            self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return self._name_index[name]
+
+    def location_index(self, location):
+        """Returns the index of the probe location, registers the location if it is not known yet.
+
+        :param str location: the probe location
+        :return int: the index of the location
+        """
+        if location not in self._location_index:
+            self._location_index[location] = len(self.locations)
+            self.locations.append(location)
+        return self._location_index[location]
+
+    def indexes_of(self, names):
+        """Returns the indexes of the known probe names.
+
+        :param iterable names: the probe names
+        :return list: the indexes of those names that are already registered
+        """
+        return [self._name_index[name] for name in names if name in self._name_index]
+
+    def translate(self, raw_ids):
+        """Translates the raw probe IDs to the arrays of name indexes, location indexes and
+        sampling steps.
+
+        :param list raw_ids: the raw probe IDs (as bytes) of the parsed records
+        :return tuple: arrays of name indexes, location indexes and steps
+        """
+        # The new IDs are registered in the order of their first occurrence
+        new_ids = [raw_id for raw_id in dict.fromkeys(raw_ids) if raw_id not in self.raw_ids]
+        for raw_id in new_ids:
+            probe_id = raw_id.decode(errors="replace")
+            name, step, location = self.probe_map.get(probe_id, (probe_id, 0, probe_id))
+            self.raw_ids[raw_id] = len(self.steps)
+            self.name_ids.append(self.name_index(name))
+            self.location_ids.append(self.location_index(location))
+            self.steps.append(step)
+        raw = np.fromiter(
+            map(self.raw_ids.__getitem__, raw_ids), dtype=np.int64, count=len(raw_ids)
         )
-        for probe in list(probes.func.values()) + list(probes.usdt.values())
-    }
-    # TID -> UID -> SEQUENCE
-    seq_map = collections.defaultdict(lambda: collections.defaultdict(int))
+        return (
+            np.array(self.name_ids, dtype=np.int64)[raw],
+            np.array(self.location_ids, dtype=np.int64)[raw],
+            np.array(self.steps, dtype=np.int64)[raw],
+        )
+
 
-    with open(file_name, "r") as trace:
-        cnt = 0
+def parse_record_batches(file_name, probe_table):
+    """Parse the raw data by large blocks, each block represented as an array of records.
+
+    The lines of each block are tokenized in bulk (see :func:`_tokenize_heads`), only the lines
+    that do not have the canonical form are parsed one by one.
+
+    :param str file_name: name of the file containing raw collection data
+    :param ProbeTable probe_table: translation of the raw probe IDs
+
+    :return iterable: a generator object that returns the arrays of parsed records (RECORD_DTYPE)
+    """
+    # (TID, name index) -> SEQUENCE
+    seq_map = collections.defaultdict(int)
+    line_count = 0
+    with open(file_name, "rb") as trace:
+        remainder = b""
         while True:
-            try:
-                cnt += 1
-                line = trace.readline()
-                if not line:
-                    break
-                # The line should contain the following values:
-                # 'type' 'tid' ['pid'] ['ppid'] 'timestamp';'probe id'
-                # where thread records have 'pid' and process records have 'pid', 'ppid'
-                major_components = line.split(";")
-                minor_components = major_components[0].split()
-                record_type = int(minor_components[0])
-                record_tid = int(minor_components[1])
-                probe_id = major_components[1].rstrip("\n")
-                record_id, probe_step, probe_lib = probe_map.get(probe_id, (probe_id, 0, probe_id))
-                # 'loc' default value is for process records
-                record = {
-                    "type": record_type,
-                    "tid": record_tid,
-                    "timestamp": int(minor_components[-1]),
-                    "id": record_id,
-                    "seq": 0,
-                    "loc": probe_lib,
-                }
-                if record_type in vals.SEQUENCED_RECORDS:
-                    # Sequenced records need to update their sequence number
-                    record["seq"] = seq_map[record_tid][record_id]
-                    seq_map[record_tid][record_id] += probe_step
-                elif record_type in vals.THREAD_RECORDS:
-                    # TYPE TID PID TIMESTAMP ID
-                    record["pid"] = int(minor_components[2])
-                elif record_type in vals.PROCESS_RECORDS:
-                    # TYPE TID PID PPID TIMESTAMP ID
-                    record["pid"] = int(minor_components[2])
-                    record["ppid"] = int(minor_components[3])
-                yield record
-            # In case there is any issue with parsing, return corrupted trace record
-            # We want to catch any error since parsing should be bullet-proof and should not crash
-            except Exception:
-                corrupted_line = line.rstrip("\n")
-                WATCH_DOG.info(f"Corrupted data record on ln {cnt}: {corrupted_line}")
-                yield {
-                    "type": vals.RecordType.CORRUPT.value,
-                    "tid": -1,
-                    "timestamp": -1,
-                    "id": -1,
-                }
-        WATCH_DOG.info(f"Parsed {cnt} records")
-        metrics.add_metric("records_count", cnt)
+            block = trace.read(vals.RECORD_BLOCK_SIZE)
+            if not block:
+                # The last line does not have to be terminated
+                block, remainder = (remainder + b"\n", b"") if remainder else (b"", b"")
+            else:
+                block, newline, remainder = (remainder + block).rpartition(b"\n")
+                if not newline:
+                    # The block does not contain a complete line yet
+                    continue
+                block += newline
+            if not block:
+                break
+            records, parsed_lines = _parse_block(block, probe_table, line_count)
+            line_count += parsed_lines
+            _assign_sequence_numbers(records, probe_table, seq_map)
+            yield records
+    WATCH_DOG.info(f"Parsed {line_count} records")
+    metrics.add_metric("records_count", line_count)
+
+
+def _parse_block(block, probe_table, line_offset):
+    """Parses the block of complete lines of raw data into an array of records.
+
+    The line should contain the following values:
+    'type' 'tid' ['pid'] ['ppid'] 'timestamp';'probe id'
+    where thread records have 'pid' and process records have 'pid', 'ppid'
+
+    :param bytes block: the block of raw data terminated by a newline
+    :param ProbeTable probe_table: translation of the raw probe IDs
+    :param int line_offset: the number of lines preceding the block
+
+    :return tuple: the array of records and the number of lines in the block
+    """
+    buffer = np.frombuffer(block, dtype=np.uint8)
+    line_ends = np.flatnonzero(buffer == _NEWLINE)
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    # The numeric values end at the first semicolon, the probe ID at the second one (if any)
+    semicolons = np.flatnonzero(buffer == _SEMICOLON)
+    semicolon_lines = np.searchsorted(line_ends, semicolons)
+    # The semicolons are ordered, hence the first semicolon of the line starts a new line
+    first_semicolon = np.flatnonzero(
+        np.concatenate(([True], semicolon_lines[1:] != semicolon_lines[:-1]))
+    )[: len(semicolon_lines)]
+    lines_with_id = semicolon_lines[first_semicolon]
+    has_id = np.zeros(len(line_ends), dtype=bool)
+    has_id[lines_with_id] = True
+    head_ends, id_ends = line_ends.copy(), line_ends.copy()
+    head_ends[lines_with_id] = semicolons[first_semicolon]
+    second_semicolon = first_semicolon + 1
+    has_second = np.zeros(len(first_semicolon), dtype=bool)
+    has_second[second_semicolon < len(semicolons)] = True
+    has_second[has_second] = (
+        semicolon_lines[second_semicolon[has_second]] == lines_with_id[has_second]
+    )
+    id_ends[lines_with_id[has_second]] = semicolons[second_semicolon[has_second]]
+
+    values, first_values, value_counts, regular = _tokenize_heads(buffer, line_starts, head_ends)
+    regular &= has_id
+    record_types = np.full(len(line_ends), -1, dtype=np.int64)
+    record_types[regular] = values[first_values[regular]]
+    known = (record_types >= 0) & (record_types < len(_RECORD_VALUES))
+    # Lines with unexpected number of values are left to the (more benevolent) line parsing
+    regular &= known
+    regular[regular] = _RECORD_VALUES[record_types[regular]] == value_counts[regular]
+    lines = np.flatnonzero(regular)
+    first = first_values[lines]
+    parsed = [
+        record_types[lines],
+        values[first + 1],
+        np.where(value_counts[lines] > 3, values[np.minimum(first + 2, len(values) - 1)], 0),
+        np.where(value_counts[lines] > 4, values[np.minimum(first + 3, len(values) - 1)], 0),
+        values[first + value_counts[lines] - 1],
+    ]
+    raw_ids = [block[start + 1 : end] for start, end in zip(head_ends[lines], id_ends[lines])]
+
+    # Parse the irregular lines one by one, the corrupted lines are skipped
+    irregular = []
+    for line in np.flatnonzero(~regular).tolist():
+        line_content = block[line_starts[line] : line_ends[line]]
+        record = _parse_line(line_content)
+        if record is None:
+            corrupted_line = line_content.decode(errors="replace")
+            WATCH_DOG.info(
+                f"Corrupted data record on ln {line_offset + line + 1}: {corrupted_line}"
+            )
+        elif 0 <= record[0] < len(_RECORD_VALUES):
+            irregular.append((line,) + record)
+    if irregular:
+        irregular_lines, *irregular_values = zip(*irregular)
+        order = np.argsort(np.concatenate((lines, irregular_lines)), kind="stable")
+        parsed = [
+            np.concatenate((column, np.array(irregular_column, dtype=np.int64)))[order]
+            for column, irregular_column in zip(parsed, irregular_values[:-1])
+        ]
+        raw_ids.extend(irregular_values[-1])
+        raw_ids = [raw_ids[idx] for idx in order.tolist()]
+
+    records = np.zeros(len(raw_ids), dtype=RECORD_DTYPE)
+    for field, column in zip(("type", "tid", "pid", "ppid", "timestamp"), parsed):
+        records[field] = column
+    records["id"], records["loc"], records["step"] = probe_table.translate(raw_ids)
+    return records, len(line_ends)
+
+
+def _tokenize_heads(buffer, line_starts, head_ends):
+    """Tokenizes the numeric values at the beginning of each line (i.e. the heads of the lines).
+
+    All the heads are gathered into single array and the values of their tokens are computed
+    using the positional values of their digits. Only heads that consist solely of decimal numbers
+    separated by single spaces are considered regular.
+
+    :param np.ndarray buffer: the block of raw data
+    :param np.ndarray line_starts: the positions of the line starts
+    :param np.ndarray head_ends: the positions of the ends of the heads
+    :return tuple: the array of all values, index of the first value of each line, number of values
+        of each line and the mask of regular lines
+    """
+    line_count = len(line_starts)
+    lengths = head_ends - line_starts
+    offsets = np.cumsum(lengths) - lengths
+    line_of = np.repeat(np.arange(line_count), lengths)
+    head = buffer[np.arange(int(lengths.sum())) - np.repeat(offsets - line_starts, lengths)]
+    digits = head - np.uint8(_ZERO)
+    is_digit = digits < 10
+    is_space = head == _SPACE
+
+    token_starts = is_digit.copy()
+    token_starts[1:] &= ~is_digit[:-1]
+    token_starts[offsets[lengths > 0]] = is_digit[offsets[lengths > 0]]
+    token_counts = np.bincount(line_of[token_starts], minlength=line_count)
+    space_counts = np.bincount(line_of[is_space], minlength=line_count)
+    other_counts = np.bincount(line_of[~(is_digit | is_space)], minlength=line_count)
+    nonempty = lengths > 0
+    regular = nonempty & (other_counts == 0) & (space_counts == token_counts - 1)
+    regular[nonempty] &= (
+        is_digit[offsets[nonempty]] & is_digit[offsets[nonempty] + lengths[nonempty] - 1]
+    )
+
+    digit_positions = np.flatnonzero(is_digit)
+    token_of_digit = np.cumsum(token_starts)[digit_positions] - 1
+    token_lengths = np.bincount(token_of_digit, minlength=int(token_counts.sum()))
+    token_firsts = np.cumsum(token_lengths) - token_lengths
+    # Values that do not fit into int64 are left to the line parsing
+    too_long = token_lengths >= len(_POWERS_OF_TEN)
+    regular[np.repeat(np.arange(line_count), token_counts)[too_long]] = False
+    exponents = np.minimum(
+        token_lengths[token_of_digit]
+        - 1
+        - (np.arange(len(digit_positions)) - token_firsts[token_of_digit]),
+        len(_POWERS_OF_TEN) - 1,
+    )
+    positional = digits[digit_positions].astype(np.int64) * _POWERS_OF_TEN[exponents]
+    values = np.add.reduceat(positional, token_firsts) if len(positional) else positional
+    return values, np.cumsum(token_counts) - token_counts, token_counts, regular
+
+
+def _parse_line(line):
+    """Parses single line of the raw data, e.g. when it does not have the canonical format.
+
+    :param bytes line: the line of raw data (without the newline)
+    :return tuple or None: the type, tid, pid, ppid, timestamp and raw probe id of the record or
+        None if the line is corrupted
+    """
+    # We want to catch any error since parsing should be bullet-proof and should not crash
+    try:
+        major_components = line.split(b";")
+        minor_components = major_components[0].split()
+        record_type = int(minor_components[0])
+        pid, ppid = 0, 0
+        if record_type in vals.THREAD_RECORDS:
+            pid = int(minor_components[2])
+        elif record_type in vals.PROCESS_RECORDS:
+            pid, ppid = int(minor_components[2]), int(minor_components[3])
+        return (
+            record_type,
+            int(minor_components[1]),
+            pid,
+            ppid,
+            int(minor_components[-1]),
+            major_components[1],
+        )
+    except (ValueError, IndexError):
+        return None
+
+
+def _assign_sequence_numbers(records, probe_table, seq_map):
+    """Assigns the sequence numbers that identify the order of records of each probe in each
+    thread. The numbers are incremented by the sampling step of the probe.
+
+    :param np.ndarray records: the array of parsed records
+    :param ProbeTable probe_table: translation of the raw probe IDs
+    :param dict seq_map: the next sequence number for each thread and probe
+    """
+    sequenced = np.flatnonzero(np.isin(records["type"], list(vals.SEQUENCED_RECORDS)))
+    if not len(sequenced):
+        return
+    tids, ids = records["tid"][sequenced], records["id"][sequenced]
+    order, group_starts = _group(tids, ids)
+    tids, ids, steps = tids[order], ids[order], records["step"][sequenced][order]
+    group_sizes = np.diff(np.append(group_starts, len(order)))
+    preceding = np.cumsum(steps) - steps
+    groups = list(zip(tids[group_starts].tolist(), ids[group_starts].tolist()))
+    initial = np.array([seq_map[group] for group in groups], dtype=np.int64)
+    records["seq"][sequenced[order]] = preceding + np.repeat(
+        initial - preceding[group_starts], group_sizes
+    )
+    for group, total in zip(groups, (initial + np.add.reduceat(steps, group_starts)).tolist()):
+        seq_map[group] = total
@@ -177,9 +177,12 @@ HEARTBEAT_INTERVAL = 30  # Periodically inform user about progress each INTERVAL
 CLEANUP_TIMEOUT = 2  # The timeout for the cleanup operations
 CLEANUP_REFRESH = 0.2  # The refresh interval for cleaning up the resources
 
-# Multiprocessing Queue constants
-RESOURCE_CHUNK = 10000  # Number of resources transported as one element through a queue
-RESOURCE_QUEUE_CAPACITY = 10  # Maximum capacity of the resources queue
+# Size of the blocks of raw data that are read and parsed at once (in bytes)
+RECORD_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Multiprocessing Queue and shared memory buffer constants
+RESOURCE_CHUNK = 10000  # Number of resources transported in one slot of the resources buffer
+RESOURCE_QUEUE_CAPACITY = 10  # Number of slots of the resources buffer
 QUEUE_TIMEOUT = 0.2  # The timeout for blocking operations of a queue
 
 # The regex to match the SystemTap module name out of the log and extract the non-PID dependent part
@@ -6,11 +6,13 @@ profile comparing with baseline profile.
 from __future__ import annotations
 
 # Standard Imports
-from typing import TYPE_CHECKING, Iterable, Any
+from typing import TYPE_CHECKING, Iterable, Any, Optional
 
 # Third-Party Imports
 
 # Perun Imports
+from perun.check.detection_kit import BaselineFingerprint
+from perun.utils import log
 import perun.check.factory as check
 import perun.logic.runner as run
 from perun.utils.structs import PerformanceChange
@@ -31,7 +33,7 @@ def baseline_testing(
     postprocessor: list[str],
     minor_version_list: list[MinorVersion],
     **kwargs: Any,
-) -> Iterable[tuple[CollectStatus, Profile, Job]]:
+) -> list[tuple[CollectStatus, Profile, Job]]:
     """Generates a profile for specified command with init seeds, compares each other.
 
     TODO: This might need some checking and tweaking as I believe it is quite shady
@@ -42,7 +44,7 @@ def baseline_testing(
     :param list postprocessor: list of postprocessors
     :param list minor_version_list: list of MinorVersion info
     :param dict kwargs: dictionary of additional params for postprocessor and collector
-    :return generator: copy of baseline profile generator
+    :return list: baseline profiles, which are shared by all subsequent target testings
     """
 
     # create baseline profile
@@ -76,13 +78,36 @@ def baseline_testing(
     return base_pg
 
 
+def create_fingerprint(
+    base_result: Iterable[tuple[CollectStatus, Profile, Job]], method: str = "best-model"
+) -> Optional[BaselineFingerprint]:
+    """Creates the fingerprint of the baseline profile, against which all mutations are checked
+
+    The models and statistics of the baseline needed by the applicable degradation methods are
+    precomputed (see :func:`perun.check.factory.create_baseline_fingerprint`).
+
+    :param iterable base_result: results of the baseline testing
+    :param method: name of detection models strategy to obtains relevant model kinds
+    :return: fingerprint of the baseline profile or None if there is no baseline profile
+    """
+    for _, base_profile, _ in base_result:
+        try:
+            return check.create_baseline_fingerprint(base_profile, method)
+        except (KeyError, ValueError) as exc:
+            # The missing data are computed, when checking the mutations
+            log.warn(f"could not precompute the models of the baseline: {exc}")
+            return BaselineFingerprint(base_profile)
+    return None
+
+
 def target_testing(
     executable: Executable,
     workload: Mutation,
     collector: str,
     postprocessor: list[str],
     minor_version_list: list[MinorVersion],
-    base_result: Iterable[tuple[CollectStatus, Profile, Job]],
+    base_result: Optional[BaselineFingerprint] | Iterable[tuple[CollectStatus, Profile, Job]],
+    checkout: bool = True,
     **kwargs: Any,
 ) -> bool:
     """Generates a profile for specified command with fuzzed workload, compares with
@@ -93,7 +118,8 @@ def target_testing(
     :param str collector: list of collectors
     :param list postprocessor: list of postprocessors
     :param list minor_version_list: list of MinorVersion info
-    :param iterable base_result: list of results for baseline
+    :param iterable base_result: fingerprint of the baseline or list of results for baseline
+    :param bool checkout: if set to false, the profile is collected on the current state of VCS
     :param dict kwargs: dictionary of additional params for postprocessor and collector
     :return bool: True if performance degradation was detected, False otherwise.
     """
@@ -105,6 +131,7 @@ def target_testing(
             [collector],
             postprocessor,
             minor_version_list,
+            checkout,
             **kwargs,
         )
     )
@@ -114,22 +141,31 @@ def target_testing(
 
 
 def check_for_change(
-    base_pg: Iterable[tuple[CollectStatus, Profile, Job]],
+    base_pg: Optional[BaselineFingerprint] | Iterable[tuple[CollectStatus, Profile, Job]],
     target_pg: Iterable[tuple[CollectStatus, Profile, Job]],
     method: str = "best-model",
 ) -> float:
     """Function that randomly choose an index from list.
 
-    :param generator base_pg: base performance profile generator
+    :param generator base_pg: fingerprint of the baseline or base performance profile generator
     :param generator target_pg: target performance profile generator
     :param method: name of detection models strategy to obtains relevant model kinds
 
     :return int: ratio between checks and founded degradations
     """
-    for base_prof, target_prof in zip(base_pg, target_pg):
+    fingerprint = (
+        base_pg
+        if base_pg is None or isinstance(base_pg, BaselineFingerprint)
+        else next((BaselineFingerprint(base_prof[1]) for base_prof in base_pg), None)
+    )
+    for target_prof in target_pg:
+        if fingerprint is None:
+            break
         checks = 0
         degs = 0
-        for perf_change in check.degradation_between_profiles(base_prof[1], target_prof[1], method):
+        for perf_change in check.degradation_between_profiles(
+            fingerprint.profile, target_prof[1], method, fingerprint
+        ):
             checks += 1
             degs += perf_change.result == PerformanceChange.Degradation
         return degs / checks if checks else 0.0
@@ -0,0 +1,352 @@
+"""Evaluation of the batches of mutations, possibly by the pool of worker processes
+
+Evaluating the mutations (i.e. running the tested program with them) takes most of the time of
+the fuzzing. The evaluator fans each batch of mutations out to the pool of worker processes, but
+yields the results in the order of the mutations, so the fuzzing loop merges them into the
+fuzzing progress and the fitness of the parents deterministically, as if the mutations were
+evaluated one by one.
+
+Each worker runs in its own temporary directory, which mirrors the directory with .gcno files.
+The coverage data of the tested program (the .gcda files) are redirected there using the
+``GCOV_PREFIX`` and ``GCOV_PREFIX_STRIP`` variables and the gcov is run there as well, so the
+concurrently evaluated mutations never overwrite the coverage of each other. The temporary files
+of the collectors, which are stored in the current working directory, are isolated the same way.
+With single worker, the mutations are evaluated directly in the fuzzing process.
+"""
+from __future__ import annotations
+
+# Standard Imports
+from typing import Any, Iterator, Optional, TYPE_CHECKING
+import copy
+import multiprocessing
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+
+# Third-Party Imports
+
+# Perun Imports
+from perun.fuzz.structs import FuzzingProgress
+from perun.logic import pcs
+from perun.utils.exceptions import NotPerunRepositoryException, SuppressedExceptions
+from perun.vcs import vcs_kit
+import perun.fuzz.evaluate.by_coverage as evaluate_workloads_by_coverage
+import perun.fuzz.evaluate.by_perun as evaluate_workloads_by_perun
+import perun.logic.runner as run
+
+if TYPE_CHECKING:
+    from multiprocessing.pool import Pool
+
+    from perun.check.detection_kit import BaselineFingerprint
+    from perun.fuzz.structs import FuzzingConfiguration, Mutation
+    from perun.utils.structs import Executable, MinorVersion
+
+# Result of coverage testing: (coverage increased, achieved coverage, fault or hang)
+CoverageResult = tuple[bool, int, Optional[subprocess.SubprocessError]]
+# Result of perun testing: (degradation found, degradation ratio, error message)
+PerformanceResult = tuple[bool, float, Optional[str]]
+
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def evaluate_coverage(
+    executable: Executable,
+    config: FuzzingConfiguration,
+    fuzz_progress: FuzzingProgress,
+    parent: Mutation,
+    mutation: Mutation,
+    **kwargs: Any,
+) -> CoverageResult:
+    """Tests the coverage of the program with the mutation
+
+    :param Executable executable: called command with arguments
+    :param FuzzingConfiguration config: configuration of the fuzzing
+    :param FuzzingProgress fuzz_progress: progress of the fuzzing process
+    :param Mutation parent: parent of the mutation
+    :param Mutation mutation: tested mutation
+    :param dict kwargs: rest of the keyword arguments
+    :return: whether the coverage increased, the achieved coverage and the raised error, if the
+        program failed or timed out
+    """
+    try:
+        result = evaluate_workloads_by_coverage.target_testing(
+            executable, mutation, config, parent, fuzz_progress, **kwargs
+        )
+        return result, mutation.cov, None
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
+        return False, mutation.cov, exc
+
+
+def evaluate_performance(
+    executable: Executable,
+    mutation: Mutation,
+    collector: str,
+    postprocessor: list[str],
+    minor_version_list: list[MinorVersion],
+    fingerprint: Optional[BaselineFingerprint],
+    **kwargs: Any,
+) -> PerformanceResult:
+    """Tests the performance of the program with the mutation
+
+    :param Executable executable: called command with arguments
+    :param Mutation mutation: tested mutation
+    :param str collector: collector used to collect profiling data
+    :param list postprocessor: list of postprocessors, which are run after collection
+    :param list minor_version_list: list of minor version for which we are collecting
+    :param BaselineFingerprint fingerprint: fingerprint of the baseline profile
+    :param dict kwargs: rest of the keyword arguments
+    :return: whether the degradation was found, the degradation ratio and the error message, if
+        the testing failed
+    """
+    try:
+        result = evaluate_workloads_by_perun.target_testing(
+            executable,
+            mutation,
+            collector,
+            postprocessor,
+            minor_version_list,
+            fingerprint,
+            **kwargs,
+        )
+        return result, mutation.deg_ratio, None
+    # temporarily we ignore error within individual perf testing without previous cov test
+    except Exception as exc:
+        return False, mutation.deg_ratio, str(exc)
+
+
+def mirror_gcno_directory(gcno_path: str, worker_dir: str) -> None:
+    """Links the content of the directory with .gcno files to the directory of the worker
+
+    The sources have to be linked as well, since gcov looks them up relatively to its working
+    directory. The coverage data are not linked, as each worker produces its own.
+
+    :param str gcno_path: path to the directory with .gcno files
+    :param str worker_dir: directory of the worker
+    """
+    for file in os.listdir(gcno_path):
+        if not file.endswith((".gcda", ".gcov", ".gcov.json.gz")):
+            os.symlink(os.path.join(gcno_path, file), os.path.join(worker_dir, file))
+
+
+def get_gcov_environment(gcno_path: str, worker_dir: str) -> dict[str, str]:
+    """Returns the variables redirecting the .gcda files from the gcno path to the worker dir
+
+    :param str gcno_path: path to the directory with .gcno files
+    :param str worker_dir: directory of the worker
+    :return: the GCOV_PREFIX and GCOV_PREFIX_STRIP variables
+    """
+    gcno_dirs = os.path.realpath(gcno_path).strip(os.sep).split(os.sep)
+    return {"GCOV_PREFIX": worker_dir, "GCOV_PREFIX_STRIP": str(len(gcno_dirs))}
+
+
+def init_worker(root_dir: str, state: dict[str, Any]) -> None:
+    """Initializes the worker process in its own temporary directory
+
+    :param str root_dir: directory, where the directories of the workers are created
+    :param dict state: the executable, configuration and baseline shared by all evaluations
+    """
+    # The interruption is handled by the fuzzing process, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Locate perun instance before we leave the current working directory
+    with SuppressedExceptions(NotPerunRepositoryException):
+        pcs.get_path()
+
+    worker_dir = tempfile.mkdtemp(dir=root_dir, prefix="worker-")
+    executable = copy.copy(state["executable"])
+    program, *args = executable.cmd.split(" ", maxsplit=1)
+    if os.path.exists(program):
+        executable.cmd = " ".join([os.path.abspath(program), *args])
+    config = copy.copy(state["config"])
+    if config.coverage_testing:
+        config.coverage = copy.copy(config.coverage)
+        mirror_gcno_directory(config.coverage.gcno_path, worker_dir)
+        os.environ.update(get_gcov_environment(config.coverage.gcno_path, worker_dir))
+        config.coverage.gcno_path = worker_dir
+        config.coverage.gcov_files = []
+    fuzz_progress = FuzzingProgress()
+    fuzz_progress.base_cov = state["base_cov"]
+
+    _WORKER_STATE.update(state, executable=executable, config=config, fuzz_progress=fuzz_progress)
+    os.chdir(worker_dir)
+
+
+def coverage_worker(task: tuple[Mutation, Mutation, float]) -> CoverageResult:
+    """Tests the coverage of the mutation within the worker
+
+    :param tuple task: the parent, the tested mutation and the current coverage increase rate
+    :return: result of the coverage testing
+    """
+    parent, mutation, _WORKER_STATE["config"].cov_rate = task
+    return evaluate_coverage(
+        _WORKER_STATE["executable"],
+        _WORKER_STATE["config"],
+        _WORKER_STATE["fuzz_progress"],
+        parent,
+        mutation,
+        **_WORKER_STATE["kwargs"],
+    )
+
+
+def performance_worker(mutation: Mutation) -> PerformanceResult:
+    """Tests the performance of the mutation within the worker
+
+    The version of the project is checked out by the fuzzing process for the whole batch, so the
+    workers do not touch the VCS concurrently.
+
+    :param Mutation mutation: tested mutation
+    :return: result of the perun testing
+    """
+    return evaluate_performance(
+        _WORKER_STATE["executable"],
+        mutation,
+        _WORKER_STATE["collector"],
+        _WORKER_STATE["postprocessor"],
+        _WORKER_STATE["minor_version_list"],
+        _WORKER_STATE["fingerprint"],
+        checkout=False,
+        **_WORKER_STATE["kwargs"],
+    )
+
+
+class MutationEvaluator:
+    """Evaluates the batches of mutations, by the pool of workers if there is more than one
+
+    :ivar Executable executable: called command with arguments
+    :ivar FuzzingConfiguration config: configuration of the fuzzing
+    :ivar FuzzingProgress fuzz_progress: progress of the fuzzing process
+    :ivar str collector: collector used to collect profiling data
+    :ivar list postprocessor: list of postprocessors, which are run after collection
+    :ivar list minor_version_list: list of minor version for which we are collecting
+    :ivar BaselineFingerprint fingerprint: fingerprint of the baseline profile
+    :ivar dict kwargs: rest of the keyword arguments
+    :ivar str root_dir: temporary directory with the directories of the workers
+    :ivar Pool pool: pool of the workers or None if the mutations are evaluated serially
+    """
+
+    __slots__ = [
+        "executable",
+        "config",
+        "fuzz_progress",
+        "collector",
+        "postprocessor",
+        "minor_version_list",
+        "fingerprint",
+        "kwargs",
+        "root_dir",
+        "pool",
+    ]
+
+    def __init__(
+        self,
+        executable: Executable,
+        config: FuzzingConfiguration,
+        fuzz_progress: FuzzingProgress,
+        collector: str,
+        postprocessor: list[str],
+        minor_version_list: list[MinorVersion],
+        fingerprint: Optional[BaselineFingerprint],
+        **kwargs: Any,
+    ) -> None:
+        """Initializes the evaluator and starts the workers
+
+        :param Executable executable: called command with arguments
+        :param FuzzingConfiguration config: configuration of the fuzzing
+        :param FuzzingProgress fuzz_progress: progress of the fuzzing process
+        :param str collector: collector used to collect profiling data
+        :param list postprocessor: list of postprocessors, which are run after collection
+        :param list minor_version_list: list of minor version for which we are collecting
+        :param BaselineFingerprint fingerprint: fingerprint of the baseline profile
+        :param dict kwargs: rest of the keyword arguments
+        """
+        self.executable = executable
+        self.config = config
+        self.fuzz_progress = fuzz_progress
+        self.collector = collector
+        self.postprocessor = postprocessor
+        self.minor_version_list = minor_version_list
+        self.fingerprint = fingerprint
+        self.kwargs = kwargs
+        self.root_dir: Optional[str] = None
+        self.pool: Optional[Pool] = None
+
+        if config.workers > 1:
+            self.root_dir = tempfile.mkdtemp(prefix="perun-fuzz-")
+            state = {
+                "executable": executable,
+                "config": config,
+                "base_cov": fuzz_progress.base_cov,
+                "collector": collector,
+                "postprocessor": postprocessor,
+                "minor_version_list": minor_version_list,
+                "fingerprint": fingerprint,
+                "kwargs": kwargs,
+            }
+            self.pool = multiprocessing.Pool(config.workers, init_worker, (self.root_dir, state))
+
+    def coverage_of(self, parent: Mutation, mutations: list[Mutation]) -> Iterator[CoverageResult]:
+        """Tests the coverage of the mutations of the parent
+
+        The coverage rate and the base coverage do not change during the batch, hence evaluating
+        the mutations concurrently yields the same results as evaluating them one by one.
+
+        :param Mutation parent: the mutated parent
+        :param list mutations: tested mutations
+        :return: iterator of the results in the order of the mutations
+        """
+        if self.pool is None:
+            for mutation in mutations:
+                yield evaluate_coverage(
+                    self.executable,
+                    self.config,
+                    self.fuzz_progress,
+                    parent,
+                    mutation,
+                    **self.kwargs,
+                )
+        else:
+            for mutation, result in zip(
+                mutations,
+                self.pool.imap(
+                    coverage_worker, [(parent, m, self.config.cov_rate) for m in mutations]
+                ),
+            ):
+                mutation.cov = result[1]
+                yield result
+
+    def performance_of(self, mutations: list[Mutation]) -> Iterator[PerformanceResult]:
+        """Tests the performance of the mutations with perun
+
+        :param list mutations: tested mutations
+        :return: iterator of the results in the order of the mutations
+        """
+        if self.pool is None:
+            for mutation in mutations:
+                yield evaluate_performance(
+                    self.executable,
+                    mutation,
+                    self.collector,
+                    self.postprocessor,
+                    self.minor_version_list,
+                    self.fingerprint,
+                    **self.kwargs,
+                )
+        else:
+            with vcs_kit.CleanState():
+                pcs.vcs().checkout(self.minor_version_list[0].checksum)
+                run.run_prephase_commands("pre_run")
+                results = self.pool.map(performance_worker, mutations)
+            for mutation, result in zip(mutations, results):
+                mutation.deg_ratio = result[1]
+                yield result
+
+    def close(self) -> None:
+        """Terminates the workers and removes their directories"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.root_dir is not None:
+            shutil.rmtree(self.root_dir, ignore_errors=True)
+            self.root_dir = None
@@ -4,7 +4,6 @@ from __future__ import annotations
 # Standard Imports
 import copy
 import filecmp
-import itertools
 import os
 import signal
 import sys
@@ -31,6 +30,7 @@ from perun.fuzz.structs import (
 from perun.utils import decorators, log
 import perun.fuzz.evaluate.by_perun as evaluate_workloads_by_perun
 import perun.fuzz.evaluate.by_coverage as evaluate_workloads_by_coverage
+import perun.fuzz.evaluate.parallel as parallel
 
 if TYPE_CHECKING:
     import types
@@ -465,6 +465,72 @@ def perform_baseline_coverage_testing(
     return base_cov
 
 
+def gather_by_coverage(
+    evaluator: parallel.MutationEvaluator,
+    parents: list[Mutation],
+    fuzz_progress: FuzzingProgress,
+    rule_set: RuleSet,
+    max_bytes: int,
+    config: FuzzingConfiguration,
+    output_dirs: dict[str, str],
+) -> None:
+    """Gathers the interesting workloads, i.e. the mutations increasing the coverage
+
+    The mutations of the chosen parents are evaluated by the @p evaluator, until the limit of the
+    interesting workloads or the limit of executions is reached. The interesting workloads are
+    rated and appended to the @p parents and to the interesting workloads of @p fuzz_progress.
+
+    :param MutationEvaluator evaluator: evaluator of the mutations
+    :param list parents: list of parents, i.e. mutations which will be further mutated
+    :param FuzzingProgress fuzz_progress: collective state of fuzzing
+    :param RuleSet rule_set: set of applied rules
+    :param int max_bytes: maximal size of the generated mutations
+    :param FuzzingConfiguration config: configuration of the fuzzing
+    :param dict output_dirs: directories, where the faults and the hangs are stored
+    """
+    execs = config.exec_limit
+
+    while len(fuzz_progress.interesting_workloads) < config.precollect_limit and execs > 0:
+        current_workload = choose_parent(fuzz_progress.parents)
+        mutations = fuzz(current_workload, max_bytes, rule_set, config)
+
+        for mutation, (result, _, error) in zip(
+            mutations, evaluator.coverage_of(current_workload, mutations)
+        ):
+            execs -= 1
+            fuzz_progress.stats.cov_execs += 1
+            # error occurred
+            if isinstance(error, CalledProcessError):
+                fuzz_progress.stats.faults += 1
+                mutation.path = filesystem.move_file_to(mutation.path, output_dirs["faults"])
+                fuzz_progress.faults.append(mutation)
+                result = True
+            # timeout expired
+            elif isinstance(error, TimeoutExpired):
+                fuzz_progress.stats.hangs += 1
+                log.warn(
+                    f"Timeout ({config.hang_timeout}s) reached when testing. See {output_dirs['hangs']}."
+                )
+                mutation.path = filesystem.move_file_to(mutation.path, output_dirs["hangs"])
+                fuzz_progress.hangs.append(mutation)
+                continue
+
+            # if successful mutation
+            if result and not rate_parent(fuzz_progress, mutation):
+                fuzz_progress.update_max_coverage()
+                parents.append(mutation)
+                fuzz_progress.interesting_workloads.append(mutation)
+                rule_set.hits[mutation.history[-1]] += 1
+                rule_set.hits[-1] += 1
+            # not successful mutation or the same file as previously generated
+            else:
+                os.remove(mutation.path)
+
+    # adapting increase coverage ratio
+    config.refine_coverage_rate(fuzz_progress.interesting_workloads)
+    log.minor_success("Gathering using coverage-based testing")
+
+
 @log.print_elapsed_time
 def run_fuzzing_for_command(
     executable: Executable,
@@ -514,6 +580,19 @@ def run_fuzzing_for_command(
         executable, parents, collector, postprocessor, minor_version_list, **kwargs
     )
     log.minor_success("Perun-based testing on parent seeds")
+    baseline_fingerprint = evaluate_workloads_by_perun.create_fingerprint(base_result_profile)
+    if baseline_fingerprint is not None:
+        log.minor_success("Precomputing baseline models")
+    evaluator = parallel.MutationEvaluator(
+        executable,
+        config,
+        fuzz_progress,
+        collector,
+        postprocessor,
+        minor_version_list,
+        baseline_fingerprint,
+        **kwargs,
+    )
 
     log.minor_info("Rating parents")
     # Rate seeds
@@ -529,6 +608,7 @@ def run_fuzzing_for_command(
     # SIGINT (CTRL-C) signal handler
     def signal_handler(sig: int, _: Optional[types.FrameType]) -> None:
         log.warn(f"Fuzzing process interrupted by signal {sig}...")
+        evaluator.close()
         teardown(fuzz_progress, output_dirs, parents, rule_set, config)
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -537,57 +617,9 @@ def run_fuzzing_for_command(
     while (time.time() - fuzz_progress.stats.start_time) < config.timeout:
         # Gathering interesting workloads
         if config.coverage_testing:
-            execs = config.exec_limit
-
-            while len(fuzz_progress.interesting_workloads) < config.precollect_limit and execs > 0:
-                current_workload = choose_parent(fuzz_progress.parents)
-                mutations = fuzz(current_workload, max_bytes, rule_set, config)
-
-                for mutation in mutations:
-                    try:
-                        execs -= 1
-                        fuzz_progress.stats.cov_execs += 1
-                        # testing for coverage
-                        result = evaluate_workloads_by_coverage.target_testing(
-                            executable,
-                            mutation,
-                            config,
-                            current_workload,
-                            fuzz_progress,
-                            **kwargs,
-                        )
-                    # error occurred
-                    except CalledProcessError:
-                        fuzz_progress.stats.faults += 1
-                        mutation.path = filesystem.move_file_to(
-                            mutation.path, output_dirs["faults"]
-                        )
-                        fuzz_progress.faults.append(mutation)
-                        result = True
-                    # timeout expired
-                    except TimeoutExpired:
-                        fuzz_progress.stats.hangs += 1
-                        log.warn(
-                            f"Timeout ({config.hang_timeout}s) reached when testing. See {output_dirs['hangs']}."
-                        )
-                        mutation.path = filesystem.move_file_to(mutation.path, output_dirs["hangs"])
-                        fuzz_progress.hangs.append(mutation)
-                        continue
-
-                    # if successful mutation
-                    if result and not rate_parent(fuzz_progress, mutation):
-                        fuzz_progress.update_max_coverage()
-                        parents.append(mutation)
-                        fuzz_progress.interesting_workloads.append(mutation)
-                        rule_set.hits[mutation.history[-1]] += 1
-                        rule_set.hits[-1] += 1
-                    # not successful mutation or the same file as previously generated
-                    else:
-                        os.remove(mutation.path)
-
-            # adapting increase coverage ratio
-            config.refine_coverage_rate(fuzz_progress.interesting_workloads)
-            log.minor_success("Gathering using coverage-based testing")
+            gather_by_coverage(
+                evaluator, parents, fuzz_progress, rule_set, max_bytes, config, output_dirs
+            )
 
         # not coverage testing, only performance testing
         else:
@@ -599,28 +631,15 @@ def run_fuzzing_for_command(
 
         log.minor_info("Evaluating mutations")
         log.increase_indent()
-        for mutation in fuzz_progress.interesting_workloads:
-            # creates copy of generator
-            base_result_profile, base_copy = itertools.tee(base_result_profile)
-
-            # testing with perun
-            successful_result = False
-            try:
-                fuzz_progress.stats.perun_execs += 1
-                successful_result = evaluate_workloads_by_perun.target_testing(
-                    executable,
-                    mutation,
-                    collector,
-                    postprocessor,
-                    minor_version_list,
-                    base_copy,
-                    **kwargs,
-                )
-                if successful_result:
-                    process_successful_mutation(mutation, parents, fuzz_progress, rule_set, config)
-            # temporarily we ignore error within individual perf testing without previous cov test
-            except Exception as exc:
-                log.warn(f"Executing binary raised an exception: {exc}")
+        for mutation, (successful_result, _, error_message) in zip(
+            fuzz_progress.interesting_workloads,
+            evaluator.performance_of(fuzz_progress.interesting_workloads),
+        ):
+            fuzz_progress.stats.perun_execs += 1
+            if successful_result:
+                process_successful_mutation(mutation, parents, fuzz_progress, rule_set, config)
+            elif error_message is not None:
+                log.warn(f"Executing binary raised an exception: {error_message}")
 
             log.minor_status(f"{mutation.path}", status=f"{mutation.fitness}")
             # in case of testing with coverage, parent will not be removed but used for mutation
@@ -633,5 +652,6 @@ def run_fuzzing_for_command(
 
     # get end time
     fuzz_progress.stats.end_time = time.time()
+    evaluator.close()
 
     teardown(fuzz_progress, output_dirs, parents, rule_set, config)
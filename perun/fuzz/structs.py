@@ -142,6 +142,7 @@ class FuzzingConfiguration:
     :ivar int cov_rate: threshold for the increase of the coverage
     :ivar bool coverage_testing: specifies if the mutations should be tested for coverage also,
         or only using perun
+    :ivar int workers: number of processes evaluating the mutations concurrently
     """
 
     __slots__ = [
@@ -160,6 +161,7 @@ class FuzzingConfiguration:
         "cov_rate",
         "coverage_testing",
         "coverage",
+        "workers",
     ]
 
     def __init__(self, **kwargs: Any) -> None:
@@ -181,6 +183,7 @@ class FuzzingConfiguration:
         self.cov_rate: float = kwargs.get("coverage_increase_rate", 1.5)
         self.coverage_testing: bool = not kwargs.get("skip_coverage_testing", False)
         self.coverage: CoverageConfiguration = CoverageConfiguration(**kwargs)
+        self.workers: int = kwargs.get("workers", 1) or (os.cpu_count() or 1)
 
     RATIO_INCR_CONST = 0.05
     RATIO_DECR_CONST = 0.01
@@ -17,7 +17,7 @@ import subprocess
 # Third-Party Imports
 
 # Perun Imports
-from perun.logic import pcs, config as perun_config, store, index, temp, stats
+from perun.logic import pcs, config as perun_config, store, index, temp, stats, summary
 from perun.utils import log as perun_log, timestamps
 from perun.utils.common import common_kit
 from perun.utils.exceptions import (
@@ -294,15 +294,18 @@ def add(
 
         # Remove origin from file
         unpacked_profile.pop("origin")
-        str_profile_content = profile.to_string(unpacked_profile)
 
-        # Append header to the content of the file
-        header = f"profile {unpacked_profile['header']['type']} {len(str_profile_content)}\0"
-        profile_content = (header + str_profile_content).encode("utf-8")
-
-        # Transform to internal representation - file as sha1 checksum and content packed with zlib
-        profile_sum = store.compute_checksum(profile_content)
-        compressed_content = store.pack_content(profile_content)
+        # Transform to internal representation - file as sha1 checksum and packed content
+        object_format = perun_config.lookup_key_recursively(
+            "profiles.object_format", store.DEFAULT_PROFILE_OBJECT_FORMAT
+        )
+        if object_format not in store.PROFILE_OBJECT_FORMATS:
+            perun_log.warn(
+                f"unsupported profile object format '{object_format}',"
+                f" using '{store.DEFAULT_PROFILE_OBJECT_FORMAT}' instead"
+            )
+            object_format = store.DEFAULT_PROFILE_OBJECT_FORMAT
+        profile_sum, compressed_content = store.pack_profile(unpacked_profile, object_format)
 
         # Add to control
         object_dir = pcs.get_object_directory()
@@ -320,6 +323,8 @@ def add(
         perun_log.minor_success(perun_log.path_style(f"{reg_rel_path}"), "registered")
         added_profile_count += 1
 
+    if added_profile_count:
+        summary.update_summaries_of([minor_version])
     profile_names_len = len(profile_names)
     perun_log.minor_status(
         "Registration succeeded for",
@@ -342,6 +347,7 @@ def remove_from_index(profile_generator: Collection[str], minor_version: str) ->
     """
     object_directory = pcs.get_object_directory()
     index.remove_from_index(object_directory, minor_version, profile_generator)
+    summary.update_summaries_of([minor_version])
 
 
 def remove_from_pending(profile_generator: Collection[str]) -> None:
@@ -473,7 +479,7 @@ def log(minor_version: str, short: bool = False, **_: Any) -> None:
             :param MinorVersion minor_v: minor version for which we are retrieving the stats
             :return: dictionary with stats for minor version
             """
-            return index.get_profile_number_for_minor(pcs.get_object_directory(), minor_v.checksum)
+            return summary.get_profile_numbers_for(minor_v.checksum)
 
         def deg_count_retriever(minor_v: MinorVersion) -> dict[str, str]:
             """Helper function for picking stats of the degradation strings of form ++--
@@ -481,9 +487,7 @@ def log(minor_version: str, short: bool = False, **_: Any) -> None:
             :param MinorVersion minor_v: minor version for which we are retrieving the stats
             :return: dictionary with stats for minor version
             """
-            counts = perun_log.count_degradations_per_group(
-                store.load_degradation_list_for(pcs.get_object_directory(), minor_v.checksum)
-            )
+            counts = summary.get_change_counts_for(minor_v.checksum)
             return {
                 "changes": counts.get("Optimization", 0) * "+" + counts.get("Degradation", 0) * "-"
             }
@@ -495,16 +499,17 @@ def log(minor_version: str, short: bool = False, **_: Any) -> None:
             calculate_maximal_lengths_for_stats(minor_versions, deg_count_retriever, " changes ")
         )
         print_shortlog_minor_version_info_list(minor_versions, minor_version_maxima)
+        summary.save_summary_table()
     else:
         # Walk the minor versions and print them
         for minor in pcs.vcs().walk_minor_versions(minor_version):
             perun_log.cprintln(
                 f"Minor Version {minor.checksum}", TEXT_EMPH_COLOUR, attrs=TEXT_ATTRS
             )
-            base_dir = pcs.get_object_directory()
-            tracked_profiles = index.get_profile_number_for_minor(base_dir, minor.checksum)
+            tracked_profiles = summary.get_profile_numbers_for(minor.checksum)
             print_profile_numbers(tracked_profiles, "tracked")
             print_minor_version_info(minor, indent=1)
+        summary.save_summary_table()
 
 
 def adjust_limit(limit: str, attr_type: str, maxima: dict[str, int], padding: int = 0) -> int:
@@ -655,11 +660,8 @@ def print_changes_token(max_lengths: dict[str, int], minor_version: MinorVersion
         column of the formatting token
     :param MinorVersionInfo minor_version: MinorVersionInfo objects
     """
-    degradations = store.load_degradation_list_for(
-        pcs.get_object_directory(), minor_version.checksum
-    )
     change_string = perun_log.change_counts_to_string(
-        perun_log.count_degradations_per_group(degradations),
+        summary.get_change_counts_for(minor_version.checksum),
         width=max_lengths["changes"],
     )
     perun_log.write(change_string, end="")
@@ -677,9 +679,7 @@ def print_stats_token(
     :param MinorVersionInfo minor_version: MinorVersionInfo objects
     :param int stat_length: the whole length of the formatting header
     """
-    tracked_profiles = index.get_profile_number_for_minor(
-        pcs.get_object_directory(), minor_version.checksum
-    )
+    tracked_profiles = summary.get_profile_numbers_for(minor_version.checksum)
     if tracked_profiles["all"]:
         perun_log.write(
             perun_log.in_color(
@@ -1066,14 +1066,27 @@ def adjust_header_length(
 def get_untracked_profiles() -> list[ProfileInfo]:
     """Returns list untracked profiles, currently residing in the .perun/jobs directory.
 
+    The pending index serves as a cache of the metadata of the untracked profiles: entries, whose
+    stamp (see :func:`perun.logic.index.compute_pending_stamp`) matches the name, modification
+    time and size of the profile, are reused; other profiles are (re)registered in the index
+    by reading only their headers. The index is rewritten only if it was outdated.
+
     :returns list: list of ProfileInfo parsed from .perun/jobs directory
     """
     saved_entries = []
     profile_list = []
-    # First load untracked files from the ./jobs/ directory
-    untracked_list = sorted(
-        list(filter(lambda f: f.endswith("perf"), os.listdir(pcs.get_job_directory())))
-    )
+    # First load untracked files from the ./jobs/ directory together with their stamps
+    job_directory = pcs.get_job_directory()
+    with os.scandir(job_directory) as job_entries:
+        untracked_stats = {
+            job_entry.name: job_entry.stat()
+            for job_entry in job_entries
+            if job_entry.name.endswith("perf")
+        }
+    untracked_stamps = {
+        untracked_path: index.compute_pending_stamp(untracked_path, untracked_stat)
+        for untracked_path, untracked_stat in untracked_stats.items()
+    }
 
     # Second load registered files in job index
     job_index = pcs.get_job_index()
@@ -1081,12 +1094,12 @@ def get_untracked_profiles() -> list[ProfileInfo]:
     with open(job_index, "rb+") as index_handle:
         pending_index_entries = list(index.walk_index(index_handle))
 
-    # Iterate through the index and check if it is still in the ./jobs directory
-    # In case it is still valid, we extract it into ProfileInfo and remove it from the list
-    #   of files in ./jobs directory
+    # Iterate through the index and check if it is still in the ./jobs directory unchanged
+    # In case it is still valid, we extract it into ProfileInfo and remove it from the
+    #   untracked files in ./jobs directory
     for index_entry in pending_index_entries:
-        if index_entry.path in untracked_list:
-            real_path = os.path.join(pcs.get_job_directory(), index_entry.path)
+        if untracked_stamps.get(index_entry.path) == index_entry.checksum:
+            real_path = os.path.join(job_directory, index_entry.path)
             index_info = {
                 "header": {
                     "type": index_entry.type,
@@ -1105,34 +1118,30 @@ def get_untracked_profiles() -> list[ProfileInfo]:
             )
             profile_list.append(profile_info)
             saved_entries.append(index_entry)
-            untracked_list.remove(index_entry.path)
-
-    # Now for every non-registered file in the ./jobs/ directory, we load the profile,
-    #   extract the info and register it in the index
-    for untracked_path in untracked_list:
-        real_path = os.path.join(pcs.get_job_directory(), untracked_path)
-        time = timestamps.timestamp_to_str(os.stat(real_path).st_mtime)
-
-        # Load the data from JSON, which contains additional information about profile
-        # We know, that the real_path exists, since we obtained it above from listdir
-        loaded_profile = store.load_profile_from_file(
-            real_path, is_raw_profile=True, unsafe_load=True
-        )
-        registered_checksum = store.compute_checksum(real_path.encode("utf-8"))
+            del untracked_stamps[index_entry.path]
+
+    # Now for every non-registered (or modified) file in the ./jobs/ directory, we load the
+    #   header of the profile, extract the info and register it in the index
+    # We know, that the real paths exist, since we obtained them above from scandir
+    for untracked_path in sorted(untracked_stamps.keys()):
+        real_path = os.path.join(job_directory, untracked_path)
+        loaded_header = store.load_raw_profile_header_from_file(real_path)
+        time = timestamps.timestamp_to_str(untracked_stats[untracked_path].st_mtime)
 
         # Update the list of profiles and counters of types
         profile_info = profile.ProfileInfo(
-            untracked_path, real_path, time, loaded_profile, is_raw_profile=True
+            untracked_path, real_path, time, loaded_header, is_raw_profile=True
         )
         untracked_entry = index.INDEX_ENTRY_CONSTRUCTORS[index.INDEX_VERSION - 1](
-            time, registered_checksum, untracked_path, -1, loaded_profile
+            time, untracked_stamps[untracked_path], untracked_path, -1, loaded_header
         )
 
         profile_list.append(profile_info)
         saved_entries.append(untracked_entry)
 
     # We write all of the entries that are valid in the ./jobs/ directory in the index
-    index.write_list_of_entries(job_index, saved_entries)
+    if len(saved_entries) != len(pending_index_entries) or untracked_stamps:
+        index.write_list_of_entries(job_index, saved_entries)
 
     return profile_list
 
@@ -7,14 +7,17 @@ from __future__ import annotations
 
 # Standard Imports
 from enum import Enum
-from typing import Callable, BinaryIO, Any, Iterable, Collection, TYPE_CHECKING
+from typing import Callable, BinaryIO, Any, Iterable, Collection, Optional, TYPE_CHECKING
 import binascii
+import bisect
 import json
+import mmap
 import os
 import struct
 import zlib
 
 # Third-Party Imports
+import numpy as np
 
 # Perun Imports
 from perun.logic import pcs, store
@@ -24,6 +27,8 @@ from perun.utils.exceptions import (
     EntryNotFoundException,
     MalformedIndexFileException,
     IndexNotFoundException,
+    NotPerunRepositoryException,
+    SuppressedExceptions,
 )
 
 if TYPE_CHECKING:
@@ -36,6 +41,16 @@ INDEX_NUMBER_OF_ENTRIES_OFFSET: int = 8
 INDEX_MAGIC_PREFIX: bytes = b"pidx"
 # Index Version 2.0 FastSloth
 INDEX_VERSION: int = 2
+# Layout of the persisted offset tables of indexes: header (magic, version, number of entries,
+# modification time and size of the index and the end of its entries) followed by the offsets
+# of entries sorted by paths and timestamps and the pairs of checksums and offsets of entries
+# sorted by checksums
+OFFSET_TABLE_MAGIC: bytes = b"pofs"
+OFFSET_TABLE_VERSION: int = 1
+OFFSET_TABLE_HEADER: struct.Struct = struct.Struct("<4sIIqqq")
+OFFSET_DTYPE: np.dtype[Any] = np.dtype("<i8")
+CHECKSUM_DTYPE: np.dtype[Any] = np.dtype([("checksum", "S20"), ("offset", "<i8")])
+OFFSET_TABLE_ENTRY_SIZE: int = OFFSET_DTYPE.itemsize + CHECKSUM_DTYPE.itemsize
 
 
 class IndexVersion(Enum):
@@ -197,8 +212,8 @@ class ExtendedIndexEntry(BasicIndexEntry):
     ) -> "ExtendedIndexEntry":
         """Reads the ExtendedIndexEntry from older version of index.
 
-        This means, that not everything was stored in the index, and the profile itself has to be
-        loaded to extract additional details.
+        This means, that not everything was stored in the index, and the metadata of the profile
+        itself have to be loaded to extract additional details.
 
         :param index_handle:
         :param index_version:
@@ -206,7 +221,7 @@ class ExtendedIndexEntry(BasicIndexEntry):
         """
         basic_entry = super().read_from(index_handle, index_version)
         _, profile_name = store.split_object_name(pcs.get_object_directory(), basic_entry.checksum)
-        profile = store.load_profile_from_file(profile_name, is_raw_profile=False)
+        profile = store.load_profile_metadata_from_file(profile_name, is_raw_profile=False)
         return ExtendedIndexEntry(
             basic_entry.time,
             basic_entry.checksum,
@@ -329,6 +344,302 @@ def walk_index(index_handle: BinaryIO) -> Iterable[BasicIndexEntry]:
         )
 
 
+class IndexOffsetTable:
+    """Sorted table of offsets of the entries within the memory mapped index
+
+    The table consists of two fixed-stride sections: offsets of the entries sorted by their paths
+    and timestamps and pairs of checksums and offsets of the entries sorted by checksums. The
+    entries can be thus looked up by the binary search over the table, comparing only the fixed
+    parts of the entries read from the memory mapped index, while the entries themselves are
+    appended to the end of the index in the order of their registration.
+
+    The table is persisted in the cache (see :func:`get_offset_table_file`) together with the
+    stamp of the index it corresponds to, so it is rebuilt by a single pass over the index only
+    when the index was modified by other means (e.g. by an older version of perun).
+
+    Note that the table behaves as a sorted sequence of pairs of paths and timestamps of entries.
+
+    :ivar IndexVersion version: version of the index
+    :ivar mmap index_map: memory mapped content of the index
+    :ivar ndarray offsets: offsets of the entries sorted by their paths and timestamps
+    :ivar ndarray checksums: pairs of checksums and offsets of the entries sorted by checksums
+    :ivar int end: offset of the end of the last entry within the index
+    """
+
+    __slots__ = ["version", "index_map", "offsets", "checksums", "end"]
+
+    def __init__(self, index_handle: BinaryIO) -> None:
+        """Loads the persisted table of the index; if it is missing or outdated, it is rebuilt
+
+        :param file index_handle: handle to file containing index
+        """
+        index_handle.flush()
+        self.index_map = mmap.mmap(index_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.index_map[:4] != INDEX_MAGIC_PREFIX:
+            raise MalformedIndexFileException("read blob is not an index file")
+
+        index_version, number_of_objects = struct.unpack_from("ii", self.index_map, 4)
+        if index_version > INDEX_VERSION:
+            raise MalformedIndexFileException(
+                "read index file is in format of different index version "
+                f"(read index file = {index_version}, supported = {INDEX_VERSION})"
+            )
+        self.version = IndexVersion(index_version)
+        if not self._load(index_handle, number_of_objects):
+            self._build(number_of_objects)
+            self.save(index_handle)
+
+    def _load(self, index_handle: BinaryIO, number_of_objects: int) -> bool:
+        """Loads the persisted table, if it corresponds to the current state of the index
+
+        :param file index_handle: handle to file containing index
+        :param int number_of_objects: number of entries registered in the index
+        :return: true if the table was loaded
+        """
+        table_file = get_offset_table_file(index_handle.name)
+        if table_file is None:
+            return False
+        try:
+            with open(table_file, "rb") as table_handle:
+                table = table_handle.read()
+            magic, version, entries, mtime, size, end = OFFSET_TABLE_HEADER.unpack_from(table)
+        except (OSError, struct.error):
+            return False
+        table_size = OFFSET_TABLE_HEADER.size + entries * OFFSET_TABLE_ENTRY_SIZE
+        if (
+            magic != OFFSET_TABLE_MAGIC
+            or version != OFFSET_TABLE_VERSION
+            or entries != number_of_objects
+            or [mtime, size] != get_index_stamp(index_handle)
+            or len(table) != table_size
+        ):
+            return False
+        checksums_start = OFFSET_TABLE_HEADER.size + entries * OFFSET_DTYPE.itemsize
+        self.offsets = np.frombuffer(table, OFFSET_DTYPE, entries, OFFSET_TABLE_HEADER.size).copy()
+        self.checksums = np.frombuffer(table, CHECKSUM_DTYPE, entries, checksums_start).copy()
+        self.end = end
+        return True
+
+    def _build(self, number_of_objects: int) -> None:
+        """Builds the table by a single pass over the memory mapped index
+
+        Only the fixed parts of entries (timestamp, checksum and path) are decoded and the rest
+        of the entry is skipped according to its stored lengths.
+
+        :param int number_of_objects: number of entries registered in the index
+        """
+        offsets: list[int] = []
+        keys: list[tuple[str, int]] = []
+        checksums: list[tuple[bytes, int]] = []
+
+        # Number of length-prefixed strings stored after the path of the entry
+        stored_strings = 5 if self.version == IndexVersion.FastSloth else 0
+        position, last_position = INDEX_ENTRIES_START_OFFSET, len(self.index_map)
+        while position + 24 < last_position and len(offsets) < number_of_objects:
+            path_end = self.index_map.find(b"\0", position + 24)
+            if path_end == -1:
+                raise MalformedIndexFileException("read index entry is not terminated")
+            offsets.append(position)
+            keys.append(self.read_key(position))
+            checksums.append((self.index_map[position + 4 : position + 24], position))
+            position = path_end + 1
+            for _ in range(stored_strings):
+                position += 4 + struct.unpack_from("<I", self.index_map, position)[0]
+        self.end = position
+
+        if len(offsets) != number_of_objects:
+            perun_log.error(
+                "fatal: malformed index file: too many or too few objects registered in index"
+            )
+        self.offsets = np.array(
+            [offset for _, offset in sorted(zip(keys, offsets))], dtype=OFFSET_DTYPE
+        )
+        self.checksums = np.array(sorted(checksums), dtype=CHECKSUM_DTYPE)
+
+    def save(self, index_handle: BinaryIO) -> None:
+        """Persists the table for the current state of the index
+
+        The table is replaced atomically, so concurrent runs of perun never read partial table.
+        The content of the index is mapped again, so further lookups see its current state.
+
+        :param file index_handle: handle to file containing index
+        """
+        index_handle.flush()
+        self.index_map = mmap.mmap(index_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        mtime, size = get_index_stamp(index_handle)
+        header = OFFSET_TABLE_HEADER.pack(
+            OFFSET_TABLE_MAGIC, OFFSET_TABLE_VERSION, len(self), mtime, size, self.end
+        )
+        table_file = get_offset_table_file(index_handle.name)
+        if table_file is None:
+            return
+        with SuppressedExceptions(OSError):
+            common_kit.touch_dir(os.path.dirname(table_file))
+            tmp_file = f"{table_file}.{os.getpid()}"
+            with open(tmp_file, "wb") as table_handle:
+                table_handle.write(header + self.offsets.tobytes() + self.checksums.tobytes())
+            os.replace(tmp_file, table_file)
+
+    def __len__(self) -> int:
+        """Returns number of entries in the index
+
+        :return: number of entries in the index
+        """
+        return len(self.offsets)
+
+    def __getitem__(self, position: int) -> tuple[str, int]:
+        """Returns the path and timestamp of the entry at the position of the sorted table
+
+        :param int position: position of the entry in the table
+        :return: pair of path and timestamp of the entry
+        """
+        return self.read_key(int(self.offsets[position]))
+
+    def read_key(self, offset: int) -> tuple[str, int]:
+        """Reads the path and timestamp of the entry at the offset of the index
+
+        :param int offset: offset of the entry within the index
+        :return: pair of path and timestamp of the entry
+        """
+        path_end = self.index_map.find(b"\0", offset + 24)
+        return (
+            self.index_map[offset + 24 : path_end].decode("utf-8"),
+            struct.unpack_from("<I", self.index_map, offset)[0],
+        )
+
+    def find_first_not_less(self, path: str, time: str = "") -> int:
+        """Finds the position of the first entry, that is not less than the path and time
+
+        :param str path: looked up path
+        :param str time: looked up timestamp (in string representation)
+        :return: position of the first greater or equal entry or -1 if there is no such entry
+        """
+        timestamp = round(timestamps.str_to_timestamp(time)) if time else -1
+        position = bisect.bisect_left(self, (path, timestamp))
+        return position if position < len(self) else -1
+
+    def find_path(self, path: str) -> int:
+        """Finds the offset of the first entry with the given path
+
+        :param str path: looked up path
+        :return: offset of the entry or -1 if there is no such entry
+        """
+        position = self.find_first_not_less(path)
+        if position == -1 or self[position][0] != path:
+            return -1
+        return int(self.offsets[position])
+
+    def find_checksum(self, checksum: str) -> int:
+        """Finds the offset of the first entry with the given checksum
+
+        :param str checksum: looked up checksum
+        :return: offset of the entry or -1 if there is no such entry
+        """
+        key = np.array(binascii.unhexlify(checksum), dtype=CHECKSUM_DTYPE["checksum"])
+        position = int(np.searchsorted(self.checksums["checksum"], key))
+        if position == len(self) or self.checksums["checksum"][position] != key:
+            return -1
+        return int(self.checksums["offset"][position])
+
+    def insert(self, position: int, entry: BasicIndexEntry, offset: int) -> None:
+        """Registers the entry appended at the offset of the index in the table
+
+        :param int position: position of the entry in the table (-1 for the end of the table)
+        :param BasicIndexEntry entry: inserted entry
+        :param int offset: offset of the entry within the index
+        """
+        position = len(self) if position == -1 else position
+        checksum = (bytes.fromhex(entry.checksum), offset)
+        checksum_position = np.searchsorted(
+            self.checksums, np.array(checksum, dtype=CHECKSUM_DTYPE)
+        )
+        self.offsets = np.insert(self.offsets, position, offset)
+        self.checksums = np.insert(self.checksums, checksum_position, checksum)
+
+    def remove(self, index_handle: BinaryIO, removed_offsets: Collection[int]) -> None:
+        """Removes the entries at the offsets from the index and the table
+
+        Only the content of the index following the first removed entry is rewritten and the
+        offsets of the kept entries are shifted by the lengths of the preceding removed entries.
+
+        :param file index_handle: handle to file containing index
+        :param collection removed_offsets: offsets of the removed entries within the index
+        """
+        entry_starts = np.sort(self.offsets)
+        entry_ends = np.append(entry_starts[1:], self.end)
+        is_removed = np.isin(entry_starts, list(removed_offsets))
+        starts, ends = entry_starts[is_removed], entry_ends[is_removed]
+        if not len(starts):
+            return
+        kept_content = b"".join(
+            self.index_map[int(start) : int(end)]
+            for start, end in zip(ends, np.append(starts[1:], self.end))
+        )
+        shifts = np.append(0, np.cumsum(ends - starts))
+
+        index_handle.seek(INDEX_NUMBER_OF_ENTRIES_OFFSET)
+        index_handle.write(struct.pack("i", len(self) - len(starts)))
+        index_handle.seek(int(starts[0]))
+        index_handle.write(kept_content)
+        index_handle.truncate()
+
+        self.offsets = self.offsets[~np.isin(self.offsets, starts)]
+        self.offsets -= shifts[np.searchsorted(starts, self.offsets)].astype(OFFSET_DTYPE)
+        self.checksums = self.checksums[~np.isin(self.checksums["offset"], starts)]
+        self.checksums["offset"] -= shifts[np.searchsorted(starts, self.checksums["offset"])]
+        self.end -= int(shifts[-1])
+
+    def read_entry(self, index_handle: BinaryIO, offset: int) -> BasicIndexEntry:
+        """Reads the whole entry at the given offset of the index
+
+        :param file index_handle: handle to file containing index
+        :param int offset: offset of the entry within the index
+        :return: read entry
+        """
+        index_handle.seek(offset)
+        entry_constructor = INDEX_ENTRY_CONSTRUCTORS[INDEX_VERSION - 1]
+        return entry_constructor.read_from(index_handle, self.version)
+
+
+def remove_offset_table(index_file: str) -> None:
+    """Removes the persisted offset table of the index, which is rewritten by other means
+
+    :param str index_file: path to the index file
+    """
+    table_file = get_offset_table_file(index_file)
+    if table_file:
+        with SuppressedExceptions(FileNotFoundError):
+            os.remove(table_file)
+
+
+def get_offset_table_file(index_file: str) -> Optional[str]:
+    """Returns the path to the file with the persisted offset table of the index
+
+    The tables are stored in the ``.perun/cache`` directory, each named by the checksum of the
+    path of its index, so the objects directory contains only the objects.
+
+    :param str index_file: path to the index file
+    :return: path to the file with the offset table or None if there is no perun instance
+    """
+    try:
+        table_dir = os.path.join(pcs.get_cache_directory(), "offsets")
+    except (NotPerunRepositoryException, OSError):
+        return None
+    table_name = store.compute_checksum(os.path.abspath(index_file).encode("utf-8"))
+    _, table_file = store.split_object_name(table_dir, table_name)
+    return table_file
+
+
+def get_index_stamp(index_handle: BinaryIO) -> list[int]:
+    """Returns the stamp identifying the current state of the index file
+
+    :param file index_handle: handle to file containing index
+    :return: list of modification time and size of the index
+    """
+    index_stat = os.fstat(index_handle.fileno())
+    return [index_stat.st_mtime_ns, index_stat.st_size]
+
+
 def print_index(index_file: str) -> None:
     """Helper function for printing the contents of the index
 
@@ -417,58 +728,55 @@ def modify_number_of_entries_in_index(index_handle: BinaryIO, modify: Callable[[
 
 
 def write_entry_to_index(index_file: str, file_entry: BasicIndexEntry) -> None:
-    """Writes the file_entry to its appropriate position within the index.
+    """Writes the file_entry to the index.
 
-    Given the file entry, writes the entry within the file, moving everything by the given offset
-    and then incrementing the number of entries within the index.
+    The entry is looked up in the offset table of the index (see :class:`IndexOffsetTable`) and,
+    unless it is already registered, it is appended to the end of the index and inserted to the
+    offset table. Entries with explicitly given offset are written to the given position, moving
+    everything following by the length of the entry. Finally, the number of entries within the
+    index is incremented.
 
     :param str index_file: path to the index file
     :param BasicIndexEntry file_entry: index entry that will be written to the file
     """
     with open(index_file, "rb+") as index_handle:
-        # Lookup the position of the registered file within the index
         if file_entry.offset == -1:
-            try:
-                predicate = lambda entry: entry.path > file_entry.path or (
-                    entry.path == file_entry.path and entry.time >= file_entry.time
-                )
-                looked_up_entry = lookup_entry_within_index(
-                    index_handle, predicate, file_entry.path
+            # Lookup the position of the registered file within the offset table
+            offset_table = IndexOffsetTable(index_handle)
+            position = offset_table.find_first_not_less(file_entry.path, file_entry.time)
+            # If there is an exact match, we do not add the entry to the index
+            if position != -1 and offset_table[position] == (
+                file_entry.path,
+                round(timestamps.str_to_timestamp(file_entry.time)),
+            ):
+                perun_log.warn(
+                    f"{file_entry.path} ({file_entry.time}) already registered in {index_file}",
                 )
-
-                # If there is an exact match, we do not add the entry to the index
-                if (
-                    looked_up_entry.path == file_entry.path
-                    and looked_up_entry.time == file_entry.time
-                ):
-                    perun_log.warn(
-                        f"{file_entry.path} ({file_entry.time}) already registered in {index_file}",
-                    )
-                    return
-                offset_in_file = looked_up_entry.offset
-            except EntryNotFoundException:
-                # Move to end of the file and set the offset to the end of the file
-                index_handle.seek(0, 2)
-                offset_in_file = index_handle.tell()
+                return
+
+            modify_number_of_entries_in_index(index_handle, lambda x: x + 1)
+            index_handle.seek(offset_table.end)
+            file_entry.write_to(index_handle)
+            offset_table.insert(position, file_entry, offset_table.end)
+            offset_table.end = index_handle.tell()
+            update_index_version(index_handle)
+            offset_table.save(index_handle)
         else:
-            offset_in_file = file_entry.offset
-
-        # Modify the number of entries in index and return to position
-        modify_number_of_entries_in_index(index_handle, lambda x: x + 1)
-        index_handle.seek(offset_in_file)
+            # Modify the number of entries in index and return to position
+            modify_number_of_entries_in_index(index_handle, lambda x: x + 1)
+            index_handle.seek(file_entry.offset)
 
-        # Read previous entries to buffer and return back to the position
-        buffer = index_handle.read()
-        index_handle.seek(offset_in_file)
+            # Read previous entries to buffer and return back to the position
+            buffer = index_handle.read()
+            index_handle.seek(file_entry.offset)
 
-        # Write the index_file entry to index
-        file_entry.write_to(index_handle)
+            # Write the index_file entry to index and the stuff stored in buffer
+            file_entry.write_to(index_handle)
+            index_handle.write(buffer)
 
-        # Write the stuff stored in buffer
-        index_handle.write(buffer)
-
-        # Finally update the index version, if it was the older one
-        update_index_version(index_handle)
+            # Finally update the index version, if it was the older one
+            update_index_version(index_handle)
+            remove_offset_table(index_file)
 
 
 def write_list_of_entries(index_file: str, entry_list: list[BasicIndexEntry]) -> None:
@@ -480,6 +788,7 @@ def write_list_of_entries(index_file: str, entry_list: list[BasicIndexEntry]) ->
     :param list of ExtendedIndexEntry entry_list:
     """
     # First delete the index
+    remove_offset_table(index_file)
     with open(index_file, "wb+") as index_handle:
         index_handle.truncate(0)
         initialize_index_in_handle(index_handle)
@@ -508,6 +817,29 @@ def lookup_entry_within_index(
     raise EntryNotFoundException(looked_up_entry_name)
 
 
+def lookup_entry_by_checksum_or_path(
+    index_handle: BinaryIO, looked_up_entry: str
+) -> BasicIndexEntry:
+    """Looks up the first entry within index with the given checksum or path
+
+    The entry is looked up in the offset table of the index (see :class:`IndexOffsetTable`), so
+    only the found entry is fully read from the index.
+
+    :param file index_handle: file handle of the index
+    :param str looked_up_entry: sha-1 checksum or the path of the looked up entry
+    :returns BasicIndexEntry: index entry with the given checksum or path
+    :raises EntryNotFoundException: when there is no such entry in the index
+    """
+    offset_table = IndexOffsetTable(index_handle)
+    if store.is_sha1(looked_up_entry):
+        offset = offset_table.find_checksum(looked_up_entry)
+    else:
+        offset = offset_table.find_path(looked_up_entry)
+    if offset == -1:
+        raise EntryNotFoundException(looked_up_entry)
+    return offset_table.read_entry(index_handle, offset)
+
+
 def lookup_all_entries_within_index(
     index_handle: BinaryIO, predicate: Callable[[BasicIndexEntry], bool]
 ) -> list[BasicIndexEntry]:
@@ -547,11 +879,29 @@ def register_in_pending_index(registered_file: str, profile: Profile) -> None:
     # Create the directory and index (if it does not exist)
     index_filename = pcs.get_job_index()
     touch_index(index_filename)
-    registered_checksum = store.compute_checksum(registered_file.encode("utf-8"))
+    registered_checksum = compute_pending_stamp(
+        os.path.split(registered_file)[-1], os.stat(registered_file)
+    )
 
     register_in_index(index_filename, registered_file, registered_checksum, profile)
 
 
+def compute_pending_stamp(file_name: str, file_stat: os.stat_result) -> str:
+    """Computes the stamp of the pending profile, which is stored as checksum of its entry
+
+    The stamp identifies the name, modification time and size of the profile, so the entries of
+    the pending index can serve as a cache of the metadata of profiles in the job directory,
+    which is valid as long as the stamp of the entry matches the actual file.
+
+    :param str file_name: name of the profile in the job directory
+    :param os.stat_result file_stat: stat of the profile
+    :return: sha-1 representation of the stamp
+    """
+    return store.compute_checksum(
+        f"{file_name}:{file_stat.st_mtime_ns}:{file_stat.st_size}".encode("utf-8")
+    )
+
+
 def register_in_minor_index(
     base_dir: str,
     minor_version: str,
@@ -627,44 +977,31 @@ def remove_from_index(
     perun_log.major_info("Removing from index")
     # Lookup all entries for the given function
     with open(minor_version_index, "rb+") as index_handle:
-        # Gather all entries from the index
-        all_entries = list(walk_index(index_handle))
-        all_entries.sort(key=lambda unsorted_entry: unsorted_entry.offset)
-        removed_entries = []
+        # Lookup the removed entries in the offset table of the index
+        offset_table = IndexOffsetTable(index_handle)
+        removed_offsets = set()
 
         for i, removed_file in enumerate(removed_file_generator):
-
-            def lookup_function(looked_entry: BasicIndexEntry) -> bool:
-                """Helper lookup function according to the type of the removed file"""
-                if store.is_sha1(removed_file):
-                    return looked_entry.checksum == removed_file
-                else:
-                    return looked_entry.path == removed_file
-
             count_status = f"{common_kit.format_counter_number(i + 1, removed_profile_number)}/{removed_profile_number}"
-            try:
-                found_entry = lookup_entry_within_index(index_handle, lookup_function, removed_file)
-                removed_entries.append(found_entry)
+            if store.is_sha1(removed_file):
+                offset = offset_table.find_checksum(removed_file)
+            else:
+                offset = offset_table.find_path(removed_file)
+            if offset != -1:
+                removed_offsets.add(offset)
                 perun_log.minor_success(
-                    f"{count_status} {perun_log.path_style(found_entry.path)}", "deregistered"
+                    f"{count_status} {perun_log.path_style(offset_table.read_key(offset)[0])}",
+                    "deregistered",
                 )
-            except EntryNotFoundException:
+            else:
                 perun_log.minor_fail(
                     f"{count_status} {perun_log.path_style(removed_file)}", "not found"
                 )
                 removed_profile_number -= 1
 
-        # Update number of entries
-        index_handle.seek(INDEX_NUMBER_OF_ENTRIES_OFFSET)
-        index_handle.write(struct.pack("i", len(all_entries) - len(removed_entries)))
-
-        # For each entry remove from the index, starting from the greatest offset
-        for entry in all_entries:
-            if entry in removed_entries:
-                continue
-            entry.write_to(index_handle)
-
-        index_handle.truncate()
+        # Move the content following the removed entries and update the offset table
+        offset_table.remove(index_handle, removed_offsets)
+        offset_table.save(index_handle)
 
     perun_log.major_info("Summary")
     if removed_profile_number:
@@ -690,7 +1027,8 @@ def get_profile_list_for_minor(base_dir: str, minor_version: str) -> list[BasicI
         with open(minor_index_file, "rb+") as index_handle:
             index_handle.seek(4)
             index_version = store.read_int_from_handle(index_handle)
-            result = list(walk_index(index_handle))
+            # The entries are appended to the index in order of their registration
+            result = sorted(walk_index(index_handle), key=lambda entry: (entry.path, entry.time))
         # Update the version of the index
         if index_version < INDEX_VERSION:
             write_list_of_entries(minor_index_file, result)
@@ -173,6 +173,17 @@ def get_tmp_directory() -> str:
     return tmp_directory
 
 
+@decorators.singleton
+def get_cache_directory() -> str:
+    """Returns the name of the directory, where cached (e.g. already translated) objects are stored
+
+    :return str: path to the cache directory
+    """
+    cache_directory = os.path.join(get_path(), "cache")
+    common_kit.touch_dir(cache_directory)
+    return cache_directory
+
+
 @decorators.singleton
 def get_tmp_index() -> str:
     """Returns the path to the index file in tmp directory, where details about some tmp files
@@ -619,6 +619,7 @@ def generate_profiles_for(
     collector: list[str],
     postprocessor: list[str],
     minor_version_list: list[MinorVersion],
+    checkout: bool = True,
     **kwargs: Any,
 ) -> Iterable[tuple[CollectStatus, Profile, Job]]:
     """Helper generator, that takes job specification and continuously generates profiles
@@ -631,12 +632,17 @@ def generate_profiles_for(
     :param list collector: list of collectors
     :param list postprocessor: list of postprocessors
     :param list minor_version_list: list of MinorVersion info
+    :param bool checkout: if set to false, the jobs are run only on the current state of the VCS,
+        which has to be prepared by the caller (e.g. when several processes collect concurrently)
     :param dict kwargs: dictionary of additional params for postprocessor and collector
     """
     job_matrix, number_of_jobs = construct_job_matrix(
         cmd, workload, collector, postprocessor, **kwargs
     )
-    yield from generate_jobs(minor_version_list, job_matrix, number_of_jobs)
+    if checkout:
+        yield from generate_jobs(minor_version_list, job_matrix, number_of_jobs)
+    else:
+        yield from generate_jobs_on_current_working_dir(job_matrix, number_of_jobs)
 
 
 def run_single_job(
@@ -6,10 +6,17 @@ or load and store into the directories or filenames.
 from __future__ import annotations
 
 # Standard Imports
-from typing import BinaryIO, Optional
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Sequence
+import codecs
+import collections
+import distutils.util as dutils
 import hashlib
+import io
+import itertools
 import json
+import multiprocessing
 import os
+import pickle
 import re
 import string
 import struct
@@ -18,10 +25,16 @@ import zlib
 # Third-Party Imports
 
 # Perun Imports
+from perun.logic import config, pcs
+from perun.profile import factory
 from perun.profile.factory import Profile
-from perun.utils import log
+from perun.utils import log, streams
 from perun.utils.common import common_kit
-from perun.utils.exceptions import IncorrectProfileFormatException
+from perun.utils.exceptions import (
+    IncorrectProfileFormatException,
+    NotPerunRepositoryException,
+    SuppressedExceptions,
+)
 from perun.utils.structs import PerformanceChange, DegradationInfo
 
 
@@ -29,6 +42,96 @@ INDEX_TAG_REGEX = re.compile(r"^(\d+)@i$")
 INDEX_TAG_RANGE_REGEX = re.compile(r"^(\d+)@i-(\d+)@i$")
 PENDING_TAG_REGEX = re.compile(r"^(\d+)@p$")
 PENDING_TAG_RANGE_REGEX = re.compile(r"^(\d+)@p-(\d+)@p$")
+DEFAULT_PROFILE_CACHE_BUDGET: str = "64"
+DEFAULT_PERSISTENT_CACHE_BUDGET: str = "256"
+# Version of the persistently cached profiles, increased whenever their pickled form changes
+PERSISTENT_CACHE_VERSION: int = 2
+DEFAULT_PROFILE_LOAD_WORKERS: str = "1"
+PROFILE_CHUNK_SIZE: int = 1 << 18
+DEFAULT_PROFILE_OBJECT_FORMAT: str = "json"
+PROFILE_OBJECT_FORMATS: list[str] = ["binary", "json"]
+# Layout of the binary profile objects: fixed header (magic, version, number of sections),
+# followed by the table of sections (name, offset, length) and separately compressed sections.
+BINARY_PROFILE_MAGIC: bytes = b"PPRF"
+BINARY_PROFILE_VERSION: int = 1
+BINARY_PROFILE_HEADER = struct.Struct("<4sHH")
+BINARY_PROFILE_SECTION = struct.Struct("<32sQQ")
+BINARY_PROFILE_SECTIONS: list[str] = ["metadata", "resource_type_map", "models", "resources"]
+# Regions of the profile, that are needed for listing the profiles (e.g. in `perun status`)
+PROFILE_HEADER_REGIONS: list[str] = ["header", "collector_info", "postprocessors"]
+
+
+class ProfileCache:
+    """Process-level LRU cache of already loaded profiles
+
+    Profiles are stored in the pickled form, hence each lookup returns fresh copy of the profile,
+    which can be freely modified by the caller, while the loading still skips the decompression,
+    JSON parsing and translation of the resources. The size of the cache is bounded by the total
+    size of the pickled profiles.
+
+    :ivar OrderedDict _entries: map of keys to pickled profiles ordered from least recently used
+    :ivar int _size: total size of all pickled profiles in bytes
+    """
+
+    __slots__ = ["_entries", "_size"]
+
+    def __init__(self) -> None:
+        """Initializes the empty cache"""
+        self._entries: collections.OrderedDict[
+            tuple[str, int, int, int], bytes
+        ] = collections.OrderedDict()
+        self._size: int = 0
+
+    def get(self, key: tuple[str, int, int, int]) -> Optional[Profile]:
+        """Returns the copy of the cached profile
+
+        :param key: key of the profile (path, mtime, ctime, size)
+        :return: copy of the cached profile or None if it is not cached
+        """
+        if (pickled_profile := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+            return pickle.loads(pickled_profile)
+        return None
+
+    def insert(self, key: tuple[str, int, int, int], pickled_profile: bytes, budget: int) -> None:
+        """Inserts the pickled profile into the cache, evicting the least recently used profiles
+
+        :param key: key of the profile (path, mtime, ctime, size)
+        :param pickled_profile: pickled profile
+        :param budget: maximal size of the cache in bytes
+        """
+        if len(pickled_profile) > budget:
+            return
+        if (previous := self._entries.pop(key, None)) is not None:
+            self._size -= len(previous)
+        self._entries[key] = pickled_profile
+        self._size += len(pickled_profile)
+        while self._size > budget:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Removes all the profiles from the cache"""
+        self._entries.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """
+        :return: number of cached profiles
+        """
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """
+        :param key: key of the profile (path, mtime, ctime, size)
+        :return: true if the profile is cached
+        """
+        return key in self._entries
+
+
+PROFILE_CACHE: ProfileCache = ProfileCache()
+# Estimated sizes of the persistent caches (in bytes) since their last eviction in this process
+PERSISTENT_CACHE_SIZES: dict[str, int] = {}
 
 
 def compute_checksum(content: bytes) -> str:
@@ -83,6 +186,53 @@ def read_and_deflate_chunk(file_handle: BinaryIO) -> str:
     return decompressor.decompress(packed_content).decode("utf-8")
 
 
+def iterate_inflated_chunks(
+    file_handle: BinaryIO, chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Iterates through the deflated content of the file chunk by chunk
+
+    :param file file_handle: opened file handle
+    :param chunk_size: size of the chunks read from the file (PROFILE_CHUNK_SIZE by default)
+    :returns: stream of deflated chunks
+    """
+    chunk_size = chunk_size or PROFILE_CHUNK_SIZE
+    decompressor = zlib.decompressobj()
+    while packed_chunk := file_handle.read(chunk_size):
+        yield decompressor.decompress(packed_chunk)
+    yield decompressor.flush()
+
+
+def decode_chunks(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Incrementally decodes the chunks of bytes to strings
+
+    Note that multibyte characters can be split between two chunks.
+
+    :param chunks: stream of bytes chunks
+    :returns: stream of utf-8 decoded chunks
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def split_header_from_chunks(chunks: Iterator[bytes]) -> tuple[str, Iterator[bytes]]:
+    """Reads the header (terminated by the zero byte) from the stream of chunks
+
+    :param chunks: stream of bytes chunks
+    :returns: pair of header and stream of the rest of the chunks
+    """
+    header_chunks = []
+    for chunk in chunks:
+        header_end = chunk.find(b"\0")
+        if header_end != -1:
+            header_chunks.append(chunk[:header_end])
+            rest = chunk[header_end + 1 :]
+            return b"".join(header_chunks).decode("utf-8"), itertools.chain([rest], chunks)
+        header_chunks.append(chunk)
+    return b"".join(header_chunks).decode("utf-8"), iter([])
+
+
 def split_object_name(base_dir: str, object_name: str, object_ext: str = "") -> tuple[str, str]:
     """
     :param str base_dir: base directory for the object_name
@@ -298,6 +448,11 @@ def load_profile_from_file(
 ) -> Profile:
     """Loads profile w.r.t :ref:`profile-spec` from file.
 
+    Loaded profiles are cached (w.r.t. their path, modification times and size) in process-level
+    LRU cache, whose size is given by :ckey:`profiles.cache_budget`. Moreover, if
+    :ckey:`profiles.persistent_cache` is set, then the translated profiles are cached in the
+    ``.perun/cache`` directory as well (see :func:`cache_pickled_profile`).
+
     :param file_name: file path, where the profile is stored
     :param is_raw_profile: if set to true, then the profile was loaded
         from the file system and is thus in the JSON already and does not have
@@ -306,21 +461,283 @@ def load_profile_from_file(
     :returns: JSON dictionary w.r.t. :ref:`profile-spec`
     :raises IncorrectProfileFormatException: raised, when **filename** contains
         data, which cannot be converted to valid :ref:`profile-spec`
-    Fixme: Add cache! Really badly!
     """
     if not unsafe_load and not os.path.exists(file_name):
         raise IncorrectProfileFormatException(file_name, "file '{}' not found")
 
+    cache_key = get_profile_cache_key(file_name)
+    if (profile := PROFILE_CACHE.get(cache_key)) is not None:
+        return profile
+
+    persistent_cache_file = get_persistent_cache_file(cache_key)
+    if persistent_cache_file and (
+        pickled_profile := load_persistently_cached_profile(cache_key, persistent_cache_file)
+    ):
+        profile = pickle.loads(pickled_profile)
+        cache_pickled_profile(cache_key, pickled_profile, None)
+        return profile
+
     with open(file_name, "rb") as file_handle:
-        return load_profile_from_handle(file_name, file_handle, is_raw_profile)
+        profile = load_profile_from_handle(file_name, file_handle, is_raw_profile)
+    if persistent_cache_file or int(
+        lookup_cache_option("profiles.cache_budget", DEFAULT_PROFILE_CACHE_BUDGET)
+    ):
+        pickled_profile = pickle.dumps(profile, protocol=pickle.HIGHEST_PROTOCOL)
+        cache_pickled_profile(cache_key, pickled_profile, persistent_cache_file)
+    return profile
+
+
+def load_profiles_from_files(
+    file_names: Sequence[str], is_raw_profile: bool, unsafe_load: bool = False
+) -> list[Profile]:
+    """Loads the list of profiles w.r.t :ref:`profile-spec` from files.
+
+    Since decompression and parsing of the profiles holds the GIL most of the time, the profiles
+    that are not cached yet are loaded concurrently in the pool of :ckey:`profiles.load_workers`
+    processes and then transferred back in pickled form. The profiles are returned in the same
+    order as the given files. Profiles, that failed to load in the pool, are loaded again in the
+    current process, so the errors are reported in the same way as in
+    :func:`load_profile_from_file`.
+
+    :param file_names: list of file paths, where the profiles are stored
+    :param is_raw_profile: if set to true, then the profiles were loaded from the file system
+    :param unsafe_load: if set to True, then we assume that the files exist and skip the check
+    :returns: list of loaded profiles
+    :raises IncorrectProfileFormatException: raised, when some of the files contains data, which
+        cannot be converted to valid :ref:`profile-spec`
+    """
+    uncached_files = [
+        file_name
+        for file_name in dict.fromkeys(file_names)
+        if os.path.exists(file_name) and not is_profile_cached(get_profile_cache_key(file_name))
+    ]
+    workers = min(get_profile_load_workers(), len(uncached_files))
+
+    pickled_profiles: dict[str, bytes] = {}
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            loaded_profiles = pool.starmap(
+                load_pickled_profile_from_file,
+                [(file_name, is_raw_profile) for file_name in uncached_files],
+            )
+        budget = int(lookup_cache_option("profiles.cache_budget", DEFAULT_PROFILE_CACHE_BUDGET))
+        for file_name, pickled_profile in zip(uncached_files, loaded_profiles):
+            if pickled_profile is not None:
+                pickled_profiles[file_name] = pickled_profile
+                cache_key = get_profile_cache_key(file_name)
+                persistent_cache_file = get_persistent_cache_file(cache_key)
+                if budget or persistent_cache_file:
+                    cache_pickled_profile(cache_key, pickled_profile, persistent_cache_file)
+
+    return [
+        pickle.loads(pickled_profiles[file_name])
+        if file_name in pickled_profiles
+        else load_profile_from_file(file_name, is_raw_profile, unsafe_load)
+        for file_name in file_names
+    ]
+
+
+def load_pickled_profile_from_file(file_name: str, is_raw_profile: bool) -> Optional[bytes]:
+    """Loads the profile from the file and returns it pickled
+
+    This is used in the worker processes of :func:`load_profiles_from_files`.
+
+    :param file_name: file path, where the profile is stored
+    :param is_raw_profile: if set to true, then the profile was loaded from the file system
+    :returns: pickled profile or None, if the profile could not be loaded
+    """
+    try:
+        with open(file_name, "rb") as file_handle:
+            profile = load_profile_from_handle(file_name, file_handle, is_raw_profile)
+        return pickle.dumps(profile, protocol=pickle.HIGHEST_PROTOCOL)
+    except (Exception, SystemExit):  # pylint: disable=broad-except
+        # The error is reported when the profile is loaded in the parent process again
+        return None
+
+
+def get_profile_load_workers() -> int:
+    """Returns the number of processes used for concurrent loading of profiles
+
+    :returns: value of :ckey:`profiles.load_workers` or the number of CPUs if it is set to 0
+    """
+    workers = int(lookup_cache_option("profiles.load_workers", DEFAULT_PROFILE_LOAD_WORKERS))
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def get_profile_cache_key(file_name: str) -> tuple[str, int, int, int]:
+    """Returns the key of the profile in the caches
+
+    :param file_name: file path, where the profile is stored
+    :returns: tuple of absolute path, modification and change times and size of the file
+    """
+    file_stat = os.stat(file_name)
+    # Note: ctime is part of the key as well, since mtime can be restored (e.g. by copystat)
+    return (
+        os.path.abspath(file_name),
+        file_stat.st_mtime_ns,
+        file_stat.st_ctime_ns,
+        file_stat.st_size,
+    )
+
+
+def is_profile_cached(cache_key: tuple[str, int, int, int]) -> bool:
+    """Checks if the profile is either in the process-level or the persistent cache
+
+    :param cache_key: key of the profile (path, mtime, ctime, size)
+    :returns: true if the profile is cached
+    """
+    if cache_key in PROFILE_CACHE:
+        return True
+    if (persistent_cache_file := get_persistent_cache_file(cache_key)) is None:
+        return False
+    with SuppressedExceptions(OSError, EOFError, ValueError, pickle.UnpicklingError):
+        with open(persistent_cache_file, "rb") as cache_handle:
+            return pickle.load(cache_handle) == (PERSISTENT_CACHE_VERSION, cache_key)
+    return False
+
+
+def load_persistently_cached_profile(
+    cache_key: tuple[str, int, int, int], persistent_cache_file: str
+) -> Optional[bytes]:
+    """Loads the pickled profile from the persistent cache
+
+    The cached profile is used only if it was cached for the same state of the profile file (and
+    by the same version of the cache). The used cache file is touched, so the recently used
+    profiles are evicted last (see :func:`evict_persistent_cache`).
+
+    :param cache_key: key of the profile (path, mtime, ctime, size)
+    :param persistent_cache_file: path to the persistent cache file
+    :return: pickled profile or None, if the profile is not cached or the cache is stale
+    """
+    with SuppressedExceptions(OSError, EOFError, ValueError, pickle.UnpicklingError):
+        with open(persistent_cache_file, "rb") as cache_handle:
+            if pickle.load(cache_handle) != (PERSISTENT_CACHE_VERSION, cache_key):
+                return None
+            pickled_profile = cache_handle.read()
+        os.utime(persistent_cache_file)
+        return pickled_profile
+    return None
+
+
+def cache_pickled_profile(
+    cache_key: tuple[str, int, int, int],
+    pickled_profile: bytes,
+    persistent_cache_file: Optional[str],
+) -> None:
+    """Stores the pickled profile in the process-level and the persistent cache
+
+    The persistently cached profile is stored together with its key, which replaces the stale
+    profile previously cached for the same file. The size of the persistent cache is bounded by
+    :ckey:`profiles.persistent_cache_budget` (see :func:`evict_persistent_cache`).
+
+    :param cache_key: key of the profile (path, mtime, ctime, size)
+    :param pickled_profile: pickled profile
+    :param persistent_cache_file: path to the persistent cache file or None if disabled
+    """
+    persistent_budget = (
+        1024
+        * 1024
+        * int(
+            lookup_cache_option("profiles.persistent_cache_budget", DEFAULT_PERSISTENT_CACHE_BUDGET)
+        )
+    )
+    if persistent_cache_file and len(pickled_profile) <= persistent_budget:
+        cache_dir, _ = os.path.split(persistent_cache_file)
+        common_kit.touch_dir(cache_dir)
+        tmp_file = f"{persistent_cache_file}.{os.getpid()}"
+        with open(tmp_file, "wb") as cache_handle:
+            pickle.dump(
+                (PERSISTENT_CACHE_VERSION, cache_key),
+                cache_handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            cache_handle.write(pickled_profile)
+        os.replace(tmp_file, persistent_cache_file)
+
+        cache_root = os.path.dirname(cache_dir)
+        cache_size = PERSISTENT_CACHE_SIZES.get(cache_root)
+        if cache_size is None or cache_size + len(pickled_profile) > persistent_budget:
+            PERSISTENT_CACHE_SIZES[cache_root] = evict_persistent_cache(
+                cache_root, persistent_budget
+            )
+        else:
+            PERSISTENT_CACHE_SIZES[cache_root] = cache_size + len(pickled_profile)
+    budget = int(lookup_cache_option("profiles.cache_budget", DEFAULT_PROFILE_CACHE_BUDGET))
+    PROFILE_CACHE.insert(cache_key, pickled_profile, budget * 1024 * 1024)
+
+
+def lookup_cache_option(key: str, default: str) -> str:
+    """Looks up the option of the profile caching
+
+    Note that loading of the profiles cannot fail because of the inaccessible configuration (e.g.
+    when the working directory was removed), hence we fall back to the default value.
+
+    :param key: looked up option
+    :param default: default value of the option
+    :return: value of the option
+    """
+    with SuppressedExceptions(OSError):
+        return str(config.lookup_key_recursively(key, default))
+    return default
+
+
+def evict_persistent_cache(cache_dir: str, budget: int) -> int:
+    """Evicts the least recently used profiles from the persistent cache to fit in the budget
+
+    :param cache_dir: directory of the persistent cache
+    :param budget: maximal size of the persistent cache in bytes
+    :return: size of the persistent cache after the eviction in bytes
+    """
+    cached_files = []
+    for cached_dir, _, cached_names in os.walk(cache_dir):
+        for cached_name in cached_names:
+            cached_file = os.path.join(cached_dir, cached_name)
+            with SuppressedExceptions(OSError):
+                file_stat = os.stat(cached_file)
+                cached_files.append((file_stat.st_mtime_ns, file_stat.st_size, cached_file))
+    cache_size = sum(file_size for _, file_size, _ in cached_files)
+    for _, file_size, cached_file in sorted(cached_files):
+        if cache_size <= budget:
+            break
+        with SuppressedExceptions(OSError):
+            os.remove(cached_file)
+        cache_size -= file_size
+    return cache_size
+
+
+def get_persistent_cache_file(cache_key: tuple[str, int, int, int]) -> Optional[str]:
+    """Returns the path to the persistently cached translated profile
+
+    Each profile file has a single cache file (named by the checksum of its path, which for the
+    profiles stored in ``.perun/objects`` contains the checksum of the object), so the profile
+    cached for the stale state of the file is replaced instead of left behind.
+
+    :param cache_key: key of the profile (path, mtime, ctime, size)
+    :return: path to the cached profile, or None if persistent caching is disabled or we are
+        outside of perun repository
+    """
+    if not dutils.strtobool(lookup_cache_option("profiles.persistent_cache", "false")):
+        return None
+    try:
+        cache_dir = os.path.join(pcs.get_cache_directory(), "profiles")
+    except (NotPerunRepositoryException, OSError):
+        return None
+    cache_name = compute_checksum(cache_key[0].encode("utf-8"))
+    _, cache_file = split_object_name(cache_dir, cache_name)
+    return cache_file
 
 
 def load_profile_from_handle(
     file_name: str, file_handle: BinaryIO, is_raw_profile: bool
 ) -> Profile:
-    """
+    """Loads the profile from the opened handle
+
+    The profile is loaded in streamed fashion: the content is inflated and decoded chunk by chunk
+    and parsed incrementally, so we never keep the whole (compressed or decompressed) content of
+    the file in the memory. Moreover, the resources are converted to the compact representation
+    one resource type at a time.
+
     Fixme: Add check that the loaded profile is in valid format!!!
-    TODO: This should be broken into two parts
 
     :param str file_name: name of the file opened in the handle
     :param file file_handle: opened file handle
@@ -329,26 +746,294 @@ def load_profile_from_handle(
     :raises IncorrectProfileFormatException: when the profile cannot be parsed by json.loads(body)
         or when the profile is not in correct supported format or when the profile is malformed
     """
-    if is_raw_profile:
-        body = file_handle.read().decode("utf-8")
-    else:
-        # Read deflated contents and split to header and body
-        contents = read_and_deflate_chunk(file_handle)
-        header, body = contents.split("\0")
-        prefix, profile_type, profile_size = header.split(" ")
-
-        # Check the header, if the body is not malformed
-        if (
-            prefix != "profile"
-            or profile_type not in common_kit.SUPPORTED_PROFILE_TYPES
-            or len(body) != int(profile_size)
-        ):
+    try:
+        if not is_raw_profile and is_binary_profile_handle(file_handle):
+            return load_binary_profile_from_handle(file_handle)
+
+        if is_raw_profile:
+            body_chunks = iter(lambda: file_handle.read(PROFILE_CHUNK_SIZE), b"")
+            profile_size = None
+        else:
+            # Read the header of deflated contents and check, if the profile is not malformed
+            header, body_chunks = split_header_from_chunks(iterate_inflated_chunks(file_handle))
+            header_tokens = header.split(" ")
+            if (
+                len(header_tokens) != 3
+                or header_tokens[0] != "profile"
+                or header_tokens[1] not in common_kit.SUPPORTED_PROFILE_TYPES
+                or not header_tokens[2].isdigit()
+            ):
+                raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
+            profile_size = int(header_tokens[2])
+
+        reader = streams.IncrementalJsonReader(decode_chunks(body_chunks))
+        profile = load_profile_from_stream(reader)
+    except (zlib.error, UnicodeDecodeError, struct.error, KeyError):
+        raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
+    except ValueError:
+        raise IncorrectProfileFormatException(
+            file_name, f"profile '{file_name}' is not in profile format"
+        )
+
+    # Check that the body is not malformed
+    if profile_size is not None and reader.consumed != profile_size:
+        raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
+    return profile
+
+
+def load_profile_from_stream(reader: streams.IncrementalJsonReader) -> Profile:
+    """Incrementally constructs the profile from the stream of JSON
+
+    Resources (in the current format) are read and converted to the compact columns one resource
+    type at a time; the rest of the regions is read as a whole.
+
+    :param reader: incremental reader of the JSON stream
+    :returns Profile: loaded profile
+    :raises ValueError: when the stream does not contain valid JSON object
+    """
+    profile_data = {}
+    resources = None
+    for key in reader.iterate_object():
+        if key == "resources" and reader.peek_char() == "{":
+            resources = read_resource_columns(reader)
+        else:
+            profile_data[key] = reader.read_value()
+    reader.read_to_end()
+
+    profile = Profile(profile_data)
+    if resources is not None:
+        profile.update_resources(resources, "resources")
+    return profile
+
+
+def read_resource_columns(reader: streams.IncrementalJsonReader) -> dict[str, Any]:
+    """Reads the resources from the stream and converts them to compact columns
+
+    The resources are read one resource type at a time.
+
+    :param reader: incremental reader positioned at the start of the resources object
+    :returns: map of resource types to their columns
+    :raises ValueError: when the stream does not contain valid resources
+    """
+    resources = {}
+    for resource_type in reader.iterate_object():
+        columns = reader.read_value()
+        if not isinstance(columns, dict):
+            raise ValueError(f"malformed resources of '{resource_type}'")
+        resources[resource_type] = {
+            collectable: factory.to_column(column) for collectable, column in columns.items()
+        }
+    return resources
+
+
+def pack_profile(profile: Profile, object_format: str) -> tuple[str, bytes]:
+    """Packs the profile to the content of the stored object
+
+    The profile is either packed to the legacy format, i.e. the compressed JSON with the header,
+    or to the binary format (see :func:`pack_binary_profile`).
+
+    :param profile: packed profile
+    :param object_format: format of the object (one of :data:`PROFILE_OBJECT_FORMATS`)
+    :returns: pair of checksum of the object and its packed content
+    """
+    if object_format == "binary":
+        binary_content = pack_binary_profile(profile)
+        return compute_checksum(binary_content), binary_content
+
+    str_profile_content = json.dumps(profile.serialize())
+    header = f"profile {profile['header']['type']} {len(str_profile_content)}\0"
+    profile_content = (header + str_profile_content).encode("utf-8")
+    return compute_checksum(profile_content), pack_content(profile_content)
+
+
+def pack_binary_profile(profile: Profile) -> bytes:
+    """Packs the profile to the versioned binary format
+
+    The object starts with the fixed header (magic, version and number of sections) followed by
+    the table of sections, where each entry contains name, offset and length of the section.
+    Each section (metadata, resource_type_map, models and resources) is compressed separately,
+    so metadata can be read without inflating the rest of the profile.
+
+    :param profile: packed profile
+    :returns: binary content of the object
+    """
+    serialized = profile.serialize()
+    regions = {
+        "metadata": {
+            key: value
+            for key, value in serialized.items()
+            if key not in BINARY_PROFILE_SECTIONS[1:]
+        },
+        "resource_type_map": serialized.get("resource_type_map", {}),
+        "models": serialized.get("models", []),
+        "resources": serialized.get("resources", {}),
+    }
+    sections = [
+        (name, pack_content(json.dumps(regions[name]).encode("utf-8")))
+        for name in BINARY_PROFILE_SECTIONS
+    ]
+
+    offset = BINARY_PROFILE_HEADER.size + BINARY_PROFILE_SECTION.size * len(sections)
+    content = [
+        BINARY_PROFILE_HEADER.pack(BINARY_PROFILE_MAGIC, BINARY_PROFILE_VERSION, len(sections))
+    ]
+    for name, section in sections:
+        content.append(BINARY_PROFILE_SECTION.pack(name.encode("utf-8"), offset, len(section)))
+        offset += len(section)
+    content.extend(section for _, section in sections)
+    return b"".join(content)
+
+
+def is_binary_profile_handle(file_handle: BinaryIO) -> bool:
+    """Checks whether the opened object is in the binary format
+
+    The handle is rewound back to its start.
+
+    :param file_handle: opened file handle
+    :returns: true if the object starts with the magic of binary profiles
+    """
+    magic = file_handle.read(len(BINARY_PROFILE_MAGIC))
+    file_handle.seek(0)
+    return magic == BINARY_PROFILE_MAGIC
+
+
+def read_binary_profile_sections(file_handle: BinaryIO) -> dict[str, tuple[int, int]]:
+    """Reads the header and the table of sections of the binary profile
+
+    :param file_handle: opened file handle positioned at the start of the object
+    :returns: map of section names to their offsets and lengths
+    :raises ValueError: when the header is malformed or the version is not supported
+    """
+    magic, version, section_count = BINARY_PROFILE_HEADER.unpack(
+        file_handle.read(BINARY_PROFILE_HEADER.size)
+    )
+    if magic != BINARY_PROFILE_MAGIC or version != BINARY_PROFILE_VERSION:
+        raise ValueError(f"unsupported binary profile version '{version}'")
+    sections = {}
+    for _ in range(section_count):
+        name, offset, length = BINARY_PROFILE_SECTION.unpack(
+            file_handle.read(BINARY_PROFILE_SECTION.size)
+        )
+        sections[name.rstrip(b"\0").decode("utf-8")] = (offset, length)
+    return sections
+
+
+def read_binary_profile_section(
+    file_handle: BinaryIO, sections: dict[str, tuple[int, int]], section: str
+) -> streams.IncrementalJsonReader:
+    """Returns the incremental reader of the given section of the binary profile
+
+    :param file_handle: opened file handle
+    :param sections: table of sections of the profile
+    :param section: name of the read section
+    :returns: incremental reader of the inflated section
+    :raises KeyError: when the section is missing in the profile
+    """
+    offset, length = sections[section]
+    file_handle.seek(offset)
+    compressed = file_handle.read(length)
+    if len(compressed) != length:
+        raise ValueError(f"truncated section '{section}'")
+    return streams.IncrementalJsonReader(
+        decode_chunks(iterate_inflated_chunks(io.BytesIO(compressed)))
+    )
+
+
+def load_binary_profile_from_handle(file_handle: BinaryIO) -> Profile:
+    """Loads the profile stored in the binary format
+
+    :param file_handle: opened file handle
+    :returns: loaded profile
+    :raises ValueError: when the profile is malformed
+    """
+    sections = read_binary_profile_sections(file_handle)
+    profile_data = read_binary_profile_section(file_handle, sections, "metadata").read_value()
+    for region in ("resource_type_map", "models"):
+        profile_data[region] = read_binary_profile_section(
+            file_handle, sections, region
+        ).read_value()
+    reader = read_binary_profile_section(file_handle, sections, "resources")
+    resources = read_resource_columns(reader)
+    reader.read_to_end()
+
+    profile = Profile(profile_data)
+    profile.update_resources(resources, "resources")
+    return profile
+
+
+def load_profile_metadata_from_file(file_name: str, is_raw_profile: bool) -> dict[str, Any]:
+    """Loads only the metadata of the profile, i.e. everything except resources and models
+
+    For binary objects only the metadata section is inflated and parsed; for objects in the legacy
+    format the whole content has to be streamed, however, the resources are immediately discarded.
+
+    :param file_name: file path, where the profile is stored
+    :param is_raw_profile: if set to true, then the profile was loaded from the file system
+    :returns: dictionary of the metadata regions (e.g. header, collector_info, postprocessors)
+    :raises IncorrectProfileFormatException: when the profile is malformed
+    """
+    if not os.path.exists(file_name):
+        raise IncorrectProfileFormatException(file_name, "file '{}' not found")
+
+    with open(file_name, "rb") as file_handle:
+        try:
+            if not is_raw_profile and is_binary_profile_handle(file_handle):
+                sections = read_binary_profile_sections(file_handle)
+                metadata = read_binary_profile_section(
+                    file_handle, sections, "metadata"
+                ).read_value()
+            else:
+                if is_raw_profile:
+                    body_chunks = iter(lambda: file_handle.read(PROFILE_CHUNK_SIZE), b"")
+                else:
+                    _, body_chunks = split_header_from_chunks(iterate_inflated_chunks(file_handle))
+                reader = streams.IncrementalJsonReader(decode_chunks(body_chunks))
+                metadata = {}
+                for key in reader.iterate_object():
+                    if key in BINARY_PROFILE_SECTIONS[1:]:
+                        reader.skip_value()
+                    else:
+                        metadata[key] = reader.read_value()
+        except (zlib.error, UnicodeDecodeError, struct.error, KeyError):
             raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
+        except ValueError:
+            raise IncorrectProfileFormatException(
+                file_name, f"profile '{file_name}' is not in profile format"
+            )
+    if not isinstance(metadata, dict):
+        raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
+    return metadata
+
 
-    # Try to load the json, if there is issue with the profile
+def load_raw_profile_header_from_file(file_name: str) -> dict[str, Any]:
+    """Loads only the regions of the raw profile, that are needed for listing it
+
+    The regions (see :data:`PROFILE_HEADER_REGIONS`) are parsed from the stream, while all other
+    regions are skipped without being parsed. The reading stops as soon as all regions are found,
+    so usually only the beginning of the profile is read.
+
+    :param file_name: file path, where the raw profile is stored
+    :returns: dictionary of the header regions (header, collector_info and postprocessors)
+    :raises IncorrectProfileFormatException: when the profile is malformed or misses some region
+    """
+    header_regions = {}
     try:
-        return Profile(json.loads(body))
+        with open(file_name, "rb") as file_handle:
+            body_chunks = iter(lambda: file_handle.read(PROFILE_CHUNK_SIZE), b"")
+            reader = streams.IncrementalJsonReader(decode_chunks(body_chunks))
+            for key in reader.iterate_object():
+                if key in PROFILE_HEADER_REGIONS:
+                    header_regions[key] = reader.read_value()
+                    if len(header_regions) == len(PROFILE_HEADER_REGIONS):
+                        break
+                else:
+                    reader.skip_value()
+    except UnicodeDecodeError:
+        raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
     except ValueError:
         raise IncorrectProfileFormatException(
             file_name, f"profile '{file_name}' is not in profile format"
         )
+    if len(header_regions) != len(PROFILE_HEADER_REGIONS):
+        raise IncorrectProfileFormatException(file_name, "malformed profile '{}'")
+    return header_regions
@@ -0,0 +1,191 @@
+"""Materialised summary of the minor versions, used for printing the log of the performance history
+
+For each minor version, the summary holds the numbers of its registered profiles per type and the
+numbers of its detected performance changes per group. The summaries of all minor versions are
+kept in a single compressed table in the ``.perun/cache`` directory, so the ``perun log`` reads
+only one file instead of walking the index and the changelog of each minor version.
+
+The table is updated incrementally, whenever the profiles are added to (or removed from) the
+minor version index or whenever new changes are detected for the minor version. Each summary
+moreover remembers the stamps (modification times and sizes) of the index and the changelog it
+was computed from, so the summaries of the minor versions, that were modified by other means,
+are transparently recomputed.
+"""
+from __future__ import annotations
+
+# Standard Imports
+from typing import Any, Iterable, Optional
+import os
+
+# Third-Party Imports
+
+# Perun Imports
+from perun.logic import index, pcs, store
+from perun.utils import log as perun_log
+from perun.utils.exceptions import SuppressedExceptions
+
+SUMMARY_VERSION: int = 1
+_SUMMARY_TABLES: dict[str, SummaryTable] = {}
+
+
+class SummaryTable:
+    """Table of summaries of minor versions
+
+    :ivar str path: path to the file with the table
+    :ivar str base_dir: directory of the objects (i.e. indexes and changelogs of minor versions)
+    :ivar dict summaries: map of checksums of minor versions to their summaries, each summary
+        consists of the numbers of profiles per type, numbers of changes per group and stamps
+        of the index and the changelog
+    :ivar list stamp: stamp of the file with the table, when it was loaded or saved
+    :ivar bool modified: set if there are summaries, that were not stored yet
+    """
+
+    __slots__ = ["path", "base_dir", "summaries", "stamp", "modified"]
+
+    def __init__(self, path: str, base_dir: str) -> None:
+        """Loads the table from the file; if the file is missing or outdated, the table is empty
+
+        :param str path: path to the file with the table
+        :param str base_dir: directory of the objects
+        """
+        self.path = path
+        self.base_dir = base_dir
+        self.stamp = get_file_stamp(path)
+        self.modified = False
+        table = index.load_custom_index(path) if self.stamp else {}
+        if table.get("version") == SUMMARY_VERSION:
+            self.summaries: dict[str, dict[str, Any]] = table.get("summaries", {})
+        else:
+            self.summaries = {}
+
+    def get_stamps_of(self, minor_version: str) -> list[Optional[list[int]]]:
+        """Returns the current stamps of the index and the changelog of the minor version
+
+        :param str minor_version: checksum of the minor version
+        :return: list of stamps of the index and the changelog (None, if the file is missing)
+        """
+        _, index_file = store.split_object_name(self.base_dir, minor_version)
+        _, changelog_file = store.split_object_name(self.base_dir, minor_version, ".changes")
+        return [get_file_stamp(index_file), get_file_stamp(changelog_file)]
+
+    def get(self, minor_version: str) -> dict[str, Any]:
+        """Returns the summary of the minor version, the outdated summary is recomputed
+
+        :param str minor_version: checksum of the minor version
+        :return: summary of the minor version
+        """
+        stamps = self.get_stamps_of(minor_version)
+        summary = self.summaries.get(minor_version)
+        if summary is not None and summary["stamps"] == stamps:
+            return summary
+        if stamps == [None, None]:
+            # The minor version has neither profiles nor changes, so there is nothing to store
+            self.modified |= self.summaries.pop(minor_version, None) is not None
+            return {"profiles": {"all": 0}, "changes": {}, "stamps": stamps}
+        return self.update(minor_version, stamps)
+
+    def update(
+        self, minor_version: str, stamps: Optional[list[Optional[list[int]]]] = None
+    ) -> dict[str, Any]:
+        """Recomputes the summary of the minor version from its index and changelog
+
+        :param str minor_version: checksum of the minor version
+        :param list stamps: current stamps of the index and the changelog (computed if not given)
+        :return: the recomputed summary of the minor version
+        """
+        stamps = stamps or self.get_stamps_of(minor_version)
+        changes = (
+            perun_log.count_degradations_per_group(
+                store.load_degradation_list_for(self.base_dir, minor_version)
+            )
+            if stamps[1]
+            else {}
+        )
+        summary = {
+            "profiles": index.get_profile_number_for_minor(self.base_dir, minor_version),
+            "changes": changes,
+            "stamps": stamps,
+        }
+        self.summaries[minor_version] = summary
+        self.modified = True
+        return summary
+
+    def save(self) -> None:
+        """Stores the table, if there are any new or recomputed summaries
+
+        The table is replaced atomically, so concurrent runs of perun never read partial table.
+        """
+        if not self.modified:
+            return
+        with SuppressedExceptions(OSError):
+            tmp_file = f"{self.path}.{os.getpid()}"
+            index.save_custom_index(
+                tmp_file, {"version": SUMMARY_VERSION, "summaries": self.summaries}
+            )
+            os.replace(tmp_file, self.path)
+            self.stamp = get_file_stamp(self.path)
+            self.modified = False
+
+
+def get_file_stamp(path: str) -> Optional[list[int]]:
+    """Returns the stamp identifying the current state of the file
+
+    :param str path: path to the file
+    :return: list of modification time and size of the file or None if the file does not exist
+    """
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return [file_stat.st_mtime_ns, file_stat.st_size]
+
+
+def get_summary_table() -> SummaryTable:
+    """Returns the summary table of the current perun instance
+
+    The table is loaded only once per run of perun, unless its file was modified in the meantime.
+
+    :return: the summary table
+    """
+    path = os.path.join(pcs.get_cache_directory(), "summary")
+    table = _SUMMARY_TABLES.get(path)
+    if table is None or table.stamp != get_file_stamp(path):
+        table = _SUMMARY_TABLES[path] = SummaryTable(path, pcs.get_object_directory())
+    return table
+
+
+def get_profile_numbers_for(minor_version: str) -> dict[str, int]:
+    """Returns the numbers of profiles of each type registered in the minor version
+
+    :param str minor_version: checksum of the minor version
+    :return: dictionary of numbers of profiles per type (see
+        :func:`perun.logic.index.get_profile_number_for_minor`)
+    """
+    return get_summary_table().get(minor_version)["profiles"]
+
+
+def get_change_counts_for(minor_version: str) -> dict[str, int]:
+    """Returns the numbers of changes of each group detected in the minor version
+
+    :param str minor_version: checksum of the minor version
+    :return: dictionary mapping change strings to its counts (see
+        :func:`perun.utils.log.count_degradations_per_group`)
+    """
+    return get_summary_table().get(minor_version)["changes"]
+
+
+def update_summaries_of(minor_versions: Iterable[str]) -> None:
+    """Recomputes and stores the summaries of the modified minor versions
+
+    :param iterable minor_versions: checksums of the minor versions, whose index or changelog was
+        modified
+    """
+    table = get_summary_table()
+    for minor_version in minor_versions:
+        table.update(minor_version)
+    table.save()
+
+
+def save_summary_table() -> None:
+    """Stores the summaries, that were recomputed when retrieving them"""
+    get_summary_table().save()
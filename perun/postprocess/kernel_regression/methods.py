@@ -19,6 +19,7 @@ import statsmodels.nonparametric.api as nparam
 
 # Perun Imports
 from perun.postprocess.regression_analysis import tools
+from perun.utils.common import parallel_kit
 import perun.thirdparty.pyqt_fit_port as pyqt_fit
 
 if TYPE_CHECKING:
@@ -125,7 +126,8 @@ class KernelRidge(sklearn.BaseEstimator, sklearn.RegressorMixin):
 
 
 def compute_kernel_regression(
-    data_gen: Iterator[tuple[list[float], list[float], str]], config: dict[str, Any]
+    data_gen: Iterator[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], str]],
+    config: dict[str, Any],
 ) -> list[dict[str, Any]]:
     """
     This method represents the wrapper for all modes of kernel regression postprocessor.
@@ -147,15 +149,26 @@ def compute_kernel_regression(
     )
 
     # list of resulting models computed by kernel analysis
-    kernel_models = []
-    for x_pts, y_pts, uid in data_gen:
-        # calling the method, that ensures the calling the relevant mode of kernel regression
-        kernel_model = execute_kernel_regression(x_pts, y_pts, config)
-        kernel_model["uid"] = uid
-        kernel_model["model"] = "kernel_regression"
-        # add partial result to the model result list - create output dictionary with kernel models
-        kernel_models.append(kernel_model)
-    return kernel_models
+    return list(parallel_kit.map_chunks(compute_kernel_chunk, data_gen, config))
+
+
+def compute_kernel_chunk(
+    x_pts: list[float], y_pts: list[float], uid: str, config: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Computes the kernel model for the data points of single uid.
+
+    :param list x_pts: the list of x points coordinates
+    :param list y_pts: the list of y points coordinates
+    :param str uid: the uid of the data points
+    :param dict config: the perun and option context contains the entered options and commands
+    :return dict: the computed kernel model
+    """
+    # calling the method, that ensures the calling the relevant mode of kernel regression
+    kernel_model = execute_kernel_regression(x_pts, y_pts, config)
+    kernel_model["uid"] = uid
+    kernel_model["model"] = "kernel_regression"
+    return kernel_model
 
 
 def kernel_regression(
@@ -5,7 +5,7 @@ auxiliary methods at executing of this method.
 from __future__ import annotations
 
 # Standard Imports
-from typing import Callable, Iterator, Any, cast
+from typing import Callable, Iterator, Any, cast, TYPE_CHECKING
 import dataclasses
 
 # Third-Party Imports
@@ -16,6 +16,10 @@ import sklearn.metrics
 
 # Perun Imports
 from perun.postprocess.regression_analysis import tools
+from perun.utils.common import parallel_kit
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
 
 
 @dataclasses.dataclass()
@@ -66,7 +70,7 @@ def compute_window_width_change(window_width: int, r_square: float) -> int:
 
 
 def compute_moving_average(
-    data_gen: Iterator[tuple[list[float], list[float], str]],
+    data_gen: Iterator[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], str]],
     configuration: dict[str, Any],
 ) -> list[dict[str, Any]]:
     """
@@ -82,14 +86,25 @@ def compute_moving_average(
     )
 
     # list of resulting models of the analysis
-    moving_average_models = []
-    for x_pts, y_pts, uid in data_gen:
-        moving_average_model = moving_average(x_pts, y_pts, configuration)
-        moving_average_model["uid"] = uid
-        moving_average_model["model"] = "moving_average"
-        # add partial result to the model result list - create output dictionaries
-        moving_average_models.append(moving_average_model)
-    return moving_average_models
+    return list(parallel_kit.map_chunks(compute_moving_average_chunk, data_gen, configuration))
+
+
+def compute_moving_average_chunk(
+    x_pts: list[float], y_pts: list[float], uid: str, configuration: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Computes the moving average model for the data points of single uid.
+
+    :param list x_pts: the list of x points coordinates
+    :param list y_pts: the list of y points coordinates
+    :param str uid: the uid of the data points
+    :param dict configuration: the perun and option context
+    :return dict: the computed moving average model
+    """
+    moving_average_model = moving_average(x_pts, y_pts, configuration)
+    moving_average_model["uid"] = uid
+    moving_average_model["model"] = "moving_average"
+    return moving_average_model
 
 
 def execute_computation(y_pts: list[float], config: dict[str, Any]) -> tuple[Any, float]:
@@ -2,60 +2,70 @@
 from __future__ import annotations
 
 # Standard Imports
-from operator import itemgetter
 from typing import Iterator, Any, TYPE_CHECKING
+import array
 
 # Third-Party Imports
+import numpy as np
 
 # Perun Imports
-from perun.profile import convert
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
+
     from perun.profile.factory import Profile
 
 
-def resource_sort_key(resource: dict[str, Any]) -> str:
-    """Extracts the key from resource used for sorting
+def column_to_array(
+    persistent_properties: dict[str, Any],
+    columns: dict[str, list[Any] | array.array[Any]],
+    resource_count: int,
+    key: str,
+) -> npt.NDArray[np.float64]:
+    """Returns the values of the key of all resources of one resource type as array of floats
+
+    Compact columns (see :func:`perun.profile.factory.to_column`) are converted directly from their
+    buffers, without constructing the values in Python, the persistent properties are repeated for
+    each resource of the type.
 
-    :param dict resource: profiling resource
-    :return: key used for sorting
+    :param dict persistent_properties: flattened persistent properties of the resource type
+    :param dict columns: collectable columns of the resource type
+    :param int resource_count: number of resources of the resource type
+    :param str key: key of the returned values
+    :return: array of the values of all resources of the resource type
     """
-    return convert.flatten(resource["uid"])
+    if key in columns:
+        return np.array(columns[key], dtype=np.float64)[:resource_count]
+    return np.full(resource_count, persistent_properties[key], dtype=np.float64)
 
 
 def generic_profile_provider(
     profile: Profile, of_key: str, per_key: str, **_: Any
-) -> Iterator[tuple[list[float], list[float], str]]:
+) -> Iterator[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], str]]:
     """Data provider for trace collector profiling output.
 
+    The resources are processed per resource types: the columns of the collectable values of each
+    resource type are grouped by the uid in single pass and each group is then concatenated to
+    single array. The groups are yielded ordered by their uids, the points in each group keep the
+    order of the resources in the profile.
+
     :param Profile profile: the trace profile dictionary
     :param str of_key: key for which we are finding the model
     :param str per_key: key of the independent variable
     :param dict _: rest of the key arguments
-    :returns generator: each subsequent call returns tuple: x points list, y points list, function
-        name
+    :returns generator: each subsequent call returns tuple: x points array, y points array,
+        function name
     """
-    # Get the file resources contents
-    resources = list(map(itemgetter(1), profile.all_resources()))
-
-    # Sort the dictionaries by function name for easier traversing
-    resources = sorted(resources, key=resource_sort_key)
-    x_points_list: list[float] = []
-    y_points_list: list[float] = []
-    function_name = convert.flatten(resources[0]["uid"])
-    # Store all the points until the function name changes
-    for resource in resources:
-        if convert.flatten(resource["uid"]) != function_name:
-            if x_points_list:
-                # Function name changed, yield the list of data points
-                yield x_points_list, y_points_list, function_name
-                x_points_list = [resource[per_key]]
-                y_points_list = [resource[of_key]]
-                function_name = convert.flatten(resource["uid"])
+    uid_to_columns: dict[str, tuple[list[npt.NDArray[np.float64]], list[npt.NDArray[np.float64]]]]
+    uid_to_columns = {}
+    for persistent_properties, columns, resource_count in profile.all_resources_by_type():
+        x_columns, y_columns = uid_to_columns.setdefault(persistent_properties["uid"], ([], []))
+        x_columns.append(column_to_array(persistent_properties, columns, resource_count, per_key))
+        y_columns.append(column_to_array(persistent_properties, columns, resource_count, of_key))
+
+    for function_name in sorted(uid_to_columns.keys()):
+        x_columns, y_columns = uid_to_columns[function_name]
+        if len(x_columns) == 1:
+            yield x_columns[0], y_columns[0], function_name
         else:
-            # Add the data points
-            x_points_list.append(resource[per_key])
-            y_points_list.append(resource[of_key])
-    # End of resources, yield the current lists
-    if x_points_list:
-        yield x_points_list, y_points_list, function_name
+            yield np.concatenate(x_columns), np.concatenate(y_columns), function_name
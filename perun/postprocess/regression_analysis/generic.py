@@ -15,15 +15,63 @@ the given argument and return value conventions.
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any, Iterable, Callable
+from typing import Any, Iterable, Callable, Optional, TYPE_CHECKING
 import math
 
 # Third-Party Imports
+import numpy as np
 
 # Perun Imports
 from perun.postprocess.regression_analysis import tools
 from perun.utils.common import common_kit
 
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+
+class RegressionPoints:
+    """Regression data points of single function shared by all computed models
+
+    The points are converted to arrays only once and each distinct (vectorized) transformation of
+    the coordinates is computed only once and then reused by all models that need it.
+
+    :ivar ndarray x_pts: the array of x data points
+    :ivar ndarray y_pts: the array of y data points
+    :ivar dict _transformed: cache of transformed coordinates and masks of their valid values
+    """
+
+    __slots__ = ["x_pts", "y_pts", "_transformed"]
+
+    def __init__(self, x_pts: list[float], y_pts: list[float]) -> None:
+        """Converts the data points to arrays
+
+        :param list x_pts: the list of x data points
+        :param list y_pts: the list of y data points
+        """
+        self.x_pts: npt.NDArray[np.float64] = np.asarray(x_pts, dtype=np.float64)
+        self.y_pts: npt.NDArray[np.float64] = np.asarray(y_pts, dtype=np.float64)
+        self._transformed: dict[
+            tuple[str, Callable[..., Any]], tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]
+        ] = {}
+
+    def transform(
+        self, axis: str, vf: Callable[..., Any]
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+        """Applies the vectorized transformation on the coordinates of given axis
+
+        Values outside the domain of the transformation (e.g. log of non-positive values) are
+        masked out as invalid.
+
+        :param str axis: either 'x' or 'y'
+        :param function vf: vectorized function (e.g. numpy ufunc) modifying the values
+        :returns tuple: array of transformed values and mask of its valid values
+        """
+        if (transformed := self._transformed.get((axis, vf))) is None:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                values = vf(self.x_pts if axis == "x" else self.y_pts)
+            transformed = self._transformed[(axis, vf)] = (values, np.isfinite(values))
+        return transformed
+
 
 def generic_compute_regression(
     data_gen: Iterable[dict[str, Any]],
@@ -62,6 +110,9 @@ def generic_regression_data(
     f_x: Callable[[float], float],
     f_y: Callable[[float], float],
     steps: int,
+    vf_x: Optional[Callable[..., Any]] = None,
+    vf_y: Optional[Callable[..., Any]] = None,
+    points: Optional[RegressionPoints] = None,
     **_: Any,
 ) -> Iterable[dict[str, float]]:
     """The generic data generator.
@@ -70,7 +121,8 @@ def generic_regression_data(
     values and the number of points.
 
     'f_x' and 'f_y' refer to the x and y values modification for the sums (e.g. log10 for x values
-    => sum of log10(x) values).
+    => sum of log10(x) values). If the model provides also their vectorized versions 'vf_x' and
+    'vf_y', the sums are computed on arrays of points instead (see RegressionPoints).
 
     The 'steps' allows to split the points sequence into parts (for iterative computation),
     where each part continues the computation (the part contains results from the previous).
@@ -85,27 +137,35 @@ def generic_regression_data(
     :param function f_y: function object for modification of y values (e.g. log10, **2, etc.) as
         specified by the model formula
     :param int steps: splits the data generation into specified steps
+    :param function vf_x: vectorized version of 'f_x'
+    :param function vf_y: vectorized version of 'f_y'
+    :param RegressionPoints points: data points shared by the computed models
     :raises GenericRegressionExceptionBase: the derived exceptions
     :raises TypeError: if the required function arguments are not in the unpacked dictionary input
     :returns iterable: generator object which produces intermediate results for each computation
         step in a data dictionary
     """
+    if vf_x is not None and vf_y is not None:
+        yield from _vectorized_regression_data(
+            points or RegressionPoints(x_pts, y_pts), vf_x, vf_y, steps
+        )
+        return
+
     # We also need the min and max values
     x_min = x_pts[0]
     x_max = x_pts[0]
 
     # Compute the sums of x, y, x^2, y^2 and x*y
     x_sum, y_sum, x_square_sum, y_square_sum, xy_sum = 0.0, 0.0, 0.0, 0.0, 0.0
+    pts_num = 0
     # Split the computation into specified steps
     for part_start, part_end in tools.split_sequence(len(x_pts), steps):
-        skipped = 0
         for x_pt, y_pt in zip(x_pts[part_start:part_end], y_pts[part_start:part_end]):
             # Account for possible domain errors with f_x and f_y functions, simply skip the point
             try:
                 x_tmp = f_x(x_pt)
                 y_tmp = f_y(y_pt)
             except ValueError:
-                skipped += 1
                 continue
 
             # Compute the intermediate results
@@ -114,12 +174,12 @@ def generic_regression_data(
             x_square_sum += x_tmp**2
             y_square_sum += y_tmp**2
             xy_sum += x_tmp * y_tmp
+            pts_num += 1
 
             # Check the min and max
             x_min, x_max = min(x_min, x_pt), max(x_max, x_pt)
 
         # Computation step is complete, save the data
-        pts_num = part_end - skipped
         data = dict(
             x_sum=x_sum,
             y_sum=y_sum,
@@ -134,6 +194,57 @@ def generic_regression_data(
         yield data
 
 
+def _vectorized_regression_data(
+    points: RegressionPoints, vf_x: Callable[..., Any], vf_y: Callable[..., Any], steps: int
+) -> Iterable[dict[str, float]]:
+    """The array-based version of the generic data generator
+
+    The sums of each step are computed at once for all points of the step; the points outside
+    the domain of the transformations are masked out.
+
+    :param RegressionPoints points: data points shared by the computed models
+    :param function vf_x: vectorized modification of x values
+    :param function vf_y: vectorized modification of y values
+    :param int steps: splits the data generation into specified steps
+    :returns iterable: generator object which produces intermediate results for each computation
+        step in a data dictionary
+    """
+    x_tmp, x_valid = points.transform("x", vf_x)
+    y_tmp, y_valid = points.transform("y", vf_y)
+    valid = x_valid & y_valid
+    x_tmp, y_tmp, x_pts = x_tmp[valid], y_tmp[valid], points.x_pts[valid]
+    # Indices of the ends of the steps among the valid points
+    part_ends = np.cumsum(valid)
+
+    x_min = x_max = float(points.x_pts[0])
+    x_sum, y_sum, x_square_sum, y_square_sum, xy_sum = 0.0, 0.0, 0.0, 0.0, 0.0
+    part_start = 0
+    for _, end in tools.split_sequence(len(points.x_pts), steps):
+        part_end = int(part_ends[end - 1])
+        if part_end > part_start:
+            x_part, y_part = x_tmp[part_start:part_end], y_tmp[part_start:part_end]
+            x_sum += float(x_part.sum())
+            y_sum += float(y_part.sum())
+            x_square_sum += float(np.dot(x_part, x_part))
+            y_square_sum += float(np.dot(y_part, y_part))
+            xy_sum += float(np.dot(x_part, y_part))
+            x_min = min(x_min, float(x_pts[part_start:part_end].min()))
+            x_max = max(x_max, float(x_pts[part_start:part_end].max()))
+            part_start = part_end
+
+        yield dict(
+            x_sum=x_sum,
+            y_sum=y_sum,
+            xy_sum=xy_sum,
+            x_sq_sum=x_square_sum,
+            y_sq_sum=y_square_sum,
+            pts_num=part_end,
+            num_sqrt=math.sqrt(part_end),
+            x_start=x_min,
+            x_end=x_max,
+        )
+
+
 def generic_regression_coefficients(
     f_a: Callable[[float], float],
     f_b: Callable[[float], float],
@@ -6,15 +6,20 @@ This module exposes all currently implemented computational methods for regressi
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any, Optional, Iterator, Protocol
+from typing import Any, Optional, Iterator, Protocol, TYPE_CHECKING
 import collections
 
 # Third-Party Imports
 
 # Perun Imports
-from perun.postprocess.regression_analysis import regression_models, tools
+from perun.postprocess.regression_analysis import generic, regression_models, tools
 from perun.utils import exceptions
 from perun.utils import log
+from perun.utils.common import parallel_kit
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 
 class ComputationMethod(Protocol):
@@ -31,7 +36,7 @@ def get_supported_param_methods() -> list[str]:
 
 
 def compute(
-    data_gen: Iterator[tuple[list[float], list[float], str]],
+    data_gen: Iterator[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], str]],
     method: str,
     models: tuple[str],
     **kwargs: Any,
@@ -51,17 +56,11 @@ def compute(
     # Split the models into derived and standard ones
     derived, models = regression_models.filter_derived(models)
     analysis = []
-    for chunk in data_gen:
-        try:
-            # First compute all the standard models
-            for result in _METHODS[method](chunk[0], chunk[1], models, **kwargs):
-                result["uid"] = chunk[2]
-                result["method"] = method
-                analysis.append(result)
-        except exceptions.GenericRegressionExceptionBase as exc:
-            log.minor_info(
-                f"unable to perform regression analysis on function '{chunk[2]} due to: {exc}",
-            )
+    # First compute all the standard models
+    for results, error in parallel_kit.map_chunks(compute_chunk, data_gen, method, models, kwargs):
+        analysis.extend(results)
+        if error:
+            log.minor_info(error)
     # Compute the derived models
     for der in compute_derived(derived, analysis, **kwargs):
         analysis.append(der)
@@ -69,6 +68,38 @@ def compute(
     return list(map(_transform_to_output_data, analysis))
 
 
+def compute_chunk(
+    x_pts: list[float],
+    y_pts: list[float],
+    uid: str,
+    method: str,
+    models: tuple[str],
+    kwargs: dict[str, Any],
+) -> tuple[list[dict[str, Any]], str]:
+    """Computes the standard regression models for the data points of single uid
+
+    :param list x_pts: the list of x points coordinates
+    :param list y_pts: the list of y points coordinates
+    :param str uid: the uid of the data points
+    :param str method: the _METHODS key value indicating requested computation method
+    :param tuple of str models: tuple of standard regression models to compute
+    :param dict kwargs: various additional configuration arguments for specific models
+    :returns tuple: the computation results (only with the values needed for the output and
+        derived models) and the message of error that stopped the computation (empty if there was
+        no error)
+    """
+    results = []
+    try:
+        for result in _METHODS[method](x_pts, y_pts, models, **kwargs):
+            result["uid"] = uid
+            result["method"] = method
+            # Drop the intermediate data (points, model functions), so the result can be pickled
+            results.append({key: result[key] for key in _RESULT_KEYS if key in result})
+    except exceptions.GenericRegressionExceptionBase as exc:
+        return results, f"unable to perform regression analysis on function '{uid} due to: {exc}"
+    return results, ""
+
+
 def compute_derived(
     derived_models: tuple[str], analysis: list[dict[str, Any]], **kwargs: Any
 ) -> Iterator[dict[str, Any]]:
@@ -102,10 +133,13 @@ def full_computation(
     :returns iterable: the generator object which produces computed models one by one as a
         transformed output data dictionary
     """
+    # The points are shared by all the models, hence all the transformations are computed once
+    points = generic.RegressionPoints(x_pts, y_pts)
     # Get all the models properties
     for model in regression_models.map_keys_to_models(computation_models):
         # Update the properties accordingly
         model["steps"] = 1
+        model["points"] = points
         model = _build_uniform_regression_data_format(x_pts, y_pts, model)
         # Compute each model
         for result in model["computation"](**model):
@@ -405,10 +439,12 @@ def _models_initial_step(
     """
     model_generators = []
     results = []
+    points = generic.RegressionPoints(x_pts, y_pts)
     # Get all the models properties
     for model in regression_models.map_keys_to_models(computation_models):
         # Transform the properties
         model["steps"] = steps
+        model["points"] = points
         data = _build_uniform_regression_data_format(x_pts, y_pts, model)
         # Do a single computational step for each model
         model_generators.append(model["computation"](**data))
@@ -493,6 +529,20 @@ def _build_uniform_regression_data_format(
     return model
 
 
+# keys of the computed results required by the output data and by the derived models
+_RESULT_KEYS = [
+    "model",
+    "coeffs",
+    "r_square",
+    "x_start",
+    "x_end",
+    "method",
+    "uid",
+    "y_sum",
+    "pts_num",
+    "tss",
+]
+
 # supported methods mapping
 # - every method must be called with proper argument signature in 'compute' function
 # -- the signature: x, y, models, **kwargs
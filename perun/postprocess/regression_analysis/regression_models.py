@@ -12,6 +12,7 @@ from typing import Callable, Iterable, Any, cast
 import math
 
 # Third-Party Imports
+import numpy as np
 
 # Perun Imports
 from perun.postprocess.regression_analysis import derived, generic, specific
@@ -154,6 +155,7 @@ def filter_derived(regression_models_keys: tuple[str]) -> tuple[tuple[str], tupl
 # - model: full name of the regression model
 # - f_x: function that modifies x values in model computation according to formulae
 # - f_y: function that modifies y values in model computation according to formulae
+# - vf_x, vf_y: vectorized versions of f_x and f_y (applied on arrays of values)
 # - f_a: function that modifies b0 (a) coefficient in model computation according to formulae
 # - f_b: function that modifies b1 (b) coefficient in model computation according to formulae
 # - data_gen: function that generates intermediate values from points for model computation
@@ -188,6 +190,8 @@ MODEL_MAP: dict[str, dict[str, Any]] = {
         "model": "linear",
         "f_x": lambda x: x,
         "f_y": lambda y: y,
+        "vf_x": np.positive,
+        "vf_y": np.positive,
         "f_a": lambda a: a,
         "f_b": lambda b: b,
         "data_gen": generic.generic_regression_data,
@@ -209,6 +213,8 @@ MODEL_MAP: dict[str, dict[str, Any]] = {
         "model": "logarithmic",
         "f_x": math.log,
         "f_y": lambda y: y,
+        "vf_x": np.log,
+        "vf_y": np.positive,
         "f_a": lambda a: a,
         "f_b": lambda b: b,
         "data_gen": generic.generic_regression_data,
@@ -249,6 +255,8 @@ MODEL_MAP: dict[str, dict[str, Any]] = {
         "model": "power",
         "f_x": math.log10,
         "f_y": math.log10,
+        "vf_x": np.log10,
+        "vf_y": np.log10,
         "f_a": lambda a: 10**a,
         "f_b": lambda b: b,
         "data_gen": generic.generic_regression_data,
@@ -270,6 +278,8 @@ MODEL_MAP: dict[str, dict[str, Any]] = {
         "model": "exponential",
         "f_x": lambda x: x,
         "f_y": math.log10,
+        "vf_x": np.positive,
+        "vf_y": np.log10,
         "f_a": lambda a: 10**a,
         "f_b": lambda b: 10**b,
         "data_gen": generic.generic_regression_data,
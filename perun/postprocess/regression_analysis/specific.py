@@ -7,17 +7,22 @@ This module contains the required specific versions for the models computation.
 from __future__ import annotations
 
 # Standard Imports
-from typing import Any, Iterable
+from typing import Any, Iterable, Optional
 
 # Third-Party Imports
+import numpy as np
 
 # Perun Imports
-from perun.postprocess.regression_analysis import tools
+from perun.postprocess.regression_analysis import generic, tools
 from perun.utils.common import common_kit
 
 
 def specific_quad_data(
-    x_pts: list[float], y_pts: list[float], steps: int, **_: Any
+    x_pts: list[float],
+    y_pts: list[float],
+    steps: int,
+    points: Optional[generic.RegressionPoints] = None,
+    **_: Any,
 ) -> Iterable[dict[str, Any]]:
     """The quadratic data generator.
 
@@ -33,37 +38,38 @@ def specific_quad_data(
     :param list x_pts: the list of x data points
     :param list y_pts: the list of y data points
     :param int steps: splits the data generation into specified steps
+    :param RegressionPoints points: data points shared by the computed models
     :raises GenericRegressionExceptionBase: the derived exceptions
     :raises TypeError: if the required function arguments are not in the unpacked dictionary input
     :returns iterable: generator object which produces intermediate results for each computation
         step in a data dictionary
     """
+    points = points or generic.RegressionPoints(x_pts, y_pts)
     # We also need the min and max values
-    x_min = x_pts[0]
-    x_max = x_pts[0]
+    x_min = x_max = float(points.x_pts[0])
 
     # Compute the sums of x, y, y^2, x^2, x^3, x^4, x * y and x^2 * y
     x_sum, y_sum, x_square_sum, x_cube_sum = 0.0, 0.0, 0.0, 0.0
     x4_sum, xy_sum, x_square_y_sum, y_square_sum = 0.0, 0.0, 0.0, 0.0
     # Split the computation into specified steps
     for part_start, part_end in tools.split_sequence(len(x_pts), steps):
-        skipped = 0
-        for x_pt, y_pt in zip(x_pts[part_start:part_end], y_pts[part_start:part_end]):
-            # Compute the intermediate results
-            x_sum += x_pt
-            y_sum += y_pt
-            y_square_sum += y_pt**2
-            x_square_sum += x_pt**2
-            x_cube_sum += x_pt**3
-            x4_sum += x_pt**4
-            xy_sum += x_pt * y_pt
-            x_square_y_sum += (x_pt**2) * y_pt
-
-            # Check the min and max
-            x_min, x_max = min(x_min, x_pt), max(x_max, x_pt)
+        # Compute the intermediate results for all points of the step at once
+        x_part, y_part = points.x_pts[part_start:part_end], points.y_pts[part_start:part_end]
+        x_square_part = x_part * x_part
+        x_sum += float(x_part.sum())
+        y_sum += float(y_part.sum())
+        y_square_sum += float(np.dot(y_part, y_part))
+        x_square_sum += float(x_square_part.sum())
+        x_cube_sum += float(np.dot(x_square_part, x_part))
+        x4_sum += float(np.dot(x_square_part, x_square_part))
+        xy_sum += float(np.dot(x_part, y_part))
+        x_square_y_sum += float(np.dot(x_square_part, y_part))
+
+        # Check the min and max
+        x_min, x_max = min(x_min, float(x_part.min())), max(x_max, float(x_part.max()))
 
         # Computation step is complete, save the data
-        pts_num = part_end - skipped
+        pts_num = part_end
         data = {
             "x_sum": x_sum,
             "y_sum": y_sum,
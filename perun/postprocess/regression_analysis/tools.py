@@ -5,7 +5,7 @@ from __future__ import annotations
 
 # Standard Imports
 from operator import itemgetter
-from typing import Any, Iterable, TYPE_CHECKING
+from typing import Any, Iterable, TYPE_CHECKING, TypeVar
 import random
 
 # Third-Party Imports
@@ -19,6 +19,8 @@ if TYPE_CHECKING:
     import perun.profile.factory as profiles
 
 
+# Sequence of the coordinates of the points, either list or array (e.g. from the data providers)
+Points = TypeVar("Points", "list[float]", "npt.NDArray[np.float64]")
 # Minimum points count to perform the regression
 MIN_POINTS_COUNT: int = 3
 # R^2 value if computation failed
@@ -104,17 +106,23 @@ def shuffle_points(x_pts: list[float], y_pts: list[float]) -> tuple[list[float],
     return list(res_x_pts), list(res_y_pts)
 
 
-def sort_points(x_pts: list[float], y_pts: list[float]) -> tuple[list[float], list[float]]:
+def sort_points(x_pts: Points, y_pts: Points) -> tuple[Points, Points]:
     """Sorts the x and y_pts coordinates sequence by x values in the ascending order.
 
-    :param list x_pts: the x coordinates list
-    :param list y_pts: the y_pts coordinates list
+    The arrays of points (e.g. from the data providers) are sorted as arrays, the points with the
+    same x value keep their order in both cases.
+
+    :param list x_pts: the x coordinates list or array
+    :param list y_pts: the y_pts coordinates list or array
     :raises InvalidPointsException: if the points count is too low or their coordinates list have
         different lengths
     :returns tuple: (x: the sorted x sequence, y_pts: the sorted y_pts sequence)
     """
-    # Build one list to ensure the coordinates are paired after the sorting
     check_points(len(x_pts), len(y_pts), MIN_POINTS_COUNT)
+    if isinstance(x_pts, np.ndarray) and isinstance(y_pts, np.ndarray):
+        order = np.argsort(x_pts, kind="stable")
+        return x_pts[order], y_pts[order]
+    # Build one list to ensure the coordinates are paired after the sorting
     points = list(zip(x_pts, y_pts))
     points.sort(key=itemgetter(0))
     res_x_pts, res_y_pts = zip(*points)
@@ -4,7 +4,7 @@ Module with regressogram computational method and auxiliary methods at executing
 from __future__ import annotations
 
 # Standard Imports
-from typing import Iterator, Any
+from typing import Iterator, Any, TYPE_CHECKING
 import inspect
 
 # Third-Party Imports
@@ -15,6 +15,10 @@ import sklearn.metrics
 
 # Perun Imports
 from perun.postprocess.regression_analysis import tools
+from perun.utils.common import parallel_kit
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
 
 # required arguments at regressogram post-processor
 _REQUIRED_KEYS = ["bucket_method", "statistic_function"]
@@ -39,7 +43,8 @@ def get_supported_selectors() -> list[str]:
 
 
 def compute_regressogram(
-    data_gen: Iterator[tuple[list[float], list[float], str]], config: dict[str, Any]
+    data_gen: Iterator[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], str]],
+    config: dict[str, Any],
 ) -> list[dict[str, Any]]:
     """
     The regressogram wrapper to execute the analysis on the individual chunks of resources.
@@ -52,24 +57,33 @@ def compute_regressogram(
     tools.validate_dictionary_keys(config, _REQUIRED_KEYS, [])
 
     # list of result of the analysis
-    analysis = []
-    for x_pts, y_pts, uid in data_gen:
-        # Check whether the user gives as own number of buckets or select the method to its estimate
-        buckets = (
-            config["bucket_number"] if config.get("bucket_number") else config["bucket_method"]
-        )
-        result = regressogram(x_pts, y_pts, config["statistic_function"], buckets)
-        result.update(
-            {
-                "uid": uid,
-                "model": "regressogram",
-                "per_key": config["per_key"],
-                "of_key": config["of_key"],
-            }
-        )
-        # add partial result to the result list - create output dictionaries
-        analysis.append(result)
-    return analysis
+    return list(parallel_kit.map_chunks(compute_regressogram_chunk, data_gen, config))
+
+
+def compute_regressogram_chunk(
+    x_pts: list[float], y_pts: list[float], uid: str, config: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Computes the regressogram for the data points of single uid.
+
+    :param list x_pts: the list of x points coordinates
+    :param list y_pts: the list of y points coordinates
+    :param str uid: the uid of the data points
+    :param dict config: the perun and option context
+    :return dict: the computed regressogram model
+    """
+    # Check whether the user gives as own number of buckets or select the method to its estimate
+    buckets = config["bucket_number"] if config.get("bucket_number") else config["bucket_method"]
+    result = regressogram(x_pts, y_pts, config["statistic_function"], buckets)
+    result.update(
+        {
+            "uid": uid,
+            "model": "regressogram",
+            "per_key": config["per_key"],
+            "of_key": config["of_key"],
+        }
+    )
+    return result
 
 
 def regressogram(
@@ -15,8 +15,9 @@ complex queries and statistical tests over the profiles.
 from __future__ import annotations
 
 # Standard Imports
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 import array
+import itertools
 import operator
 
 # Third-Party Imports
@@ -27,17 +28,22 @@ import pandas
 from perun.postprocess.regression_analysis import transform
 from perun.profile import query
 from perun.utils.common import common_kit
+from perun.utils.exceptions import SuppressedExceptions
 
 if TYPE_CHECKING:
     from perun.profile.factory import Profile
 
 
-def resources_to_pandas_dataframe(profile: Profile) -> pandas.DataFrame:
+def resources_to_pandas_dataframe(
+    profile: Profile, columns: Optional[Iterable[str]] = None, categorical: bool = False
+) -> pandas.DataFrame:
     """Converts the profile (w.r.t :ref:`profile-spec`) to format supported by
     `pandas`_ library.
 
     Queries through the resources in the `profile`, and flattens each
-    key and value to the tabular representation. Refer to `pandas`_ library for
+    key and value to the tabular representation. The table is constructed column by column for
+    each resource type: persistent values are repeated and collectable columns are sliced, so no
+    resource is constructed on its own. Refer to `pandas`_ library for
     more possibilities how to work with the tabular representation of collected
     resources.
 
@@ -59,24 +65,112 @@ def resources_to_pandas_dataframe(profile: Profile) -> pandas.DataFrame:
         0  main:../memo...:22         main        22   ../memory_collect_test.c
         1  main:../memo...:27         main        27   ../memory_collect_test.c
 
+    Since the tables of large profiles can be huge, one can restrict the set of the converted
+    ``columns`` and convert the columns of repeated values (such as ``uid``) to categorical
+    dtypes by setting ``categorical``.
+
     :param Profile profile: dictionary with profile w.r.t. :ref:`profile-spec`
+    :param columns: if set, then only the given columns are converted (missing columns are
+        ignored)
+    :param categorical: if set to true, then the columns of non-numeric values are converted to
+        ``pandas.Categorical``
     :returns: converted profile to ``pandas.DataFramelist`` with resources
         flattened as a pandas dataframe
     """
     # Since some keys may be missing in the resources, we consider the possible fields
     resource_keys = list(profile.all_resource_fields())
-    values: dict[str, list[Any] | array.array[float] | array.array[int]] = {
-        key: [] for key in resource_keys
+    if columns is not None:
+        selected_columns = set(columns)
+        resource_keys = [key for key in resource_keys if key in selected_columns]
+        if "snapshots" not in selected_columns and "snapshots" in resource_keys:
+            resource_keys.remove("snapshots")
+    chunks: dict[str, list[tuple[Any, int, bool]]] = {key: [] for key in resource_keys}
+    with_snapshots = columns is None or "snapshots" in selected_columns
+    snapshot_chunks: list[tuple[Any, int, bool]] = []
+
+    # All persistent values at this point should be flat; they take precedence over collectables
+    for persistent, collectable, count in profile.all_resources_by_type():
+        for resource_key in resource_keys:
+            if resource_key in persistent:
+                chunks[resource_key].append((persistent[resource_key], count, True))
+            elif resource_key in collectable:
+                chunks[resource_key].append((collectable[resource_key][:count], count, False))
+            else:
+                chunks[resource_key].append((numpy.nan, count, True))
+        if with_snapshots:
+            if "snapshot" in persistent:
+                snapshot_chunks.append((persistent["snapshot"], count, True))
+            elif "snapshot" in collectable:
+                snapshot_chunks.append((collectable["snapshot"][:count], count, False))
+            else:
+                snapshot_chunks.append((0, count, True))
+
+    values: dict[str, Any] = {
+        key: merge_column_chunks(key_chunks, categorical) for key, key_chunks in chunks.items()
     }
-    values["snapshots"] = array.array("I")
+    if with_snapshots:
+        values["snapshots"] = array.array(
+            "I", itertools.chain.from_iterable(iterate_column_chunks(snapshot_chunks))
+        )
+    return pandas.DataFrame(values)
 
-    # All resources at this point should be flat
-    for snapshot, resource in profile.all_resources(True):
-        values["snapshots"].append(snapshot)
-        for resource_key in resource_keys:
-            values[resource_key].append(resource.get(resource_key, numpy.nan))
 
-    return pandas.DataFrame(values)
+def iterate_column_chunks(chunks: list[tuple[Any, int, bool]]) -> Iterable[Iterable[Any]]:
+    """Iterates through the values of the chunks of one column
+
+    :param chunks: list of chunks of column, i.e. either repeated value or slice of the column
+    :return: iterable of iterables of values of the chunks
+    """
+    for value, count, is_repeated in chunks:
+        yield itertools.repeat(value, count) if is_repeated else value
+
+
+def merge_column_chunks(
+    chunks: list[tuple[Any, int, bool]], categorical: bool
+) -> list[Any] | numpy.ndarray[Any, Any] | pandas.Categorical:
+    """Merges the chunks of one column of the dataframe
+
+    Each chunk is either a value repeated for some number of rows (e.g. persistent value of the
+    resource type) or a slice of collectable column. If all the chunks are numeric, they are merged
+    directly to the ``numpy`` array (with the same dtype that would be inferred by ``pandas``).
+    Columns of repeated values can be further constructed directly as categorical. Otherwise, the
+    chunks are merged into one list.
+
+    :param chunks: list of chunks of the column, i.e. triples of value, count and flag whether
+        the value is repeated or whether it is the slice of the column
+    :param categorical: if set to true, then non-numeric columns are converted to categorical
+    :return: merged column
+    """
+    arrays = []
+    for value, count, is_repeated in chunks:
+        if not is_repeated and isinstance(value, array.array):
+            arrays.append(numpy.asarray(value))
+        elif is_repeated and type(value) in (int, float):
+            try:
+                arrays.append(numpy.full(count, value))
+            except OverflowError:
+                break
+        else:
+            break
+    else:
+        unsigned = [array_chunk.dtype.kind == "u" for array_chunk in arrays]
+        if arrays and (all(unsigned) or not any(unsigned)):
+            return numpy.concatenate(arrays)
+
+    if categorical and all(is_repeated for (_, _, is_repeated) in chunks):
+        with SuppressedExceptions(TypeError):
+            categories = {value: None for (value, _, _) in chunks if value is not numpy.nan}
+            codes = {category: code for code, category in enumerate(categories)}
+            return pandas.Categorical.from_codes(
+                numpy.repeat(
+                    [codes.get(value, -1) for (value, _, _) in chunks],
+                    [count for (_, count, _) in chunks],
+                ),
+                categories=pandas.Index(list(categories)),
+            )
+
+    merged = list(itertools.chain.from_iterable(iterate_column_chunks(chunks)))
+    return pandas.Categorical(merged) if categorical and merged else merged
 
 
 def models_to_pandas_dataframe(profile: Profile) -> pandas.DataFrame:
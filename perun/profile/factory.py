@@ -9,10 +9,12 @@ from __future__ import annotations
 
 # Standard Imports
 from collections.abc import MutableMapping
-from typing import Any, Iterator, Iterable, TYPE_CHECKING
+from typing import Any, Iterator, Iterable, Optional, TYPE_CHECKING
+import array
 import collections
 import itertools
 import operator
+import sys
 
 # Third-Party Imports
 import click
@@ -29,17 +31,146 @@ if TYPE_CHECKING:
     from perun.utils.structs import ModelRecord
 
 
+# Type codes of the array buffers used for homogeneous numeric collectable columns
+INT_COLUMN_TYPECODES = ("q", "Q")
+FLOAT_COLUMN_TYPECODE = "d"
+
+
+def to_column(values: Iterable[Any]) -> list[Any] | array.array[Any]:
+    """Converts the sequence of collectable values to the most compact column representation
+
+    Columns consisting solely of integers are stored in signed (or, if they overflow, unsigned)
+    64-bit ``array.array`` buffers, columns consisting solely of floats are stored in ``double``
+    buffers. Any other column (mixed, strings, booleans, too big integers, etc.) is kept as a list,
+    so the values retrieved from the column are always identical to the stored ones.
+
+    :param values: sequence of collectable values
+    :return: either array buffer or list of values
+    """
+    if isinstance(values, array.array):
+        return values
+    values = values if isinstance(values, list) else list(values)
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        for typecode in INT_COLUMN_TYPECODES:
+            try:
+                return array.array(typecode, values)
+            except OverflowError:
+                continue
+    elif kinds == {float}:
+        return array.array(FLOAT_COLUMN_TYPECODE, values)
+    return values
+
+
+def from_column(column: list[Any] | array.array[Any]) -> list[Any]:
+    """Converts the column back to the list of values
+
+    :param column: either array buffer or list of values
+    :return: list of values
+    """
+    return column.tolist() if isinstance(column, array.array) else column
+
+
+def extend_column(
+    column: list[Any] | array.array[Any], values: Iterable[Any]
+) -> list[Any] | array.array[Any]:
+    """Appends the values to the column, keeping the column in its compact representation
+
+    The compact column is extended in place, if the values fit its type. Otherwise (e.g. floats
+    are appended to integers), the column is promoted to the list once and the values are appended
+    to it. Empty columns are replaced by the compact representation of the values.
+
+    :param column: either array buffer or list of values
+    :param values: sequence of appended collectable values
+    :return: the extended column (either the original one or its promoted copy)
+    """
+    values = to_column(values)
+    if (
+        isinstance(column, array.array)
+        and isinstance(values, array.array)
+        and column.typecode == values.typecode
+    ):
+        column.extend(values)
+    elif not column:
+        return (
+            array.array(values.typecode, values)
+            if isinstance(values, array.array)
+            else list(values)
+        )
+    else:
+        if isinstance(column, array.array):
+            column = column.tolist()
+        column.extend(from_column(values))
+    return column
+
+
+def intern_value(value: Any) -> Any:
+    """Recursively interns all strings in the (persistent) value
+
+    Persistent values (such as traces or uids) are usually shared among many resource types, hence
+    interning them reduces the memory of the profile significantly.
+
+    :param value: interned value
+    :return: value with interned strings
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    elif isinstance(value, dict):
+        return {sys.intern(k): intern_value(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [intern_value(v) for v in value]
+    return value
+
+
+def freeze_value(value: Any) -> tuple[Any, ...]:
+    """Recursively converts the (persistent) value to hashable representation
+
+    Lists are converted to tuples tagged by ``"L"``, dictionaries to tuples of their items tagged
+    by ``"D"`` and scalars are paired with their types, so e.g. the traces can be used as keys of
+    dictionaries without formatting them into strings, while different values (e.g. ``1`` and
+    ``1.0``, or lists and dictionaries with the same content) are never frozen to the same key.
+
+    :param value: frozen value
+    :return: hashable representation of the value
+    """
+    if isinstance(value, list):
+        try:
+            # Fast path for lists of flat dictionaries (e.g. traces), which is done without
+            # inspecting each frame in Python; hashing fails if the frames contain nested values
+            frozen = tuple(
+                [
+                    ("D", tuple(zip(frame.keys(), map(type, frame.values()), frame.values())))
+                    for frame in value
+                ]
+            )
+            hash(frozen)
+            return ("L", frozen)
+        except (TypeError, AttributeError):
+            pass
+        return ("L", tuple([freeze_value(v) for v in value]))
+    elif isinstance(value, dict):
+        return ("D", tuple([(k, *freeze_value(v)) for k, v in value.items()]))
+    return (type(value), value)
+
+
 class Profile(MutableMapping[str, Any]):
     """
+    The collectable properties of resources are stored in columnar fashion: for each resource type,
+    each collectable property is stored as single column. Homogeneous numeric columns are kept as
+    compact ``array.array`` buffers (see :func:`to_column`), the rest is kept as lists.
+
     :ivar dict _storage: internal storage of the profile
     :ivar dict _tuple_to_resource_type_map: map of tuple of persistent records of resources to
         unique identifier of those resources
+    :ivar dict _frozen_value_ids: intern table of compound persistent values (e.g. traces), which
+        maps their frozen representation (see :func:`freeze_value`) to small unique ids
     :ivar Counter _uid_counter: counter of how many resources type uid has
     """
 
     __slots__ = [
         "_storage",
         "_tuple_to_resource_type_map",
+        "_frozen_value_ids",
         "_resource_type_to_flattened_resources_map",
         "_uid_counter",
     ]
@@ -80,17 +211,40 @@ class Profile(MutableMapping[str, Any]):
             "resource_type_map": {},
             "models": global_data.get("models", []) if isinstance(global_data, dict) else [],
         }
-        self._tuple_to_resource_type_map: dict[str, str] = {}
+        self._tuple_to_resource_type_map: dict[tuple[Any, ...], str] = {}
+        self._frozen_value_ids: dict[Any, int] = {}
         self._resource_type_to_flattened_resources_map: dict[str, dict[str, Any]] = {}
         self._uid_counter: collections.Counter[str] = collections.Counter()
 
         for key, value in initialization_data.items():
             if key in ("resources", "snapshots", "global"):
                 self.update_resources(value, key)
+            elif key == "resource_type_map":
+                self._storage[key] = intern_value(value)
             else:
                 self._storage[key] = value
         config.runtime().append("context.profiles", self)
 
+    def __getstate__(self) -> dict[str, Any]:
+        """Returns the state of the profile for pickling
+
+        :return: dictionary of all slots of the profile
+        """
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores the state of the unpickled profile
+
+        :param state: dictionary of all slots of the profile
+        """
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        if "_frozen_value_ids" not in state:
+            # Profiles pickled by older versions used string keys of resource types
+            self._tuple_to_resource_type_map = {}
+            self._frozen_value_ids = {}
+        config.runtime().append("context.profiles", self)
+
     def update_resources(
         self,
         resource_list: Any,
@@ -126,9 +280,21 @@ class Profile(MutableMapping[str, Any]):
                 )
         elif isinstance(resource_list, (dict, Profile)):
             self._storage["resources"].update(resource_list)
+            self._compact_resources(resource_list.keys())
         else:
             self._translate_resources(resource_list, {})
 
+    def _compact_resources(self, resource_types: Iterable[str]) -> None:
+        """Converts the collectable columns of the resource types to their compact representation
+
+        :param resource_types: the updated resource types
+        """
+        for resource_type in resource_types:
+            resources = self._storage["resources"][resource_type]
+            for key, column in resources.items():
+                if isinstance(column, list):
+                    resources[key] = to_column(column)
+
     def _translate_resources(
         self, resource_list: list[dict[str, Any]], additional_params: dict[str, Any]
     ) -> None:
@@ -136,23 +302,17 @@ class Profile(MutableMapping[str, Any]):
 
         Given a list of resources, this is all flattened into a new format: a dictionary that
         maps unique resource identifiers (set of persistent properties) to list of collectable
-        properties (such as amounts, addresses, etc.)
+        properties (such as amounts, addresses, etc.). The new values are first gathered per
+        resource type and then appended to the stored (compact) columns at once.
 
         :param resource_list: list of dictionaries, i.e. actual resources
         :param additional_params: additional information that are added to resources in the list
         """
-        ctx = config.runtime().safe_get("context.workload", {})
-        ctx_persistent_properties = [
-            (key, value) for (key, value) in ctx.items() if isinstance(value, str)
-        ]
-        ctx_collectable_properties = [
-            (key, value) for (key, value) in ctx.items() if not isinstance(value, str)
-        ]
-
-        # Update collectable and persistent keys (needed for merge)
-        Profile.persistent.update({key for key, val in ctx.items() if isinstance(val, str)})
-        Profile.collectable.update({key for key, val in ctx.items() if not isinstance(val, str)})
+        ctx_persistent_properties, ctx_collectable_properties = self._context_properties()
 
+        # Resources often share the very same objects of traces, which are then interned only once
+        value_cache: dict[int, tuple[Any, Any]] = {}
+        new_columns: dict[str, dict[str, list[Any]]] = {}
         for resource in resource_list:
             persistent_properties = [
                 (key, value) for (key, value) in resource.items() if key not in Profile.collectable
@@ -163,32 +323,146 @@ class Profile(MutableMapping[str, Any]):
                 (key, value) for (key, value) in resource.items() if key in Profile.collectable
             ] + ctx_collectable_properties
             resource_type = self.register_resource_type(
-                resource["uid"], tuple(persistent_properties)
+                resource["uid"], tuple(persistent_properties), value_cache
             )
-            if resource_type not in self._storage["resources"].keys():
-                self._storage["resources"][resource_type] = {
-                    key: [] for (key, _) in collectable_properties
-                }
+            if resource_type not in new_columns:
+                stored_resources = self._storage["resources"].setdefault(
+                    resource_type, {key: [] for (key, _) in collectable_properties}
+                )
+                new_columns[resource_type] = {key: [] for key in stored_resources}
+            columns = new_columns[resource_type]
             for key, value in collectable_properties:
-                self._storage["resources"][resource_type][key].append(value)
+                columns[key].append(value)
+
+        for resource_type, columns in new_columns.items():
+            resources = self._storage["resources"][resource_type]
+            for key, values in columns.items():
+                resources[key] = extend_column(resources[key], values)
 
-    def register_resource_type(self, uid: str, persistent_properties: tuple[Any, ...]) -> str:
+    def update_resource_columns(
+        self,
+        resource_columns: Iterable[tuple[dict[str, Any], dict[str, list[Any] | array.array[Any]]]],
+    ) -> None:
+        """Appends the columns of collectable properties of resources grouped by resource types
+
+        Each group is equivalent to the resources (one for each row of the columns) that share
+        all the persistent properties, however, the columns are appended to the storage at once,
+        without translating the individual resources.
+
+        The resource types, that were already stored with different collectable properties, are
+        padded with None values, so all their columns are of the same length. The columns of the
+        same type are extended in place. When the appended column does not
+        fit the type of the stored column (e.g. floats are appended to integers), the stored
+        column is promoted to the list once and the values of further groups are appended to it.
+
+        :param resource_columns: pairs of persistent properties shared by the resources of the
+            group (including the uid and additional information such as time) and the columns
+            of their collectable properties (all of the same length)
+        """
+        ctx_persistent_properties, ctx_collectable_properties = self._context_properties()
+        for persistent_properties, columns in resource_columns:
+            resource_count = len(next(iter(columns.values()), []))
+            resource_type = self.register_resource_type(
+                persistent_properties["uid"],
+                tuple(
+                    sorted(
+                        list(persistent_properties.items()) + ctx_persistent_properties,
+                        key=operator.itemgetter(0),
+                    )
+                ),
+            )
+            collectable_columns = list(columns.items()) + [
+                (key, [value] * resource_count) for (key, value) in ctx_collectable_properties
+            ]
+            resources = self._storage["resources"].setdefault(resource_type, {})
+            stored_count = len(next(iter(resources.values()), []))
+            # The resources missing some of the collectable properties are padded with None
+            for key, _ in collectable_columns:
+                if key not in resources:
+                    resources[key] = [None] * stored_count
+            for key in resources.keys() - {key for key, _ in collectable_columns}:
+                collectable_columns.append((key, [None] * resource_count))
+            for key, values in collectable_columns:
+                resources[key] = extend_column(resources[key], values)
+
+    @staticmethod
+    def _context_properties() -> tuple[list[tuple[str, Any]], list[tuple[str, Any]]]:
+        """Returns the persistent and collectable properties of the current workload context
+
+        The keys of the properties are registered as persistent and collectable keys (needed for
+        merge) as well.
+
+        :return: lists of persistent and collectable properties (as pairs of keys and values)
+        """
+        ctx = config.runtime().safe_get("context.workload", {})
+        ctx_persistent_properties = [
+            (key, value) for (key, value) in ctx.items() if isinstance(value, str)
+        ]
+        ctx_collectable_properties = [
+            (key, value) for (key, value) in ctx.items() if not isinstance(value, str)
+        ]
+
+        # Update collectable and persistent keys (needed for merge)
+        Profile.persistent.update({key for key, val in ctx.items() if isinstance(val, str)})
+        Profile.collectable.update({key for key, val in ctx.items() if not isinstance(val, str)})
+        return ctx_persistent_properties, ctx_collectable_properties
+
+    def register_resource_type(
+        self,
+        uid: str,
+        persistent_properties: tuple[Any, ...],
+        value_cache: Optional[dict[int, tuple[Any, Any]]] = None,
+    ) -> str:
         """Registers tuple of persistent properties under new key or return existing one
 
+        The compound persistent values (e.g. traces) are interned in the profile, and the resource
+        types are then looked up by tuple of scalar values and ids of the interned values.
+
         :param str uid: uid of the resource that will be used to describe the resource type
         :param tuple persistent_properties: tuple of persistent properties
+        :param dict value_cache: cache of already interned compound values, which maps the id of
+            the value to the pair of the value and its key (the values must stay alive as long as
+            the cache is used)
         :return: uid corresponding to the tuple of persistent properties
         """
-        property_key = str(convert.flatten(persistent_properties))
-        uid_key = convert.flatten(uid)
-        if property_key not in self._tuple_to_resource_type_map.keys():
-            new_type = f"{uid_key}#{self._uid_counter[uid_key]}"
-            self._tuple_to_resource_type_map[property_key] = new_type
+        property_items = []
+        for key, value in persistent_properties:
+            if isinstance(value, (list, dict)):
+                property_items.append(self._get_persistent_value_key(key, value, value_cache))
+            else:
+                property_items.append((key, type(value), value))
+        property_key = tuple(property_items)
+        if (resource_type := self._tuple_to_resource_type_map.get(property_key)) is None:
+            uid_key = uid if isinstance(uid, str) else convert.flatten(uid)
+            resource_type = f"{uid_key}#{self._uid_counter[uid_key]}"
+            self._tuple_to_resource_type_map[property_key] = resource_type
             self._uid_counter[uid_key] += 1
-            self._storage["resource_type_map"][new_type] = {
-                key: value for (key, value) in persistent_properties
+            self._storage["resource_type_map"][resource_type] = {
+                sys.intern(key): intern_value(value) for (key, value) in persistent_properties
             }
-        return self._tuple_to_resource_type_map[property_key]
+        return resource_type
+
+    def _get_persistent_value_key(
+        self, key: str, value: Any, value_cache: Optional[dict[int, tuple[Any, Any]]]
+    ) -> tuple[Any, ...]:
+        """Returns hashable key of the compound persistent property
+
+        The compound values are interned and represented by their unique id, so the key of the
+        property has constant size regardless of the length of the value (e.g. of the trace).
+
+        :param str key: name of the persistent property
+        :param object value: compound value of the persistent property
+        :param dict value_cache: cache of already interned compound values
+        :return: hashable key of the persistent property
+        """
+        if value_cache is not None and (cached := value_cache.get(id(value))) is not None:
+            return cached[1]
+        frozen_value = freeze_value(value)
+        value_id = self._frozen_value_ids.setdefault(frozen_value, len(self._frozen_value_ids))
+        value_key = (key, None, value_id)
+        if value_cache is not None:
+            value_cache[id(value)] = (value, value_key)
+        return value_key
 
     def __getitem__(self, item: str) -> Any:
         """Returns the item stored in profile
@@ -238,9 +512,17 @@ class Profile(MutableMapping[str, Any]):
     def serialize(self) -> dict[str, Any]:
         """Returns serializable representation of the profile
 
+        The compact columns of collectable properties are converted back to lists, the rest of
+        the storage is shared with the profile.
+
         :return: serializable representation (i.e. the actual storage)
         """
-        return self._storage
+        serialized = dict(self._storage)
+        serialized["resources"] = {
+            resource_type: {key: from_column(column) for key, column in resources.items()}
+            for resource_type, resources in self._storage["resources"].items()
+        }
+        return serialized
 
     def _get_flattened_persistent_values_for(self, resource_type: str) -> dict[str, Any]:
         """Flattens the nested values of the resources to single level
@@ -313,6 +595,35 @@ class Profile(MutableMapping[str, Any]):
                 # In case we have only persistent properties
                 yield persistent_properties.get("snapshot", 0), persistent_properties
 
+    def all_resources_by_type(
+        self, flatten_values: bool = True
+    ) -> Iterable[tuple[dict[str, Any], dict[str, list[Any] | array.array[Any]], int]]:
+        """Generator for iterating through all the resources grouped by their resource types
+
+        In contrast to :meth:`all_resources`, the resources are not constructed one by one, instead
+        for each resource type we yield its (flattened) persistent properties, columns of its
+        collectable properties and number of its resources. Hence, the resources can be processed
+        in bulk (e.g. when converting to the tabular representation).
+
+        Note that the columns (and the persistent properties) are shared with the profile and
+        should not be modified.
+
+        :param bool flatten_values: if set to true, then the persistent values will
+            be flattened to one level, otherwise they can contain nested values (e.g. `traces`)
+        :returns: iterable stream of triples ``(dict, dict, int)`` of persistent properties,
+            collectable columns and number of resources of each resource type
+        """
+        for resource_type, resources in self._storage["resources"].items():
+            if flatten_values:
+                persistent_properties = self._get_flattened_persistent_values_for(resource_type)
+            else:
+                persistent_properties = self._storage["resource_type_map"][resource_type]
+            if resources:
+                yield persistent_properties, resources, min(map(len, resources.values()))
+            else:
+                # In case we have only persistent properties
+                yield persistent_properties, {}, 1
+
     def all_resource_fields(self) -> set[str]:
         """Generator for iterating through all the fields (both flattened and
         original) that are occurring in the resources.
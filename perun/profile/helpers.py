@@ -244,14 +244,7 @@ def find_profile_entry(profile: str, minor_version: str) -> index.BasicIndexEntr
     # Search the minor index for the requested profile
     with open(minor_index, "rb") as index_handle:
         # The profile can be only sha value or source path now
-        if store.is_sha1(profile):
-            return index.lookup_entry_within_index(
-                index_handle, lambda x: x.checksum == profile, profile
-            )
-        else:
-            return index.lookup_entry_within_index(
-                index_handle, lambda x: x.path == profile, profile
-            )
+        return index.lookup_entry_by_checksum_or_path(index_handle, profile)
 
 
 def generate_units(collector: types.ModuleType) -> dict[str, str]:
@@ -578,6 +571,34 @@ class ProfileInfo:
         """
         return store.load_profile_from_file(self.realpath, self._is_raw_profile)
 
+    @staticmethod
+    def load_all(profile_infos: list[ProfileInfo]) -> list[profiles.Profile]:
+        """Loads the profiles of all the given infos at once
+
+        The profiles are loaded concurrently (see :func:`perun.logic.store.load_profiles_from_files`)
+        and are returned in the same order as the given infos.
+
+        :param profile_infos: list of infos of loaded profiles
+        :return: list of loaded profiles in dictionary format, w.r.t :ref:`profile-spec`
+        """
+        loaded_profiles: dict[int, profiles.Profile] = {}
+        for is_raw_profile in {profile_info._is_raw_profile for profile_info in profile_infos}:
+            loaded_infos = [
+                position
+                for position, profile_info in enumerate(profile_infos)
+                if profile_info._is_raw_profile == is_raw_profile
+            ]
+            loaded_profiles.update(
+                zip(
+                    loaded_infos,
+                    store.load_profiles_from_files(
+                        [profile_infos[position].realpath for position in loaded_infos],
+                        is_raw_profile,
+                    ),
+                )
+            )
+        return [loaded_profiles[position] for position in range(len(profile_infos))]
+
     def is_compatible_with_profile(self, profile: profiles.Profile) -> bool:
         """Tests if the profile info is compatible with other profile
 
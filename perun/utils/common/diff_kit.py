@@ -7,10 +7,12 @@ from typing import Optional
 import os
 
 # Third-Party Imports
+import pandas
 
 # Perun Imports
 from perun.profile import helpers
 from perun.profile.factory import Profile
+from perun.utils.common import traces_kit
 
 
 def save_diff_view(
@@ -41,3 +43,37 @@ def save_diff_view(
         template_out.write(content)
 
     return output_file
+
+
+def aggregate_similar_traces(
+    df: pandas.DataFrame,
+    threshold: float = traces_kit.DEFAULT_THRESHOLD,
+    strategy: traces_kit.ClassificationStrategy = traces_kit.ClassificationStrategy.FIRST_FIT,
+) -> pandas.DataFrame:
+    """Aggregates the records of the same uid with similar traces into records of trace clusters
+
+    The traces (including their uids) are classified by :class:`traces_kit.TraceClassifier`
+    stratified by the uids, so only traces of the same uid are compared. The records are
+    classified from the heaviest, so the heaviest trace of each cluster represents the cluster,
+    and the amounts of all records of the cluster are summed.
+
+    :param df: dataframe of records with uid, trace (delimited by ',') and amount columns
+    :param threshold: maximal distance of the trace to the representant of its cluster
+    :param strategy: strategy used for finding the suitable cluster for the trace
+    :return: dataframe of the aggregated records with uid, trace and amount columns
+    """
+    sorted_df = df.sort_values(by="amount", ascending=False, kind="stable")
+    classifier = traces_kit.TraceClassifier(
+        strategy, threshold, stratification_strategy=lambda trace: trace[-1]
+    )
+    cluster_traces = []
+    for uid, trace in zip(sorted_df["uid"], sorted_df["trace"]):
+        full_trace = trace.split(",") + [uid] if trace else [uid]
+        pivot = classifier.classify_trace(full_trace)
+        cluster_traces.append(",".join(pivot.as_list[:-1]))
+    return (
+        sorted_df.assign(trace=cluster_traces)
+        .groupby(["uid", "trace"], sort=False)
+        .agg({"amount": "sum"})
+        .reset_index()
+    )
@@ -0,0 +1,75 @@
+"""Contains helper functions for computing the postprocessors over the chunks in parallel
+
+The postprocessors compute their models for each chunk of resources (i.e. for the data points of
+each uid, as provided by the data providers) independently. The executor fans the chunks out to
+the pool of :ckey:`postprocess.workers` processes, while keeping the order of the results the same
+as the order of the chunks, so the models in the resulting profile are ordered deterministically.
+"""
+from __future__ import annotations
+
+# Standard Imports
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+import functools
+import multiprocessing
+import os
+
+# Third-Party Imports
+
+# Perun Imports
+from perun.logic import config
+from perun.utils import exceptions
+
+
+DEFAULT_POSTPROCESS_WORKERS: str = "1"
+Result = TypeVar("Result")
+
+
+def get_postprocess_workers() -> int:
+    """Returns the number of processes used for computing the models of the chunks
+
+    :return: value of :ckey:`postprocess.workers` or the number of CPUs if it is set to 0
+    """
+    workers = DEFAULT_POSTPROCESS_WORKERS
+    with exceptions.SuppressedExceptions(OSError):
+        workers = config.lookup_key_recursively("postprocess.workers", DEFAULT_POSTPROCESS_WORKERS)
+    return int(workers) if int(workers) > 0 else (os.cpu_count() or 1)
+
+
+def compute_chunk(
+    compute: Callable[..., Result],
+    args: tuple[Any, ...],
+    chunk: tuple[Any, Any, str],
+) -> Result:
+    """Computes the model of single chunk
+
+    :param compute: function computing the model from x points, y points, uid and args
+    :param args: additional arguments of the compute function
+    :param chunk: the x points, y points and uid of the chunk
+    :return: result of the compute function
+    """
+    return compute(*chunk, *args)
+
+
+def map_chunks(
+    compute: Callable[..., Result],
+    data_gen: Iterable[tuple[Any, Any, str]],
+    *args: Any,
+) -> Iterator[Result]:
+    """Computes the models of all chunks, possibly in parallel
+
+    Both the compute function and its arguments have to be picklable, if more than one worker is
+    used. The chunks are consumed from the data generator lazily.
+
+    :param compute: function computing the model from x points, y points, uid and args
+    :param data_gen: the generator object with collected data (data provider generators)
+    :param args: additional arguments of the compute function
+    :return: iterator of the results of the compute function in the order of the chunks
+    """
+    compute_with_args = functools.partial(compute_chunk, compute, args)
+    workers = get_postprocess_workers()
+    if workers <= 1:
+        yield from map(compute_with_args, data_gen)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(compute_with_args, data_gen)
@@ -3,8 +3,11 @@ from __future__ import annotations
 
 # Standard Imports
 from enum import Enum
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
+import collections
 import functools
+import heapq
+import math
 
 # Third-Party Imports
 
@@ -37,17 +40,20 @@ class TraceCluster:
     :ivar pivot: main representant of the cluster, that is used for comparisons with other members
     :ivar members: list of members corresponding to the cluster, whose distance is from pivot smaller than
         threshold of the classifier.
+    :ivar order: order in which the cluster was created in its layer
     """
 
-    __slots__ = ["members", "pivot"]
+    __slots__ = ["members", "pivot", "order"]
 
-    def __init__(self, pivot: TraceClusterMember):
+    def __init__(self, pivot: TraceClusterMember, order: int = 0):
         """Creates empty cluster with single element
 
         :param pivot: initial pivot of the cluster
+        :param order: order in which the cluster was created in its layer
         """
         self.pivot: TraceClusterMember = pivot
         self.members: list[TraceClusterMember] = [pivot]
+        self.order: int = order
 
 
 class TraceClusterMember:
@@ -80,12 +86,21 @@ class TraceClassifierLayer:
     through the clusters, tries to find a suitable cluster, and if not found, a new one is created.
     The trace is then merged into the classified cluster.
 
-    The layer utilizes its own cache for computing the distances. For computing costs of switching
-    uids in the traces, we use the shared general cache.
+    The layer utilizes its own bounded (LRU) cache for computing the distances. For computing costs
+    of switching uids in the traces, we use the function table shared by the whole classifier.
+
+    The clusters are indexed by the lengths of their pivots and by the sets of functions in their
+    pivots (signatures), so for each trace we only look up the clusters, whose pivots are not
+    longer or shorter than the threshold allows, and we try the clusters with the same signature
+    first.
 
     :ivar trace_to_cluster: mapping of traces (as strings) to their classified TraceClusters
-    :ivar distance_cache: cache of the distances between two traces represented as floating point
+    :ivar distance_cache: LRU cache of the distances between two traces represented as floating
+        point
+    :ivar functions: table of interned functions of the traces
     :ivar clusters: list of clusters in the layer
+    :ivar length_buckets: map of lengths of pivots to the clusters (in order of creation)
+    :ivar signature_index: map of signatures of pivots to the clusters (in order of creation)
     :ivar find_cluster: function used to find appropriate cluster; this is set wrt strategy either
         as 'best-fit' or as 'first-fit'.
     :ivar threshold: threshold of the distances between vectors.
@@ -94,7 +109,10 @@ class TraceClassifierLayer:
     __slots__ = [
         "trace_to_cluster",
         "distance_cache",
+        "functions",
         "clusters",
+        "length_buckets",
+        "signature_index",
         "find_cluster",
         "threshold",
     ]
@@ -103,16 +121,24 @@ class TraceClassifierLayer:
         self,
         strategy: ClassificationStrategy = ClassificationStrategy.FIRST_FIT,
         threshold: float = DEFAULT_THRESHOLD,
+        functions: Optional[FunctionTable] = None,
     ):
         """Initializes the cluster layer
 
         :param strategy: strategy used to find the appropriate cluster
         :param threshold: threshold for checking the distances between traces; traces of different
             lengths are automatically pruned.
+        :param functions: table of interned functions shared with other layers; if not set, the
+            layer uses its own table
         """
         self.trace_to_cluster: dict[str, TraceClusterMember] = {}
-        self.distance_cache: dict[str, float] = {}
+        self.distance_cache: DistanceCache = collections.OrderedDict()
+        self.functions: FunctionTable = functions if functions is not None else FunctionTable()
         self.clusters: list[TraceCluster] = []
+        self.length_buckets: dict[int, list[TraceCluster]] = collections.defaultdict(list)
+        self.signature_index: dict[frozenset[str], list[TraceCluster]] = collections.defaultdict(
+            list
+        )
         if strategy == ClassificationStrategy.FIRST_FIT:
             self.find_cluster: Callable[
                 [TraceClusterMember], TraceClusterMember
@@ -148,6 +174,49 @@ class TraceClassifierLayer:
         """
         return self.find_cluster(trace_member)
 
+    def candidate_clusters_for(self, trace_member: TraceClusterMember) -> Iterator[TraceCluster]:
+        """Lazily looks up the clusters, that can be suitable for the given trace
+
+        We skip clusters, that are bigger or smaller than the analysed trace wrt given threshold
+        (no need to classify them, since they will always have cost higher than the threshold).
+        The clusters with the same signature as the trace are returned first, the rest follows
+        in the order of their creation.
+
+        :param trace_member: trace which we are classifying
+        :return: stream of candidate clusters
+        """
+        trace_len = len(trace_member.as_list)
+        similar = [
+            cluster
+            for cluster in self.signature_index.get(frozenset(trace_member.as_list), [])
+            if abs(len(cluster.pivot.as_list) - trace_len) <= self.threshold
+        ]
+        yield from similar
+        similar_clusters = set(similar)
+        # Each bucket is sorted by the order of creation, so we can merge them lazily
+        buckets = [
+            self.length_buckets.get(length, [])
+            for length in range(
+                math.ceil(trace_len - self.threshold), math.floor(trace_len + self.threshold) + 1
+            )
+        ]
+        for cluster in heapq.merge(*buckets, key=lambda cluster: cluster.order):
+            if cluster not in similar_clusters:
+                yield cluster
+
+    def create_cluster_for(self, trace_member: TraceClusterMember) -> TraceClusterMember:
+        """Creates new cluster with the trace as its pivot and registers it in the indexes
+
+        :param trace_member: trace which we are classifying
+        :return: classification of the trace, i.e. the trace itself
+        """
+        new_cluster = TraceCluster(trace_member, len(self.clusters))
+        self.clusters.append(new_cluster)
+        self.length_buckets[len(trace_member.as_list)].append(new_cluster)
+        self.signature_index[frozenset(trace_member.as_list)].append(new_cluster)
+        trace_member.parent = new_cluster
+        return trace_member
+
     def find_first_fit_cluster_for(self, trace_member: TraceClusterMember) -> TraceClusterMember:
         """Finds first suitable cluster for the given trace
 
@@ -165,23 +234,22 @@ class TraceClassifierLayer:
         :param trace_member: trace which we are classifying
         :return: classification of the traces
         """
-        trace_len = len(trace_member.as_list)
-        for cluster in self.clusters:
-            if abs(len(cluster.pivot.as_list) - trace_len) <= self.threshold:
-                fitness = fast_compute_distance(
-                    trace_member.as_list, cluster.pivot.as_list, self.threshold, self.distance_cache
-                )
-                if fitness <= self.threshold:
-                    cluster.members.append(trace_member)
-                    trace_member.parent = cluster
-                    trace_member.distance = fitness
-                    return cluster.pivot
+        for cluster in self.candidate_clusters_for(trace_member):
+            fitness = fast_compute_distance(
+                trace_member.as_list,
+                cluster.pivot.as_list,
+                self.threshold,
+                self.distance_cache,
+                self.functions,
+            )
+            if fitness <= self.threshold:
+                cluster.members.append(trace_member)
+                trace_member.parent = cluster
+                trace_member.distance = fitness
+                return cluster.pivot
 
         # We did not find any suitable cluster, hence we crate new one
-        new_cluster = TraceCluster(trace_member)
-        self.clusters.append(new_cluster)
-        trace_member.parent = new_cluster
-        return trace_member
+        return self.create_cluster_for(trace_member)
 
     def find_best_fit_cluster_for(self, trace_member: TraceClusterMember) -> TraceClusterMember:
         """Finds best fit cluster for the given trace
@@ -201,22 +269,19 @@ class TraceClassifierLayer:
         """
         best_fit: Optional[TraceCluster] = None
         best_fit_distance = self.threshold
-        trace_len = len(trace_member.as_list)
-        for cluster in self.clusters:
-            if abs(len(cluster.pivot.as_list) - trace_len) <= self.threshold:
-                fitness = fast_compute_distance(
-                    trace_member.as_list, cluster.pivot.as_list, self.threshold, self.distance_cache
-                )
-                if fitness < best_fit_distance or (
-                    fitness == best_fit_distance and best_fit is None
-                ):
-                    best_fit = cluster
+        candidates = list(self.candidate_clusters_for(trace_member))
+        fitnesses = fast_compute_distances(
+            trace_member.as_list,
+            [cluster.pivot.as_list for cluster in candidates],
+            self.threshold,
+            self.functions,
+        )
+        for cluster, fitness in zip(candidates, fitnesses):
+            if fitness < best_fit_distance or (fitness == best_fit_distance and best_fit is None):
+                best_fit = cluster
         if not best_fit:
             # We did not find any suitable cluster, hence we crate new one
-            new_cluster = TraceCluster(trace_member)
-            self.clusters.append(new_cluster)
-            trace_member.parent = new_cluster
-            return trace_member
+            return self.create_cluster_for(trace_member)
         else:
             trace_member.parent = best_fit
             trace_member.distance = best_fit_distance
@@ -238,9 +303,10 @@ class TraceClassifier:
     :ivar threshold: threshold used in each classifier for limiting the computed distance
     :ivar stratification_strategy: strategy used to distribute the state space into a smaller
         number of layers.
+    :ivar functions: table of interned functions shared by all the layers
     """
 
-    __slots__ = ["layers", "strategy", "threshold", "stratification_strategy"]
+    __slots__ = ["layers", "strategy", "threshold", "stratification_strategy", "functions"]
 
     def __init__(
         self,
@@ -261,6 +327,7 @@ class TraceClassifier:
         else:
             self.stratification_strategy = TraceClassifier.stratify_trace
         self.threshold: float = threshold
+        self.functions: FunctionTable = FunctionTable()
 
     @staticmethod
     def stratify_trace(trace: list[str]) -> str:
@@ -282,7 +349,7 @@ class TraceClassifier:
         stratification = self.stratification_strategy(trace)
         if layer := self.layers.get(stratification):
             return layer
-        new_layer = TraceClassifierLayer(self.strategy, self.threshold)
+        new_layer = TraceClassifierLayer(self.strategy, self.threshold, self.functions)
         self.layers[stratification] = new_layer
         return new_layer
 
@@ -308,6 +375,73 @@ def split_to_words(identifier: str) -> set[str]:
     return set(identifier.split("_"))
 
 
+SWITCH_CACHE_SIZE: int = 1 << 16
+DISTANCE_CACHE_SIZE: int = 1 << 16
+DistanceCache = collections.OrderedDict[tuple[tuple[int, ...], tuple[int, ...]], float]
+
+
+class FunctionTable:
+    """Table of functions of the traces interned to unique integer ids
+
+    Comparing (and hashing) the integer ids is much cheaper than comparing the names. The table
+    is owned by its classifier (or by single computation of distance), so the interned functions
+    are released together with it.
+
+    :ivar ids: map of names of functions to their ids
+    :ivar names: list of names of functions indexed by their ids
+    :ivar cached_switch_cost: LRU cache of costs of switching the functions (with ordered ids)
+    """
+
+    __slots__ = ["ids", "names", "cached_switch_cost"]
+
+    def __init__(self) -> None:
+        """Initializes the empty table"""
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+        self.cached_switch_cost: Callable[[int, int], float] = functools.lru_cache(
+            maxsize=SWITCH_CACHE_SIZE
+        )(self._switch_cost_of_ids)
+
+    def intern(self, trace: Iterable[str]) -> tuple[int, ...]:
+        """Translates the trace of function names to the trace of unique integer ids
+
+        :param trace: trace of function names
+        :return: trace of function ids
+        """
+        ids = []
+        for function in trace:
+            function_id = self.ids.get(function)
+            if function_id is None:
+                function_id = self.ids[function] = len(self.names)
+                self.names.append(function)
+            ids.append(function_id)
+        return tuple(ids)
+
+    def _switch_cost_of_ids(self, lhs_id: int, rhs_id: int) -> float:
+        """Computes cost of switching two interned functions, see :func:`switch_cost`
+
+        :param lhs_id: lower id of the switched function
+        :param rhs_id: higher id of the switched function
+        :return: float cost of switching lhs with rhs
+        """
+        return switch_cost(self.names[lhs_id], self.names[rhs_id])
+
+    def switch_cost(self, lhs_id: int, rhs_id: int) -> float:
+        """Computes cost of switching two interned functions, regardless of the order of ids
+
+        The costs are cached with the ids ordered, so the cost is cached only once.
+
+        :param lhs_id: id of the lhs function
+        :param rhs_id: id of the rhs function
+        :return: float cost of switching lhs with rhs
+        """
+        return (
+            self.cached_switch_cost(lhs_id, rhs_id)
+            if lhs_id < rhs_id
+            else self.cached_switch_cost(rhs_id, lhs_id)
+        )
+
+
 def switch_cost(lhs_identifier: str, rhs_identifier: str) -> float:
     """Computes cost of switching lhs_identifier with rhs_identifier
 
@@ -317,21 +451,9 @@ def switch_cost(lhs_identifier: str, rhs_identifier: str) -> float:
     :param rhs_identifier: right hand side identifier (function)
     :return: float cost of switching lhs with rhs
     """
-    key = (
-        f"{lhs_identifier};{rhs_identifier}"
-        if lhs_identifier < rhs_identifier
-        else f"{rhs_identifier};{lhs_identifier}"
-    )
-    if key not in SWITCH_CACHE.keys():
-        lhs_words = split_to_words(lhs_identifier)
-        rhs_words = split_to_words(rhs_identifier)
-        cost = 1 - (2 * len(lhs_words.intersection(rhs_words)) / (len(lhs_words) + len(rhs_words)))
-        SWITCH_CACHE[key] = cost
-    return SWITCH_CACHE[key]
-
-
-DISTANCE_CACHE: dict[str, float] = {}
-SWITCH_CACHE: dict[str, float] = {}
+    lhs_words = split_to_words(lhs_identifier)
+    rhs_words = split_to_words(rhs_identifier)
+    return 1 - (2 * len(lhs_words.intersection(rhs_words)) / (len(lhs_words) + len(rhs_words)))
 
 
 def compute_distance(
@@ -354,40 +476,105 @@ def compute_distance(
     with key "func" that corresponds to the name of the ids. One can change it using
     the parameter "trace_key".
 
+    The distance is computed iteratively by dynamic programming over the suffixes of the traces,
+    keeping only two rows of the table in memory.
+
     :param lhs_trace: lhs trace of function names
     :param rhs_trace: rhs trace of function names
     :param trace_key: key that is used for retrieving the trace names
     :return: distance between two traces
     """
-    key = f"{','.join(l[trace_key] for l in lhs_trace)};{','.join(r[trace_key] for r in rhs_trace)}"
-
-    if key not in DISTANCE_CACHE.keys():
-        # We need to insert everything from RHS, hence full cost of what is in RHS
-        if len(lhs_trace) == 0:
-            cost = float(len(rhs_trace))
-        # We need to insert everything from LHS, hence full cost of what is in LHS
-        elif len(rhs_trace) == 0:
-            cost = float(len(lhs_trace))
-        # 1. First parts are matched in the trace, so the cost is the cost of matching the rest of the trace
-        elif lhs_trace[0][trace_key] == rhs_trace[0][trace_key]:
-            cost = compute_distance(lhs_trace[1:], rhs_trace[1:], trace_key)
-        # Else, we have to either try to insert/delete or switch functions
-        else:
-            # 2. We try Insertion/Deletion of the current functions, and add the cost of inserting/deleting
-            cost_delete_lhs = compute_distance(lhs_trace[1:], rhs_trace, trace_key) + 1
-            cost_delete_rhs = compute_distance(lhs_trace, rhs_trace[1:], trace_key) + 1
-            # 3. We try Switch of the current two functions add the switch cost and compute the rest of the distance
-            cost_switch = compute_distance(lhs_trace[1:], rhs_trace[1:], trace_key) + switch_cost(
-                lhs_trace[0][trace_key], rhs_trace[0][trace_key]
-            )
-            # We take the minimum of the computed costs
-            cost = min(cost_delete_lhs, cost_delete_rhs, cost_switch)
-        DISTANCE_CACHE[key] = cost
-    return DISTANCE_CACHE[key]
+    functions = FunctionTable()
+    lhs = functions.intern(lhs[trace_key] for lhs in lhs_trace)
+    rhs = functions.intern(rhs[trace_key] for rhs in rhs_trace)
+    lhs_len, rhs_len = len(lhs), len(rhs)
+
+    # The row for lhs suffix of length a holds the distances to rhs suffixes of length b
+    previous_row = [float(b) for b in range(rhs_len + 1)]
+    for a in range(1, lhs_len + 1):
+        lhs_id = lhs[lhs_len - a]
+        row = [float(a)]
+        for b in range(1, rhs_len + 1):
+            rhs_id = rhs[rhs_len - b]
+            if lhs_id == rhs_id:
+                # 1. First parts are matched, so the cost is the cost of matching the rest
+                row.append(previous_row[b - 1])
+            else:
+                # 2. We try Insertion/Deletion and 3. Switch of the current two functions
+                row.append(
+                    min(
+                        previous_row[b] + 1,
+                        row[b - 1] + 1,
+                        previous_row[b - 1] + functions.switch_cost(lhs_id, rhs_id),
+                    )
+                )
+        previous_row = row
+    return previous_row[rhs_len]
+
+
+def _banded_distance(
+    lhs: tuple[int, ...], rhs: tuple[int, ...], threshold: float, functions: FunctionTable
+) -> float:
+    """Computes the distance of interned traces, see :func:`fast_compute_distance`
+
+    The distance is computed iteratively by dynamic programming over the lengths of suffixes of
+    the traces. Since we always insert/delete from the bigger side, the difference of lengths of
+    the compared suffixes only shrinks toward zero; hence we compute only the band of the table
+    between the original difference of the lengths and zero, which is bounded by the threshold.
+
+    :param lhs: left interned trace
+    :param rhs: right interned trace
+    :param threshold: threshold for pruning less interesting traces from start
+    :param functions: table of the interned functions of the traces
+    :return: distance between rhs and lhs
+    """
+    lhs_len, rhs_len = len(lhs), len(rhs)
+    if lhs_len == 0:
+        return rhs_len
+    if rhs_len == 0:
+        return lhs_len
+    if abs(lhs_len - rhs_len) > threshold:
+        return threshold + 1
+
+    # The band is the range of differences (a - b) of lengths of lhs suffix a and rhs suffix b
+    diff_min, diff_max = min(lhs_len - rhs_len, 0), max(lhs_len - rhs_len, 0)
+    band = range(diff_max, diff_min - 1, -1)
+    # previous_row[diff - diff_min] holds the distance of suffixes of lengths (a - 1, a - 1 - diff)
+    previous_row: list[float] = [0.0] * (diff_max - diff_min + 1)
+    for a in range(0, lhs_len + 1):
+        row = list(previous_row)
+        for diff in band:
+            b = a - diff
+            if b < 0 or b > rhs_len:
+                continue
+            if a == 0 or b == 0:
+                row[diff - diff_min] = a + b
+                continue
+            lhs_id, rhs_id = lhs[lhs_len - a], rhs[rhs_len - b]
+            if lhs_id == rhs_id:
+                # 1. First match
+                cost = previous_row[diff - diff_min]
+            elif diff == 0:
+                # We will always do switch if the lens are same
+                cost = previous_row[diff - diff_min] + functions.switch_cost(lhs_id, rhs_id)
+            else:
+                # 2. Try Insertion/Deletion (from the bigger side) and 3. Try Switch
+                cost = min(
+                    (previous_row[diff - 1 - diff_min] if diff > 0 else row[diff + 1 - diff_min])
+                    + 1,
+                    previous_row[diff - diff_min] + functions.switch_cost(lhs_id, rhs_id),
+                )
+            row[diff - diff_min] = cost
+        previous_row = row
+    return previous_row[lhs_len - rhs_len - diff_min]
 
 
 def fast_compute_distance(
-    lhs: list[str], rhs: list[str], threshold: float, cache: dict[str, float]
+    lhs: list[str],
+    rhs: list[str],
+    threshold: float,
+    cache: Optional[DistanceCache] = None,
+    functions: Optional[FunctionTable] = None,
 ) -> float:
     """Optimized version of the computed distance
 
@@ -399,46 +586,52 @@ def fast_compute_distance(
       2. We assume, that if the traces are of same length, then the switch is always preferred.
       3. We always insert/delete to bigger side (hence, omitting one case)
 
+    The distance is computed iteratively only for the band of suffixes, whose difference of
+    lengths is within the threshold (see :func:`_banded_distance`), and only the final distance
+    is stored in the cache; the cache keeps at most :data:`DISTANCE_CACHE_SIZE` least recently
+    used distances.
+
     :param lhs: left trace
     :param rhs: right trace
     :param threshold: threshold for pruning less interesting traces from start
-    :param cache: cache for the results
+    :param cache: LRU cache for the results, keyed by the traces interned in functions
+    :param functions: table of the interned functions; must be given together with the cache
     :return: distance between rhs and lhs
     """
-    keys = [",".join(lhs), ",".join(rhs)]
-    key = f"{keys[0]};{keys[1]}" if keys[0] < keys[1] else f"{keys[1]};{keys[0]}"
-    lhs_len = len(lhs)
-    rhs_len = len(rhs)
-
-    if lhs_len == 0:
-        return rhs_len
-    if rhs_len == 0:
-        return lhs_len
-    if abs(lhs_len - rhs_len) > threshold:
-        return threshold + 1
-
-    if key not in cache.keys():
-        # Extremes we need to insert or delete
-        # 1. First match
-        if lhs[0] == rhs[0]:
-            cost = fast_compute_distance(lhs[1:], rhs[1:], threshold, cache)
-        elif lhs_len == rhs_len:
-            # We will always do switch if the lens are same
-            cost = fast_compute_distance(lhs[1:], rhs[1:], threshold, cache) + switch_cost(
-                lhs[0], rhs[0]
-            )
-        else:
-            costs = []
-            # 2. Try Insertion/Deletion
-            if lhs_len > rhs_len:
-                costs.append(fast_compute_distance(lhs[1:], rhs, threshold, cache) + 1)
-            else:
-                costs.append(fast_compute_distance(lhs, rhs[1:], threshold, cache) + 1)
-            # 3. Try Switch
-            costs.append(
-                fast_compute_distance(lhs[1:], rhs[1:], threshold, cache)
-                + switch_cost(lhs[0], rhs[0])
-            )
-            cost = min(costs)
-        cache[key] = cost
-    return cache[key]
+    functions = functions if functions is not None else FunctionTable()
+    lhs_ids, rhs_ids = functions.intern(lhs), functions.intern(rhs)
+    if cache is None:
+        return _banded_distance(lhs_ids, rhs_ids, threshold, functions)
+    key = (lhs_ids, rhs_ids) if lhs_ids < rhs_ids else (rhs_ids, lhs_ids)
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    distance = cache[key] = _banded_distance(lhs_ids, rhs_ids, threshold, functions)
+    if len(cache) > DISTANCE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return distance
+
+
+def fast_compute_distances(
+    trace: list[str],
+    candidates: Iterable[list[str]],
+    threshold: float,
+    functions: Optional[FunctionTable] = None,
+) -> list[float]:
+    """Computes the distances of the trace to each of the candidate traces at once
+
+    The trace is interned only once, and the candidates, whose lengths differ from the trace by
+    more than threshold, are pruned without any computation.
+
+    :param trace: the compared trace
+    :param candidates: the candidate traces
+    :param threshold: threshold for pruning less interesting traces from start
+    :param functions: table of the interned functions
+    :return: list of distances of the trace to the candidates (in the same order)
+    """
+    functions = functions if functions is not None else FunctionTable()
+    trace_ids = functions.intern(trace)
+    return [
+        _banded_distance(trace_ids, functions.intern(candidate), threshold, functions)
+        for candidate in candidates
+    ]
@@ -5,7 +5,7 @@ This contains functions for getting outputs from commands or running commands or
 from __future__ import annotations
 
 # Standard Imports
-from typing import Optional, IO, Any
+from typing import Optional, IO, Any, Iterator
 import shlex
 import subprocess
 
@@ -50,6 +50,43 @@ def run_safely_external_command(
     # Split
     unpiped_commands = list(map(str.strip, cmd.split(" | ")))
     cmd_no = len(unpiped_commands)
+    objects = start_piped_commands(unpiped_commands, subprocess.PIPE, **kwargs)
+
+    try:
+        # communicate with the last piped object
+        cmdout, cmderr = objects[-1].communicate(timeout=timeout)
+
+        for i in range(len(objects) - 1):
+            objects[i].wait(timeout=timeout)
+
+    except subprocess.TimeoutExpired:
+        for p in objects:
+            p.terminate()
+        raise
+
+    # collect the return codes
+    if check_results:
+        for i in range(cmd_no):
+            if objects[i].returncode:
+                if not quiet and (cmdout or cmderr):
+                    log.cprintln(f"captured stdout: {cmdout.decode('utf-8')}", "red")
+                    log.cprintln(f"captured stderr: {cmderr.decode('utf-8')}", "red")
+                raise subprocess.CalledProcessError(objects[i].returncode, unpiped_commands[i])
+
+    return cmdout, cmderr
+
+
+def start_piped_commands(
+    unpiped_commands: list[str], last_stderr: Any, **kwargs: Any
+) -> list[subprocess.Popen[bytes]]:
+    """Starts the piped commands, where each command reads the output of the previous one
+
+    :param list unpiped_commands: list of commands in the pipe
+    :param object last_stderr: stream for the standard error of the last command
+    :param dict kwargs: additional args to subprocess call
+    :return: list of started processes
+    """
+    cmd_no = len(unpiped_commands)
 
     # Run the command through pipes
     objects: list[subprocess.Popen[bytes]] = []
@@ -58,7 +95,7 @@ def run_safely_external_command(
 
         # set streams
         stdin = None if i == 0 else objects[i - 1].stdout
-        stderr = subprocess.STDOUT if i < (cmd_no - 1) else subprocess.PIPE
+        stderr = subprocess.STDOUT if i < (cmd_no - 1) else last_stderr
 
         # run the piped command and close the previous one
         piped_command = subprocess.Popen(
@@ -73,29 +110,36 @@ def run_safely_external_command(
             # Fixme: we ignore this, as it is tricky to handle
             objects[i - 1].stdout.close()  # type: ignore
         objects.append(piped_command)
+    return objects
 
-    try:
-        # communicate with the last piped object
-        cmdout, cmderr = objects[-1].communicate(timeout=timeout)
 
-        for i in range(len(objects) - 1):
-            objects[i].wait(timeout=timeout)
+def stream_safely_external_command(cmd: str, **kwargs: Any) -> Iterator[str]:
+    """Safely runs the piped command, without executing of the shell, and yields its output
 
-    except subprocess.TimeoutExpired:
-        for p in objects:
-            p.terminate()
-        raise
+    Contrary to :func:`run_safely_external_command`, the output is not buffered in the memory,
+    but it is decoded and yielded line by line, as the command produces it. The standard error
+    of the command is discarded.
 
-    # collect the return codes
-    if check_results:
-        for i in range(cmd_no):
-            if objects[i].returncode:
-                if not quiet and (cmdout or cmderr):
-                    log.cprintln(f"captured stdout: {cmdout.decode('utf-8')}", "red")
-                    log.cprintln(f"captured stderr: {cmderr.decode('utf-8')}", "red")
-                raise subprocess.CalledProcessError(objects[i].returncode, unpiped_commands[i])
-
-    return cmdout, cmderr
+    :param str cmd: string with command that we are executing
+    :param dict kwargs: additional args to subprocess call
+    :return: iterator of the lines of standard output
+    :raises subprocess.CalledProcessError: when any of the piped commands fails
+    """
+    unpiped_commands = list(map(str.strip, cmd.split(" | ")))
+    objects = start_piped_commands(unpiped_commands, subprocess.DEVNULL, **kwargs)
+    # The stdout is always piped, see start_piped_commands
+    stdout: IO[bytes] = objects[-1].stdout  # type: ignore
+    try:
+        for line in stdout:
+            yield line.decode("utf-8")
+    finally:
+        stdout.close()
+        for piped_command in objects:
+            piped_command.wait()
+
+    for i, piped_command in enumerate(objects):
+        if piped_command.returncode:
+            raise subprocess.CalledProcessError(piped_command.returncode, unpiped_commands[i])
 
 
 def run_safely_list_of_commands(cmd_list: list[str]) -> None:
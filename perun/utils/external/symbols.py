@@ -0,0 +1,280 @@
+"""Batched and persistently cached resolution of symbols of the profiled binaries
+
+The symbols (demangled names of functions and source lines of instruction addresses) are resolved
+by long-lived ``c++filt`` and ``addr2line`` co-processes, which are fed through pipes with whole
+batches of symbols at once. The resolved symbols are cached for each binary, identified by the
+checksum of its content, for the whole run of perun, so repeated collections of the same binary
+(e.g. in ``perun run matrix``) resolve the already seen symbols without running any external
+command. If :ckey:`symbols.persistent_cache` is set, the caches are moreover stored in the
+``.perun/cache/symbols`` directory and shared by subsequent runs of perun.
+"""
+from __future__ import annotations
+
+# Standard Imports
+from typing import Iterable, Optional
+import atexit
+import distutils.util as dutils
+import hashlib
+import json
+import os
+import subprocess
+import threading
+
+# Third-Party Imports
+
+# Perun Imports
+from perun.logic import config, pcs
+from perun.utils.common import common_kit
+from perun.utils.exceptions import NotPerunRepositoryException, SuppressedExceptions
+
+
+DEFAULT_SYMBOLS_PERSISTENT_CACHE: str = "false"
+CHECKSUM_CHUNK_SIZE: int = 1 << 20
+_RESOLVERS: dict[Optional[str], SymbolResolver] = {}
+_CHECKSUMS: dict[tuple[str, int, int], str] = {}
+
+
+class CoProcess:
+    """Long-lived process, which translates its input line by line
+
+    The tool has to write exactly one line of output for each line of input and flush it, which
+    holds for both ``c++filt`` and ``addr2line``.
+
+    :ivar list command: the command of the process
+    :ivar Popen process: handle of the running process or None if it was not started yet
+    """
+
+    __slots__ = ["command", "process"]
+
+    def __init__(self, command: list[str]) -> None:
+        """Initializes the co-process; the process itself is started lazily
+
+        :param list command: the command of the process
+        """
+        self.command = command
+        self.process: Optional[subprocess.Popen[str]] = None
+
+    def translate(self, lines: list[str]) -> list[str]:
+        """Translates the batch of lines
+
+        The input is written from separate thread, so the process cannot block on the full pipe
+        of its output while we are still writing the input.
+
+        :param list lines: translated lines (without newlines)
+        :return: list of translated lines in the same order
+        :raises CalledProcessError: if the process terminates before translating all lines
+        """
+        if not lines:
+            return []
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        assert self.process.stdin is not None and self.process.stdout is not None
+        stdin, stdout = self.process.stdin, self.process.stdout
+
+        def write_lines() -> None:
+            """Writes the whole batch to the input of the process"""
+            with SuppressedExceptions(BrokenPipeError):
+                stdin.write("".join(line + "\n" for line in lines))
+                stdin.flush()
+
+        writer = threading.Thread(target=write_lines)
+        writer.start()
+        output = [stdout.readline() for _ in lines]
+        writer.join()
+        if not all(line.endswith("\n") for line in output):
+            # The process ended prematurely (e.g. the binary does not exist)
+            self.close()
+            raise subprocess.CalledProcessError(1, self.command)
+        return [line[:-1] for line in output]
+
+    def close(self) -> None:
+        """Terminates the process"""
+        if self.process is not None:
+            with SuppressedExceptions(OSError):
+                assert self.process.stdin is not None and self.process.stdout is not None
+                self.process.stdin.close()
+                self.process.stdout.close()
+            self.process.terminate()
+            self.process.wait()
+            self.process = None
+
+
+class SymbolResolver:
+    """Resolver of symbols of one binary with caches of already resolved symbols
+
+    :ivar str binary: path to the binary or None if only the names are demangled
+    :ivar str checksum: checksum of the content of the binary
+    :ivar dict demangled: cache of demangled names
+    :ivar dict lines: cache of source lines ('file:line') of the addresses
+    :ivar bool modified: set if there are new symbols, that were not persistently stored yet
+    :ivar CoProcess demangler: the c++filt co-process
+    :ivar CoProcess translator: the addr2line co-process
+    """
+
+    __slots__ = [
+        "binary",
+        "checksum",
+        "demangled",
+        "lines",
+        "modified",
+        "demangler",
+        "translator",
+    ]
+
+    def __init__(self, binary: Optional[str], checksum: Optional[str] = None) -> None:
+        """Initializes the resolver and loads the persistent cache of the binary
+
+        :param str binary: path to the binary or None if only the names are demangled
+        :param str checksum: checksum of the binary (computed if not given)
+        """
+        self.binary = binary
+        self.checksum = checksum or (compute_binary_checksum(binary) if binary else None)
+        self.demangled: dict[str, str] = {}
+        self.lines: dict[str, str] = {}
+        self.modified = False
+        self.demangler = CoProcess(["c++filt"])
+        self.translator = CoProcess(["addr2line", "-e", binary or ""])
+        self.load()
+
+    def demangle(self, names: Iterable[str]) -> dict[str, str]:
+        """Demangles the names, the names that are not cached yet are demangled at once
+
+        :param iterable names: demangled names
+        :return: map of the names to their demangled counterparts
+        """
+        names = list(dict.fromkeys(names))
+        missing = [name for name in names if name not in self.demangled]
+        if missing:
+            self.demangled.update(zip(missing, self.demangler.translate(missing)))
+            self.modified = True
+        return {name: self.demangled[name] for name in names}
+
+    def address_to_line(self, addresses: Iterable[str]) -> dict[str, str]:
+        """Translates the addresses to source lines, the uncached addresses are translated at once
+
+        :param iterable addresses: translated addresses (in hexadecimal format)
+        :return: map of the addresses to the source lines in format 'file:line'
+        """
+        addresses = list(dict.fromkeys(addresses))
+        missing = [address for address in addresses if address not in self.lines]
+        if missing:
+            self.lines.update(zip(missing, self.translator.translate(missing)))
+            self.modified = True
+        return {address: self.lines[address] for address in addresses}
+
+    def get_cache_file(self) -> Optional[str]:
+        """Returns the path to the persistent cache of the symbols of the binary
+
+        :return: path to the cache, or None if persistent caching is disabled, the binary is not
+            known or we are outside of perun repository
+        """
+        if self.checksum is None or not dutils.strtobool(
+            lookup_symbols_option("symbols.persistent_cache", DEFAULT_SYMBOLS_PERSISTENT_CACHE)
+        ):
+            return None
+        try:
+            return os.path.join(pcs.get_cache_directory(), "symbols", f"{self.checksum}.json")
+        except (NotPerunRepositoryException, OSError):
+            return None
+
+    def load(self) -> None:
+        """Loads the persistently cached symbols of the binary (if there are any)"""
+        if (cache_file := self.get_cache_file()) is None or not os.path.exists(cache_file):
+            return
+        with SuppressedExceptions(OSError, ValueError, TypeError):
+            with open(cache_file, "r") as cache_handle:
+                cached_symbols = json.load(cache_handle)
+            self.demangled.update(cached_symbols.get("demangled", {}))
+            self.lines.update(cached_symbols.get("lines", {}))
+
+    def save(self) -> None:
+        """Persistently stores the resolved symbols, if there are any new ones
+
+        The cache is replaced atomically, so concurrent runs of perun never read partial cache.
+        """
+        if not self.modified or (cache_file := self.get_cache_file()) is None:
+            return
+        with SuppressedExceptions(OSError):
+            common_kit.touch_dir(os.path.dirname(cache_file))
+            tmp_file = f"{cache_file}.{os.getpid()}"
+            with open(tmp_file, "w") as cache_handle:
+                json.dump({"demangled": self.demangled, "lines": self.lines}, cache_handle)
+            os.replace(tmp_file, cache_file)
+            self.modified = False
+
+    def close(self) -> None:
+        """Stores the cache and terminates the co-processes"""
+        self.save()
+        self.demangler.close()
+        self.translator.close()
+
+
+def lookup_symbols_option(key: str, default: str) -> str:
+    """Looks up the option of the symbol resolution
+
+    :param key: looked up option
+    :param default: default value of the option
+    :return: value of the option
+    """
+    with SuppressedExceptions(OSError):
+        return str(config.lookup_key_recursively(key, default))
+    return default
+
+
+def compute_binary_checksum(binary: str) -> Optional[str]:
+    """Computes the checksum of the content of the binary
+
+    The checksums are remembered for the path, modification time and size of the binary, so
+    the unchanged binary is read only once.
+
+    :param str binary: path to the binary
+    :return: SHA-1 checksum of the binary or None if the binary cannot be read
+    """
+    try:
+        binary_stat = os.stat(binary)
+        key = (os.path.abspath(binary), binary_stat.st_mtime_ns, binary_stat.st_size)
+        if (cached_checksum := _CHECKSUMS.get(key)) is not None:
+            return cached_checksum
+        checksum = hashlib.sha1()
+        with open(binary, "rb") as binary_handle:
+            for chunk in iter(lambda: binary_handle.read(CHECKSUM_CHUNK_SIZE), b""):
+                checksum.update(chunk)
+    except OSError:
+        return None
+    _CHECKSUMS[key] = checksum.hexdigest()
+    return _CHECKSUMS[key]
+
+
+def get_resolver(binary: Optional[str] = None) -> SymbolResolver:
+    """Returns the shared resolver of the symbols of the binary
+
+    The resolvers (and their co-processes) are kept alive for the whole run of perun, however, if
+    the binary was changed (e.g. recompiled) since the last call, new resolver is created.
+
+    :param str binary: path to the binary or None if only the names are demangled
+    :return: resolver of the symbols of the binary
+    """
+    key = os.path.abspath(binary) if binary else None
+    checksum = compute_binary_checksum(binary) if binary else None
+    resolver = _RESOLVERS.get(key)
+    if resolver is None or resolver.checksum != checksum:
+        if resolver is not None:
+            resolver.close()
+        resolver = _RESOLVERS[key] = SymbolResolver(binary, checksum)
+    return resolver
+
+
+def close_resolvers() -> None:
+    """Stores the caches and terminates the co-processes of all resolvers"""
+    for resolver in _RESOLVERS.values():
+        resolver.close()
+    _RESOLVERS.clear()
+
+
+atexit.register(close_resolvers)
@@ -6,7 +6,7 @@ This module encapsulates such functions, so they can be used in CLI, in tests, i
 from __future__ import annotations
 
 # Standard Imports
-from typing import TextIO, Any
+from typing import TextIO, Any, Iterator
 import io
 import json
 import os
@@ -18,6 +18,9 @@ from ruamel.yaml import YAML
 # Perun Imports
 from perun.utils import log
 
+# Strings (possibly unterminated at the end of the buffer) and brackets of JSON values
+JSON_STRUCTURE_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|["\[\]{}]')
+
 
 def store_json(profile: dict[Any, Any], file_path: str) -> None:
     """Stores profile w.r.t. :ref:`profile-spec` to output file.
@@ -96,3 +99,179 @@ def safely_load_file(filename: str) -> list[str]:
         except UnicodeDecodeError as ude:
             log.warn(f"Could not decode '{filename}': {ude}")
             return []
+
+
+class IncrementalJsonReader:
+    """Incremental reader of JSON values from the stream of string chunks
+
+    The reader keeps in the memory only the part of the stream, that is needed for parsing the
+    currently read value. This allows one to iterate through the (nested) objects key by key
+    and parse (and possibly transform) their values one at a time, without keeping the whole
+    stream (and the whole parsed JSON) in memory.
+
+    :ivar Iterator _chunks: stream of string chunks
+    :ivar str _buffer: currently buffered part of the stream
+    :ivar int _pos: position of the first unprocessed character in the buffer
+    :ivar bool _exhausted: true if all chunks were read from the stream
+    :ivar JSONDecoder _decoder: decoder used for parsing the values
+    :ivar int consumed: number of all characters read from the stream
+    """
+
+    __slots__ = ["_chunks", "_buffer", "_pos", "_exhausted", "_decoder", "consumed"]
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        """Initializes the reader
+
+        :param chunks: stream of string chunks
+        """
+        self._chunks = chunks
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._exhausted: bool = False
+        self._decoder = json.JSONDecoder()
+        self.consumed: int = 0
+
+    def _read_more(self) -> bool:
+        """Reads new chunks from the stream until the unprocessed part of the buffer is doubled
+
+        Doubling the buffer guarantees, that repeated attempts to parse long values take
+        amortized linear time.
+
+        :return: false if nothing could be read from the stream
+        """
+        if self._pos > len(self._buffer) // 2:
+            # Drop the processed part of the buffer
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        target_length = len(self._buffer) + max(len(self._buffer) - self._pos, 1)
+        new_chunks = [self._buffer]
+        read_length = len(self._buffer)
+        while read_length < target_length:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._exhausted = True
+                break
+            new_chunks.append(chunk)
+            read_length += len(chunk)
+        if read_length == len(self._buffer):
+            return False
+        self.consumed += read_length - len(self._buffer)
+        self._buffer = "".join(new_chunks)
+        return True
+
+    def _skip_whitespace(self) -> bool:
+        """Skips the whitespaces in the stream
+
+        :return: false if the stream ended
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return True
+            if not self._read_more():
+                return False
+
+    def peek_char(self) -> str:
+        """Returns the next non-whitespace character in the stream without consuming it
+
+        :return: next character or empty string if the stream ended
+        """
+        return self._buffer[self._pos] if self._skip_whitespace() else ""
+
+    def expect_char(self, expected: str) -> str:
+        """Consumes the next non-whitespace character, which has to be one of the expected ones
+
+        :param expected: string of expected characters
+        :return: the consumed character
+        :raises ValueError: if the next character is not expected
+        """
+        char = self.peek_char()
+        if not char or char not in expected:
+            raise ValueError(f"expected one of '{expected}', got '{char}'")
+        self._pos += 1
+        return char
+
+    def read_value(self) -> Any:
+        """Parses the next JSON value in the stream
+
+        :return: parsed value
+        :raises ValueError: if the value is malformed or the stream ended
+        """
+        if not self._skip_whitespace():
+            raise ValueError("unexpected end of the stream")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # Values like numbers could continue in the next chunk, hence we need to see
+                # at least one more character after the value (or the end of the stream)
+                while end < len(self._buffer) and self._buffer[end].isspace():
+                    end += 1
+                if end < len(self._buffer) or self._exhausted:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._exhausted:
+                    raise
+            self._read_more()
+
+    def skip_value(self) -> None:
+        """Skips the next JSON value in the stream without parsing it
+
+        The nested objects and lists are skipped by matching the brackets outside of strings,
+        hence, unlike :meth:`read_value`, no (potentially huge) objects are constructed.
+
+        :raises ValueError: if the stream ended before the end of the value
+        """
+        if self.peek_char() not in "[{":
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            for token in JSON_STRUCTURE_TOKEN.finditer(self._buffer, self._pos):
+                char = token.group()
+                if char == '"':
+                    # The string continues in the next chunk
+                    self._pos = token.start()
+                    break
+                self._pos = token.end()
+                if char in "[{":
+                    depth += 1
+                elif char in "]}":
+                    depth -= 1
+                    if depth == 0:
+                        return
+            else:
+                self._pos = len(self._buffer)
+            if not self._read_more():
+                raise ValueError("unexpected end of the stream")
+
+    def iterate_object(self) -> Iterator[str]:
+        """Iterates through the keys of the next JSON object in the stream
+
+        After each yielded key, the caller has to consume its value (e.g. by
+        :meth:`read_value` or nested :meth:`iterate_object`).
+
+        :return: stream of keys of the object
+        :raises ValueError: if the object is malformed
+        """
+        self.expect_char("{")
+        if self.peek_char() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError(f"expected string key, got '{key}'")
+            self.expect_char(":")
+            yield key
+            if self.expect_char(",}") == "}":
+                return
+
+    def read_to_end(self) -> None:
+        """Checks that the rest of the stream contains only whitespaces
+
+        :raises ValueError: if there is any trailing content in the stream
+        """
+        if self._skip_whitespace():
+            raise ValueError("unexpected trailing content")
@@ -87,7 +87,7 @@ def get_uids(profile: Profile) -> set[str]:
     :param profile: profile
     :return: set of unique uids in profile
     """
-    df = convert.resources_to_pandas_dataframe(profile)
+    df = convert.resources_to_pandas_dataframe(profile, columns=["uid"], categorical=True)
     return set(df["uid"].unique())
 
 
@@ -11,7 +11,7 @@ import jinja2
 
 # Perun Imports
 from perun.utils import log
-from perun.utils.common import diff_kit
+from perun.utils.common import diff_kit, traces_kit
 from perun.profile.factory import Profile
 from perun.profile import convert
 from perun.view_diff.flamegraph import run as flamegraph_run
@@ -53,15 +53,20 @@ def to_short_trace(trace: str) -> str:
     return " -> ".join([split_trace[0], "...", split_trace[-1]])
 
 
-def profile_to_data(profile: Profile) -> list[TableRecord]:
+def profile_to_data(profile: Profile, **kwargs: Any) -> list[TableRecord]:
     """Converts profile to list of columns and list of list of values
 
     :param profile: converted profile
+    :param kwargs: other parameters (e.g. whether the similar traces should be clustered)
     :return: list of columns and list of rows
     """
-    df = convert.resources_to_pandas_dataframe(profile)
+    df = convert.resources_to_pandas_dataframe(profile, columns=["uid", "trace", "amount"])
 
     grouped_df = df.groupby(["uid", "trace"]).agg({"amount": "sum"}).reset_index()
+    if kwargs.get("cluster_traces"):
+        grouped_df = diff_kit.aggregate_similar_traces(
+            grouped_df, kwargs.get("cluster_threshold", traces_kit.DEFAULT_THRESHOLD)
+        )
     sorted_df = grouped_df.sort_values(by="amount", ascending=False)
     amount_sum = df["amount"].sum()
     data = []
@@ -87,9 +92,9 @@ def generate_html_report(lhs_profile: Profile, rhs_profile: Profile, **kwargs: A
     :param kwargs: other parameters
     """
     log.major_info("Generating HTML Report", no_title=True)
-    lhs_data = profile_to_data(lhs_profile)
+    lhs_data = profile_to_data(lhs_profile, **kwargs)
     log.minor_success("Baseline data", "generated")
-    rhs_data = profile_to_data(rhs_profile)
+    rhs_data = profile_to_data(rhs_profile, **kwargs)
     log.minor_success("Target data", "generated")
     columns = [
         ("uid", "The measured symbol (click [+] for full trace)."),
@@ -122,6 +127,23 @@ def generate_html_report(lhs_profile: Profile, rhs_profile: Profile, **kwargs: A
 
 @click.command()
 @click.option("-o", "--output-file", help="Sets the output file (default=automatically generated).")
+@click.option(
+    "-c",
+    "--cluster-traces",
+    is_flag=True,
+    default=False,
+    help="Aggregates the records of the same uid with similar traces into single record.",
+)
+@click.option(
+    "-t",
+    "--cluster-threshold",
+    type=click.FLOAT,
+    default=traces_kit.DEFAULT_THRESHOLD,
+    help=(
+        "Sets the maximal distance of similar traces for --cluster-traces"
+        f" (default={traces_kit.DEFAULT_THRESHOLD})."
+    ),
+)
 @click.pass_context
 def report(ctx: click.Context, *_: Any, **kwargs: Any) -> None:
     assert ctx.parent is not None and f"impossible happened: {ctx} has no parent"
@@ -25,6 +25,7 @@ import tabulate
 
 # Perun Imports
 from perun.utils import log
+from perun.utils.common import diff_kit, traces_kit
 from perun.profile import convert
 from perun.profile.factory import Profile
 
@@ -98,6 +99,10 @@ def get_top_n_records(profile: Profile, **kwargs: Any) -> list[TableRecord]:
         df = filter_df(df, filters)
 
     grouped_df = df.groupby(["uid", "trace"]).agg({"amount": "sum"}).reset_index()
+    if kwargs.get("cluster_traces"):
+        grouped_df = diff_kit.aggregate_similar_traces(
+            grouped_df, kwargs.get("cluster_threshold", traces_kit.DEFAULT_THRESHOLD)
+        )
     sorted_df = grouped_df.sort_values(by="amount", ascending=False)
     amount_sum = df["amount"].sum()
     top_n = []
@@ -199,6 +204,23 @@ def compare_profiles(lhs_profile: Profile, rhs_profile: Profile, **kwargs: Any)
     type=click.STRING,
     help="Names the each profile by its particular option (default=origin).",
 )
+@click.option(
+    "-c",
+    "--cluster-traces",
+    is_flag=True,
+    default=False,
+    help="Aggregates the records of the same uid with similar traces into single record.",
+)
+@click.option(
+    "-t",
+    "--cluster-threshold",
+    type=click.FLOAT,
+    default=traces_kit.DEFAULT_THRESHOLD,
+    help=(
+        "Sets the maximal distance of similar traces for --cluster-traces"
+        f" (default={traces_kit.DEFAULT_THRESHOLD})."
+    ),
+)
 @click.pass_context
 def table(ctx: click.Context, *_: Any, **kwargs: Any) -> None:
     assert ctx.parent is not None and f"impossible happened: {ctx} has no parent"
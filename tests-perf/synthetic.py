@@ -0,0 +1,127 @@
+"""
+Generator of synthetic profiles used in the performance benchmarks of Perun
+
+The generated profiles mimic the profiles of the tracer-like collectors: resources are grouped into
+resource types given by the function (uid), its location (binary) and the call trace, while the
+collectable values (amounts and exclusive times) are generated randomly. The profiles are generated
+directly in the compact format of resources, so even profiles with millions of resources can be
+generated quickly.
+"""
+import array
+
+import numpy
+
+from perun.profile.factory import Profile
+
+
+# Named scales of the generated profiles (number of resources)
+SCALES = {
+    "10k": 10_000,
+    "1M": 1_000_000,
+    "10M": 10_000_000,
+}
+LOCATIONS = ["app", "libc.so.6", "libm.so.6", "libstdc++.so.6"]
+
+
+def to_array(values: numpy.ndarray, typecode: str) -> array.array:
+    """Converts the numpy array to the array of given type code without iterating the values
+
+    :param numpy.ndarray values: converted values
+    :param str typecode: typecode of the resulting array ('q' or 'd')
+    :return: array with the values
+    """
+    column = array.array(typecode)
+    column.frombytes(values.astype("q" if typecode == "q" else "d").tobytes())
+    return column
+
+
+def generate_profile(
+    resource_count, seed=0, function_count=None, trace_count=4, trace_depth=8, slowdown=None
+):
+    """Generates the synthetic time profile with given number of resources
+
+    :param int resource_count: number of resources in the profile
+    :param int seed: seed of the random generator (the same seed yields the same profile)
+    :param int function_count: number of distinct functions (uids); by default scales with the
+        square root of the number of resources
+    :param int trace_count: number of distinct traces for each function
+    :param int trace_depth: maximal depth of the generated traces
+    :param dict slowdown: map of function indexes to the factor by which their amounts are scaled
+        (used to generate the target profiles with injected degradations)
+    :return: generated profile
+    """
+    rng = numpy.random.default_rng(seed)
+    function_count = function_count or max(10, int(resource_count**0.5) // 2)
+    type_count = function_count * trace_count
+
+    # Distribute the resources among the resource types (each type has at least one resource)
+    weights = rng.pareto(1.5, type_count) + 1.0
+    counts = numpy.maximum(1, (weights / weights.sum() * resource_count).astype(numpy.int64))
+    counts[numpy.argmax(counts)] += resource_count - counts.sum()
+
+    resource_type_map = {}
+    resources = {}
+    for type_index, count in enumerate(counts):
+        function_index, trace_index = divmod(type_index, trace_count)
+        uid = f"function_{function_index}"
+        depth = 1 + (function_index + trace_index) % trace_depth
+        trace = [{"func": "main"}] + [
+            {"func": f"function_{(function_index * 31 + trace_index * 7 + level) % function_count}"}
+            for level in range(depth - 1)
+        ]
+        resource_type = f"{uid}#{trace_index}"
+        resource_type_map[resource_type] = {
+            "uid": uid,
+            "location": LOCATIONS[function_index % len(LOCATIONS)],
+            "trace": trace + [{"func": uid}],
+            "type": "time",
+        }
+
+        scale = (slowdown or {}).get(function_index, 1.0) * (1 + function_index % 13)
+        amounts = rng.gamma(2.0, 50.0 * scale, int(count)).astype(numpy.int64) + 1
+        resources[resource_type] = {
+            "amount": to_array(amounts, "q"),
+            "exclusive": to_array(amounts * rng.uniform(0.1, 1.0, int(count)), "d"),
+        }
+
+    profile = Profile(
+        {
+            "resource_type_map": resource_type_map,
+            "origin": "0" * 40,
+            "header": {
+                "type": "time",
+                "cmd": "synthetic",
+                "workload": str(resource_count),
+                "units": {"time": "sample"},
+            },
+            "collector_info": {"name": "kperf", "params": {}},
+            "machine": {
+                "host": "synthetic",
+                "release": "?",
+                "cpu": {"total": 1},
+                "memory": {"total_ram": "?"},
+            },
+            "postprocessors": [],
+        }
+    )
+    profile.update_resources(resources, "resources")
+    return profile
+
+
+def generate_profile_pair(resource_count, seed=0, degradation_count=5):
+    """Generates the pair of baseline and target profiles
+
+    The target profile has the same structure as the baseline, but some of its functions are
+    slowed down.
+
+    :param int resource_count: number of resources in each of the profiles
+    :param int seed: seed of the random generator
+    :param int degradation_count: number of slowed down functions in the target profile
+    :return: pair of baseline and target profile
+    """
+    baseline = generate_profile(resource_count, seed)
+    slowdown = {
+        function_index * 3: 2.0 + function_index for function_index in range(degradation_count)
+    }
+    target = generate_profile(resource_count, seed + 1, slowdown=slowdown)
+    return baseline, target
@@ -1,33 +1,478 @@
 """
-Basic set of performance benchmarks for Perun
+Performance benchmark suite for Perun
 
-1. Handling of the profiles
-  a. loading the profile from json (and converting to latest format)
-  b. iterating through all of the resources
-  c. converting to pandas dataframe
-  d. storing the profile from json to filesystem
+The suite measures the lifecycle operations over the synthetic profiles (see ``synthetic.py``) of
+several scales (10k, 1M and 10M resources):
+
+  1. storing the profile as an object and loading it back
+  2. operations over the minor version index (registration, lookups and removal)
+  3. iterating through all of the resources (``Profile.all_resources``)
+  4. converting the resources to pandas dataframe
+  5. generating the diff report of two profiles
+  6. checking the degradations between two profiles
+
+Each benchmark is run in a separate process, so we can measure both its time and its peak resident
+set size (RSS). The results are stored in machine-readable JSON, can be compared against a saved
+baseline (returning non-zero exit code in case of regression) and can be exported as a Perun
+profile, so Perun can track its own performance.
+
+Run ``python tests-perf/test_performance.py suite --help`` for the list of options. The original
+benchmark of real profiles stored in a directory can be run by ``files`` command.
 """
-import time
+import contextlib
+import gc
+import json
+import multiprocessing
 import os
+import queue
+import resource
 import sys
+import tempfile
+import time
+import tracemalloc
+
+import click
 import tabulate
+
+import perun.logic.index as index
 import perun.logic.store as store
+from perun.check import factory as check_factory
+from perun.profile import convert
+import perun.profile.factory as factory
+from perun.utils import log, streams, timestamps
 from perun.utils.common import common_kit
-import perun.profile.convert as convert
-import perun.utils.log as log
-import perun.utils.streams as streams
+from perun.utils.external import environment
+from perun.view_diff.report import run as report_run
+
+import synthetic
+
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_TOLERANCE = 0.25
+
+
+def prepare_store(resource_count, workdir):
+    """Prepares the benchmark of packing and storing the profile as an object
+
+    :param int resource_count: number of resources of the profile
+    :param str workdir: directory, where the temporary files are stored
+    :return: measured function
+    """
+    profile = synthetic.generate_profile(resource_count)
 
+    def measured():
+        checksum, content = store.pack_profile(profile, store.DEFAULT_PROFILE_OBJECT_FORMAT)
+        store.add_loose_object_to_dir(os.path.join(workdir, "objects"), checksum, content)
 
-RUN_SINGLE = False
+    return measured
 
 
-def run_benchmark(benchmark_dir, performance_tests):
+def prepare_load(resource_count, workdir):
+    """Prepares the benchmark of loading the stored profile object
+
+    :param int resource_count: number of resources of the profile
+    :param str workdir: directory, where the temporary files are stored
+    :return: measured function
+    """
+    profile = synthetic.generate_profile(resource_count)
+    object_file = os.path.join(workdir, "profile.obj")
+    with open(object_file, "wb") as object_handle:
+        object_handle.write(store.pack_profile(profile, store.DEFAULT_PROFILE_OBJECT_FORMAT)[1])
+    del profile
+    return lambda: store.load_profile_from_file(object_file, False)
+
+
+def prepare_index(resource_count, workdir):
+    """Prepares the benchmark of operations over the minor version index
+
+    The number of registered entries is the number of resources divided by 1000.
+
+    :param int resource_count: scale of the benchmark
+    :param str workdir: directory, where the temporary files are stored
+    :return: measured function
+    """
+    entry_count = max(10, resource_count // 1000)
+    minor_version = "0" * 40
+    minor_dir, index_file = store.split_object_name(workdir, minor_version)
+    common_kit.touch_dir(minor_dir)
+    profile_info = {
+        "header": {"type": "time", "cmd": "synthetic", "workload": ""},
+        "collector_info": {"name": "kperf"},
+        "postprocessors": [],
+    }
+    paths = [f"profile-{(i * 7919) % entry_count}.perf" for i in range(entry_count)]
+    checksums = [store.compute_checksum(path.encode("utf-8")) for path in paths]
+    stamps = [timestamps.timestamp_to_str(1700000000 + i) for i in range(entry_count)]
+
+    def measured():
+        index.touch_index(index_file)
+        for path, checksum, stamp in zip(paths, checksums, stamps):
+            entry = index.ExtendedIndexEntry(stamp, checksum, path, -1, profile_info)
+            index.write_entry_to_index(index_file, entry)
+        with open(index_file, "rb") as index_handle:
+            for path, checksum in zip(paths[::10], checksums[1::10]):
+                index.lookup_entry_by_checksum_or_path(index_handle, path)
+                index.lookup_entry_by_checksum_or_path(index_handle, checksum)
+        index.remove_from_index(workdir, minor_version, paths[::2])
+
+    return measured
+
+
+def prepare_all_resources(resource_count, _):
+    """Prepares the benchmark of iterating through all the resources of the profile
+
+    :param int resource_count: number of resources of the profile
+    :return: measured function
+    """
+    profile = synthetic.generate_profile(resource_count)
+
+    def measured():
+        for _ in profile.all_resources(True):
+            pass
+
+    return measured
+
+
+def prepare_convert(resource_count, _):
+    """Prepares the benchmark of converting the resources to pandas dataframe
+
+    :param int resource_count: number of resources of the profile
+    :return: measured function
+    """
+    profile = synthetic.generate_profile(resource_count)
+    return lambda: convert.resources_to_pandas_dataframe(profile)
+
+
+def prepare_report(resource_count, workdir):
+    """Prepares the benchmark of generating the diff report of two profiles
+
+    :param int resource_count: number of resources of each of the profiles
+    :param str workdir: directory, where the temporary files are stored
+    :return: measured function
+    """
+    baseline, target = synthetic.generate_profile_pair(resource_count)
+    output_file = os.path.join(workdir, "report.html")
+    return lambda: report_run.generate_html_report(baseline, target, output_file=output_file)
+
+
+def prepare_check(resource_count, _):
+    """Prepares the benchmark of checking degradations between two profiles
+
+    :param int resource_count: number of resources of each of the profiles
+    :return: measured function
+    """
+    baseline, target = synthetic.generate_profile_pair(resource_count)
+
+    def measured():
+        for method in ("average_amount_threshold", "exclusive_time_outliers"):
+            list(check_factory.run_degradation_check(method, baseline, target))
+
+    return measured
+
+
+BENCHMARKS = {
+    "store": prepare_store,
+    "load": prepare_load,
+    "index": prepare_index,
+    "all_resources": prepare_all_resources,
+    "convert": prepare_convert,
+    "report": prepare_report,
+    "check": prepare_check,
+}
+
+
+def get_peak_rss():
+    """Returns the peak resident set size of the current process
+
+    :return: peak RSS in MB
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Note: Linux reports the peak RSS in kilobytes, while macOS in bytes
+    return peak_rss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def measure_benchmark(benchmark, resource_count, result_queue):
+    """Measures one benchmark in the current (fresh) process
+
+    :param str benchmark: name of the benchmark
+    :param int resource_count: scale of the benchmark
+    :param multiprocessing.Queue result_queue: queue, where the results are passed
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        measured = BENCHMARKS[benchmark](resource_count, workdir)
+        gc.collect()
+        setup_rss = get_peak_rss()
+        with open(os.devnull, "w") as black_hole, contextlib.redirect_stdout(black_hole):
+            before = time.perf_counter()
+            measured()
+            elapsed = time.perf_counter() - before
+        result_queue.put({"time": elapsed, "setup_rss": setup_rss, "peak_rss": get_peak_rss()})
+
+
+def run_benchmark(benchmark, scale, repeat):
+    """Runs the benchmark in separate processes and returns the best of the measured results
+
+    :param str benchmark: name of the benchmark
+    :param str scale: name of the scale of the benchmark
+    :param int repeat: number of repetitions of the benchmark
+    :return: dictionary with results of the benchmark
+    """
+    context = multiprocessing.get_context("spawn")
+    measurements = []
+    for _ in range(repeat):
+        result_queue = context.Queue()
+        process = context.Process(
+            target=measure_benchmark,
+            args=(benchmark, synthetic.SCALES[scale], result_queue),
+        )
+        process.start()
+        while True:
+            try:
+                measurements.append(result_queue.get(timeout=1))
+                break
+            except queue.Empty:
+                if not process.is_alive():
+                    raise click.ClickException(
+                        f"benchmark '{benchmark}' ({scale}) failed with exit code"
+                        f" {process.exitcode}"
+                    )
+        process.join()
+    return {
+        "benchmark": benchmark,
+        "scale": scale,
+        "resources": synthetic.SCALES[scale],
+        "time": min(measurement["time"] for measurement in measurements),
+        "peak_rss": min(measurement["peak_rss"] for measurement in measurements),
+        "rss_delta": min(
+            measurement["peak_rss"] - measurement["setup_rss"] for measurement in measurements
+        ),
+    }
+
+
+# Minimal absolute slowdown (in seconds) that is reported as regression
+MIN_TIME_DIFFERENCE = 0.1
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Compares the results with the baseline results
+
+    The benchmark is regressed, if either its time or its peak RSS exceeds the baseline by more
+    than the given tolerance. Slowdowns smaller than MIN_TIME_DIFFERENCE are considered to be
+    a measurement noise.
+
+    :param list results: list of results of the benchmarks
+    :param dict baseline: loaded baseline results
+    :param float tolerance: tolerated relative slowdown (e.g. 0.25 for 25%)
+    :return: pair of table rows with comparison and list of regressed benchmarks
+    """
+    baseline_results = {
+        (result["benchmark"], result["scale"]): result for result in baseline["results"]
+    }
+    rows, regressions = [], []
+    for result in results:
+        key = (result["benchmark"], result["scale"])
+        if key not in baseline_results:
+            rows.append([*key, result["time"], None, None, result["peak_rss"], None, "new"])
+            continue
+        base = baseline_results[key]
+        time_ratio = result["time"] / base["time"] if base["time"] else 1.0
+        rss_ratio = result["peak_rss"] / base["peak_rss"] if base["peak_rss"] else 1.0
+        is_slower = result["time"] - base["time"] > MIN_TIME_DIFFERENCE
+        is_regressed = (is_slower and time_ratio > 1 + tolerance) or rss_ratio > 1 + tolerance
+        if is_regressed:
+            regressions.append(key)
+        rows.append(
+            [
+                *key,
+                result["time"],
+                base["time"],
+                time_ratio,
+                result["peak_rss"],
+                base["peak_rss"],
+                log.in_color("regressed", "red") if is_regressed else "ok",
+            ]
+        )
+    return rows, regressions
+
+
+def results_to_profile(results):
+    """Converts the results of the benchmarks to Perun profile
+
+    Each measured benchmark is represented by two resources: its time and its peak RSS.
+
+    :param list results: list of results of the benchmarks
+    :return: profile with the results
+    """
+    profile = factory.Profile(
+        {
+            "header": {
+                "type": "mixed",
+                "cmd": "perun-benchmarks",
+                "workload": ",".join(sorted({result["scale"] for result in results})),
+                "units": {"time": "s", "memory": "MB"},
+            },
+            "collector_info": {"name": "benchmarks", "params": {}},
+            "postprocessors": [],
+            "machine": environment.get_machine_specification(),
+        }
+    )
+    profile.update_resources(
+        [
+            {
+                "uid": f"{result['benchmark']}@{result['scale']}",
+                "type": kind,
+                "subtype": result["benchmark"],
+                "amount": result[key],
+            }
+            for result in results
+            for kind, key in (("time", "time"), ("memory", "peak_rss"))
+        ],
+        "resources",
+    )
+    return profile
+
+
+@click.group()
+def cli():
+    """Performance benchmarks of Perun"""
+
+
+@cli.command()
+@click.option(
+    "--benchmark",
+    "-b",
+    "benchmarks",
+    type=click.Choice(list(BENCHMARKS)),
+    multiple=True,
+    help="Runs only the selected benchmarks (by default all are run).",
+)
+@click.option(
+    "--scale",
+    "-s",
+    "scales",
+    type=click.Choice(list(synthetic.SCALES)),
+    multiple=True,
+    help="Scales of the synthetic profiles (by default 10k and 1M).",
+)
+@click.option("--repeat", "-r", type=int, default=1, help="Number of repetitions of benchmarks.")
+@click.option(
+    "--output", "-o", type=click.Path(), default=None, help="Stores the results in JSON file."
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True),
+    default=None,
+    help="Compares the results against the baseline results (stored by --output).",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=DEFAULT_TOLERANCE,
+    help="Tolerated relative regression of time and peak RSS w.r.t. baseline.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(),
+    default=None,
+    help="Stores the results as Perun profile.",
+)
+def suite(benchmarks, scales, repeat, output, baseline, tolerance, profile_output):
+    """Runs the benchmarks over the synthetic profiles"""
+    benchmarks = benchmarks or list(BENCHMARKS)
+    scales = scales or ["10k", "1M"]
+    results = []
+    for scale in scales:
+        for benchmark in benchmarks:
+            log.write(f" > {log.in_color(benchmark, 'yellow')} ({scale})")
+            result = run_benchmark(benchmark, scale, repeat)
+            log.write(
+                "   {} in {}, peak RSS {}".format(
+                    benchmark,
+                    log.in_color(f"{result['time']:0.2f}s", "white"),
+                    log.in_color(f"{result['peak_rss']:0.0f}MB", "white"),
+                )
+            )
+            results.append(result)
+
+    log.write("")
+    headers = ["benchmark", "scale", "time [s]", "peak RSS [MB]", "RSS delta [MB]"]
+    rows = [
+        [
+            result["benchmark"],
+            result["scale"],
+            result["time"],
+            result["peak_rss"],
+            result["rss_delta"],
+        ]
+        for result in results
+    ]
+    log.write(tabulate.tabulate(rows, headers=headers, floatfmt=".2f"))
+
+    if output:
+        with open(output, "w") as output_handle:
+            json.dump(
+                {
+                    "version": RESULTS_FORMAT_VERSION,
+                    "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "machine": environment.get_machine_specification(),
+                    "results": results,
+                },
+                output_handle,
+                indent=2,
+            )
+        log.write(f"Results stored in {log.in_color(output, 'white')}")
+
+    if profile_output:
+        streams.store_json(results_to_profile(results).serialize(), profile_output)
+        log.write(f"Results stored as profile in {log.in_color(profile_output, 'white')}")
+
+    if baseline:
+        with open(baseline, "r") as baseline_handle:
+            rows, regressions = compare_with_baseline(
+                results, json.load(baseline_handle), tolerance
+            )
+        log.write("")
+        headers = [
+            "benchmark",
+            "scale",
+            "time [s]",
+            "baseline [s]",
+            "ratio",
+            "peak RSS [MB]",
+            "baseline [MB]",
+            "status",
+        ]
+        log.write(tabulate.tabulate(rows, headers=headers, floatfmt=".2f"))
+        if regressions:
+            log.write(log.in_color(f"{len(regressions)} benchmark(s) regressed", "red"))
+            sys.exit(1)
+
+
+@cli.command()
+@click.argument("benchmark_dir", type=click.Path(exists=True, file_okay=False))
+@click.argument(
+    "performance_tests",
+    nargs=-1,
+    type=click.Choice(["load", "query", "convert", "store", "memory"]),
+)
+def files(benchmark_dir, performance_tests):
+    """Runs the benchmark on all the profiles stored in the directory"""
+    start_time = time.time()
+    run_files_benchmark(benchmark_dir, performance_tests)
+    benchmark_time = time.time() - start_time
+    log.write(
+        "Benchmark finished in {}".format(log.in_color("{:0.2f}s".format(benchmark_time), "white"))
+    )
+
+
+def run_files_benchmark(benchmark_dir, performance_tests):
     """Runs the benchmark on all of the files in the given benchmark directory
 
     :param str benchmark_dir: directory, where benchmarks are stored
     :param list performance_tests: list of performance tests that should be run
     """
-    possible_tests = ("load", "query", "convert", "store")
+    possible_tests = ("load", "query", "convert", "store", "memory")
     executed_tests = performance_tests or possible_tests
     log.write("Running benchmark_dir: {}".format(log.in_color(benchmark_dir, "red")))
     results = []
@@ -40,6 +485,8 @@ def run_benchmark(benchmark_dir, performance_tests):
     log.write("")
     log.write("")
     headers = ["file"] + [pt for pt in possible_tests if pt in executed_tests]
+    if "memory" in executed_tests:
+        headers = headers[:-1] + ["columns [MB]", "lists [MB]"]
     log.write(tabulate.tabulate(results, headers=headers, floatfmt=".2f"))
     with open(benchmark_dir + ".html", "w") as hh:
         hh.write(tabulate.tabulate(results, headers=headers, tablefmt="html", floatfmt=".2f"))
@@ -86,17 +533,38 @@ def performance_test(bench_dir, file, store_dir, executed_tests):
         elapsed = time.time() - before
         results.append(elapsed)
         log.write("Storing profile: {}".format(log.in_color("{:0.2f}s".format(elapsed), "white")))
+
+    if "memory" in executed_tests:
+        resources = profile.serialize()["resources"]
+        columns_size = measure_memory(
+            lambda: {
+                resource_type: {key: factory.to_column(column) for key, column in res.items()}
+                for resource_type, res in resources.items()
+            }
+        )
+        lists_size = measure_memory(lambda: profile.serialize()["resources"])
+        results.extend([columns_size, lists_size])
+        log.write(
+            "Resources in columns: {}, in lists: {}".format(
+                log.in_color("{:0.2f}MB".format(columns_size), "white"),
+                log.in_color("{:0.2f}MB".format(lists_size), "white"),
+            )
+        )
     return results
 
 
+def measure_memory(func):
+    """Measures the memory that is kept allocated by the result of the function
+
+    :param function func: measured function
+    :return: size of the retained memory in MB
+    """
+    tracemalloc.start()
+    _ = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 2**20
+
+
 if __name__ == "__main__":
-    performance_tests = sys.argv[1:]
-    start_time = time.time()
-    if RUN_SINGLE:
-        run_benchmark(os.path.join("tests-perf", "single-monster"), performance_tests)
-    else:
-        run_benchmark(os.path.join("tests-perf", "monster-profiles"), performance_tests)
-    benchmark_time = time.time() - start_time
-    log.write(
-        "Benchmark finished in {}".format(log.in_color("{:0.2f}s".format(benchmark_time), "white"))
-    )
+    cli()
@@ -520,6 +520,7 @@ def setup():
         singleton.instance = None
     for singleton_with_args in decorators.func_args_cache.values():
         singleton_with_args.clear()
+    store.PROFILE_CACHE.clear()
 
     # Reset the verbosity to release
     log.VERBOSITY = 0
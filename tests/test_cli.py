@@ -20,7 +20,7 @@ import pytest
 # Perun Imports
 from perun import cli
 from perun.cli_groups import utils_cli, config_cli, run_cli, check_cli
-from perun.logic import config, pcs, stats, temp
+from perun.logic import config, pcs, stats, store, temp
 from perun.testing import asserts
 from perun.utils import exceptions, log
 from perun.utils.common import common_kit
@@ -899,6 +899,43 @@ def test_kernel_regression_correct(pcs_with_root):
     kernel_regression_runner_test(runner, correct_tests, tests_edge, 0, profile)
 
 
+def test_parallel_postprocessing(pcs_with_root):
+    """Test postprocessing of the profiles with computation of the models in more processes
+
+    Expecting the same models in the same order as when computed sequentially
+    """
+    warnings.filterwarnings("ignore")
+    runner = CliRunner()
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "postprocess_profiles")
+    profile = os.path.join(pool_path, "exp_datapoints_rg_ma_kr.perf")
+    postprocessors = [
+        ["regression-analysis", "-m", "full"],
+        ["regressogram", "-bn", "5"],
+        ["moving-average"],
+        ["kernel-regression"],
+    ]
+    for workers in ("1", "3"):
+        config.runtime().set("postprocess.workers", workers)
+        for postprocessor in postprocessors:
+            result = runner.invoke(
+                cli.postprocessby,
+                ["-ot", f"{postprocessor[0]}-{workers}", profile] + postprocessor,
+            )
+            asserts.predicate_from_cli(result, "succeeded" in result.output)
+            asserts.predicate_from_cli(result, result.exit_code == 0)
+
+    jobs_dir = pcs.get_job_directory()
+    for postprocessor in postprocessors:
+        sequential, parallel = [
+            store.load_profile_from_file(
+                os.path.join(jobs_dir, f"{postprocessor[0]}-{workers}.perf"), True
+            )
+            for workers in ("1", "3")
+        ]
+        assert sequential["models"]
+        assert parallel["models"] == sequential["models"]
+
+
 def test_reg_analysis_incorrect(pcs_single_prof):
     """Test various failure scenarios for regression analysis cli.
 
@@ -1907,6 +1944,11 @@ def test_check_all(pcs_with_degradations, monkeypatch):
     result = runner.invoke(check_cli.check_all, [])
     asserts.predicate_from_cli(result, result.exit_code == 0)
 
+    result = runner.invoke(check_cli.check_all, ["--workers", "2", "--resume"])
+    asserts.predicate_from_cli(result, result.exit_code == 0)
+    assert config.runtime().get("degradation.workers") == 2
+    config.runtime().data.clear()
+
     runner = CliRunner()
     result = runner.invoke(cli.status)
     asserts.predicate_from_cli(result, result.exit_code == 0)
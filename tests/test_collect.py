@@ -8,10 +8,18 @@ import signal
 
 # Third-Party Imports
 from click.testing import CliRunner
+import progressbar
+import pytest
 
 # Perun Imports
 from perun import cli
 from perun.collect.complexity import makefiles, symbols, run as complexity, configurator
+from perun.collect.kperf import parser as kperf_parser, run as kperf_run
+from perun.collect.memory import (
+    filter as memory_filters,
+    parsing as memory_parsing,
+    run as memory_run,
+)
 from perun.logic import pcs, runner as run
 from perun.profile.factory import Profile
 from perun.testing import asserts, utils as test_utils
@@ -75,7 +83,8 @@ def test_collect_complexity(monkeypatch, pcs_with_root, complexity_collect_job):
 
     # Assert that nothing was removed
     after_object_count = test_utils.count_contents_on_path(pcs_with_root.get_path())[0]
-    assert before_object_count + 2 == after_object_count
+    # The profile, the pending index and its offset table (in the cache) were created
+    assert before_object_count + 3 == after_object_count
     profiles = list(
         filter(
             test_utils.index_filter,
@@ -264,7 +273,8 @@ def test_collect_memory(capsys, pcs_with_root, memory_collect_job, memory_collec
 
     # Assert that nothing was removed
     after_object_count = test_utils.count_contents_on_path(pcs_with_root.get_path())[0]
-    assert before_object_count + 2 == after_object_count
+    # The profile, the pending index and its offset table (in the cache) were created
+    assert before_object_count + 3 == after_object_count
 
     profiles = list(
         filter(
@@ -392,6 +402,39 @@ def test_collect_memory_incorrect(monkeypatch, capsys, pcs_with_root, memory_col
     assert "Execution of binary failed with error code: 42" in err
 
 
+def test_collect_memory_parsing(monkeypatch, pcs_with_root, memory_collect_job):
+    """Test parsing the memory log in batches of allocations"""
+    executable = Executable(memory_collect_job[0][0], "3")
+    assert memory_run.before(executable)[0] == CollectStatus.OK
+    assert memory_run.collect(executable)[0] == CollectStatus.OK
+
+    def collect_resources(**filter_params):
+        resource_filter = memory_filters.create_resource_filter(**filter_params)
+        profile = memory_parsing.parse_log("MemoryLog", executable, 0.001, resource_filter)
+        return sorted(
+            (res["snapshot"], res["subtype"], res["amount"], res["uid"]["function"])
+            for _, res in profile.all_resources()
+        )
+
+    resources = collect_resources(include_all=False, exclude_funcs=[], exclude_sources=[])
+    assert [res[1:] for res in resources].count(("malloc", 4, "fun")) == 3
+    assert {res[3] for res in resources} == {"main", "fun"}
+    excluded = collect_resources(include_all=False, exclude_funcs=["fun"], exclude_sources=[])
+    assert excluded == [res for res in resources if res[3] != "fun"]
+
+    # Parsing in the smallest batches yields the same resources
+    monkeypatch.setattr(memory_parsing, "ALLOCATION_BATCH_SIZE", 1)
+    assert collect_resources(include_all=False, exclude_funcs=[], exclude_sources=[]) == resources
+
+    # The log without exit record is malformed
+    with open("MemoryLog", "r") as memory_log:
+        lines = memory_log.readlines()
+    with open("MemoryLog", "w") as memory_log:
+        memory_log.writelines(line for line in lines if not line.startswith("EXIT"))
+    with pytest.raises(ValueError):
+        collect_resources(include_all=False, exclude_funcs=[], exclude_sources=[])
+
+
 def test_collect_memory_with_generator(pcs_with_root, memory_collect_job):
     """Tries to collect the memory with integer generators"""
     executable = Executable(memory_collect_job[0][0])
@@ -461,7 +504,8 @@ def test_collect_time(monkeypatch, pcs_with_root, capsys):
     # Assert that just one profile was created
     # + 1 for index
     after_object_count = test_utils.count_contents_on_path(pcs_with_root.get_path())[0]
-    assert before_object_count + 2 == after_object_count
+    # The profile, the pending index and its offset table (in the cache) were created
+    assert before_object_count + 3 == after_object_count
 
     profiles = list(
         filter(
@@ -564,7 +608,8 @@ def test_collect_kperf(monkeypatch, pcs_with_root, capsys):
     result = runner.invoke(cli.collect, ["-c", "ls", "-w", ".", "kperf", "-w", "1", "-r", "1"])
     assert result.exit_code == 0
     after_object_count = test_utils.count_contents_on_path(pcs_with_root.get_path())[0]
-    assert before_object_count + 2 == after_object_count
+    # The profile, the pending index and its offset table (in the cache) were created
+    assert before_object_count + 3 == after_object_count
 
     # Test sudo (mocked)
     def mocked_safe_external(*_, **__):
@@ -614,3 +659,62 @@ def test_collect_kperf(monkeypatch, pcs_with_root, capsys):
     result = runner.invoke(cli.collect, ["-c", "ls", "-w", ".", "kperf", "-w", "0", "-r", "1"])
     assert result.exit_code != 0
     assert "not-executable" in result.output
+
+
+def test_collect_kperf_streamed(monkeypatch, pcs_with_root):
+    """Test collecting the profile using the kperf collector with streamed output of perf
+
+    Expecting the folded stacks to be aggregated over the repeats, both if run sequentially or
+    in parallel, and the failed runs to be skipped
+    """
+    # The progress bars may be bound to the streams of the previous tests
+    monkeypatch.setattr(progressbar, "progressbar", lambda iterable, **_: iterable)
+    folded_stacks = ["ls;main;f;g 3\n", "ls;main;f 2\n", "\n", "ls;main;f;g 1\n"]
+    assert kperf_parser.parse_events(folded_stacks) == [
+        {"amount": 3, "uid": "g", "command": "ls", "trace": [{"func": "main"}, {"func": "f"}]},
+        {"amount": 1, "uid": "g", "command": "ls", "trace": [{"func": "main"}, {"func": "f"}]},
+        {"amount": 2, "uid": "f", "command": "ls", "trace": [{"func": "main"}]},
+    ]
+
+    # The streaming of the commands
+    assert list(commands.stream_safely_external_command("echo hello world | tr o 0")) == [
+        "hell0 w0rld\n"
+    ]
+    with pytest.raises(CalledProcessError):
+        list(commands.stream_safely_external_command("echo hello | false"))
+
+    recorded_files = []
+
+    def mocked_record(cmd, *_, **__):
+        recorded_files.append(cmd.split(" -o ")[1].split()[0])
+        return b"", b""
+
+    def mocked_stream(cmd, *_, **__):
+        if "collected.1.data" in cmd:
+            raise CalledProcessError(1, "perf script")
+        yield from folded_stacks
+
+    monkeypatch.setattr(commands, "run_safely_external_command", mocked_record)
+    monkeypatch.setattr(commands, "stream_safely_external_command", mocked_stream)
+
+    for jobs, expected_amounts in [(1, [3, 1, 3, 1, 3, 1]), (3, [3, 1, 3, 1])]:
+        recorded_files.clear()
+        status, _, kwargs = kperf_run.collect(Executable("ls"), warmup=1, repeat=3, jobs=jobs)
+        assert status == CollectStatus.OK
+        assert len(recorded_files) == 4
+        status, _, kwargs = kperf_run.after(**kwargs)
+        assert status == CollectStatus.OK
+        resources = kwargs["profile"]["global"]["resources"]
+        assert [r["amount"] for r in resources if r["uid"] == "g"] == expected_amounts
+        assert not any(os.path.exists(f"collected.{i}.data") for i in range(3))
+
+    monkeypatch.setattr("perun.utils.external.commands.is_executable", lambda command: True)
+    before_object_count = test_utils.count_contents_on_path(pcs_with_root.get_path())[0]
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.collect, ["-c", "ls", "-w", ".", "kperf", "-w", "0", "-r", "2", "-j", "2"]
+    )
+    assert result.exit_code == 0
+    after_object_count = test_utils.count_contents_on_path(pcs_with_root.get_path())[0]
+    # The profile, the pending index and its offset table (in the cache) were created
+    assert before_object_count + 3 == after_object_count
@@ -11,9 +11,13 @@ import pytest
 # Perun Imports
 from perun.check.methods.abstract_base_checker import AbstractBaseChecker
 from perun.logic import config, store
+from perun.profile.factory import Profile
 from perun.utils import log
 from perun.utils.exceptions import UnsupportedModuleException
+import perun.check.detection_kit as detection
+import perun.check.methods.exclusive_time_outliers as eto_module
 import perun.check.factory as check
+import perun.fuzz.evaluate.by_perun as perun_fuzz
 
 
 def test_degradation_precollect(monkeypatch, pcs_with_degradations, capsys):
@@ -69,11 +73,19 @@ def test_degradation_in_minor(pcs_with_degradations, capsys):
     git_repo = git.Repo(pcs_with_degradations.get_vcs_path())
     head = str(git_repo.head.commit)
 
-    check.degradation_in_minor(head)
+    changes = check.degradation_in_minor(head)
     out, err = capsys.readouterr()
     assert "Optimization" in out
     assert err == ""
 
+    # The profiles loaded concurrently in batches yield the same changes
+    config.runtime().set("profiles.load_workers", "2")
+    batched_changes = check.degradation_in_minor(head)
+    config.runtime().data.clear()
+    assert [(deg.location, deg.result, cmd, src) for deg, cmd, src in batched_changes] == [
+        (deg.location, deg.result, cmd, src) for deg, cmd, src in changes
+    ]
+
 
 def test_degradation_in_history(pcs_with_degradations):
     """Set of basic tests for testing degradation in while history
@@ -87,6 +99,61 @@ def test_degradation_in_history(pcs_with_degradations):
     assert check.PerformanceChange.Degradation in [r[0].result for r in result]
 
 
+def test_degradation_in_history_resume(pcs_with_degradations, monkeypatch):
+    """Test checking the whole history in parallel and resuming the interrupted check
+
+    Expects correct behaviour
+    """
+    git_repo = git.Repo(pcs_with_degradations.get_vcs_path())
+    head = str(git_repo.head.commit)
+
+    def to_records(changes):
+        return [
+            (deg.location, deg.result, deg.from_baseline, deg.to_target, cmdstr, source)
+            for deg, cmdstr, source in changes
+        ]
+
+    expected = to_records(check.degradation_in_history(head))
+    checkpoint = check.HistoryCheckpoint(head, True)
+    assert not os.path.exists(checkpoint.path)
+
+    # The changes are reported in the same order when checked by the pool of workers
+    config.runtime().set("degradation.workers", 2)
+    assert check.get_degradation_workers() == 2
+    assert to_records(check.degradation_in_history(head)) == expected
+    config.runtime().data.clear()
+
+    # Interrupt the check after the first minor version
+    check_pairs = check.check_history_pairs
+    checked_pairs = []
+
+    def interrupted_check(pairs, loaded_profiles):
+        if checked_pairs:
+            raise KeyboardInterrupt
+        checked_pairs.append(pairs)
+        return check_pairs(pairs, loaded_profiles)
+
+    monkeypatch.setattr(check, "check_history_pairs", interrupted_check)
+    with pytest.raises(KeyboardInterrupt):
+        check.degradation_in_history(head)
+    checkpoint = check.HistoryCheckpoint(head, True)
+    assert list(checkpoint.finished.keys()) == [head]
+
+    # The resumed check does not check the finished minor version again
+    checked_pairs.clear()
+
+    def resumed_check(pairs, loaded_profiles):
+        # Only the profiles of the checked minor version are passed to the check
+        assert set(loaded_profiles) == {path for pair in pairs for path in pair[1:3]}
+        checked_pairs.append(pairs)
+        return check_pairs(pairs, loaded_profiles)
+
+    monkeypatch.setattr(check, "check_history_pairs", resumed_check)
+    assert to_records(check.degradation_in_history(head, resume=True)) == expected
+    assert len(checked_pairs) == 3
+    assert not os.path.exists(checkpoint.path)
+
+
 def test_degradation_between_profiles(pcs_with_root, capsys):
     """Set of basic tests for testing degradation between profiles
 
@@ -197,6 +264,167 @@ def test_degradation_between_profiles(pcs_with_root, capsys):
         _ = list(check.run_degradation_check("unknown", profiles[3], profiles[3]))
 
 
+def test_exclusive_time_outliers(pcs_with_root):
+    """Test the exclusive time outliers on profiles with renamed locations
+
+    Expects correct behaviour
+    """
+
+    def trace_profile(functions):
+        resources, resource_type_map = {}, {}
+        for i, (uid, location, exclusive_times) in enumerate(functions):
+            resources[f"{uid}#{i}"] = {"amount": exclusive_times, "exclusive": exclusive_times}
+            resource_type_map[f"{uid}#{i}"] = {"uid": uid, "location": location, "tid": i}
+        return Profile({"resources": resources, "resource_type_map": resource_type_map})
+
+    baseline = trace_profile(
+        [
+            ("main", "prog", [1000000]),
+            ("parse", "mylib-3.4", [2000000, 2000000]),
+            ("parse", "mylib-3.4", [1000000]),
+            ("removed", "mylib-3.4", [3000000]),
+        ]
+        + [(f"f{i}", "prog", [1000000]) for i in range(10)]
+    )
+    target = trace_profile(
+        [
+            ("main", "prog", [1000000]),
+            ("parse", "mylib-3.5", [25000000]),
+            ("added", "mylib-3.5", [1000000]),
+        ]
+        + [(f"f{i}", "prog", [1000000 + 1000 * i]) for i in range(10)]
+    )
+    eto = eto_module.ExclusiveTimeOutliers()
+    results = {r.location: r for r in eto.check(baseline, target)}
+    # The resources of the same function are summed and the renamed library is still matched
+    assert results["parse"].result == check.PerformanceChange.SevereDegradation
+    assert (results["parse"].from_baseline, results["parse"].to_target) == ("5.0", "25.0")
+    assert results["parse"].rate_degradation == 20.0
+    assert results["added"].result == check.PerformanceChange.NotInBaseline
+    assert results["main"].result == check.PerformanceChange.NoChange
+    assert results["mylib-3."].result == check.PerformanceChange.TotalDegradation
+    assert results["prog"].rate_degradation == pytest.approx(0.045)
+    assert "mylib-3.4" not in results and "removed" not in results
+
+    # Only the functions from the filtered locations are checked
+    config.runtime().set("degradation.location_filter", "^prog$")
+    filtered = {r.location for r in eto.check(baseline, target)}
+    config.runtime().data.clear()
+    assert filtered == {"prog", "main"} | {f"f{i}" for i in range(10)}
+
+    # Similar names are matched only to names of similar lengths, identical names have priority
+    assert eto_module._map_similar_names(
+        ["mylib-3.4", "libc.so.6", "libc.so.7", "a"], ["libc.so.7x", "libc.so.6", "mylib-3.5"]
+    ) == (
+        {"mylib-3.4": "mylib-3.", "libc.so.6": "libc.so.6", "libc.so.7": "libc.so.7"},
+        {"mylib-3.5": "mylib-3.", "libc.so.6": "libc.so.6", "libc.so.7x": "libc.so.7"},
+    )
+    for length in range(50):
+        lower, upper = eto_module._length_bounds(length)
+        for other in range(100):
+            if not lower <= other <= upper:
+                assert 2 * min(length, other) / (length + other) < eto_module.SIMILARITY_CUTOFF
+
+
+def test_degradation_with_fingerprint(pcs_with_root):
+    """Tests checking the targets against the precomputed fingerprint of the baseline
+
+    Expects the same results as when the baseline is checked without the fingerprint
+    """
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    baseline = store.load_profile_from_file(os.path.join(pool_path, "linear_base.perf"), True, True)
+    targets = [
+        store.load_profile_from_file(os.path.join(pool_path, "quad_base.perf"), True, True),
+        store.load_profile_from_file(
+            os.path.join(pool_path, "linear_base_degradated.perf"), True, True
+        ),
+    ]
+
+    def to_tuples(degradations):
+        return [
+            (
+                str(deg.result),
+                deg.location,
+                deg.from_baseline,
+                deg.to_target,
+                str(deg.rate_degradation),
+            )
+            for deg in degradations
+        ]
+
+    fingerprint = detection.BaselineFingerprint(baseline)
+    for method in [
+        "average_amount_threshold",
+        "best_model_order_equality",
+        "fast_check",
+        "polynomial_regression",
+    ]:
+        for target in targets:
+            expected = to_tuples(check.run_degradation_check(method, baseline, target))
+            result = to_tuples(
+                check.run_degradation_check(method, baseline, target, fingerprint=fingerprint)
+            )
+            assert result == expected
+
+    def compare_models(_, baseline_model, target_model, **__):
+        return check.DetectionChangeResult(
+            check.PerformanceChange.NoChange, target_model.b1 - baseline_model.b1
+        )
+
+    for target in targets:
+        expected = to_tuples(
+            check.run_detection_with_strategy(compare_models, baseline, target, "best-both")
+        )
+        result = to_tuples(
+            check.run_detection_with_strategy(
+                compare_models, baseline, target, "best-both", fingerprint
+            )
+        )
+        assert result == expected
+    assert {
+        "averages",
+        "best-param-models",
+        "linear-param-models",
+        "best-nonparam-models",
+    } <= set(fingerprint.data.keys())
+
+    # The fingerprint is not used for other baselines
+    result = to_tuples(
+        check.run_degradation_check(
+            "average_amount_threshold", targets[0], baseline, fingerprint=fingerprint
+        )
+    )
+    assert result == to_tuples(
+        check.run_degradation_check("average_amount_threshold", targets[0], baseline)
+    )
+
+    # The precomputed data are reused
+    fingerprint.data["averages"] = {}
+    assert not list(
+        check.run_degradation_check(
+            "average_amount_threshold", baseline, targets[0], fingerprint=fingerprint
+        )
+    )
+
+    # Fuzzing checks the mutations against the fingerprint of the baseline
+    base_result = [(None, baseline, None)]
+    fuzz_fingerprint = perun_fuzz.create_fingerprint(base_result)
+    assert fuzz_fingerprint is not None and "strategies" in fuzz_fingerprint.data
+    # All data of the baseline are precomputed, so checking the mutations computes nothing new
+    precomputed = set(fuzz_fingerprint.data.keys())
+    for degradation in check.degradation_between_profiles(
+        baseline, targets[0], "best-model", fuzz_fingerprint
+    ):
+        assert degradation is not None
+    assert set(fuzz_fingerprint.data.keys()) == precomputed
+    for target in targets:
+        assert perun_fuzz.check_for_change(
+            fuzz_fingerprint, [(None, target, None)]
+        ) == perun_fuzz.check_for_change(base_result, [(None, target, None)])
+    assert perun_fuzz.create_fingerprint([]) is None
+    assert perun_fuzz.check_for_change(None, [(None, targets[0], None)]) == 0.0
+
+
 def test_strategies():
     """Set of basic tests for handling the strategies
 
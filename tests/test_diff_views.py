@@ -6,10 +6,12 @@ import os
 
 # Third-Party Imports
 from click.testing import CliRunner
+import pandas
 
 # Perun Imports
 from perun import cli
 from perun.testing import utils as test_utils
+from perun.utils.common import diff_kit
 
 
 def test_diff_tables(pcs_with_root):
@@ -86,3 +88,43 @@ def test_diff_reports(pcs_with_root):
     assert result.exit_code == 0
 
     assert "diff.html" in os.listdir(os.getcwd())
+
+
+def test_diff_clustered_traces(pcs_with_root):
+    """Test aggregating similar traces in the diff views
+
+    Expecting no errors, and the records of the similar traces of the same uid to be merged
+    """
+    runner = CliRunner()
+    baseline_profilename = test_utils.load_profilename("diff_profiles", "kperf-baseline.perf")
+    target_profilename = test_utils.load_profilename("diff_profiles", "kperf-target.perf")
+
+    result = runner.invoke(
+        cli.showdiff, [baseline_profilename, target_profilename, "table", "-c", "-t", "3"]
+    )
+    assert result.exit_code == 0
+    assert "Top-1 Record" in result.output
+    assert "Top-9 Record" not in result.output
+
+    result = runner.invoke(
+        cli.showdiff,
+        [baseline_profilename, target_profilename, "report", "-c", "-o", "clustered.html"],
+    )
+    assert result.exit_code == 0
+    assert "clustered.html" in os.listdir(os.getcwd())
+
+    df = pandas.DataFrame(
+        {
+            "uid": ["f", "f", "f", "g", "g"],
+            "trace": ["main,a_x,b", "main,a_y,b", "main,c,d,e,h,i", "main,a_x,b", ""],
+            "amount": [1, 5, 2, 3, 4],
+        }
+    )
+    aggregated = diff_kit.aggregate_similar_traces(df, threshold=1)
+    assert sorted(aggregated.itertuples(index=False, name=None)) == [
+        ("f", "main,a_y,b", 6),
+        ("f", "main,c,d,e,h,i", 2),
+        ("g", "", 4),
+        ("g", "main,a_x,b", 3),
+    ]
+    assert aggregated["amount"].sum() == df["amount"].sum()
@@ -5,20 +5,27 @@ from __future__ import annotations
 
 # Standard Imports
 import os
+import random
 import sys
 import subprocess
+import tempfile
 
 # Third-Party Imports
+import numpy as np
 import pytest
 from click.testing import CliRunner
 
 # Perun Imports
 from perun import cli
-from perun.fuzz.structs import CoverageConfiguration
+from perun.fuzz import filesystem, filetype
+from perun.fuzz.structs import CoverageConfiguration, FuzzingConfiguration, FuzzingProgress
 from perun.testing import asserts
 from perun.utils.external import commands
+from perun.utils.structs import Executable
 import perun.fuzz.evaluate.by_coverage as coverage_fuzz
 import perun.fuzz.evaluate.by_perun as perun_fuzz
+import perun.fuzz.evaluate.parallel as parallel_fuzz
+import perun.fuzz.factory as fuzz_factory
 
 
 @pytest.mark.usefixtures("cleandir")
@@ -175,6 +182,119 @@ def test_fuzzing_correct(pcs_with_root):
     asserts.predicate_from_cli(result, result.exit_code == 0)
 
 
+def _gather_interesting_workloads(
+    workers: int, tail: str, workload: str, output_dir: str
+) -> list[tuple[str, list[int], float]]:
+    """Gathers the interesting workloads of the tail by the coverage with the fixed seed
+
+    :param int workers: number of workers evaluating the mutations
+    :param str tail: path to the tail binary
+    :param str workload: path to the initial workloads
+    :param str output_dir: directory, where the mutations are generated
+    :return: list of the contents, fuzz histories and fitness values of the interesting workloads
+    """
+    random.seed(42)
+    np.random.seed(42)
+    executable = Executable(tail)
+    config = FuzzingConfiguration(
+        output_dir=output_dir,
+        source_path=os.path.dirname(tail),
+        gcno_path=os.path.dirname(tail),
+        hang_timeout=10,
+        coverage_increase_rate=1.05,
+        interesting_files_limit=2,
+        exec_limit=10,
+        workers=workers,
+    )
+    output_dirs = filesystem.make_output_dirs(config.output_dir)
+    fuzz_progress = FuzzingProgress()
+    parents = filesystem.get_corpus([workload], config.workloads_filter)
+    rule_set = filetype.choose_ruleset(parents[0].path, config.regex_rules)
+    max_bytes = fuzz_factory.get_max_size(
+        parents, config.max_size, config.max_size_ratio, config.max_size_gain
+    )
+    fuzz_progress.base_cov = coverage_fuzz.baseline_testing(executable, parents, config)
+    for parent in parents:
+        fuzz_factory.rate_parent(fuzz_progress, parent)
+
+    evaluator = parallel_fuzz.MutationEvaluator(
+        executable, config, fuzz_progress, "time", [], [], None
+    )
+    try:
+        fuzz_factory.gather_by_coverage(
+            evaluator, parents, fuzz_progress, rule_set, max_bytes, config, output_dirs
+        )
+    finally:
+        evaluator.close()
+
+    interesting_workloads = []
+    for mutation in fuzz_progress.interesting_workloads:
+        with open(mutation.path, "r") as mutation_handle:
+            interesting_workloads.append(
+                (mutation_handle.read(), mutation.history, mutation.fitness)
+            )
+    return interesting_workloads
+
+
+@pytest.mark.usefixtures("cleandir")
+def test_fuzzing_workers(pcs_with_root, monkeypatch, tmp_path):
+    """Runs fuzzing with mutations evaluated by the pool of workers"""
+    # the temporary directories of the workers are created in the directory private to the test
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    runner = CliRunner()
+    examples = os.path.join(os.path.dirname(__file__), "sources", "fuzz_examples")
+    process = subprocess.Popen(["make", "-C", os.path.join(examples, "tail")])
+    process.communicate()
+    process.wait()
+    tail = os.path.join(examples, "tail", "tail")
+    txt_workload = os.path.join(examples, "samples", "txt")
+
+    gcov_environment = parallel_fuzz.get_gcov_environment(os.path.dirname(tail), "/tmp/worker")
+    assert gcov_environment["GCOV_PREFIX"] == "/tmp/worker"
+    assert int(gcov_environment["GCOV_PREFIX_STRIP"]) == len(
+        os.path.realpath(os.path.dirname(tail)).strip(os.sep).split(os.sep)
+    )
+
+    for coverage_params in [
+        ["--source-path", os.path.dirname(tail), "--gcno-path", os.path.dirname(tail)],
+        ["--skip-coverage-testing"],
+    ]:
+        result = runner.invoke(
+            cli.fuzz_cmd,
+            [
+                "--cmd", tail,
+                "--output-dir", ".",
+                "--input-sample", txt_workload,
+                "--timeout", "0.5",
+                "--coverage-increase-rate", "1.05",
+                "--interesting-files-limit", "2",
+                "--no-plotting",
+                "--collector-params", "time", "repeat: 1",
+                "--collector-params", "time", "warmup: 0",
+                "--exec-limit", "10",
+                "--workers", "2",
+                *coverage_params,
+            ],
+        )  # fmt: skip
+        asserts.predicate_from_cli(result, result.exit_code == 0)
+        asserts.predicate_from_cli(
+            result, "Program executions for performance testing" in result.output
+        )
+
+    # the workers find the same interesting workloads with the same fitness as the serial evaluation
+    serial_workloads = _gather_interesting_workloads(
+        1, tail, txt_workload, str(tmp_path / "serial")
+    )
+    assert serial_workloads
+    assert (
+        _gather_interesting_workloads(2, tail, txt_workload, str(tmp_path / "workers"))
+        == serial_workloads
+    )
+
+    # the temporary directories of the workers are removed after the fuzzing
+    assert not [d for d in os.listdir(tmp_path) if d.startswith("perun-fuzz-")]
+
+
 @pytest.mark.usefixtures("cleandir")
 def test_fuzzing_sigabort(pcs_with_root):
     """Runs basic tests for fuzzing CLI"""
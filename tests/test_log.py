@@ -14,7 +14,8 @@ import git
 import pytest
 
 # Perun Imports
-from perun.logic import commands, config
+from perun.logic import commands, config, index, pcs, summary
+from perun.profile import helpers as profile_helpers
 from perun.profile.helpers import ProfileInfo
 from perun.utils import decorators
 from perun.utils.common import common_kit
@@ -181,3 +182,39 @@ def test_internals(capsys, monkeypatch):
             {},
             ProfileListConfig("pending", True, []),
         )
+
+
+@pytest.mark.usefixtures("cleandir")
+def test_log_summary(pcs_single_prof, capsys, monkeypatch):
+    """Test that the log is printed from the summaries of minor versions
+
+    Expecting the summaries to be updated by adding the profiles, reused by subsequent logs and
+    recomputed when the index of the minor version is modified behind their back.
+    """
+    git_repo = git.Repo(pcs_single_prof.get_vcs_path())
+    head = str(git_repo.head.commit)
+    summary_file = os.path.join(pcs.get_cache_directory(), "summary")
+
+    # The summary of head was stored when its profile was added
+    assert os.path.exists(summary_file)
+    assert summary.get_profile_numbers_for(head)["all"] == 1
+    commands.log(None, short=True)
+    out, _ = capsys.readouterr()
+
+    # Valid summaries are never recomputed
+    def recompute(*_, **__):
+        assert False, "the valid summary should not be recomputed"
+
+    with monkeypatch.context() as patch:
+        patch.setattr("perun.logic.index.get_profile_number_for_minor", recompute)
+        patch.setattr("perun.logic.store.load_degradation_list_for", recompute)
+        commands.log(None, short=True)
+        assert capsys.readouterr()[0] == out
+
+    # Outdated summary is recomputed
+    profile = profile_helpers.load_list_for_minor_version(head)[0]
+    index.remove_from_index(pcs.get_object_directory(), head, [profile.source])
+    assert summary.get_profile_numbers_for(head)["all"] == 0
+    commands.log(None, short=True)
+    assert capsys.readouterr()[0] != out
+    assert summary.get_summary_table().modified is False
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 # Standard Imports
+import array
+import json
 
 # Third-Party Imports
 import pytest
@@ -118,3 +120,166 @@ def test_name_generation(capsys):
     rt_config.set("format.output_profile_template", "sampling-[%memory.sampling%]")
     profile_name = profiles.generate_profile_name({"collector_info": {"name": "trace"}})
     assert profile_name == "sampling-[_].perf"
+
+
+def test_columnar_storage():
+    """Test that the collectable properties are stored in compact columns
+
+    Expecting numeric columns to be stored as arrays, while keeping the same resources and
+    serialization as with plain lists
+    """
+    resources = [
+        {"uid": "f", "type": "time", "amount": 1, "timestamp": 0.5, "subtype": "a"},
+        {"uid": "f", "type": "time", "amount": 2, "timestamp": 1.5, "subtype": "a"},
+        {"uid": "g", "type": "time", "amount": 3.0, "timestamp": 2.5, "subtype": "b"},
+        {"uid": "g", "type": "time", "amount": 4, "timestamp": 3.5, "subtype": "b"},
+        {"uid": "h", "type": "time", "amount": 2**64 + 1, "timestamp": 1, "subtype": "c"},
+    ]
+    profile = Profile({"resources": resources})
+    storage = profile["resources"]
+    assert isinstance(storage["f#0"]["amount"], array.array)
+    assert isinstance(storage["f#0"]["timestamp"], array.array)
+    # Mixed and too big numbers are kept as they are
+    assert isinstance(storage["g#0"]["amount"], list)
+    assert isinstance(storage["h#0"]["amount"], list)
+
+    loaded_resources = [res for _, res in profile.all_resources()]
+    assert len(loaded_resources) == len(resources)
+    assert sorted(r["amount"] for r in loaded_resources) == [1, 2, 3.0, 4, 2**64 + 1]
+    assert [type(r["amount"]) for r in loaded_resources if r["uid"] == "g"] == [float, int]
+
+    # Updating compacted columns keeps the values and extends the columns in place, while the
+    # columns of the resource types untouched by the update are left as they are
+    compact_column = storage["f#0"]["amount"]
+    untouched_column = storage["h#0"]["amount"] = [5, 6]
+    profile.update_resources(
+        [{"uid": "f", "type": "time", "amount": 5, "timestamp": 4.5, "subtype": "a"}]
+    )
+    assert list(profile["resources"]["f#0"]["amount"]) == [1, 2, 5]
+    assert profile["resources"]["f#0"]["amount"] is compact_column
+    assert profile["resources"]["h#0"]["amount"] is untouched_column
+
+    # The serialized profile contains only lists and can be loaded back
+    serialized = profile.serialize()
+    assert serialized["resources"]["f#0"]["amount"] == [1, 2, 5]
+    reloaded = Profile(json.loads(json.dumps(serialized)))
+    assert sorted(map(str, reloaded.all_resources())) == sorted(map(str, profile.all_resources()))
+
+
+def test_resource_columns():
+    """Test that the columns of resource types are appended directly to the storage
+
+    Expecting the same resource types and columns as when the resources are added one by one
+    """
+    resources = [
+        {"uid": "f", "type": "time", "amount": 1, "timestamp": 0},
+        {"uid": "g", "type": "time", "amount": 2, "timestamp": 1},
+        {"uid": "f", "type": "time", "amount": 3, "timestamp": 2},
+        {"uid": "f", "type": "memory", "amount": 4, "timestamp": 3},
+        {"uid": "g", "type": "time", "amount": 5.5, "timestamp": 4},
+    ]
+    profile = Profile()
+    profile.update_resources(resources)
+
+    columnar_profile = Profile()
+    columnar_profile.update_resource_columns(
+        [
+            (
+                {"uid": "f", "type": "time"},
+                {"amount": array.array("q", [1, 3]), "timestamp": [0, 2]},
+            ),
+            ({"uid": "g", "type": "time"}, {"amount": array.array("q", [2]), "timestamp": [1]}),
+            ({"uid": "f", "type": "memory"}, {"amount": array.array("q", [4]), "timestamp": [3]}),
+        ]
+    )
+    # Columns of different types are merged
+    columnar_profile.update_resource_columns(
+        [({"uid": "g", "type": "time"}, {"amount": array.array("d", [5.5]), "timestamp": [4]})]
+    )
+    assert columnar_profile.serialize() == profile.serialize()
+    assert isinstance(columnar_profile["resources"]["f#0"]["amount"], array.array)
+    assert isinstance(columnar_profile["resources"]["f#0"]["timestamp"], array.array)
+
+    # The promoted column is extended in place by further columns
+    promoted_column = columnar_profile["resources"]["g#0"]["amount"]
+    assert promoted_column == [2, 5.5]
+    columnar_profile.update_resource_columns(
+        [({"uid": "g", "type": "time"}, {"amount": array.array("q", [6]), "timestamp": [5]})]
+    )
+    assert columnar_profile["resources"]["g#0"]["amount"] is promoted_column
+    assert promoted_column == [2, 5.5, 6]
+
+    # The columns of collectable properties missing in the stored or appended resources are padded
+    columnar_profile.update_resource_columns(
+        [({"uid": "f", "type": "memory"}, {"amount": [7], "address": [42]})]
+    )
+    columnar_profile.update_resource_columns(
+        [({"uid": "f", "type": "memory"}, {"address": array.array("q", [43])})]
+    )
+    memory_resources = columnar_profile["resources"]["f#1"]
+    assert list(memory_resources["amount"]) == [4, 7, None]
+    assert list(memory_resources["timestamp"]) == [3, None, None]
+    assert list(memory_resources["address"]) == [None, 42, 43]
+
+
+def test_resource_type_interning():
+    """Test that resources are registered to resource types by interned persistent properties
+
+    Expecting that identical traces are mapped to the same resource type regardless of whether
+    they are shared objects or equal copies, while different traces get new resource types
+    """
+    trace = [{"func": "main", "line": 1}, {"func": "f", "line": 2}]
+    other_trace = [{"func": "main", "line": 1}, {"func": "g", "line": 3}]
+    resources = [
+        {"uid": "f", "type": "time", "amount": 1, "trace": trace},
+        {"uid": "f", "type": "time", "amount": 2, "trace": trace},
+        {"uid": "f", "type": "time", "amount": 3, "trace": json.loads(json.dumps(trace))},
+        {"uid": "f", "type": "time", "amount": 4, "trace": other_trace},
+        {"uid": "f", "type": "memory", "amount": 5, "trace": trace},
+        {"uid": "f", "type": "time", "amount": 6, "trace": [{"func": "main", "args": [1, 2]}]},
+    ]
+    profile = Profile({"resources": resources})
+    assert list(profile["resources"]["f#0"]["amount"]) == [1, 2, 3]
+    assert list(profile["resources"]["f#1"]["amount"]) == [4]
+    assert list(profile["resources"]["f#2"]["amount"]) == [5]
+    assert list(profile["resources"]["f#3"]["amount"]) == [6]
+    assert profile["resource_type_map"]["f#1"]["trace"] == other_trace
+
+    # Updating the profile reuses the already interned traces
+    profile.update_resources([{"uid": "f", "type": "time", "amount": 7, "trace": list(trace)}])
+    profile.update_resources(
+        [{"uid": "f", "type": "time", "amount": 8, "trace": [{"func": "main", "args": [1, 2]}]}]
+    )
+    assert list(profile["resources"]["f#0"]["amount"]) == [1, 2, 3, 7]
+    assert list(profile["resources"]["f#3"]["amount"]) == [6, 8]
+    assert len(profile["resource_type_map"]) == 4
+
+
+def test_resource_type_collisions():
+    """Test that persistent values differing only in types or structure are not merged
+
+    Expecting each of the values to get its own resource type and to be returned as it was given
+    """
+    persistent_values = [
+        [{"l": 1}],
+        [{"l": 1.0}],
+        [{"l": True}],
+        {"f": "a"},
+        [["f", "a"]],
+        [{"l": [1]}],
+        [{"l": [1.0]}],
+        1,
+        1.0,
+        True,
+    ]
+    resources = [
+        {"uid": "f", "type": "time", "amount": i, "tr": value}
+        for i, value in enumerate(persistent_values)
+    ]
+    profile = Profile({"resources": resources})
+    assert len(profile["resource_type_map"]) == len(persistent_values)
+    for i, value in enumerate(persistent_values):
+        stored_value = profile["resource_type_map"][f"f#{i}"]["tr"]
+        assert stored_value == value and type(stored_value) is type(value)
+        assert json.dumps(stored_value) == json.dumps(value)
+        assert list(profile["resources"][f"f#{i}"]["amount"]) == [i]
@@ -40,6 +40,30 @@ def test_convert_models_to_dataframe():
     assert len(df) == 12
 
 
+def test_convert_resources_to_dataframe(memory_profiles):
+    """Test conversion of resources to the dataframe
+
+    Expecting the same values as when iterating the resources one by one
+    """
+    for memory_profile in memory_profiles:
+        resources = list(memory_profile.all_resources(True))
+        df = convert.resources_to_pandas_dataframe(memory_profile)
+        assert sorted(list(df)) == sorted(memory_profile.all_resource_fields() | {"snapshots"})
+        assert len(df) == len(resources)
+        assert list(df["snapshots"]) == [snapshot for snapshot, _ in resources]
+        assert list(df["amount"]) == [resource["amount"] for _, resource in resources]
+        assert list(df["uid"]) == [resource["uid"] for _, resource in resources]
+
+        # Only the selected columns are converted and the repeated values can be categorical
+        df = convert.resources_to_pandas_dataframe(
+            memory_profile, columns=["uid", "amount", "nonexistent"], categorical=True
+        )
+        assert sorted(list(df)) == ["amount", "uid"]
+        assert df["uid"].dtype == "category"
+        assert df["amount"].dtype != "category"
+        assert list(df["uid"]) == [resource["uid"] for _, resource in resources]
+
+
 def test_flame_graph(memory_profiles):
     """Test creation of flame graph format out of the profile of memory type
 
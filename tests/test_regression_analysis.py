@@ -11,9 +11,12 @@ from __future__ import annotations
 # Standard Imports
 
 # Third-Party Imports
+import numpy as np
 import pytest
 
 # Perun Imports
+from perun.postprocess.regression_analysis import data_provider, generic, regression_models
+from perun.profile.factory import Profile
 from perun.postprocess.regression_analysis.run import postprocess
 from perun.utils import exceptions, metrics
 import perun.testing.utils as test_utils
@@ -372,3 +375,59 @@ def test_exp_model():
     test_utils.compare_results(model["r_square"], 1.0)
     test_utils.compare_results([c["value"] for c in model["coeffs"] if c["name"] == "b0"][0], 1.0)
     test_utils.compare_results([c["value"] for c in model["coeffs"] if c["name"] == "b1"][0], 2.0)
+
+
+def test_vectorized_regression_data():
+    """Test that the array-based computation of the regression data matches the iterative one
+
+    Expecting the same sums for each of the generic models, including the points outside the
+    domain of the model transformations and the computation split into more steps
+    """
+    x_pts = [0, 1, 2, -3, 4, 5, 6, 7, 8.5, 9, 10, 0]
+    y_pts = [1, 2, 0, 4, 5, -6, 7, 8, 9, 10, 11.5, 12]
+    points = generic.RegressionPoints(x_pts, y_pts)
+    for model in ("linear", "logarithmic", "power", "exponential"):
+        properties = regression_models.MODEL_MAP[model]
+        for steps in (1, 3):
+            iterative = list(
+                generic.generic_regression_data(
+                    x_pts, y_pts, properties["f_x"], properties["f_y"], steps
+                )
+            )
+            vectorized = list(
+                generic.generic_regression_data(
+                    x_pts, y_pts, steps=steps, points=points, **properties
+                )
+            )
+            assert len(iterative) == len(vectorized) == steps
+            for expected, actual in zip(iterative, vectorized):
+                assert expected.keys() == actual.keys()
+                for key, value in expected.items():
+                    assert actual[key] == pytest.approx(value), (model, steps, key)
+
+
+def test_generic_profile_provider():
+    """Test grouping the points of the resources by their uids
+
+    Expecting one group per uid ordered by uids, including the first one, with points of all the
+    resource types of the uid in the order of the resources
+    """
+    profile = Profile()
+    profile.update_resources(
+        [
+            {"uid": "foo", "trace": [{"func": "main"}], "amount": 10, "structure-unit-size": 1},
+            {"uid": "bar", "trace": [{"func": "main"}], "amount": 1.5, "structure-unit-size": 2},
+            {"uid": "foo", "trace": [{"func": "baz"}], "amount": 30, "structure-unit-size": 3},
+            {"uid": "foo", "trace": [{"func": "main"}], "amount": 20, "structure-unit-size": 2},
+            {"uid": "bar", "trace": [{"func": "main"}], "amount": 2.5, "structure-unit-size": 4},
+        ]
+    )
+    groups = list(
+        data_provider.generic_profile_provider(
+            profile, of_key="amount", per_key="structure-unit-size"
+        )
+    )
+    assert [uid for _, _, uid in groups] == ["bar", "foo"]
+    assert all(isinstance(pts, np.ndarray) for x_pts, y_pts, _ in groups for pts in (x_pts, y_pts))
+    assert groups[0][0].tolist() == [2, 4] and groups[0][1].tolist() == [1.5, 2.5]
+    assert groups[1][0].tolist() == [1, 2, 3] and groups[1][1].tolist() == [10, 20, 30]
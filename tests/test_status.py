@@ -17,7 +17,7 @@ import git
 import pytest
 
 # Perun Imports
-from perun.logic import config, commands
+from perun.logic import config, commands, index, pcs, store
 from perun.utils import timestamps, decorators
 from perun.utils.common import common_kit
 from perun.utils.exceptions import NotPerunRepositoryException
@@ -350,3 +350,41 @@ def test_status_sort(monkeypatch, pcs_single_prof, capsys, valid_profile_pool):
     out, _ = capsys.readouterr()
     assert "invalid sort key" in out
     monkeypatch.undo()
+
+
+def test_status_pending_cache(pcs_full, monkeypatch, valid_profile_pool):
+    """Test that the pending index caches the metadata of untracked profiles
+
+    Expecting the unchanged profiles to be listed from the index without reading them (and without
+    rewriting the index), while modified profiles are read again.
+    """
+    test_utils.populate_repo_with_untracked_profiles(pcs_full.get_path(), valid_profile_pool)
+    job_index = pcs.get_job_index()
+    untracked = commands.get_untracked_profiles()
+    assert len(untracked) == len(valid_profile_pool)
+    index_stat = os.stat(job_index)
+
+    read_headers = []
+    load_header = store.load_raw_profile_header_from_file
+
+    def tracked_load_header(file_name):
+        read_headers.append(os.path.basename(file_name))
+        return load_header(file_name)
+
+    monkeypatch.setattr("perun.logic.store.load_raw_profile_header_from_file", tracked_load_header)
+    assert [p.source for p in commands.get_untracked_profiles()] == [p.source for p in untracked]
+    assert read_headers == []
+    assert os.stat(job_index).st_mtime_ns == index_stat.st_mtime_ns
+
+    # Modified profile is read again, other profiles are still taken from the index
+    modified_profile = os.path.join(pcs.get_job_directory(), untracked[0].source)
+    with open(modified_profile, "a") as profile_handle:
+        profile_handle.write("\n")
+    assert len(commands.get_untracked_profiles()) == len(valid_profile_pool)
+    assert read_headers == [untracked[0].source]
+
+    # Removed profile is dropped from the index
+    os.remove(modified_profile)
+    assert len(commands.get_untracked_profiles()) == len(valid_profile_pool) - 1
+    with open(job_index, "rb") as index_handle:
+        assert len(list(index.walk_index(index_handle))) == len(valid_profile_pool) - 1
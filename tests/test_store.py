@@ -2,13 +2,17 @@
 from __future__ import annotations
 
 # Standard Imports
+import json
 import os
+import shutil
+import zlib
 
 # Third-Party Imports
 import pytest
 
 # Perun Imports
-from perun.logic import store, index
+from perun.logic import config, index, pcs, store
+from perun.profile import factory as profiles
 from perun.utils import exceptions, timestamps, streams
 
 
@@ -112,7 +116,9 @@ def test_versions(tmpdir, monkeypatch):
     # Test FastSloth with SlowLorris
     monkeypatch.setattr("perun.logic.index.INDEX_VERSION", index.IndexVersion.FastSloth.value)
     monkeypatch.setattr("perun.logic.pcs.get_object_directory", lambda: "")
-    monkeypatch.setattr("perun.logic.store.load_profile_from_file", lambda *_, **__: profile)
+    monkeypatch.setattr(
+        "perun.logic.store.load_profile_metadata_from_file", lambda *_, **__: profile
+    )
     index_v1_2_file = os.path.join(str(tmpdir), "index_v1_2")
     index.touch_index(index_v1_2_file)
     index.write_entry_to_index(index_v1_2_file, basic_entry)
@@ -122,6 +128,92 @@ def test_versions(tmpdir, monkeypatch):
         assert stored.__dict__ == extended_entry.__dict__
 
 
+@pytest.mark.usefixtures("cleandir")
+def test_index_offset_table(tmpdir, monkeypatch):
+    """Test looking up entries in the index through the offset table
+
+    Expecting the same entries as when walking the index
+    """
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    profile = store.load_profile_from_file(os.path.join(pool_path, "linear_base.perf"), True)
+    index_file = os.path.join(str(tmpdir), "index")
+    index.touch_index(index_file)
+    table_file = os.path.join(str(tmpdir), "index.offsets")
+    monkeypatch.setattr("perun.logic.index.get_offset_table_file", lambda _: table_file)
+
+    # Register the entries in shuffled order
+    checksums = {}
+    for i in (5, 3, 9, 0, 7, 1, 8, 2, 6, 4, 3):
+        path = f"profile-{i}.perf"
+        checksums[path] = store.compute_checksum(path.encode("utf-8"))
+        st = timestamps.timestamp_to_str(1700000000 + i)
+        entry = index.ExtendedIndexEntry(st, checksums[path], path, -1, profile)
+        index.write_entry_to_index(index_file, entry)
+
+    registered = [5, 3, 9, 0, 7, 1, 8, 2, 6, 4]
+    with open(index_file, "rb") as index_handle:
+        walked_entries = list(index.walk_index(index_handle))
+        # The entries are appended in order of registration, while the table is sorted
+        assert [entry.path for entry in walked_entries] == [f"profile-{i}.perf" for i in registered]
+        offset_table = index.IndexOffsetTable(index_handle)
+        assert [path for path, _ in offset_table] == [f"profile-{i}.perf" for i in range(10)]
+        assert sorted(offset_table.offsets) == [entry.offset for entry in walked_entries]
+
+        # The table kept up to date during the registration is loaded without reading the index
+        def unreachable_build(*_, **__):
+            assert False, "offset table should be loaded from its file"
+
+        assert os.path.exists(table_file)
+        with monkeypatch.context() as patch:
+            patch.setattr(index.IndexOffsetTable, "_build", unreachable_build)
+            persisted_table = index.IndexOffsetTable(index_handle)
+        assert persisted_table.offsets.tolist() == offset_table.offsets.tolist()
+        assert persisted_table.checksums.tolist() == offset_table.checksums.tolist()
+        assert persisted_table.end == offset_table.end
+
+        for path, checksum in checksums.items():
+            for looked_up in (path, checksum):
+                entry = index.lookup_entry_by_checksum_or_path(index_handle, looked_up)
+                assert entry == next(e for e in walked_entries if e.path == path)
+        with pytest.raises(exceptions.EntryNotFoundException):
+            index.lookup_entry_by_checksum_or_path(index_handle, "profile-10.perf")
+        with pytest.raises(exceptions.EntryNotFoundException):
+            index.lookup_entry_by_checksum_or_path(index_handle, "0" * 40)
+        assert offset_table.find_first_not_less("profile-10.perf") == 2
+        assert (
+            offset_table.find_first_not_less(
+                "profile-9.perf", timestamps.timestamp_to_str(1800000000)
+            )
+            == -1
+        )
+
+    # Remove some of the entries and check that the rest is kept intact
+    monkeypatch.setattr("perun.logic.store.split_object_name", lambda *_: (None, index_file))
+    index.remove_from_index(
+        os.getcwd(), "", ["profile-0.perf", checksums["profile-5.perf"], "profile-9.perf"]
+    )
+    with open(index_file, "rb") as index_handle:
+        remaining_entries = list(index.walk_index(index_handle))
+        for entry in remaining_entries:
+            assert index.lookup_entry_by_checksum_or_path(index_handle, entry.path) == entry
+            assert index.lookup_entry_by_checksum_or_path(index_handle, entry.checksum) == entry
+    assert [entry.path for entry in remaining_entries] == [
+        f"profile-{i}.perf" for i in (3, 7, 1, 8, 2, 6, 4)
+    ]
+    assert [entry.cmd for entry in remaining_entries] == [
+        entry.cmd for entry in walked_entries if entry.path in {e.path for e in remaining_entries}
+    ]
+
+    # The table of the index rewritten by other means is rebuilt
+    index.write_list_of_entries(index_file, remaining_entries[::-1])
+    with open(index_file, "rb") as index_handle:
+        for entry in index.walk_index(index_handle):
+            assert index.lookup_entry_by_checksum_or_path(index_handle, entry.checksum) == entry
+    assert [entry.path for entry in index.get_profile_list_for_minor(os.getcwd(), "")] == [
+        f"profile-{i}.perf" for i in (1, 2, 3, 4, 6, 7, 8)
+    ]
+
+
 @pytest.mark.usefixtures("cleandir")
 def test_helpers(tmpdir):
     index_file = os.path.join(str(tmpdir), "index")
@@ -141,7 +233,7 @@ def test_helpers(tmpdir):
 
 
 @pytest.mark.usefixtures("cleandir")
-def test_streams(tmpdir, monkeypatch):
+def test_streams(tmpdir):
     """Test various untested behaviour"""
     # Loading from nonexistant file
     yaml = streams.safely_load_yaml_from_file("nonexistant")
@@ -166,6 +258,260 @@ def test_streams(tmpdir, monkeypatch):
     with pytest.raises(exceptions.IncorrectProfileFormatException):
         store.load_profile_from_file("nonexistant", False)
 
-    monkeypatch.setattr("perun.logic.store.read_and_deflate_chunk", lambda _: "p mixed 1\0tmp")
+    # Deflated profile with malformed header
+    malformed_file = tmpdir.join("malformed.file")
+    with open(malformed_file, "wb") as tmp:
+        tmp.write(zlib.compress(b"p mixed 1\0tmp"))
+    with pytest.raises(exceptions.IncorrectProfileFormatException):
+        store.load_profile_from_file(malformed_file, False)
+
+
+def test_profile_cache(pcs_single_prof, monkeypatch):
+    """Test caching of the loaded profiles
+
+    Expecting the repeated loads to be served from the cache, returning fresh copies of profile
+    """
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    profile_name = os.path.join(pool_path, "linear_base.perf")
+
+    store.PROFILE_CACHE.clear()
+    profile = store.load_profile_from_file(profile_name, True)
+    assert len(store.PROFILE_CACHE) == 1
+
+    def unreachable_load(*_, **__):
+        assert False, "profile should be loaded from the cache"
+
+    monkeypatch.setattr("perun.logic.store.load_profile_from_handle", unreachable_load)
+    cached_profile = store.load_profile_from_file(profile_name, True)
+    assert cached_profile is not profile
+    assert list(cached_profile.all_resources()) == list(profile.all_resources())
+    assert cached_profile.serialize() == profile.serialize()
+    monkeypatch.undo()
+
+    # Profiles are not cached, if the budget does not suffice
+    store.PROFILE_CACHE.clear()
+    config.runtime().set("profiles.cache_budget", "0")
+    store.load_profile_from_file(profile_name, True)
+    assert len(store.PROFILE_CACHE) == 0
+
+    # The translated profile is stored in the persistent cache
+    config.runtime().set("profiles.persistent_cache", "true")
+    store.load_profile_from_file(profile_name, True)
+    cache_dir = os.path.join(pcs.get_cache_directory(), "profiles")
+    assert len(os.listdir(cache_dir)) == 1
+
+    monkeypatch.setattr("perun.logic.store.load_profile_from_handle", unreachable_load)
+    persistent_profile = store.load_profile_from_file(profile_name, True)
+    assert persistent_profile.serialize() == profile.serialize()
+    monkeypatch.undo()
+
+    # The stale profile is replaced in the persistent cache, when the file is modified
+    shutil.copy(profile_name, "copied.perf")
+    store.load_profile_from_file("copied.perf", True)
+    cached_files = [os.path.join(d, f) for d, _, files in os.walk(cache_dir) for f in files]
+    assert len(cached_files) == 2
+    os.utime("copied.perf", ns=(0, 0))
+    cache_key = store.get_profile_cache_key("copied.perf")
+    assert not store.is_profile_cached(cache_key)
+    store.load_profile_from_file("copied.perf", True)
+    assert store.is_profile_cached(cache_key)
+    assert len([f for _, _, files in os.walk(cache_dir) for f in files]) == 2
+
+    # The least recently used profiles are evicted, when the cache exceeds the budget
+    recent_file = store.get_persistent_cache_file(cache_key)
+    assert store.evict_persistent_cache(cache_dir, os.path.getsize(recent_file)) == (
+        os.path.getsize(recent_file)
+    )
+    assert [os.path.join(d, f) for d, _, files in os.walk(cache_dir) for f in files] == [
+        recent_file
+    ]
+    config.runtime().set("profiles.persistent_cache_budget", "0")
+    store.PROFILE_CACHE.clear()
+    store.load_profile_from_file(profile_name, True)
+    assert not store.is_profile_cached(store.get_profile_cache_key(profile_name))
+
+
+@pytest.mark.usefixtures("cleandir")
+def test_parallel_loading():
+    """Test loading of multiple profiles in the pool of processes
+
+    Expecting the same profiles in the same order as when loaded one by one
+    """
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    profile_names = [
+        os.path.join(pool_path, profile_name)
+        for profile_name in ("linear_base.perf", "const1.perf", "linear_base.perf", "const2.perf")
+    ]
+    expected_profiles = [
+        store.load_profile_from_file(profile_name, True).serialize()
+        for profile_name in profile_names
+    ]
+
+    config.runtime().set("profiles.load_workers", "2")
+    store.PROFILE_CACHE.clear()
+    loaded_profiles = store.load_profiles_from_files(profile_names, True)
+    assert [profile.serialize() for profile in loaded_profiles] == expected_profiles
+    assert loaded_profiles[0] is not loaded_profiles[2]
+    assert len(store.PROFILE_CACHE) == 3
+
+    # Errors are reported as if the profiles were loaded one by one
+    store.PROFILE_CACHE.clear()
+    with open("malformed.perf", "w") as malformed_handle:
+        malformed_handle.write('{"header": ')
+    with pytest.raises(exceptions.IncorrectProfileFormatException):
+        store.load_profiles_from_files(profile_names + ["malformed.perf"], True)
+    with pytest.raises(exceptions.IncorrectProfileFormatException):
+        store.load_profiles_from_files(profile_names + ["nonexistent.perf"], True)
+
+
+@pytest.mark.usefixtures("cleandir")
+def test_streamed_loading(monkeypatch):
+    """Test incremental loading of the profiles from small chunks
+
+    Expecting the same profile as when loading the whole content at once
+    """
+    reader = streams.IncrementalJsonReader(iter('{"a": 1234, "b": ["čau", 5.5e3], "c": {}}'))
+    assert [(key, reader.read_value()) for key in reader.iterate_object()] == [
+        ("a", 1234),
+        ("b", ["čau", 5500.0]),
+        ("c", {}),
+    ]
+    reader.read_to_end()
+
+    for malformed in ('{"a": 1', '{"a" 1}', '{"a": 1} 2', "[1, 2]"):
+        with pytest.raises(ValueError):
+            reader = streams.IncrementalJsonReader(iter(malformed))
+            _ = [(key, reader.read_value()) for key in reader.iterate_object()]
+            reader.read_to_end()
+
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    profile_name = os.path.join(pool_path, "linear_base.perf")
+    with open(profile_name, "r") as profile_handle:
+        body = profile_handle.read()
+    profile = profiles.Profile(json.loads(body))
+
+    header = f"profile {profile['header']['type']} {len(body)}\0"
+    with open("packed.perf", "wb") as packed_handle:
+        packed_handle.write(store.pack_content((header + body).encode("utf-8")))
+
+    monkeypatch.setattr("perun.logic.store.PROFILE_CHUNK_SIZE", 7)
+    for file_name, is_raw_profile in ((profile_name, True), ("packed.perf", False)):
+        with open(file_name, "rb") as profile_handle:
+            loaded_profile = store.load_profile_from_handle(
+                file_name, profile_handle, is_raw_profile
+            )
+        assert loaded_profile.serialize() == profile.serialize()
+
+    # Profiles with wrong size in header are malformed
+    with open("packed.perf", "wb") as packed_handle:
+        packed_handle.write(store.pack_content((header + body + " ").encode("utf-8")))
+    with pytest.raises(exceptions.IncorrectProfileFormatException):
+        store.load_profile_from_file("packed.perf", False)
+
+
+@pytest.mark.usefixtures("cleandir")
+def test_binary_profile_format():
+    """Test storing and loading the profiles in the binary format
+
+    Expecting the same profile for both of the formats, and the metadata read without resources
+    """
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    profile = store.load_profile_from_file(os.path.join(pool_path, "linear_base.perf"), True)
+
+    for object_format in store.PROFILE_OBJECT_FORMATS:
+        checksum, content = store.pack_profile(profile, object_format)
+        assert store.is_sha1(checksum)
+        assert content.startswith(store.BINARY_PROFILE_MAGIC) == (object_format == "binary")
+        with open(object_format, "wb") as object_handle:
+            object_handle.write(content)
+
+        loaded_profile = store.load_profile_from_file(object_format, False)
+        assert loaded_profile.serialize() == profile.serialize()
+
+        metadata = store.load_profile_metadata_from_file(object_format, False)
+        assert "resources" not in metadata and "models" not in metadata
+        assert metadata["header"] == profile["header"]
+        assert metadata["collector_info"] == profile["collector_info"]
+
+    # Only the metadata section is needed for the metadata
+    _, content = store.pack_profile(profile, "binary")
+    with open("binary", "rb") as object_handle:
+        sections = store.read_binary_profile_sections(object_handle)
+    assert list(sections.keys()) == store.BINARY_PROFILE_SECTIONS
+    resources_offset, _ = sections["resources"]
+    with open("truncated", "wb") as object_handle:
+        object_handle.write(content[:resources_offset])
+    assert store.load_profile_metadata_from_file("truncated", False)["header"] == profile["header"]
     with pytest.raises(exceptions.IncorrectProfileFormatException):
-        store.load_profile_from_file(tmp_file, False)
+        store.load_profile_from_file("truncated", False)
+
+    # Unsupported versions and malformed headers are reported as malformed profiles
+    for malformed in (content[:4] + b"\xff\xff" + content[6:], content[:10]):
+        with open("malformed", "wb") as object_handle:
+            object_handle.write(malformed)
+        with pytest.raises(exceptions.IncorrectProfileFormatException):
+            store.load_profile_from_file("malformed", False)
+        with pytest.raises(exceptions.IncorrectProfileFormatException):
+            store.load_profile_metadata_from_file("malformed", False)
+
+
+@pytest.mark.usefixtures("cleandir")
+def test_raw_profile_header(monkeypatch):
+    """Test reading only the header regions of the raw profiles
+
+    Expecting the same header regions as in the fully loaded profile, while other regions are
+    skipped without being parsed even if they are split in many chunks.
+    """
+    reader = streams.IncrementalJsonReader(iter('{"a": [1, {"b": "]}\\\\\\""}], "c": "{", "d": 2}'))
+    keys = []
+    for key in reader.iterate_object():
+        keys.append(key)
+        if key == "d":
+            assert reader.read_value() == 2
+        else:
+            reader.skip_value()
+    assert keys == ["a", "c", "d"]
+    reader.read_to_end()
+    with pytest.raises(ValueError):
+        reader = streams.IncrementalJsonReader(iter('{"a": [1, "]'))
+        for _ in reader.iterate_object():
+            reader.skip_value()
+
+    pool_path = os.path.join(os.path.split(__file__)[0], "profiles", "degradation_profiles")
+    profile_name = os.path.join(pool_path, "linear_base.perf")
+    with open(profile_name, "r") as profile_handle:
+        profile = json.load(profile_handle)
+
+    # Put the resources in front of the header, so they have to be skipped
+    resources_first = {"resources": profile["resources"]}
+    resources_first.update(profile)
+    with open("resources_first.perf", "w") as profile_handle:
+        json.dump(resources_first, profile_handle)
+    monkeypatch.setattr("perun.logic.store.PROFILE_CHUNK_SIZE", 7)
+    monkeypatch.setattr(
+        "perun.utils.streams.IncrementalJsonReader.read_value",
+        _fail_on_resources(streams.IncrementalJsonReader.read_value),
+    )
+    for file_name in (profile_name, "resources_first.perf"):
+        header = store.load_raw_profile_header_from_file(file_name)
+        assert header == {region: profile[region] for region in store.PROFILE_HEADER_REGIONS}
+
+    with open("malformed.perf", "w") as profile_handle:
+        json.dump({"header": profile["header"]}, profile_handle)
+    with pytest.raises(exceptions.IncorrectProfileFormatException):
+        store.load_raw_profile_header_from_file("malformed.perf")
+
+
+def _fail_on_resources(read_value):
+    """Wraps the reading of values, so it fails when it would parse the resources
+
+    :param function read_value: wrapped method of the reader
+    :return: the wrapped method
+    """
+
+    def wrapper(reader):
+        value = read_value(reader)
+        assert not (isinstance(value, dict) and "amount" in json.dumps(value))
+        return value
+
+    return wrapper
@@ -3,21 +3,28 @@ from __future__ import annotations
 
 # Standard Imports
 import glob
+import multiprocessing
 import os
 import re
 import shutil
+import types
 
 # Third-Party Imports
 from click.testing import CliRunner
+import numpy
 
 # Perun Imports
 from perun import cli
 from perun.collect.trace.values import TraceRecord, RecordType, FileSize
 from perun.logic import config, locks, temp, pcs
+from perun.profile.factory import Profile
 from perun.utils import decorators
 from perun.utils.exceptions import SystemTapStartupException
 from perun.utils.structs import CollectStatus
+import perun.collect.trace.processes as processes
 import perun.collect.trace.run as trace_run
+import perun.collect.trace.systemtap.parse_compact as parse_compact
+import perun.collect.trace.values as values
 import perun.collect.trace.systemtap.engine as stap
 import perun.testing.utils as test_utils
 
@@ -648,3 +655,251 @@ def test_collect_trace_fail(monkeypatch, pcs_full, trace_collect_job):
     # )
     # assert result.exit_code == 1
     # assert 'Error while parsing the raw trace record' in result.output
+
+
+def test_collect_trace_batch_parsing(monkeypatch, tmpdir):
+    """Test the parsing of the raw trace output by blocks and pairing of the function records"""
+    probes = types.SimpleNamespace(
+        func={
+            name: {"name": name, "id": idx, "sample": 1, "lib": "/bin/tst"}
+            for idx, name in enumerate(["main", "foo", "bar"])
+        },
+        usdt={},
+        usdt_reversed={},
+    )
+    trace_config = types.SimpleNamespace(
+        libs=[],
+        binary="/bin/tst",
+        verbose_trace=True,
+        executable=types.SimpleNamespace(workload="1"),
+        extract_mcg=False,
+    )
+    # The corrupted record is skipped and the last record does not have to be terminated
+    data_file = os.path.join(str(tmpdir), "trace.txt")
+    with open(data_file, "w") as trace:
+        trace.write(
+            "7 10 10 1 100;tst\n0 10 200;main\n0 10 210;foo\n0 10 220;bar\n1 10 250;bar\n"
+            "1 10 270;foo\n0 10 280;bar\n1 1O 290;bar\n1 10 300;bar\n1 10 400;main"
+        )
+    monkeypatch.setattr(parse_compact, "_build_alternative_cg", lambda *_: None)
+
+    # The records do not depend on the size of the blocks
+    batches = list(
+        parse_compact.parse_record_batches(data_file, parse_compact.ProbeTable(probes, True))
+    )
+    monkeypatch.setattr(values, "RECORD_BLOCK_SIZE", 16)
+    small_batches = list(
+        parse_compact.parse_record_batches(data_file, parse_compact.ProbeTable(probes, True))
+    )
+    assert len(small_batches) > len(batches)
+    records = numpy.concatenate(batches)
+    assert (numpy.concatenate(small_batches) == records).all()
+    assert records["seq"].tolist() == [0, 0, 0, 0, 0, 0, 1, 0, 0]
+
+    resources = list(parse_compact.process_records(data_file, trace_config, probes))
+    assert [
+        (resource["uid"], resource["amount"], resource["exclusive"]) for resource in resources
+    ] == [("bar", 30, 30), ("foo", 60, 30), ("bar", 20, 20), ("main", 200, 120)]
+    assert trace_config.stats_data["f"][10]["main"]["e"].tolist() == [120]
+
+
+def _process_records_by_handlers(data_file, trace_config, probes):
+    """Transforms the collection output by dispatching each record to the record handlers
+
+    :return: the list of resources and the parsing context
+    """
+    binaries = set(map(os.path.basename, trace_config.libs + [trace_config.binary]))
+    ctx = parse_compact.TransformContext(
+        probes, binaries, trace_config.verbose_trace, trace_config.executable.workload
+    )
+    probe_table = parse_compact.ProbeTable(probes, trace_config.verbose_trace)
+    handlers = parse_compact._record_handlers()
+    resources = []
+    for records in parse_compact.parse_record_batches(data_file, probe_table):
+        for record in records:
+            record = parse_compact._record_to_dict(record, probe_table)
+            try:
+                resource = handlers[record["type"]](record, ctx)
+            except (KeyError, IndexError):
+                continue
+            if resource:
+                resources.append(resource)
+    return resources, ctx
+
+
+def _summarize_context(ctx):
+    """Converts the statistics gathered in the parsing context to comparable structures"""
+    return {
+        "bottom": {tid: dict(funcs) for tid, funcs in ctx.bottom.items()},
+        "levels": {tid: dict(levels) for tid, levels in ctx.level_times_exclusive.items()},
+        "funcs": {
+            tid: {uid: (func["e"].tolist(), func["i"].tolist()) for uid, func in funcs.items()}
+            for tid, funcs in ctx.funcs.items()
+        },
+        "processes": dict(ctx.processes),
+        "threads": ctx.threads,
+        "dyn_cg": ctx.dyn_cg,
+        "probes_hit": ctx.probes_hit,
+    }
+
+
+def test_collect_trace_batch_equivalence(monkeypatch, tmpdir):
+    """Test that the batch processing of records matches the processing by the record handlers
+
+    Expecting the same resources and statistics for any size of the blocks, i.e. when the call
+    stacks are carried across the batches, threads end (and their ids are reused) with unfinished
+    calls, threads interleave and some of the records are lost
+    """
+    probes = types.SimpleNamespace(
+        func={
+            name: {"name": name, "id": idx, "sample": 1, "lib": "/bin/tst"}
+            for idx, name in enumerate(["main", "foo", "bar", "baz"])
+        },
+        usdt={},
+        usdt_reversed={"mend": "mbeg"},
+    )
+    trace_config = types.SimpleNamespace(
+        libs=[],
+        binary="/bin/tst",
+        verbose_trace=True,
+        executable=types.SimpleNamespace(workload="1"),
+        extract_mcg=False,
+    )
+    data_file = os.path.join(str(tmpdir), "trace.txt")
+    with open(data_file, "w") as trace:
+        trace.write(
+            "\n".join(
+                [
+                    "7 10 10 1 100;tst",
+                    "0 10 110;main",
+                    "0 10 120;foo",
+                    "5 11 10 125;tst",
+                    "0 11 130;foo",
+                    "0 10 140;bar",
+                    "3 10 145;mbeg",
+                    "0 11 150;bar",
+                    # The exit of bar in thread 11 is lost
+                    "0 11 155;baz",
+                    "1 10 160;bar",
+                    "0 10 165;bar",
+                    "0 10 170;foo",
+                    "0 10 175;baz",
+                    "4 10 176;mend",
+                    "1 10 180;baz",
+                    "1 11 185;baz",
+                    "1 10 190;foo",
+                    "0 11 195;bar",
+                    "1 11 200;bar",
+                    "1 11 230;foo",
+                    "6 11 10 240;tst",
+                    "5 12 10 250;tst",
+                    "0 12 260;bar",
+                    "1 1O 265;bar",
+                    "0 12 270;foo",
+                    "1 12 280;foo",
+                    # Thread 12 ends with unfinished call of bar
+                    "6 12 10 290;tst",
+                    "5 11 10 300;tst",
+                    "0 11 310;foo",
+                    "0 10 315;baz",
+                    "0 11 320;bar",
+                    "1 10 325;baz",
+                    "1 11 330;bar",
+                    "1 11 335;foo",
+                    "6 11 10 340;tst",
+                    "8 13 13 10 350;sh",
+                    # The exit of foo in thread 10 does not match the top of the stack
+                    "1 10 360;foo",
+                    "1 10 380;bar",
+                    "0 10 390;bar",
+                    "1 10 395;bar",
+                    "1 10 400;foo",
+                    "1 10 450;main",
+                    "8 10 10 1 500;tst",
+                ]
+            )
+        )
+
+    contexts = []
+    monkeypatch.setattr(parse_compact, "_build_alternative_cg", lambda _, ctx: contexts.append(ctx))
+    expected_resources, expected_ctx = _process_records_by_handlers(data_file, trace_config, probes)
+    expected_stats = {"p": expected_ctx.processes, "t": expected_ctx.threads}
+    assert {resource["uid"] for resource in expected_resources} >= {
+        "main",
+        "bar",
+        "foo",
+        "baz",
+        "mbeg#mend",
+        "!ThreadResource!",
+        "!ProcessResource!",
+    }
+
+    for block_size in (16, 48, 128, values.RECORD_BLOCK_SIZE):
+        monkeypatch.setattr(values, "RECORD_BLOCK_SIZE", block_size)
+        resources = list(parse_compact.process_records(data_file, trace_config, probes))
+        assert resources == expected_resources
+        assert _summarize_context(contexts[-1]) == _summarize_context(expected_ctx)
+        assert {key: trace_config.stats_data[key] for key in "pt"} == expected_stats
+
+
+def test_collect_trace_profile_builder(monkeypatch, tmpdir):
+    """Test building the profile from resources passed through the shared memory"""
+    probes = types.SimpleNamespace(
+        func={
+            name: {"name": name, "id": idx, "sample": 1, "lib": "/bin/tst"}
+            for idx, name in enumerate(["main", "foo"])
+        },
+        usdt={},
+        usdt_reversed={},
+    )
+    trace_config = types.SimpleNamespace(
+        libs=[],
+        binary="/bin/tst",
+        verbose_trace=True,
+        executable=types.SimpleNamespace(workload="1"),
+        extract_mcg=False,
+    )
+    data_file = os.path.join(str(tmpdir), "trace.txt")
+    with open(data_file, "w") as trace:
+        trace.write(
+            "5 10 10 100;tst\n0 10 200;main\n0 10 210;foo\n1 10 250;foo\n0 10 260;foo\n"
+            "1 10 270;foo\n0 11 280;foo\n1 11 300;foo\n1 10 400;main\n6 10 10 500;tst\n"
+        )
+    monkeypatch.setattr(parse_compact, "_build_alternative_cg", lambda *_: None)
+    profile = Profile()
+    profile.update_resources(
+        {"resources": list(parse_compact.process_records(data_file, trace_config, probes))},
+        "global",
+    )
+
+    # The resources are split into multiple slots of the buffer
+    resource_buffer = processes.SharedRingBuffer(parse_compact.RESOURCE_DTYPE, 2, 4)
+    profile_queue = processes.SafeQueue(1)
+    builder = multiprocessing.Process(
+        target=parse_compact.profile_builder, args=(resource_buffer, profile_queue, "1")
+    )
+    builder.start()
+    try:
+        for resources, probe_table in parse_compact.process_resource_arrays(
+            data_file, trace_config, probes
+        ):
+            resource_buffer.write(resources, (probe_table.names, probe_table.locations))
+        resource_buffer.end_of_input()
+        built_profile = profile_queue.read_large()
+    finally:
+        resource_buffer.close_writer()
+        profile_queue.close_reader()
+        builder.join()
+    assert built_profile.serialize() == profile.serialize()
+    assert sorted(built_profile["resources"]) == ["!ThreadResource!#0", "foo#0", "foo#1", "main#0"]
+
+    # The writing does not wait for free slots forever, when the consumer is terminated
+    resource_buffer = processes.SharedRingBuffer(parse_compact.RESOURCE_DTYPE, 1, 1)
+    terminated_consumer = multiprocessing.Process(target=int)
+    terminated_consumer.start()
+    terminated_consumer.join()
+    try:
+        records = numpy.zeros(2, dtype=parse_compact.RESOURCE_DTYPE)
+        assert not resource_buffer.write(records, consumer=terminated_consumer)
+    finally:
+        resource_buffer.close_writer()
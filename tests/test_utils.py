@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 # Standard Imports
+import collections
 import glob
 import io
 import pkgutil
@@ -28,7 +29,13 @@ from perun.utils.exceptions import (
     ResourceLockedException,
 )
 from perun.utils.structs import Unit, OrderedEnum, HandledSignals
-from perun.utils.external import environment, commands as external_commands, processes, executable
+from perun.utils.external import (
+    environment,
+    commands as external_commands,
+    processes,
+    executable,
+    symbols,
+)
 
 
 def assert_all_registered_modules(package_name, package, must_have_function_names):
@@ -230,6 +237,38 @@ def test_nonblocking_subprocess():
     assert "already being used" in str(exception.value)
 
 
+def test_symbol_resolution(monkeypatch, pcs_with_root, memory_collect_job):
+    """Test the batched resolution of symbols with the persistent cache"""
+    target = memory_collect_job[0][0]
+    symbols.close_resolvers()
+    monkeypatch.setattr(symbols, "DEFAULT_SYMBOLS_PERSISTENT_CACHE", "true")
+    resolver = symbols.get_resolver(target)
+    assert symbols.get_resolver(target) is resolver
+    names = resolver.demangle(["_ZN9SLListclsD1Ev", "main", "main"])
+    assert names == {"_ZN9SLListclsD1Ev": "SLListcls::~SLListcls()", "main": "main"}
+    lines = resolver.address_to_line(["0x0", "0xffffffff"])
+    assert lines == {"0x0": "??:0", "0xffffffff": "??:0"}
+    symbols.close_resolvers()
+    assert len(os.listdir(os.path.join(pcs_with_root.get_path(), "cache", "symbols"))) == 1
+
+    # The already resolved symbols are looked up without running any co-process
+    def no_translation(*_):
+        assert False, "symbols should have been cached"
+
+    original_translate = symbols.CoProcess.translate
+    monkeypatch.setattr(symbols.CoProcess, "translate", no_translation)
+    resolver = symbols.get_resolver(target)
+    assert resolver.demangle(["main", "_ZN9SLListclsD1Ev"]) == names
+    assert resolver.address_to_line(["0x0", "0xffffffff"]) == lines
+    monkeypatch.setattr(symbols.CoProcess, "translate", original_translate)
+
+    # Binaries that cannot be read by the tools are not translated
+    resolver = symbols.get_resolver(os.path.join(pcs_with_root.get_path(), "nonexisting"))
+    with pytest.raises(subprocess.CalledProcessError):
+        resolver.address_to_line(["0x0"])
+    symbols.close_resolvers()
+
+
 def test_signal_handler():
     """Tests default signal handler"""
     with HandledSignals(signal.SIGINT):
@@ -459,8 +498,61 @@ def test_trace_manager():
     classification = classifier_best.classify_trace(trace_d)
     assert classification.as_str == "main,a_a,b_b,c_a,d_a,e_a"
 
-    assert traces_kit.fast_compute_distance(trace_a, trace_b, cache={}, threshold=1) == 2
-    assert int(traces_kit.fast_compute_distance(trace_a, trace_b, cache={}, threshold=3)) == 3
+    # The interned functions are owned by the classifier and shared by its layers
+    assert classifier.functions is not classifier_best.functions
+    assert all(layer.functions is classifier.functions for layer in classifier.layers.values())
+    assert classifier.functions.ids and classifier_best.functions.ids
+
+    functions = traces_kit.FunctionTable()
+    for threshold, distance in [(1, 2), (3, 3)]:
+        cache = collections.OrderedDict()
+        assert int(traces_kit.fast_compute_distance(trace_a, trace_b, threshold, cache, functions))
+        assert list(cache.values()) == [
+            traces_kit.fast_compute_distance(trace_a, trace_b, threshold=threshold)
+        ]
+        assert int(cache.popitem()[1]) == distance
+
+
+def test_trace_distance_deep():
+    """Test computing distances of deep traces
+
+    Expecting no recursion errors, the batch distances equal to the single ones and bounded cache
+    of switch costs.
+    """
+    deep_trace = [f"func_{i % 50}" for i in range(5000)]
+    other_trace = deep_trace[:2500] + ["other_func"] + deep_trace[2500:]
+    assert traces_kit.fast_compute_distance(deep_trace, deep_trace, threshold=2) == 0
+    assert traces_kit.fast_compute_distance(deep_trace, other_trace, threshold=2) == 1
+    assert traces_kit.fast_compute_distance(deep_trace, deep_trace[3:], threshold=2) == 3
+    assert traces_kit.compute_distance(
+        [{"func": f} for f in deep_trace[:300]], [{"func": f} for f in other_trace[:301]]
+    ) == traces_kit.compute_distance(
+        [{"func": f} for f in deep_trace[:300]], [{"func": f} for f in deep_trace[:299]]
+    )
+
+    candidates = [other_trace, deep_trace[1:], deep_trace[:10], other_trace[1:]]
+    assert traces_kit.fast_compute_distances(deep_trace, candidates, threshold=2) == [
+        traces_kit.fast_compute_distance(deep_trace, candidate, threshold=2)
+        for candidate in candidates
+    ]
+    assert traces_kit.switch_cost("func_1", "other_func") == 0.5
+    functions = traces_kit.FunctionTable()
+    assert functions.switch_cost(*functions.intern(["func_1", "other_func"])) == 0.5
+    assert functions.cached_switch_cost.cache_info().maxsize == traces_kit.SWITCH_CACHE_SIZE
+
+
+def test_trace_distance_cache(monkeypatch):
+    """Test that the cache of distances of the classifier layer is bounded
+
+    Expecting that only the least recently used distances are evicted
+    """
+    monkeypatch.setattr(traces_kit, "DISTANCE_CACHE_SIZE", 2)
+    layer = traces_kit.TraceClassifierLayer(threshold=0.5)
+    for trace in (["main", "a"], ["main", "b_x"], ["main", "c_y"], ["main", "d_z"]):
+        layer.classify_trace(trace)
+    assert len(layer.clusters) == 4
+    assert len(layer.distance_cache) == 2
+    assert list(layer.distance_cache.values()) == [1.0, 1.0]
 
 
 def test_machine_info(monkeypatch):